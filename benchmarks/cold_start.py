@@ -0,0 +1,135 @@
+﻿"""
+Cold-start report - import time per module (python -X importtime, parsed) plus command registration, measured in
+fresh interpreters that import and wire what core/main.py does, without connecting to Discord
+Run offline: python -m benchmarks.cold_start --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_PARTY = ("core", "systems", "commands")
+
+# Mirrors core/main.py up to bot.run (main.py logs in at import, so it can't be imported here)
+_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import discord
+from discord.ext import commands
+imported_discord = time.perf_counter()
+import systems.events as events
+import systems.handlers as handlers
+import systems.tasks as tasks
+from commands import user_commands, admin_commands
+from core import utils, latency
+import systems.onboarding as onboarding
+imported = time.perf_counter()
+bot = commands.Bot(command_prefix="!", intents=discord.Intents.all())
+for module in (handlers, tasks, utils, events, user_commands, admin_commands, onboarding):
+    module.set_bot(bot)
+user_commands.register_commands(bot)
+registered_user = time.perf_counter()
+admin_commands.register_commands(bot)
+registered_admin = time.perf_counter()
+latency.install(bot)
+latency.instrument_tree(bot.tree)
+done = time.perf_counter()
+print(json.dumps({
+    "import_discord": imported_discord - started,
+    "import_bot_modules": imported - imported_discord,
+    "register_user_commands": registered_user - imported,
+    "register_admin_commands": registered_admin - registered_user,
+    "instrument": done - registered_admin,
+    "total": done - started,
+    "commands": len(bot.tree.get_commands()),
+}))
+"""
+
+def parse_importtime(stderr: str) -> list:
+    """-X importtime lines -> [(module, self_us, cumulative_us, depth)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        head, cumulative_us, name = line.split("|", 2)
+        self_us = int(head.split(":", 1)[1])
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), self_us, int(cumulative_us), depth))
+    return rows
+
+def _run_once(python: str) -> tuple:
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    with tempfile.TemporaryDirectory() as tmp:  # Some modules write relative data/ files at import
+        proc = subprocess.run(
+            [python, "-X", "importtime", "-c", _SCRIPT],
+            cwd=tmp, env=env, capture_output=True, text=True, check=False,
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Cold-start run failed:\n{proc.stderr[-2000:]}")
+    phases = json.loads(proc.stdout.strip().splitlines()[-1])
+    return phases, parse_importtime(proc.stderr)
+
+def _group(module: str) -> str:
+    top = module.split(".", 1)[0]
+    if top in FIRST_PARTY:
+        return "first-party"
+    if top in ("discord", "aiohttp", "aiosqlite", "multidict", "yarl", "frozenlist", "aiosignal", "attr", "propcache", "aiohappyeyeballs"):
+        return top
+    return "stdlib/other"
+
+def run_report(runs: int = 3, python: str = sys.executable, top: int = 20) -> dict:
+    """Median phase timings over runs, plus import self/cumulative times from the last run"""
+    samples = []
+    modules = []
+    for _ in range(max(1, runs)):
+        phases, modules = _run_once(python)
+        samples.append(phases)
+    phases = {key: statistics.median(sample[key] for sample in samples) for key in samples[0] if key != "commands"}
+    phases["commands"] = samples[0]["commands"]
+
+    groups = {}
+    for module, self_us, _, _ in modules:
+        groups[_group(module)] = groups.get(_group(module), 0) + self_us
+    first_party = [row for row in modules if _group(row[0]) == "first-party"]
+    return {
+        "runs": len(samples),
+        "phases": phases,
+        "self_ms_by_group": {group: us / 1000 for group, us in sorted(groups.items(), key=lambda kv: -kv[1])},
+        "slowest_imports": [(m, s / 1000, c / 1000) for m, s, c, _ in sorted(modules, key=lambda r: -r[2])[:top]],
+        "first_party_imports": [(m, s / 1000, c / 1000) for m, s, c, _ in sorted(first_party, key=lambda r: -r[1])[:top]],
+    }
+
+def format_report(result: dict) -> str:
+    phases = result["phases"]
+    lines = [f"Cold start (median of {result['runs']} run(s), {phases['commands']} top-level commands)"]
+    for key in ("import_discord", "import_bot_modules", "register_user_commands", "register_admin_commands", "instrument", "total"):
+        lines.append(f"  {key:<26} {phases[key] * 1000:>9.1f} ms")
+    lines.append("Import self time by group:")
+    for group, ms in result["self_ms_by_group"].items():
+        lines.append(f"  {group:<26} {ms:>9.1f} ms")
+    for title, key in (("Slowest imports (cumulative)", "slowest_imports"), ("First-party imports (self)", "first_party_imports")):
+        lines.append(f"{title}:")
+        lines.append(f"  {'module':<40} {'self ms':>9} {'cum ms':>9}")
+        for module, self_ms, cumulative_ms in result[key]:
+            lines.append(f"  {module:<40} {self_ms:>9.2f} {cumulative_ms:>9.2f}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import and command registration time for a bot cold start")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to run (phase timings are medians)")
+    parser.add_argument("--top", type=int, default=20, help="Modules listed per table")
+    parser.add_argument("--python", default=sys.executable, help="Interpreter to measure")
+    parser.add_argument("--json", action="store_true", help="Print the raw result as JSON")
+    args = parser.parse_args(argv)
+
+    result = run_report(args.runs, args.python, args.top)
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
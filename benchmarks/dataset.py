@@ -0,0 +1,408 @@
+﻿"""
+Synthetic dataset generator - fills a fresh isla_bot.db with a realistic, seeded population (ledger, activity,
+orders, loans, debt, rank cache, short-term event tables) for the progression and economy benchmarks
+Run offline: python -m benchmarks.dataset --users 20000 --ledger-rows 10000000 --out data/bench/isla_bot.db
+"""
+import argparse
+import asyncio
+import datetime
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.config import ALLOWED_GUILDS
+
+GUILD_ID = next(iter(ALLOWED_GUILDS))
+FIRST_USER_ID = 100_000
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "bench", "isla_bot.db")
+BATCH_ROWS = 100_000
+
+# Tunable distributions; override any of them with --set name=value
+DEFAULTS = {
+    "engagement_alpha": 1.4,   # Pareto shape of per-user engagement (lower = heavier tail of power users)
+    "active_share": 0.35,      # Chance a user of average engagement is active on a given day
+    "messages_per_day": 18.0,  # Mean messages on an active day at average engagement
+    "vc_share": 0.25,          # Share of active days with voice time
+    "vc_minutes": 45.0,        # Mean voice minutes on those days
+    "orders_per_user": 12.0,   # Mean order runs per user over the window at average engagement
+    "order_completed": 0.62,   # Order run outcome mix (weights)
+    "order_late": 0.10,
+    "order_failed": 0.22,
+    "order_accepted": 0.06,
+    "loan_share": 0.04,        # Users holding a loan
+    "loan_overdue": 0.3,       # Share of those loans already past due
+    "debt_share": 0.07,        # Users carrying debt
+    "event_rows": 200_000,     # message/reaction/command events and voice sessions, across the last 14 days
+}
+
+# (ledger type, weight, min amount, max amount); negative amounts are burns
+LEDGER_TYPES = (
+    ("casino_bet", 40, -500, -10),
+    ("casino_payout", 30, 10, 1000),
+    ("unknown", 10, 50, 150),  # /daily
+    ("event_participation", 6, 10, 50),
+    ("order_completed", 8, 40, 400),
+    ("weekly_claim", 2, 100, 800),
+    ("order_streak_bonus", 1, 25, 100),
+    ("inactivity_tax", 2, -400, -10),
+    ("loan_payment", 0.5, -500, -50),
+    ("debt_payment", 0.5, -500, -50),
+)
+
+# -----------------------------
+# Helpers
+# -----------------------------
+_TIMES_OF_DAY = [f"{h:02d}:{m:02d}:{s:02d}" for h in range(24) for m in range(60) for s in range(60)]
+_dates = {}  # {days since epoch: 'YYYY-MM-DD'}
+
+def _iso(ts: float) -> str:
+    """UTC ISO timestamp to the second (datetime.isoformat() dominates load time at 10M+ rows)"""
+    day, second = divmod(int(ts), 86400)
+    date = _dates.get(day)
+    if date is None:
+        date = _dates[day] = (datetime.date(1970, 1, 1) + datetime.timedelta(days=day)).isoformat()
+    return f"{date}T{_TIMES_OF_DAY[second]}+00:00"
+
+def _rng(seed: int, table: str) -> random.Random:
+    """Independent stream per table, so resizing one table leaves the others unchanged"""
+    return random.Random(f"{seed}:{table}")
+
+def _batched(rows, size: int = BATCH_ROWS):
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def _insert(conn: sqlite3.Connection, table: str, columns: tuple, rows, batches=None) -> int:
+    """executemany in BATCH_ROWS chunks (or over ready-made batches); returns rows inserted"""
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    count = 0
+    for batch in batches if batches is not None else _batched(rows):
+        conn.executemany(query, batch)
+        count += len(batch)
+    return count
+
+async def _create_schema(path: str):
+    """Tables and indexes exactly as the bot creates them"""
+    from core import db
+    original_path = db._db_path
+    db._db_path = path
+    try:
+        await db.init_db()
+        await db.close_db()
+    finally:
+        db._db_path = original_path
+
+# -----------------------------
+# Population
+# -----------------------------
+class Population:
+    """Users and their engagement weights (mean ~1)"""
+
+    def __init__(self, users: int, seed: int, alpha: float):
+        rng = _rng(seed, "users")
+        self.user_ids = list(range(FIRST_USER_ID, FIRST_USER_ID + users))
+        raw = [rng.paretovariate(alpha) for _ in self.user_ids]
+        mean = sum(raw) / len(raw) if raw else 1.0
+        self.weights = [w / mean for w in raw]
+        self.cum_weights = list(itertools.accumulate(self.weights))
+
+def _ledger_batches(pop: Population, count: int, start: float, end: float, seed: int, earned: list, burned: list):
+    """Ledger row batches picked by engagement; adds each user's earned/burned totals (indexed like pop.user_ids)"""
+    if np is not None:
+        yield from _ledger_batches_numpy(pop, count, start, end, seed, earned, burned)
+        return
+    rng = _rng(seed, "ledger")
+    types, weights = zip(*((t[0], t[1]) for t in LEDGER_TYPES))
+    bounds = {t[0]: (t[2], t[3]) for t in LEDGER_TYPES}
+    indexes = range(len(pop.user_ids))
+    span = end - start
+    remaining = count
+    while remaining > 0:
+        size = min(BATCH_ROWS, remaining)
+        remaining -= size
+        users = rng.choices(indexes, cum_weights=pop.cum_weights, k=size)
+        kinds = rng.choices(types, weights, k=size)
+        batch = []
+        for i, kind in zip(users, kinds):
+            low, high = bounds[kind]
+            amount = low + int(rng.random() * (high - low + 1))
+            if amount > 0:
+                earned[i] += amount
+            else:
+                burned[i] -= amount
+            batch.append((GUILD_ID, FIRST_USER_ID + i, _iso(start + rng.random() * span), kind, amount, None))
+        yield batch
+
+def _ledger_batches_numpy(pop: Population, count: int, start: float, end: float, seed: int, earned: list, burned: list):
+    """Vectorized draws for the ledger (the only table at tens of millions of rows); same distributions, different stream"""
+    gen = np.random.default_rng([seed, 1])
+    cum = np.asarray(pop.cum_weights)
+    types = [t[0] for t in LEDGER_TYPES]
+    p = np.array([t[1] for t in LEDGER_TYPES], dtype=np.float64)
+    lows = np.array([t[2] for t in LEDGER_TYPES], dtype=np.int64)
+    widths = np.array([t[3] - t[2] + 1 for t in LEDGER_TYPES], dtype=np.int64)
+    n = len(cum)
+    earned_sum = np.zeros(n)
+    burned_sum = np.zeros(n)
+    remaining = count
+    while remaining > 0:
+        size = min(BATCH_ROWS, remaining)
+        remaining -= size
+        users = np.minimum(np.searchsorted(cum, gen.random(size) * cum[-1], side="right"), n - 1)
+        kinds = gen.choice(len(types), size, p=p / p.sum())
+        amounts = lows[kinds] + (gen.random(size) * widths[kinds]).astype(np.int64)
+        seconds = (start + gen.random(size) * (end - start)).astype(np.int64)
+        earned_sum += np.bincount(users, weights=np.maximum(amounts, 0), minlength=n)
+        burned_sum += np.bincount(users, weights=np.maximum(-amounts, 0), minlength=n)
+        stamps = np.datetime_as_string(seconds.astype("datetime64[s]")).tolist()
+        yield list(zip(
+            itertools.repeat(GUILD_ID), (users + FIRST_USER_ID).tolist(), [f"{t}+00:00" for t in stamps],
+            [types[k] for k in kinds.tolist()], amounts.tolist(), itertools.repeat(None),
+        ))
+    for i in range(n):
+        earned[i] += int(earned_sum[i])
+        burned[i] += int(burned_sum[i])
+
+def _activity_rows(pop: Population, days: list, knobs: dict, seed: int, active_users: set):
+    rng = _rng(seed, "activity")
+    for user_id, weight in zip(pop.user_ids, pop.weights):
+        chance = min(0.98, knobs["active_share"] * weight)
+        for day, day_iso in days:
+            if rng.random() >= chance:
+                continue
+            active_users.add(user_id)
+            messages = int(rng.expovariate(1 / (knobs["messages_per_day"] * weight))) + 1
+            vc_minutes = int(rng.expovariate(1 / knobs["vc_minutes"])) if rng.random() < knobs["vc_share"] else 0
+            yield (
+                GUILD_ID, user_id, day, messages, vc_minutes,
+                rng.randint(0, messages // 3), rng.randint(0, 4), rng.randint(0, 2), rng.randint(0, 6), day_iso,
+            )
+
+def _order_rows(pop: Population, order_ids: dict, knobs: dict, start: float, end: float, seed: int, outcomes: dict):
+    """order_runs rows; accumulates per-day outcome counts for order_outcomes_daily"""
+    from systems.orders import ORDERS_CATALOG
+    rng = _rng(seed, "orders")
+    keys = list(ORDERS_CATALOG)
+    statuses = ("completed", "late", "failed", "accepted")
+    mix = [knobs[f"order_{s}"] for s in statuses]
+    span = end - start
+    for user_id, weight in zip(pop.user_ids, pop.weights):
+        runs = min(200, int(rng.expovariate(1 / (knobs["orders_per_user"] * weight))))
+        for _ in range(runs):
+            key = rng.choice(keys)
+            order = ORDERS_CATALOG[key]
+            outcome = rng.choices(statuses, mix)[0]
+            # Open runs are recent; the rest may be anywhere in the window
+            accepted = end - rng.random() * order["due_seconds"] if outcome == "accepted" else start + rng.random() * span
+            due = accepted + order["due_seconds"]
+            completed_at = None
+            if outcome == "completed":
+                completed_at = _iso(accepted + rng.random() * order["due_seconds"])
+            elif outcome == "late":
+                completed_at = _iso(due + rng.random() * 86400)
+            status = "completed" if outcome == "late" else outcome
+            if outcome != "accepted":
+                day = (completed_at or _iso(due))[:10]
+                counts = outcomes.setdefault((user_id, day), [0, 0, 0])
+                counts[("completed", "late", "failed").index(outcome)] += 1
+            yield (
+                GUILD_ID, user_id, order_ids[key], key, _iso(accepted), _iso(due), completed_at,
+                status, 1 if outcome == "late" else 0, None, None,
+            )
+
+def _event_rows(pop: Population, count: int, now: float, seed: int):
+    """Short-term event rows over the last 14 days, so retention cleanup has work"""
+    rng = _rng(seed, "events")
+    window = 14 * 86400
+    per_table = count // 4
+    users = rng.choices(pop.user_ids, cum_weights=pop.cum_weights, k=per_table)
+    messages = ((GUILD_ID, u, int(now - rng.random() * window), rng.randint(1, 20), int(rng.random() < 0.2), 0) for u in users)
+    reactions = ((GUILD_ID, u, int(now - rng.random() * window), rng.randint(1, 20), rng.choice(("❤️", "👍", "🔥", "😂")), rng.randint(1, 10**9), 0) for u in users)
+    commands = ((GUILD_ID, u, int(now - rng.random() * window), rng.choice(("profile", "balance", "daily", "dice")), rng.randint(1, 20)) for u in users)
+    sessions = []
+    for u in users:
+        join = int(now - rng.random() * window)
+        minutes = rng.randint(1, 180)
+        sessions.append((GUILD_ID, u, join, join + minutes * 60, minutes))
+    return messages, reactions, commands, sessions
+
+def _rank_index(lce: int) -> int:
+    from systems.progression import RANK_LADDER
+    for i in range(len(RANK_LADDER) - 1, -1, -1):
+        if lce >= RANK_LADDER[i]["lce_min"]:
+            return i
+    return 0
+
+# -----------------------------
+# Generator
+# -----------------------------
+def generate(out: str, users: int = 10_000, ledger_rows: int = 1_000_000, days: int = 35, seed: int = 0,
+             as_of: datetime.date = None, force: bool = False, **overrides) -> dict:
+    """
+    Create out (refuses to overwrite unless force) and fill it. Returns {table: rows} plus "seconds".
+    Deterministic for the same arguments and as_of date.
+    """
+    unknown = set(overrides) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown dataset settings: {', '.join(sorted(unknown))}")
+    knobs = {**DEFAULTS, **overrides}
+    if os.path.exists(out):
+        if not force:
+            raise FileExistsError(f"{out} exists (use --force to replace it)")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(out + suffix):
+                os.remove(out + suffix)
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+
+    started = time.perf_counter()
+    as_of = as_of or datetime.datetime.now(datetime.UTC).date()
+    end = datetime.datetime.combine(as_of, datetime.time(12), datetime.UTC).timestamp()
+    start = end - days * 86400
+    day_list = [((as_of - datetime.timedelta(days=d)).isoformat(), _iso(end - d * 86400)) for d in range(days)]
+    now_iso = _iso(end)
+
+    asyncio.run(_create_schema(out))
+    pop = Population(users, seed, knobs["engagement_alpha"])
+    counts = {}
+
+    conn = sqlite3.connect(out, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-262144")
+        # Secondary indexes are rebuilt once after the load instead of maintained row by row
+        indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")]
+        for name in indexes:
+            conn.execute(f"DROP INDEX {name}")
+        conn.execute("BEGIN")
+
+        earned, burned = [0] * users, [0] * users
+        counts["economy_ledger"] = _insert(conn, "economy_ledger", ("guild_id", "user_id", "ts", "type", "amount", "meta_json"),
+                                           None, _ledger_batches(pop, ledger_rows, start, end, seed, earned, burned))
+
+        active_users = set()
+        counts["activity_daily"] = _insert(
+            conn, "activity_daily",
+            ("guild_id", "user_id", "day", "messages_count", "vc_minutes", "reactions_count", "commands_used_count",
+             "events", "presence_ticks", "updated_at"),
+            _activity_rows(pop, day_list, knobs, seed, active_users))
+
+        from systems.orders import ORDERS_CATALOG
+        order_ids = {}
+        for key, order in ORDERS_CATALOG.items():
+            cursor = conn.execute(
+                "INSERT INTO orders (guild_id, name, description, reward_coins, due_seconds, is_active, created_at) VALUES (?, ?, ?, ?, ?, 1, ?)",
+                (GUILD_ID, order["title"], order.get("instructions", ""), order["reward_coins"], order["due_seconds"], _iso(start))
+            )
+            order_ids[key] = cursor.lastrowid
+        counts["orders"] = len(order_ids)
+        outcomes = {}
+        counts["order_runs"] = _insert(
+            conn, "order_runs",
+            ("guild_id", "user_id", "order_id", "order_key", "accepted_at", "due_at", "completed_at", "status",
+             "completed_late", "progress_json", "meta_json"),
+            _order_rows(pop, order_ids, knobs, start, end, seed, outcomes))
+        counts["order_outcomes_daily"] = _insert(
+            conn, "order_outcomes_daily", ("guild_id", "user_id", "day", "done_count", "late_count", "failed_count"),
+            ((GUILD_ID, user_id, day, *c) for (user_id, day), c in outcomes.items()))
+
+        # Balances follow from the ledger; everyone in it gets a profile and a rank cache row
+        rng = _rng(seed, "wallets")
+        wallets = [(FIRST_USER_ID + i, (e, b)) for i, (e, b) in enumerate(zip(earned, burned)) if e or b]
+        counts["economy_balance"] = _insert(
+            conn, "economy_balance",
+            ("guild_id", "user_id", "coins_balance", "coins_lifetime_earned", "coins_lifetime_burned", "updated_at"),
+            ((GUILD_ID, u, max(0, earned - burned), earned, burned, now_iso) for u, (earned, burned) in wallets))
+        counts["user_profile"] = _insert(
+            conn, "user_profile",
+            ("guild_id", "user_id", "coins", "times_gambled", "total_wins", "total_spent", "updated_at"),
+            ((GUILD_ID, u, max(0, earned - burned), burned // 100, burned // 250, burned, now_iso) for u, (earned, burned) in wallets))
+        from systems.progression import RANK_LADDER
+        rank_rows = []
+        for user_id, (earned, _) in wallets:
+            idx = _rank_index(earned)
+            held = max(0, idx - (1 if rng.random() < 0.3 else 0))
+            at_risk = 1 if rng.random() < 0.05 else 0
+            rank_rows.append((
+                GUILD_ID, user_id, RANK_LADDER[idx]["name"], RANK_LADDER[held]["name"], RANK_LADDER[held]["name"], held,
+                at_risk, now_iso if at_risk else None, rng.randint(0, 100), None, now_iso, rng.randint(0, 3), None,
+            ))
+        counts["rank_cache"] = _insert(
+            conn, "rank_cache",
+            ("guild_id", "user_id", "coin_rank", "eligible_rank", "final_rank", "held_rank_idx", "at_risk", "at_risk_since",
+             "readiness_pct", "blocker_text", "computed_at", "failed_weeks_count", "last_promotion_at"),
+            rank_rows)
+
+        loan_rows, debt_rows = [], []
+        for user_id in pop.user_ids:
+            if rng.random() < knobs["loan_share"]:
+                principal = rng.randint(5, 50) * 100
+                issued = end - rng.random() * 14 * 86400
+                due = end - rng.random() * 86400 * 3 if rng.random() < knobs["loan_overdue"] else end + rng.random() * 7 * 86400
+                loan_rows.append((GUILD_ID, user_id, principal, rng.randint(1, principal), _iso(issued), _iso(due), "active"))
+            if rng.random() < knobs["debt_share"]:
+                debt_rows.append((GUILD_ID, user_id, rng.randint(1, 100) * 50, rng.randint(0, 10), _iso(end - rng.random() * days * 86400), None, now_iso))
+            elif user_id in active_users:
+                debt_rows.append((GUILD_ID, user_id, 0, 0, now_iso, None, now_iso))
+        counts["loans"] = _insert(conn, "loans", ("guild_id", "user_id", "principal", "remaining_principal", "issued_at", "due_at", "status"), loan_rows)
+        counts["discipline_state"] = _insert(
+            conn, "discipline_state",
+            ("guild_id", "user_id", "debt", "inactive_days", "last_qualifying_activity_at", "last_taxed_at", "updated_at"),
+            debt_rows)
+
+        messages, reactions, commands, sessions = _event_rows(pop, knobs["event_rows"], end, seed)
+        counts["message_events"] = _insert(conn, "message_events", ("guild_id", "user_id", "ts", "channel_id", "is_reply", "replied_to_user_is_bot"), messages)
+        counts["reaction_events"] = _insert(conn, "reaction_events", ("guild_id", "user_id", "ts", "channel_id", "emoji", "message_id", "is_forum"), reactions)
+        counts["command_events"] = _insert(conn, "command_events", ("guild_id", "user_id", "ts", "command_name", "channel_id"), commands)
+        counts["voice_sessions"] = _insert(conn, "voice_sessions", ("guild_id", "user_id", "join_ts", "leave_ts", "minutes"), sessions)
+
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    # Re-running the bot's schema setup rebuilds the dropped indexes and restores WAL mode
+    asyncio.run(_create_schema(out))
+    counts["seconds"] = time.perf_counter() - started
+    return counts
+
+def _parse_setting(text: str):
+    name, _, value = text.partition("=")
+    if name not in DEFAULTS:
+        raise argparse.ArgumentTypeError(f"unknown setting {name} (one of: {', '.join(DEFAULTS)})")
+    return name, type(DEFAULTS[name])(value)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic IslaBot database for benchmarks")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--ledger-rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=35, help="Days of activity/ledger/order history")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--as-of", type=datetime.date.fromisoformat, default=None, help="Anchor date (default: today, UTC)")
+    parser.add_argument("--set", type=_parse_setting, action="append", default=[], metavar="NAME=VALUE",
+                        help=f"Override a distribution setting ({', '.join(DEFAULTS)})")
+    parser.add_argument("--force", action="store_true", help="Replace an existing file")
+    args = parser.parse_args(argv)
+
+    counts = generate(args.out, users=args.users, ledger_rows=args.ledger_rows, days=args.days, seed=args.seed,
+                      as_of=args.as_of, force=args.force, **dict(args.set))
+    seconds = counts.pop("seconds")
+    print(f"Generated {args.out} in {seconds:.1f}s")
+    for table, rows in counts.items():
+        print(f"  {table:<22} {rows:>12,}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
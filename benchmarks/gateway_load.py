@@ -0,0 +1,487 @@
+﻿"""
+Gateway load generator - replays synthetic messages, reactions, voice updates and slash commands through the
+real handlers against a throwaway SQLite database and reports throughput, latency and DB work per event
+Run offline: python -m benchmarks.gateway_load --members 1000 --events 5000 --event-type 1
+"""
+import argparse
+import asyncio
+import collections
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import discord
+from discord.ext import commands
+
+from core import db, latency
+from core.config import (
+    ALLOWED_GUILDS, USER_COMMAND_CHANNEL_ID, VC_XP_TRACK_CHANNELS,
+    EVENT_PHASE2_CHANNEL_ID, EVENT_PHASE2_ALLOWED_ROLE,
+    EVENT_4_WOOF_CHANNEL_ID, EVENT_4_WOOF_ROLE, EVENT_7_SUCCESS_ROLE,
+)
+
+GUILD_ID = next(iter(ALLOWED_GUILDS))
+BOT_USER_ID = 1
+FIRST_MEMBER_ID = 10_000
+EVENT_MESSAGE_ID = 555_000  # Message carrying the hidden reaction during event 3
+TEXT_CHANNEL_IDS = (9_001, 9_002, 9_003, 9_004)
+STARTING_COINS = 50_000
+DEFAULT_MIX = "message=80,reaction=10,voice=5,command=5"
+EVENT_TYPES = (0, 1, 2, 3, 4, 5, 7)  # 0 = no active event
+EVENT_SHARE = 0.3  # Fraction of messages/reactions aimed at the active event
+COMMANDS = (("balance", {}), ("profile", {}), ("daily", {}), ("dice", {"bet": 100}), ("slots bet", {"bet": 50}))
+HEART = discord.PartialEmoji(name="❤️")
+OTHER_EMOJI = (discord.PartialEmoji(name="👍"), discord.PartialEmoji(name="😂"), discord.PartialEmoji(name="🔥"))
+CHATTER = (
+    "good morning everyone", "lol same", "what are we doing tonight", "i am so tired today",
+    "did anyone see the new program", "brb", "that is actually so funny", "ok but why",
+)
+EVENT_CONTENT = {1: "hi", 4: "me me me", 5: "here", 7: "steam"}
+
+# -----------------------------
+# Fake gateway objects
+# -----------------------------
+class FakeRole:
+    def __init__(self, role_id: int, name: str):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+class FakeAsset:
+    url = "https://cdn.discordapp.com/embed/avatars/0.png"
+
+class FakeChannel:
+    def __init__(self, channel_id: int, name: str):
+        self.id = channel_id
+        self.name = name
+        self.mention = f"<#{channel_id}>"
+        self.category = None
+        self.parent = None
+
+    def __str__(self):
+        return self.name
+
+    async def send(self, *args, **kwargs):
+        return None
+
+class FakeGuild:
+    def __init__(self, guild_id: int, channels: list, roles: list):
+        self.id = guild_id
+        self.name = "Benchmark Guild"
+        self.members = {}
+        self._channels = {c.id: c for c in channels}
+        self._roles = {r.id: r for r in roles}
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def get_role(self, role_id):
+        return self._roles.get(role_id)
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+class FakeMember(discord.Member):
+    """discord.Member stand-in; handlers and permission checks isinstance-check Member"""
+
+    def __init__(self, guild: FakeGuild, user_id: int, roles: list, is_bot: bool = False):
+        self.guild = guild
+        self.member_id = user_id
+        self.member_name = f"member{user_id}"
+        self.member_roles = roles
+        self.is_bot = is_bot
+
+    id = property(lambda self: self.member_id)
+    name = property(lambda self: self.member_name)
+    display_name = property(lambda self: self.member_name)
+    mention = property(lambda self: f"<@{self.member_id}>")
+    bot = property(lambda self: self.is_bot)
+    roles = property(lambda self: self.member_roles)
+    display_avatar = property(lambda self: FakeAsset)
+
+    async def send(self, *args, **kwargs):
+        return None
+
+    async def add_roles(self, *roles, reason=None, atomic=True):
+        self.member_roles.extend(r for r in roles if r not in self.member_roles)
+
+class FakeMessage:
+    def __init__(self, message_id: int, author: FakeMember, channel: FakeChannel, content: str, reference=None):
+        self.id = message_id
+        self.author = author
+        self.channel = channel
+        self.guild = author.guild
+        self.content = content
+        self.reference = reference
+
+    async def add_reaction(self, emoji):
+        return None
+
+    async def reply(self, *args, **kwargs):
+        return None
+
+    async def delete(self, *args, **kwargs):
+        return None
+
+class FakeReference:
+    def __init__(self, resolved):
+        self.resolved = resolved
+
+class FakeReactionPayload:
+    """RawReactionActionEvent fields the handlers read"""
+
+    def __init__(self, guild_id: int, user_id: int, channel_id: int, message_id: int, emoji):
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.emoji = emoji
+
+class FakeVoiceState:
+    def __init__(self, channel=None):
+        self.channel = channel
+
+class FakeResponse:
+    def __init__(self):
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def send_message(self, *args, **kwargs):
+        self.done = True
+
+    async def defer(self, *args, **kwargs):
+        self.done = True
+
+    async def edit_message(self, *args, **kwargs):
+        self.done = True
+
+class FakeFollowup:
+    async def send(self, *args, **kwargs):
+        return None
+
+class FakeInteraction(discord.Interaction):
+    """discord.Interaction stand-in; command callbacks isinstance-check Interaction"""
+
+    def __init__(self, user: FakeMember, channel: FakeChannel):
+        self.id = random.getrandbits(63)
+        self.user = user
+        self.channel = channel
+        self.guild_id = user.guild.id
+        self.locale = discord.Locale.american_english
+        self.fake_response = FakeResponse()
+        self.fake_followup = FakeFollowup()
+
+    guild = property(lambda self: self.user.guild)
+    channel_id = property(lambda self: self.channel.id)
+    response = property(lambda self: self.fake_response)
+    followup = property(lambda self: self.fake_followup)
+
+class FakeBot:
+    def __init__(self, guild: FakeGuild):
+        self.user = FakeRole(BOT_USER_ID, "IslaBot")
+        self.guild = guild
+
+    def get_guild(self, guild_id):
+        return self.guild if guild_id == self.guild.id else None
+
+# -----------------------------
+# Scenario
+# -----------------------------
+def parse_mix(text: str) -> dict:
+    """'message=80,reaction=10,...' -> {kind: weight}"""
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in ("message", "reaction", "voice", "command"):
+            raise ValueError(f"Unknown event kind in mix: {kind}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+def build_guild(member_count: int, rng: random.Random) -> FakeGuild:
+    roles = [FakeRole(EVENT_4_WOOF_ROLE, "Woof"), FakeRole(EVENT_PHASE2_ALLOWED_ROLE, "Opted In"), FakeRole(EVENT_7_SUCCESS_ROLE, "Success")]
+    channels = [FakeChannel(cid, f"chat-{i}") for i, cid in enumerate(TEXT_CHANNEL_IDS)]
+    channels += [
+        FakeChannel(USER_COMMAND_CHANNEL_ID, "user-commands"),
+        FakeChannel(EVENT_4_WOOF_CHANNEL_ID, "woof"),
+        FakeChannel(EVENT_PHASE2_CHANNEL_ID, "event-phase-2"),
+    ]
+    channels += [FakeChannel(cid, f"voice-{i}") for i, cid in enumerate(sorted(VC_XP_TRACK_CHANNELS))]
+    guild = FakeGuild(GUILD_ID, channels, roles)
+    woof, opted_in = roles[0], roles[1]
+    for user_id in range(FIRST_MEMBER_ID, FIRST_MEMBER_ID + member_count):
+        member_roles = [role for role in (woof, opted_in) if rng.random() < 0.5]
+        guild.members[user_id] = FakeMember(guild, user_id, member_roles)
+    return guild
+
+def event_state(event_type: int, guild_id: int):
+    """Minimal active_event dict as start_obedience_event leaves it for the handled phase"""
+    if not event_type:
+        return None
+    state = {
+        "type": event_type,
+        "guild_id": guild_id,
+        "message_id": EVENT_MESSAGE_ID,
+        "phase": 1,
+        "participants": set(),
+        "reactors": set(),
+        "message_cooldowns": {},
+    }
+    if event_type == 2:
+        state["join_times"] = {}
+    elif event_type == 3:
+        state["heart_emojis"] = [str(HEART)]
+    elif event_type == 4:
+        state["phase"] = 2
+        state["answered"] = set()
+    elif event_type == 7:
+        state["phase"] = 2
+        state["question_answers"] = [EVENT_CONTENT[7]]
+        state["answered_correctly"] = set()
+        state["answered_incorrectly"] = set()
+    return state
+
+def build_events(guild: FakeGuild, count: int, mix: dict, event_type: int, rng: random.Random, tree) -> list:
+    """Pre-build [(label, kind, payload)] so object construction stays out of the timings"""
+    members = list(guild.members.values())
+    text_channels = [guild.get_channel(cid) for cid in TEXT_CHANNEL_IDS]
+    voice_channels = [guild.get_channel(cid) for cid in sorted(VC_XP_TRACK_CHANNELS)]
+    command_channel = guild.get_channel(USER_COMMAND_CHANNEL_ID)
+    kinds, weights = zip(*mix.items())
+    in_voice = {}
+    recent = collections.deque(maxlen=50)
+    next_message_id = 1_000_000
+    events = []
+
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        member = rng.choice(members)
+        aimed = rng.random() < EVENT_SHARE
+
+        if kind == "message":
+            channel = rng.choice(text_channels)
+            content = rng.choice(CHATTER)
+            if aimed and event_type in EVENT_CONTENT:
+                content = EVENT_CONTENT[event_type]
+                if event_type == 4:
+                    channel = guild.get_channel(EVENT_4_WOOF_CHANNEL_ID)
+                elif event_type == 7:
+                    channel = guild.get_channel(EVENT_PHASE2_CHANNEL_ID)
+            reference = FakeReference(rng.choice(recent)) if recent and rng.random() < 0.2 else None
+            next_message_id += 1
+            message = FakeMessage(next_message_id, member, channel, content, reference)
+            recent.append(message)
+            events.append(("message", kind, message))
+
+        elif kind == "reaction":
+            if aimed and event_type == 3:
+                message_id, emoji = EVENT_MESSAGE_ID, HEART
+            else:
+                message_id = recent[-1].id if recent else EVENT_MESSAGE_ID + 1
+                emoji = rng.choice(OTHER_EMOJI + (HEART,))
+            channel = rng.choice(text_channels)
+            events.append(("reaction", kind, FakeReactionPayload(guild.id, member.id, channel.id, message_id, emoji)))
+
+        elif kind == "voice":
+            current = in_voice.pop(member.id, None)
+            if current is None:
+                after = rng.choice(voice_channels)
+                in_voice[member.id] = after
+                payload = (member, FakeVoiceState(), FakeVoiceState(after))
+            else:
+                payload = (member, FakeVoiceState(current), FakeVoiceState())
+            events.append(("voice", kind, payload))
+
+        else:
+            name, kwargs = rng.choice(COMMANDS)
+            command = tree.get_command(name.split()[0])
+            if " " in name:
+                command = command.get_command(name.split()[1])
+            events.append((f"/{name}", kind, (command, FakeInteraction(member, command_channel), kwargs)))
+    return events
+
+async def seed_database(guild: FakeGuild):
+    """Balances for every member and channel config so commands take their full path"""
+    now = db._now_iso()
+    await db.executemany(
+        """INSERT INTO economy_balance (guild_id, user_id, coins_balance, coins_lifetime_earned, coins_lifetime_burned, updated_at)
+           VALUES (?, ?, ?, ?, 0, ?)""",
+        [(guild.id, user_id, STARTING_COINS, STARTING_COINS, now) for user_id in guild.members]
+    )
+    await db.execute(
+        "INSERT INTO usercommands_channel_config (guild_id, channel_id, updated_at) VALUES (?, ?, ?)",
+        (guild.id, USER_COMMAND_CHANNEL_ID, now)
+    )
+    await db.execute(
+        "INSERT INTO casino_channel_config (guild_id, channel_id, updated_at) VALUES (?, ?, ?)",
+        (guild.id, USER_COMMAND_CHANNEL_ID, now)
+    )
+
+# -----------------------------
+# Driver
+# -----------------------------
+async def _dispatch(kind: str, payload):
+    from systems import handlers
+    if kind == "message":
+        await handlers.on_message(payload)
+    elif kind == "reaction":
+        await handlers.on_raw_reaction_add(payload)
+    elif kind == "voice":
+        await handlers.on_voice_state_update(*payload)
+    else:
+        command, interaction, kwargs = payload
+        await command._callback(interaction, **kwargs)
+        await handlers.on_app_command_completion(interaction, command)
+
+async def _timed(label: str, kind: str, payload, samples: dict, errors: collections.Counter):
+    with latency.capture(label) as trace:
+        started = time.perf_counter()
+        try:
+            await _dispatch(kind, payload)
+        except Exception as e:
+            errors[f"{label}: {type(e).__name__}: {e}"] += 1
+        elapsed = time.perf_counter() - started
+    samples[label].append((elapsed, trace.db_queries, trace.db_commits))
+
+async def _drive(events: list, rate: float, concurrency: int, samples: dict, errors: collections.Counter):
+    """Open loop at rate events/sec (latency includes queueing), else closed loop with concurrency workers"""
+    if rate > 0:
+        started = time.perf_counter()
+        tasks = []
+        for i, (label, kind, payload) in enumerate(events):
+            delay = started + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(_timed(label, kind, payload, samples, errors)))
+        await asyncio.gather(*tasks)
+        return
+
+    pending = iter(events)
+
+    async def worker():
+        for label, kind, payload in pending:
+            await _timed(label, kind, payload, samples, errors)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+def _percentile(ordered: list, pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+def _summarize(rows: list) -> dict:
+    ordered = sorted(row[0] for row in rows)
+    count = len(rows)
+    return {
+        "events": count,
+        "p50_ms": _percentile(ordered, 50) * 1000,
+        "p99_ms": _percentile(ordered, 99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+        "queries_per_event": sum(row[1] for row in rows) / count if count else 0.0,
+        "commits_per_event": sum(row[2] for row in rows) / count if count else 0.0,
+    }
+
+async def run_benchmark(members: int = 500, events: int = 2000, rate: float = 0.0, concurrency: int = 1,
+                        event_type: int = 0, mix: str = DEFAULT_MIX, warmup: int = 100, seed: int = 0) -> dict:
+    """
+    Drive the handlers against a temp database; returns {"config", "seconds", "events_per_second",
+    "total": summary, "by_label": {label: summary}, "errors": {message: count}}
+    """
+    from systems import handlers, events as events_module, gambling
+    from commands import user_commands
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    guild = build_guild(members, rng)
+    fake_bot = FakeBot(guild)
+    handlers.set_bot(fake_bot)
+    events_module.set_bot(fake_bot)
+    gambling.set_bot(fake_bot)
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+    user_commands.register_commands(bot)
+
+    state = event_state(event_type, guild.id)
+    events_module.active_event = state
+    handlers.active_event = state  # handlers binds active_event by name at import
+
+    plan = build_events(guild, warmup + events, parse_mix(mix), event_type, rng, bot.tree)
+    samples = collections.defaultdict(list)
+    errors = collections.Counter()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original_path = db._db_path
+        db._db_path = os.path.join(tmp, "isla_bot.db")
+        try:
+            with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+                await db.init_db()
+                await seed_database(guild)
+                await _drive(plan[:warmup], 0, concurrency, collections.defaultdict(list), collections.Counter())
+                started = time.perf_counter()
+                await _drive(plan[warmup:], rate, concurrency, samples, errors)
+                seconds = time.perf_counter() - started
+                from core import cooldowns
+                await cooldowns.flush()
+                await db.close_db()
+        finally:
+            db._db_path = original_path
+            events_module.active_event = None
+            handlers.active_event = None
+
+    all_rows = [row for rows in samples.values() for row in rows]
+    return {
+        "config": {"members": members, "events": events, "rate": rate, "concurrency": concurrency,
+                   "event_type": event_type, "mix": mix, "seed": seed},
+        "seconds": seconds,
+        "events_per_second": len(all_rows) / seconds if seconds else 0.0,
+        "total": _summarize(all_rows),
+        "by_label": {label: _summarize(rows) for label, rows in sorted(samples.items())},
+        "errors": dict(errors.most_common()),
+    }
+
+def format_report(result: dict) -> str:
+    config = result["config"]
+    pacing = f"{config['rate']:g} ev/s offered" if config["rate"] > 0 else f"closed loop x{config['concurrency']}"
+    lines = [
+        f"Gateway load: {config['members']} members, {config['events']} events, {pacing}, "
+        f"active event {config['event_type'] or 'none'}, mix {config['mix']}",
+        f"{'event':<14} {'n':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'queries':>8} {'commits':>8}",
+    ]
+    for label, data in list(result["by_label"].items()) + [("all", result["total"])]:
+        lines.append(
+            f"{label:<14} {data['events']:>6} {data['p50_ms']:>8.2f} {data['p99_ms']:>8.2f} {data['max_ms']:>8.2f} "
+            f"{data['queries_per_event']:>8.2f} {data['commits_per_event']:>8.2f}"
+        )
+    lines.append(f"Throughput: {result['events_per_second']:.0f} events/sec over {result['seconds']:.2f}s")
+    for message, count in list(result["errors"].items())[:10]:
+        lines.append(f"[!] {count}x {message}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay synthetic gateway traffic through the handlers (no Discord connection)")
+    parser.add_argument("--members", type=int, default=500, help="Guild size")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=0.0, help="Offered events/sec (0 = as fast as possible)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Workers in closed-loop mode")
+    parser.add_argument("--event-type", type=int, choices=EVENT_TYPES, default=0, help="Active obedience event (0 = none)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Event kind weights")
+    parser.add_argument("--warmup", type=int, default=100, help="Untimed events run first")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the raw result as JSON")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run_benchmark(
+        members=args.members, events=args.events, rate=args.rate, concurrency=args.concurrency,
+        event_type=args.event_type, mix=args.mix, warmup=args.warmup, seed=args.seed,
+    ))
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
+    return 1 if result["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
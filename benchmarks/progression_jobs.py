@@ -0,0 +1,162 @@
+﻿"""
+Progression/economy job benchmarks - times v3 daily progression, get_profile_stats, cleanup_expired_events and the
+leaderboards against a copy of a generated dataset (python -m benchmarks.dataset)
+Run offline: python -m benchmarks.progression_jobs --db data/bench/isla_bot.db
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from core import db, latency
+from benchmarks.dataset import DEFAULT_OUT, GUILD_ID
+
+DEFAULT_SAMPLE = 200  # Users timed through get_profile_stats
+DIRTY_SHARE = 0.01  # Users marked dirty before the incremental leaderboard refresh
+
+def _percentile(ordered: list, pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+class _Timings:
+    """Rows of (name, [seconds], queries, commits, note)"""
+
+    def __init__(self):
+        self.rows = {}
+
+    @contextlib.asynccontextmanager
+    async def measure(self, name: str, note: str = ""):
+        row = self.rows.setdefault(name, {"seconds": [], "queries": 0, "commits": 0, "note": note})
+        with latency.capture(name) as trace:
+            started = time.perf_counter()
+            yield row
+            row["seconds"].append(time.perf_counter() - started)
+        row["queries"] += trace.db_queries
+        row["commits"] += trace.db_commits
+
+    def summary(self) -> dict:
+        result = {}
+        for name, row in self.rows.items():
+            ordered = sorted(row["seconds"])
+            calls = len(ordered)
+            result[name] = {
+                "calls": calls,
+                "total_s": sum(ordered),
+                "p50_ms": _percentile(ordered, 50) * 1000,
+                "p99_ms": _percentile(ordered, 99) * 1000,
+                "queries_per_call": row["queries"] / calls if calls else 0.0,
+                "commits_per_call": row["commits"] / calls if calls else 0.0,
+                "note": row["note"],
+            }
+        return result
+
+async def _count(table: str) -> int:
+    row = await db.fetchone(f"SELECT COUNT(*) AS n FROM {table}")
+    return row["n"]
+
+async def _bench_profiles(timings: _Timings, sample: int, rng: random.Random):
+    from core.data import get_profile_stats
+    rows = await db.fetchall("SELECT user_id FROM economy_balance WHERE guild_id = ?", (GUILD_ID,))
+    users = rng.sample([row["user_id"] for row in rows], min(sample, len(rows)))
+    for user_id in users:
+        async with timings.measure("get_profile_stats"):
+            await get_profile_stats(GUILD_ID, user_id)
+
+async def _bench_leaderboards(timings: _Timings, rng: random.Random):
+    from systems import leaderboards
+    for board in leaderboards.BOARDS:
+        leaderboards.invalidate_leaderboards(GUILD_ID)
+        async with timings.measure(f"leaderboard {board} build") as row:
+            index = await leaderboards.get_leaderboard(GUILD_ID, board)
+            row["note"] = f"{len(index.keys):,} entries"
+        async with timings.measure(f"leaderboard {board} page"):
+            leaderboards.render_page(index, 0)
+        async with timings.measure(f"leaderboard {board} page (cached)"):
+            leaderboards.render_page(index, 0)
+
+        dirty = rng.sample(list(index.entries), max(1, int(len(index.entries) * DIRTY_SHARE))) if index.entries else []
+        for user_id in dirty:
+            leaderboards.mark_dirty(GUILD_ID, user_id, (board,))
+        async with timings.measure(f"leaderboard {board} refresh", note=f"{len(dirty):,} dirty users"):
+            await leaderboards.get_leaderboard(GUILD_ID, board)
+
+async def _bench_daily(timings: _Timings):
+    from core.data import convert_overdue_loans
+    from systems.tasks import run_daily_progression
+    async with timings.measure("convert_overdue_loans") as row:
+        row["note"] = f"{await convert_overdue_loans():,} loans converted"
+    async with timings.measure("v3 daily progression") as row:
+        row["note"] = f"{await run_daily_progression(GUILD_ID):,} users processed"
+
+async def _bench_cleanup(timings: _Timings):
+    tables = ("message_events", "reaction_events", "command_events", "voice_sessions")
+    before = sum([await _count(t) for t in tables])
+    async with timings.measure("cleanup_expired_events") as row:
+        await db.cleanup_expired_events()
+    row["note"] = f"{before - sum([await _count(t) for t in tables]):,} rows deleted"
+
+async def run_benchmarks(path: str, sample: int = DEFAULT_SAMPLE, seed: int = 0, skip: tuple = ()) -> dict:
+    """Run against a temporary copy of path (the jobs write); returns {"dataset", "benchmarks": {name: summary}}"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found (generate one with python -m benchmarks.dataset)")
+    rng = random.Random(seed)
+    timings = _Timings()
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, "isla_bot.db")
+        shutil.copyfile(path, copy)
+        original_path = db._db_path
+        db._db_path = copy
+        try:
+            with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+                await db.init_db()
+                try:
+                    dataset = {t: await _count(t) for t in ("economy_balance", "economy_ledger", "activity_daily", "order_runs", "loans")}
+                    if "profile" not in skip:
+                        await _bench_profiles(timings, sample, rng)
+                    if "leaderboards" not in skip:
+                        await _bench_leaderboards(timings, rng)
+                    if "daily" not in skip:
+                        await _bench_daily(timings)
+                    if "cleanup" not in skip:
+                        await _bench_cleanup(timings)
+                finally:
+                    await db.close_db()  # An open aiosqlite thread would keep the process alive
+        finally:
+            db._db_path = original_path
+    return {"dataset": dataset, "benchmarks": timings.summary()}
+
+def format_report(result: dict) -> str:
+    sizes = ", ".join(f"{table} {rows:,}" for table, rows in result["dataset"].items())
+    lines = [
+        f"Dataset: {sizes}",
+        f"{'benchmark':<34} {'calls':>6} {'p50 ms':>9} {'p99 ms':>9} {'total s':>8} {'queries':>8} {'commits':>8}  note",
+    ]
+    for name, data in result["benchmarks"].items():
+        lines.append(
+            f"{name:<34} {data['calls']:>6} {data['p50_ms']:>9.2f} {data['p99_ms']:>9.2f} {data['total_s']:>8.2f} "
+            f"{data['queries_per_call']:>8.1f} {data['commits_per_call']:>8.1f}  {data['note']}"
+        )
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark progression/economy jobs against a generated dataset")
+    parser.add_argument("--db", default=DEFAULT_OUT, help="Dataset from python -m benchmarks.dataset (a copy is used)")
+    parser.add_argument("--sample", type=int, default=DEFAULT_SAMPLE, help="Users timed through get_profile_stats")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip", action="append", default=[], choices=("profile", "leaderboards", "daily", "cleanup"))
+    parser.add_argument("--json", action="store_true", help="Print the raw result as JSON")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run_benchmarks(args.db, sample=args.sample, seed=args.seed, skip=tuple(args.skip)))
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
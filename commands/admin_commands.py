@@ -12,7 +12,7 @@ from core.config import (
     MESSAGE_COOLDOWN, VC_XP, HEART_GIF
 )
 from core.utils import get_timezone, USE_PYTZ
-from systems.gambling import build_casino_embed
+from systems.static_embeds import invalidate_static_embeds
 # Legacy event system imports removed
 
 # Central message registry: {message_id: {"kind": str, "visibility": str, "impact": str}}
@@ -154,6 +154,32 @@ def register_commands(bot_instance):
         embed.add_field(name="Message Cooldown", value=f"{MESSAGE_COOLDOWN} seconds", inline=True)
         embed.add_field(name="VC XP/min", value=f"{VC_XP} XP", inline=True)
         
+        from core.cooldowns import get_cooldown_stats
+        cd = get_cooldown_stats()
+        embed.add_field(
+            name="Cooldown Store",
+            value=f"{cd['entries']} entries • {cd['memory_bytes'] / 1024:.1f} KiB • hit rate {cd['hit_rate'] * 100:.1f}% • {cd['expired']} expired • {cd['pending_writes']} pending",
+            inline=False
+        )
+        
+        from core.locks import get_lock_stats
+        locks = get_lock_stats()
+        top_users = ", ".join(f"<@{uid}> ×{n}" for (_, uid), n in locks["top_users"][:5]) or "None"
+        top_commands = ", ".join(f"`{cmd}` ×{n}" for cmd, n in locks["top_commands"][:5]) or "None"
+        embed.add_field(
+            name="Economy Locks",
+            value=f"{locks['acquired']} acquired • {locks['contended']} contended • max wait {locks['max_wait_seconds']:.2f}s\nUsers: {top_users}\nCommands: {top_commands}",
+            inline=False
+        )
+        
+        from systems.leaderboards import get_page_cache_stats
+        pages = get_page_cache_stats()
+        embed.add_field(
+            name="Leaderboard Pages",
+            value=f"{pages['indexes']} indexes • {pages['entries']} cached pages • hit rate {pages['hit_rate'] * 100:.1f}% • {pages['evictions']} evicted",
+            inline=False
+        )
+        
         raw_config = (
             "```python\n"
             f"XP_TRACK_CHANNELS = {sorted(XP_TRACK_SET)}\n"
@@ -215,13 +241,17 @@ def register_commands(bot_instance):
         print(f"Event killed by {interaction.user.name}. Cooldown until {events.event_cooldown_until.strftime('%H:%M:%S UTC')}")
     
     @bot.tree.command(name="sync", description="Sync slash commands. Admin only.")
-    @app_commands.describe(clear_commands="Dangerous: Clear all commands before syncing (default: false)")
-    async def sync_commands(interaction: discord.Interaction, clear_commands: bool = False):
+    @app_commands.describe(
+        force="Sync every scope even if its command tree is unchanged (default: false)",
+        clear_commands="Dangerous: Clear all commands before syncing (default: false)"
+    )
+    async def sync_commands(interaction: discord.Interaction, force: bool = False, clear_commands: bool = False):
         """Sync slash commands (Admin only)"""
         if not await check_admin_command_permissions(interaction):
             return
         
         from core.config import ALLOWED_GUILDS
+        from core.command_sync import sync_commands as sync_command_tree
         
         # Count commands before sync
         commands_before = list(bot.tree.get_commands())
@@ -243,25 +273,17 @@ def register_commands(bot_instance):
                 await interaction.response.send_message(f"❌ Failed to clear commands: {e}", ephemeral=True)
                 return
         
-        # Global sync
+        # Global + per-guild sync (unchanged scopes are skipped unless forced; clearing always forces)
+        await interaction.response.defer(ephemeral=True)
         try:
-            synced_global = await bot.tree.sync()
-            sync_results["global"] = len(synced_global)
+            sync_results.update(await sync_command_tree(bot, ALLOWED_GUILDS, force=force or clear_commands))
         except Exception as e:
             sync_results["global"] = f"ERROR: {e}"
         
-        # Per-guild sync for faster propagation
-        for guild_id in ALLOWED_GUILDS:
-            try:
-                synced_guild = await bot.tree.sync(guild=discord.Object(id=guild_id))
-                sync_results[f"guild_{guild_id}"] = len(synced_guild)
-            except Exception as e:
-                sync_results[f"guild_{guild_id}"] = f"ERROR: {e}"
-        
         # Build response embed
         embed = discord.Embed(
             title="🔄 Command Sync Results",
-            color=0x4ec200 if all(isinstance(v, int) for v in sync_results.values() if v != True) else 0xff000d
+            color=0xff000d if any(str(v).startswith("ERROR") for v in sync_results.values()) else 0x4ec200
         )
         
         embed.add_field(name="Commands Before Sync", value=str(commands_count_before), inline=True)
@@ -272,11 +294,11 @@ def register_commands(bot_instance):
         embed.add_field(name="Global Sync", value=str(sync_results.get("global", "N/A")), inline=True)
         
         for guild_id in ALLOWED_GUILDS:
-            key = f"guild_{guild_id}"
+            key = f"guild:{guild_id}"
             if key in sync_results:
                 embed.add_field(name=f"Guild {guild_id}", value=str(sync_results[key]), inline=True)
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.followup.send(embed=embed, ephemeral=True)
         print(f"✅ Manual sync by {interaction.user.name}: {sync_results}")
     
     # Legacy Level/XP admin commands removed - V3 progression system only
@@ -582,7 +604,7 @@ def register_commands(bot_instance):
         @discord.ui.select(
             placeholder="Select an action...",
             options=[
-                discord.SelectOption(label="Set Channel", value="set", description=f"Set {display_name.lower()}"),
+                discord.SelectOption(label="Set Channel", value="set", description="Choose the channel to use"),
                 discord.SelectOption(label="Show Current", value="show", description="Show current configuration"),
             ]
         )
@@ -770,7 +792,7 @@ def register_commands(bot_instance):
                 await interaction.followup.send("No valid channel IDs found. Please provide channel mentions or IDs (comma-separated).", ephemeral=True)
                 return
             
-            from core.db import execute, _now_iso
+            from core.db import execute, _now_iso, invalidate_usercommands_channels
             now = _now_iso()
             guild_id = interaction.guild.id
             
@@ -789,6 +811,8 @@ def register_commands(bot_instance):
                            VALUES (?, ?, ?)""",
                         (guild_id, channel_id, now)
                     )
+            invalidate_usercommands_channels(guild_id)
+            invalidate_static_embeds()
             
             channel_mentions = " ".join(f"<#{cid}>" for cid in channel_ids if bot.get_channel(cid) or interaction.guild.get_channel(cid))
             embed = discord.Embed(
@@ -838,7 +862,8 @@ def register_commands(bot_instance):
             self.action_type = action_type
             self.config_category = config_category
         
-        @discord.ui.channel_select(
+        @discord.ui.select(
+            cls=discord.ui.ChannelSelect,
             placeholder="Select a channel...",
             channel_types=[discord.ChannelType.text]
         )
@@ -849,6 +874,7 @@ def register_commands(bot_instance):
             if self.action_type == "onboarding_channel":
                 from systems.onboarding import set_onboarding_channel
                 set_onboarding_channel(channel.id)
+                invalidate_static_embeds()
                 embed = discord.Embed(
                     title="✅ Configuration Updated",
                     description=f"Onboarding channel set to {channel.mention}",
@@ -863,6 +889,7 @@ def register_commands(bot_instance):
                        VALUES (?, ?, ?)""",
                     (select_interaction.guild.id, channel.id, now)
                 )
+                invalidate_static_embeds()
                 embed = discord.Embed(
                     title="✅ Configuration Updated",
                     description=f"Casino channel set to {channel.mention}",
@@ -877,6 +904,7 @@ def register_commands(bot_instance):
                        VALUES (?, ?, ?)""",
                     (select_interaction.guild.id, channel.id, now)
                 )
+                invalidate_static_embeds()
                 embed = discord.Embed(
                     title="✅ Configuration Updated",
                     description=f"Announcements channel set to {channel.mention}",
@@ -891,6 +919,7 @@ def register_commands(bot_instance):
                        VALUES (?, ?, ?)""",
                     (select_interaction.guild.id, channel.id, now)
                 )
+                invalidate_static_embeds()
                 embed = discord.Embed(
                     title="✅ Configuration Updated",
                     description=f"Logs channel set to {channel.mention}\n\nAdmin commands can now only be used in this channel.",
@@ -905,6 +934,7 @@ def register_commands(bot_instance):
                        VALUES (?, ?, ?)""",
                     (select_interaction.guild.id, channel.id, now)
                 )
+                invalidate_static_embeds()
                 embed = discord.Embed(
                     title="✅ Configuration Updated",
                     description=f"Introductions channel set to {channel.mention}",
@@ -919,6 +949,7 @@ def register_commands(bot_instance):
                        VALUES (?, ?, ?)""",
                     (select_interaction.guild.id, channel.id, now)
                 )
+                invalidate_static_embeds()
                 embed = discord.Embed(
                     title="✅ Configuration Updated",
                     description=f"Orders announcements channel set to {channel.mention}",
@@ -960,7 +991,8 @@ def register_commands(bot_instance):
             self.action_type = action_type
             self.role_name = role_name
         
-        @discord.ui.role_select(
+        @discord.ui.select(
+            cls=discord.ui.RoleSelect,
             placeholder="Select a role..."
         )
         async def role_select(self, select_interaction: discord.Interaction, select: discord.ui.RoleSelect):
@@ -969,6 +1001,7 @@ def register_commands(bot_instance):
             
             from systems.onboarding import set_role
             set_role(self.role_name, role.id)
+            invalidate_static_embeds()
             
             embed = discord.Embed(
                 title="✅ Configuration Updated",
@@ -1081,7 +1114,8 @@ def register_commands(bot_instance):
             self.message_type = message_type
             self.action = action
         
-        @discord.ui.channel_select(
+        @discord.ui.select(
+            cls=discord.ui.ChannelSelect,
             placeholder="Select a channel...",
             channel_types=[discord.ChannelType.text]
         )
@@ -1180,6 +1214,7 @@ def register_commands(bot_instance):
                 return
             
             set_onboarding_channel(channel.id)
+            invalidate_static_embeds()
             embed = discord.Embed(
                 title="✅ Configuration Updated",
                 description=f"Onboarding channel set to {channel.mention}",
@@ -1198,6 +1233,7 @@ def register_commands(bot_instance):
                 return
             
             set_role(name, serverrole.id)
+            invalidate_static_embeds()
             embed = discord.Embed(
                 title="✅ Configuration Updated",
                 description=f"Onboarding role '{name}' set to {serverrole.mention}",
@@ -1454,6 +1490,7 @@ def register_commands(bot_instance):
                VALUES (?, ?, ?, ?, ?)""",
             (guild_id, message_type, channel_id, message_id, now)
         )
+        invalidate_static_embeds()
     
     async def get_roles_config(guild_id: int, message_type: str):
         """Get roles configuration from database"""
@@ -1471,6 +1508,7 @@ def register_commands(bot_instance):
     
     # configure_group = app_commands.Group(name="configure", description="[DEPRECATED]")
     # roles_group = app_commands.Group(name="roles", parent=configure_group, description="Configure role selection messages")
+    roles_group = app_commands.Group(name="roles", parent=_dummy_configure_group, description="[NOT REGISTERED]")  # Remaining old subcommands still reference it
     
     # @roles_group.command(name="send", description="Send a role selection message to a channel")
     @app_commands.describe(
@@ -1616,6 +1654,7 @@ def register_commands(bot_instance):
                VALUES (?, ?, ?)""",
             (interaction.guild.id, channel.id, now)
         )
+        invalidate_static_embeds()
         
         embed = discord.Embed(
             title="✅ Configuration Updated",
@@ -1697,6 +1736,7 @@ def register_commands(bot_instance):
                VALUES (?, ?, ?)""",
             (interaction.guild.id, channel.id, now)
         )
+        invalidate_static_embeds()
         
         embed = discord.Embed(
             title="✅ Configuration Updated",
@@ -1766,6 +1806,7 @@ def register_commands(bot_instance):
                VALUES (?, ?, ?)""",
             (interaction.guild.id, channel.id, now)
         )
+        invalidate_static_embeds()
         
         embed = discord.Embed(
             title="✅ Configuration Updated",
@@ -1835,6 +1876,7 @@ def register_commands(bot_instance):
                VALUES (?, ?, ?)""",
             (interaction.guild.id, channel.id, now)
         )
+        invalidate_static_embeds()
         
         embed = discord.Embed(
             title="✅ Configuration Updated",
@@ -1919,7 +1961,7 @@ def register_commands(bot_instance):
             await interaction.followup.send("No valid channel IDs found. Please provide channel mentions or IDs (comma-separated).", ephemeral=True)
             return
         
-        from core.db import execute, _now_iso
+        from core.db import execute, _now_iso, invalidate_usercommands_channels
         now = _now_iso()
         guild_id = interaction.guild.id
         
@@ -1938,6 +1980,8 @@ def register_commands(bot_instance):
                        VALUES (?, ?, ?)""",
                     (guild_id, channel_id, now)
                 )
+        invalidate_usercommands_channels(guild_id)
+        invalidate_static_embeds()
         
         channel_mentions = " ".join(f"<#{cid}>" for cid in channel_ids if bot.get_channel(cid) or interaction.guild.get_channel(cid))
         embed = discord.Embed(
@@ -2102,6 +2146,7 @@ def register_commands(bot_instance):
                VALUES (?, ?, ?)""",
             (interaction.guild.id, channel.id, now)
         )
+        invalidate_static_embeds()
         
         embed = discord.Embed(
             title="✅ Configuration Updated",
@@ -2143,325 +2188,217 @@ def register_commands(bot_instance):
         if not await check_admin_command_permissions(interaction):
             return
         
-        user_display = interaction.user.display_name
-        
-        if embed_type == "coinflip_win":
-            embed = build_casino_embed(
-                kind="win",
-                outcome=100,
-                title="🪙 Coinflip — WIN",
-                description=f"**{user_display}** wins **100** coins.",
-                fields=[
-                    {"name": "Bet", "value": "**100**", "inline": True},
-                    {"name": "Multiplier", "value": "`x2`", "inline": True},
-                    {"name": "New Balance", "value": "**500**", "inline": True}
-                ],
-                streak=5,
-                cooldown=8
-            )
-        elif embed_type == "coinflip_loss":
-            embed = build_casino_embed(
-                kind="loss",
-                outcome=-100,
-                title="🪙 Coinflip — LOSS",
-                description=f"**{user_display}** loses **100** coins.",
-                fields=[
-                    {"name": "Bet", "value": "**100**", "inline": True},
-                    {"name": "Result", "value": "`Lose`", "inline": True},
-                    {"name": "New Balance", "value": "**400**", "inline": True}
-                ],
-                streak=-6,
-                cooldown=8
-            )
-        elif embed_type == "dice_win":
-            embed = build_casino_embed(
-                kind="win",
-                outcome=100,
-                title="🎲 Dice — WIN",
-                description=f"**{user_display}** wins.",
-                fields=[
-                    {"name": "Rolls", "value": "`You: 5` • `Dealer: 3`", "inline": False},
-                    {"name": "Bet", "value": "**100**", "inline": True},
-                    {"name": "Net", "value": "**+100**", "inline": True},
-                    {"name": "New Balance", "value": "**500**", "inline": True}
-                ],
-                streak=3,
-                cooldown=10
-            )
-        elif embed_type == "dice_loss":
-            embed = build_casino_embed(
-                kind="loss",
-                outcome=-100,
-                title="🎲 Dice — LOSS",
-                description=f"**{user_display}** loses.",
-                fields=[
-                    {"name": "Rolls", "value": "`You: 2` • `Dealer: 4`", "inline": False},
-                    {"name": "Bet", "value": "**100**", "inline": True},
-                    {"name": "Net", "value": "**-100**", "inline": True},
-                    {"name": "New Balance", "value": "**400**", "inline": True}
-                ],
-                streak=-5,
-                cooldown=10
-            )
-        elif embed_type == "dice_draw":
-            embed = build_casino_embed(
-                kind="draw",
-                outcome=0,
-                title="🎲 Dice — DRAW",
-                description=f"**{user_display}** ties.",
-                fields=[
-                    {"name": "Rolls", "value": "`You: 4` • `Dealer: 4`", "inline": False},
-                    {"name": "Bet", "value": "**100**", "inline": True},
-                    {"name": "Net", "value": "**0** (refunded)", "inline": True},
-                    {"name": "New Balance", "value": "**500**", "inline": True}
-                ],
-                cooldown=10
-            )
-        elif embed_type == "slots_win":
-            embed = build_casino_embed(
-                kind="win",
-                outcome=750,
-                title="🎰 Slots",
-                description=f"**{user_display}** spins for **100** coins.",
-                fields=[
-                    {"name": "Reels", "value": "🍒 │ 🍒 │ 🍒", "inline": False},
-                    {"name": "Outcome", "value": "Win x15", "inline": True},
-                    {"name": "Net", "value": "**+750**", "inline": True},
-                    {"name": "New Balance", "value": "**850**", "inline": True}
-                ],
-                streak=4,
-                cooldown=15
-            )
-        elif embed_type == "slots_loss":
-            embed = build_casino_embed(
-                kind="loss",
-                outcome=-50,
-                title="🎰 Slots",
-                description=f"**{user_display}** spins for **100** coins.",
-                fields=[
-                    {"name": "Reels", "value": "🥝 │ 🍇 │ 🍋", "inline": False},
-                    {"name": "Outcome", "value": "Loss", "inline": True},
-                    {"name": "Net", "value": "**-50**", "inline": True},
-                    {"name": "New Balance", "value": "**450**", "inline": True}
-                ],
-                streak=-7,
-                cooldown=15
-            )
-        elif embed_type == "slots_jackpot":
-            embed = build_casino_embed(
-                kind="win",
-                outcome=2900,
-                title="🎰 Slots",
-                description=f"**{user_display}** spins for **100** coins.",
-                fields=[
-                    {"name": "Reels", "value": "👑 │ 👑 │ 👑", "inline": False},
-                    {"name": "Outcome", "value": "Win x30 👑", "inline": True},
-                    {"name": "Net", "value": "**+2900**", "inline": True},
-                    {"name": "New Balance", "value": "**3000**", "inline": True}
-                ],
-                streak=5,
-                cooldown=15
-            )
-        elif embed_type == "roulette_win":
-            embed = build_casino_embed(
-                kind="win",
-                outcome=3500,
-                title="🎡 Roulette",
-                description=f"**{user_display}** bets **100** coins.",
-                fields=[
-                    {"name": "Bet Type", "value": "`7`", "inline": True},
-                    {"name": "Spin", "value": "`🔴 7`", "inline": True},
-                    {"name": "Payout", "value": "x36", "inline": True},
-                    {"name": "Net", "value": "**+3500**", "inline": True},
-                    {"name": "New Balance", "value": "**3600**", "inline": True}
-                ],
-                streak=3,
-                cooldown=20
-            )
-        elif embed_type == "roulette_loss":
-            embed = build_casino_embed(
-                kind="loss",
-                outcome=-100,
-                title="🎡 Roulette",
-                description=f"**{user_display}** bets **100** coins.",
-                fields=[
-                    {"name": "Bet Type", "value": "`red`", "inline": True},
-                    {"name": "Spin", "value": "`⚫ 14`", "inline": True},
-                    {"name": "Net", "value": "**-100**", "inline": True},
-                    {"name": "New Balance", "value": "**400**", "inline": True}
-                ],
-                streak=-5,
-                cooldown=20
-            )
-        elif embed_type == "blackjack_state":
-            embed = build_casino_embed(
-                kind="neutral",
-                outcome=None,
-                title="🃏 Blackjack",
-                description=f"**{user_display}** plays **100** coins. Choose an action below.",
-                fields=[
-                    {"name": "Your Hand", "value": "10 + 6  (**16**)", "inline": False},
-                    {"name": "Dealer", "value": "9  (`?`)", "inline": False}
-                ],
-                footer_text="Timeout: 60s (auto-stand)",
-                cooldown=30
-            )
-        elif embed_type == "blackjack_win":
-            embed = build_casino_embed(
-                kind="win",
-                outcome=100,
-                title="🃏 Blackjack — WIN",
-                description=f"**{user_display}** wins.",
-                fields=[
-                    {"name": "Your Hand", "value": "10 + 8  (**18**)", "inline": False},
-                    {"name": "Dealer Hand", "value": "7 + 9  (**16**)", "inline": False},
-                    {"name": "Net", "value": "**+100**", "inline": True},
-                    {"name": "New Balance", "value": "**500**", "inline": True}
-                ],
-                streak=3,
-                cooldown=30
-            )
-        elif embed_type == "blackjack_loss":
-            embed = build_casino_embed(
-                kind="loss",
-                outcome=-100,
-                title="🃏 Blackjack — LOSS",
-                description=f"**{user_display}** loses.",
-                fields=[
-                    {"name": "Your Hand", "value": "10 + 9 + 5  (**24**)", "inline": False},
-                    {"name": "Dealer Hand", "value": "8 + 7  (**15**)", "inline": False},
-                    {"name": "Net", "value": "**-100**", "inline": True},
-                    {"name": "New Balance", "value": "**400**", "inline": True}
-                ],
-                streak=-5,
-                cooldown=30
-            )
-        elif embed_type == "blackjack_draw":
-            embed = build_casino_embed(
-                kind="draw",
-                outcome=0,
-                title="🃏 Blackjack — DRAW",
-                description=f"**{user_display}** pushes.",
-                fields=[
-                    {"name": "Your Hand", "value": "10 + 7  (**17**)", "inline": False},
-                    {"name": "Dealer Hand", "value": "9 + 8  (**17**)", "inline": False},
-                    {"name": "Net", "value": "**0** (bet returned)", "inline": True},
-                    {"name": "New Balance", "value": "**500**", "inline": True}
-                ],
-                cooldown=30
-            )
-        elif embed_type == "info_casino":
-            embed = build_casino_embed(
-                kind="info",
-                outcome=None,
-                title="ℹ️ Casino Overview",
-                description="All games use unified validation: **debt blocking**, **rank caps**, **channel enforcement**, and **LCE tracking**.",
-                fields=[
-                    {"name": "Games", "value": "`/coinflip` `/gamble` • `/dice` • `/slots` • `/roulette` • `/blackjack`", "inline": False},
-                    {"name": "Cooldowns", "value": "Coinflip 8s • Dice 10s • Slots 15s • Roulette 20s • Blackjack 30s", "inline": False},
-                    {"name": "Streaks", "value": "🔥 Hot: 3+ wins • 🥶 Cold: 5+ losses • resets after 1h inactivity", "inline": False}
-                ],
-                footer_text="Use the /<game>info commands for full rules."
-            )
-        elif embed_type == "info_paytable":
-            embed = build_casino_embed(
-                kind="info",
-                outcome=None,
-                title="ℹ️ Slots Paytable",
-                description="3-of-a-kind multipliers (weighted reels).",
-                fields=[
-                    {"name": "Multipliers", "value": "🥝 x1.5 • 🍇 x2 • 🍋 x3 • 🍑 x5 • 🍉 x8 • 🍒 x15 • 👑 x30 (JACKPOT)", "inline": False},
-                    {"name": "Bonus 🎁", "value": "3x 🎁 → +5 free spins\n2x 🎁 → +2 free spins +250 coins\n🎁 + pair → x0.8 multiplier", "inline": False},
-                    {"name": "Safety Nets", "value": "2-of-a-kind → -50% loss\nFree spins: `/slots free`", "inline": False}
-                ],
-                footer_text="Cooldown: 15s • Min bet: 10"
-            )
-        elif embed_type == "error_channel":
-            embed = build_casino_embed(
-                kind="info",
-                outcome=None,
-                title="ℹ️ Casino Channel Only",
-                description="Use casino commands in <#1449946515882774630>.",
-                fields=[
-                    {"name": "Blocked Here", "value": "This command is restricted to the configured casino channel.", "inline": False}
-                ],
-                footer_text="Ask staff if the casino channel was moved."
-            )
-        elif embed_type == "error_debt":
-            embed = build_casino_embed(
-                kind="info",
-                outcome=None,
-                title="ℹ️ Gambling Locked",
-                description="Gambling is disabled while your **Debt ≥ 5000** coins.",
-                fields=[
-                    {"name": "Current Debt", "value": "**5250**", "inline": True},
-                    {"name": "Requirement", "value": "Debt must be **< 5000**", "inline": True}
-                ],
-                footer_text="Clear debt to regain casino access."
-            )
-        elif embed_type == "error_limit":
-            embed = build_casino_embed(
-                kind="info",
-                outcome=None,
-                title="ℹ️ Bet Limit Reached",
-                description="Your bet exceeds your allowed maximum.",
-                fields=[
-                    {"name": "Your Rank Cap", "value": "**5000**", "inline": True},
-                    {"name": "Absolute Max", "value": "**25000**", "inline": True},
-                    {"name": "Your Bet", "value": "**6000**", "inline": True}
-                ],
-                footer_text="Caps are based on Lifetime Coins Earned (LCE)."
-            )
-        elif embed_type == "error_cooldown":
-            embed = build_casino_embed(
-                kind="info",
-                outcome=None,
-                title="ℹ️ Cooldown Active",
-                description="You can gamble again in 5 seconds.",
-                cooldown=8
-            )
-        elif embed_type == "jackpot_announcement":
-            embed = build_casino_embed(
-                kind="announcement",
-                outcome=None,
-                title="📣 JACKPOT HIT",
-                description=f"**{user_display}** just landed **👑 x30** on Slots.",
-                fields=[
-                    {"name": "Spin", "value": "👑 │ 👑 │ 👑", "inline": False},
-                    {"name": "Bet", "value": "**100**", "inline": True},
-                    {"name": "Payout", "value": "**3000**", "inline": True},
-                    {"name": "Net Gain", "value": "**2900**", "inline": True}
-                ],
-                footer_text="Casino • Slots • Big win broadcast"
-            )
+        from commands import admin_test_commands
+        await admin_test_commands.casino_test(interaction, embed_type)
+
+    @bot.tree.command(name="casino_sim", description="Simulate casino RTP and volatility. Admin only.")
+    @app_commands.describe(
+        game="Game to simulate",
+        rounds="Rounds to simulate (max 2,000,000)",
+        bet="Bet per round (default: 100)",
+        ruin="Also show bankroll-ruin odds per rank bet cap"
+    )
+    @app_commands.choices(game=[
+        app_commands.Choice(name="coinflip", value="coinflip"),
+        app_commands.Choice(name="dice", value="dice"),
+        app_commands.Choice(name="roulette", value="roulette"),
+        app_commands.Choice(name="slots", value="slots"),
+        app_commands.Choice(name="blackjack", value="blackjack"),
+    ])
+    async def casino_sim(interaction: discord.Interaction, game: str, rounds: int = 200_000, bet: int = 100, ruin: bool = False):
+        """Run the casino simulator off the event loop and report RTP / volatility."""
+        import asyncio
+        from systems import casino_sim as sim
+
+        if not await check_admin_command_permissions(interaction):
+            return
+
+        rounds = max(1_000, min(rounds, 2_000_000))
+        bet = max(1, bet)
+
+        if not sim.numpy_available():
+            if game != "slots":
+                await interaction.response.send_message("NumPy is not installed - simulation unavailable (exact slots figures only).", ephemeral=True)
+                return
+            report = sim.format_exact_slots(sim.exact_slots_rtp(bet))
         else:
-            await interaction.response.send_message(f"Unknown embed type: {embed_type}", ephemeral=True)
+            await interaction.response.defer(ephemeral=True)
+            try:
+                result = await asyncio.to_thread(sim.simulate_game, game, rounds, bet)
+                report = sim.format_result(result)
+                if game == "slots":
+                    report += "\n\n" + sim.format_exact_slots(sim.exact_slots_rtp(bet))
+                if ruin:
+                    curves = await asyncio.to_thread(sim.ruin_curves, game)
+                    report += "\n\n" + sim.format_ruin(game, curves)
+            except Exception as e:
+                print(f"[-] Casino simulation failed: {e}")
+                await interaction.followup.send(f"❌ Simulation failed: {e}", ephemeral=True)
+                return
+
+        embed = discord.Embed(
+            title=f"🎰 Casino Simulation — {game}",
+            description=f"```\n{report[:3900]}\n```",
+            color=0x4ec200
+        )
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @bot.tree.command(name="latency", description="Show command latency percentiles. Admin only.")
+    @app_commands.describe(command="Show one command's phases in detail (e.g. profile, order complete)")
+    async def latency_report(interaction: discord.Interaction, command: str = None):
+        """Rolling per-command latency: time to first response, DB, Discord REST and wall time."""
+        if not await check_admin_command_permissions(interaction):
             return
         
+        from core.latency import get_latency_stats, format_latency_report
+        stats = get_latency_stats()
+        
+        if command:
+            data = stats["commands"].get(command.lstrip("/"))
+            if not data:
+                await interaction.response.send_message(f"No samples for `/{command.lstrip('/')}` yet.", ephemeral=True)
+                return
+            lines = [f"{'phase':<15} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}"]
+            for phase in ("first_response", "db", "rest", "wall"):
+                p = data[phase]
+                lines.append(f"{phase:<15} {p['p50']:>7.3f} {p['p95']:>7.3f} {p['p99']:>7.3f} {p['max']:>7.3f}")
+            report = "\n".join(lines)
+            title = f"⏱️ /{command.lstrip('/')} — {data['count']} samples, {data['deadline_misses']} over budget"
+        else:
+            report = format_latency_report(stats) if stats["commands"] else "No commands traced yet."
+            title = f"⏱️ Command Latency — {stats['invocations']} invocations, {stats['deadline_misses']} over budget"
+        
+        embed = discord.Embed(
+            title=title,
+            description=f"```\n{report[:3900]}\n```",
+            color=0x4ec200
+        )
+        embed.set_footer(text=f"Seconds • budget {stats['budget_seconds']:.1f}s to first response")
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
-    @bot.tree.command(name="orders_test", description="Test orders embed and views. Admin only.")
-    async def orders_test(interaction: discord.Interaction):
-        """Test orders embed and views - sends public /orders view"""
+    @bot.tree.command(name="loop_lag", description="Show event-loop lag and the worst stalls with stacks. Admin only.")
+    @app_commands.describe(count="How many of the worst offenders to include (default: 3)")
+    async def loop_lag(interaction: discord.Interaction, count: int = 3):
+        """Dump watchdog stats and the worst recorded stalls / slow callbacks."""
         if not await check_admin_command_permissions(interaction):
             return
         
-        if not interaction.guild:
-            await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
+        from core.watchdog import get_loop_stats, get_worst_offenders
+        stats = get_loop_stats()
+        offenders = get_worst_offenders()[:max(1, min(count, 10))]
+        
+        summary = (
+            f"Lag: last {stats['last_lag_seconds'] * 1000:.0f}ms • avg {stats['avg_lag_seconds'] * 1000:.0f}ms • "
+            f"max {stats['max_lag_seconds'] * 1000:.0f}ms\n"
+            f"Stalls > {stats['threshold_seconds']:.2f}s: {stats['stalls']} • slow callbacks: {stats['slow_callbacks']}"
+        )
+        embed = discord.Embed(title="🐢 Event Loop Watchdog", description=summary, color=0x4ec200)
+        for entry in offenders:
+            when = datetime.datetime.fromtimestamp(entry["at"], datetime.UTC).strftime("%m-%d %H:%M:%S")
+            body = entry["detail"] or entry["stack"]
+            embed.add_field(
+                name=f"{entry['kind']} • {entry['lag']:.2f}s • {when} UTC",
+                value=f"```\n{body[-950:]}\n```",
+                inline=False
+            )
+        if not offenders:
+            embed.add_field(name="Offenders", value="None recorded", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @bot.tree.command(name="jobs", description="Show scheduled jobs: next/last run, status and run history. Admin only.")
+    @app_commands.describe(job="Only show this job's recent runs (default: all jobs)")
+    async def jobs(interaction: discord.Interaction, job: str = None):
+        """Scheduler overview from SQLite (scheduled_jobs / scheduled_job_runs)"""
+        if not await check_admin_command_permissions(interaction):
             return
         
-        # Import orders embed builder and view
-        from commands.user_commands import build_orders_embed, OrdersSelectView, _get_available_orders
+        from core.scheduler import get_scheduler_stats, get_job_history
+        from core.batch_jobs import get_batch_progress
+        stats = await get_scheduler_stats()
+        history = await get_job_history(job, limit=10)
+        batches = await get_batch_progress(limit=5)
         
-        guild_id = interaction.guild.id
-        user_id = interaction.user.id
+        def when(ts):
+            return f"<t:{int(ts)}:R>" if ts else "never"
+        
+        summary = (
+            f"Scheduler: {'running' if stats['scheduler_running'] else 'STOPPED'} • runs {stats['runs']} • "
+            f"failures {stats['failures']} • catch-ups {stats['catch_ups']} • lease conflicts {stats['lease_conflicts']}"
+        )
+        embed = discord.Embed(title="⏰ Scheduled Jobs", description=summary, color=0x4ec200)
+        for name, info in stats["jobs"].items():
+            if job and name != job:
+                continue
+            state = "running" if info["running"] else (info["last_status"] or "not run yet")
+            avg = f"{info['avg_seconds']:.1f}s" if info["avg_seconds"] is not None else "-"
+            embed.add_field(
+                name=f"{name} ({info['schedule']})",
+                value=f"Next {when(info['next_run_at'])} • last {when(info['last_run_at'])} ({state}) • avg {avg}",
+                inline=False
+            )
+        lines = []
+        for run in history:
+            started = datetime.datetime.fromtimestamp(run["started_at"], datetime.UTC).strftime("%m-%d %H:%M")
+            seconds = f"{run['seconds']:.1f}s" if run["seconds"] is not None else "-"
+            error = f" {run['error'][:60]}" if run["error"] else ""
+            lines.append(f"{started} {run['name'][:18]:<18} {run['status']:<9} {seconds:>8}{error}")
+        body = "\n".join(lines)[-1000:]
+        embed.add_field(name="Recent runs (UTC)", value=f"```\n{body}\n```" if lines else "None recorded", inline=False)
+        batch_lines = [
+            f"{b['job']} {b['period']}: {b['done'] + b['failed'] + b['skipped']}/{b['total']} "
+            f"({b['failed']} failed, {b['skipped']} skipped) • {b['status']} • {b['seconds']:.1f}s"
+            for b in batches
+        ]
+        embed.add_field(name="Batch progress", value="\n".join(batch_lines)[:1000] if batch_lines else "None recorded", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @bot.tree.command(name="profile_bot", description="Sample the running bot and write a flamegraph-ready profile. Admin only.")
+    @app_commands.describe(seconds="How long to sample (5-300, default: 30)")
+    async def profile_bot(interaction: discord.Interaction, seconds: int = 30):
+        """Profile the event loop for N seconds; replies with the top functions and the collapsed-stack file."""
+        if not await check_admin_command_permissions(interaction):
+            return
+        
+        import os
+        from core import profiler
+        if profiler.is_running():
+            await interaction.response.send_message("A profile is already running.", ephemeral=True)
+            return
+        
+        seconds = max(5, min(seconds, profiler.MAX_SECONDS))
+        await interaction.response.send_message(f"⏳ Sampling the event loop for {seconds}s...", ephemeral=True)
+        try:
+            result = await profiler.profile(seconds)
+        except Exception as e:
+            print(f"[-] Profile failed: {e}")
+            await interaction.followup.send(f"❌ Profile failed: {e}", ephemeral=True)
+            return
         
-        available_orders = await _get_available_orders(guild_id)
-        embed = build_orders_embed(available_orders, guild_id, user_id)
-        view = OrdersSelectView(available_orders, guild_id, user_id)
+        top = "\n".join(
+            f"{count * 100 / result['samples']:5.1f}%  {name[-70:]}" for name, count in result["top"]
+        ) or "No busy samples"
+        embed = discord.Embed(
+            title="🔥 Bot Profile",
+            description=(
+                f"{result['samples']} samples over {result['seconds']:.1f}s • loop busy {result['busy_pct']:.1f}%\n"
+                f"```\n{top[:3800]}\n```"
+            ),
+            color=0x4ec200
+        )
+        embed.set_footer(text=f"Saved to data/profiles/{os.path.basename(result['path'])} (flamegraph.pl / speedscope)")
+        await interaction.followup.send(embed=embed, file=discord.File(result["path"]), ephemeral=True)
+    
+    @bot.tree.command(name="orders_test", description="Test orders embed and views. Admin only.")
+    async def orders_test(interaction: discord.Interaction):
+        """Test orders embed and views - sends public /orders view"""
+        if not await check_admin_command_permissions(interaction):
+            return
         
-        # Send publicly (no ephemeral) to match /orders behavior
-        await interaction.response.send_message(embed=embed, view=view)
+        from commands import admin_test_commands
+        await admin_test_commands.orders_test(interaction)
     
     @bot.tree.command(name="onboarding_test", description="Test onboarding messages. Admin only.")
     async def onboarding_test(interaction: discord.Interaction):
@@ -2469,14 +2406,8 @@ def register_commands(bot_instance):
         if not await check_admin_command_permissions(interaction):
             return
         
-        if not isinstance(interaction.user, discord.Member):
-            await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
-            return
-        
-        from systems.onboarding import send_onboarding_rules
-        
-        member = interaction.user
-        await send_onboarding_rules(interaction, member, is_reply=False)
+        from commands import admin_test_commands
+        await admin_test_commands.onboarding_test(interaction)
     
     @bot.tree.command(name="introduction_test", description="Test introduction channel message. Admin only.")
     async def introduction_test(interaction: discord.Interaction):
@@ -2484,25 +2415,8 @@ def register_commands(bot_instance):
         if not await check_admin_command_permissions(interaction):
             return
         
-        if not interaction.guild:
-            await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
-            return
-        
-        # Show what happens: the bot adds a ❤️ reaction
-        embed = discord.Embed(
-            title="📝 Introduction Channel Test",
-            description="When a message is sent in the introductions channel, IslaBot automatically adds a ❤️ reaction.\n\nThis is a test - in the actual channel, reactions are added automatically.",
-            color=0x4ec200
-        )
-        
-        # Add ❤️ reaction to this test message to demonstrate
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        try:
-            # Get the response message to add reaction
-            message = await interaction.original_response()
-            await message.add_reaction("❤️")
-        except:
-            pass
+        from commands import admin_test_commands
+        await admin_test_commands.introduction_test(interaction)
     
     @bot.tree.command(name="testmessage", description="Test onboarding and profile messages. Admin only.")
     @app_commands.describe(message_name="Name of the message to test", category="Category for profile_info (optional)")
@@ -2511,219 +2425,8 @@ def register_commands(bot_instance):
         if not await check_admin_command_permissions(interaction):
             return
         
-        if not isinstance(interaction.user, discord.Member):
-            await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
-            return
-        
-        member = interaction.user
-        
-        # Onboarding messages
-        if message_name.startswith("onboarding_"):
-            from systems.onboarding import (
-                send_onboarding_welcome, send_onboarding_rules,
-                send_rules_accept_1, send_rules_decline_1,
-                send_rules_accept_2, send_rules_decline_2,
-                send_rules_submission_false, send_rules_submission_correct
-            )
-            
-            if message_name == "onboarding_welcome":
-                await interaction.response.defer(ephemeral=True)
-                await send_onboarding_welcome(member)
-                await interaction.followup.send("✅ Welcome message sent!", ephemeral=True)
-            
-            elif message_name == "onboarding_rules":
-                await send_onboarding_rules(interaction, member)
-            
-            elif message_name == "onboarding_rules_accept_1":
-                await send_rules_accept_1(interaction, member)
-            
-            elif message_name == "onboarding_rules_decline_1":
-                await send_rules_decline_1(interaction, member)
-            
-            elif message_name == "onboarding_rules_accept_2":
-                await send_rules_accept_2(interaction, member)
-            
-            elif message_name == "onboarding_rules_decline_2":
-                await send_rules_decline_2(interaction, member)
-            
-            elif message_name == "onboarding_rules_submission_false":
-                await send_rules_submission_false(interaction, member)
-            
-            elif message_name == "onboarding_rules_submission_correct":
-                await interaction.response.defer(ephemeral=True)
-                channel = interaction.channel
-                if isinstance(channel, discord.TextChannel):
-                    await send_rules_submission_correct(channel, member)
-                await interaction.followup.send("✅ Submission correct message sent!", ephemeral=True)
-            
-            else:
-                await interaction.response.send_message(
-                    f"Unknown onboarding message: {message_name}",
-                    ephemeral=True,
-                    delete_after=5
-                )
-        
-        # Profile messages
-        elif message_name == "profile":
-            from core.data import get_profile_stats
-            from commands.user_commands import build_profile_embed
-            
-            guild_id = interaction.guild.id if interaction.guild else 0
-            fake_stats = await get_profile_stats(guild_id, member.id)
-            embed = build_profile_embed(member, fake_stats)
-            
-            from core.config import ALLOWED_SEND_SET
-            if int(interaction.channel.id) in ALLOWED_SEND_SET:
-                await interaction.response.send_message(content=f"<@{member.id}>", embed=embed)
-            else:
-                await interaction.response.send_message(content=f"<@{member.id}>", embed=embed, delete_after=15)
-        
-        elif message_name == "collection":
-            from core.data import get_profile_stats
-            from commands.user_commands import build_collection_embed
-            
-            guild_id = interaction.guild.id if interaction.guild else 0
-            fake_stats = await get_profile_stats(guild_id, member.id)
-            embed = build_collection_embed(member, fake_stats)
-            
-            from core.config import ALLOWED_SEND_SET
-            if int(interaction.channel.id) in ALLOWED_SEND_SET:
-                await interaction.response.send_message(content=f"<@{member.id}>", embed=embed)
-            else:
-                await interaction.response.send_message(content=f"<@{member.id}>", embed=embed, delete_after=15)
-        
-        # Rank messages
-        elif message_name == "rank":
-            from core.data import get_profile_stats, get_rank
-            from commands.user_commands import build_rank_embed
-            from systems.progression import GATES, RANK_LADDER
-            
-            guild_id = interaction.guild.id if interaction.guild else 0
-            fake_stats = await get_profile_stats(guild_id, member.id)
-            rank_data = await get_rank(guild_id, member.id)
-            fake_stats.update(rank_data)
-            
-            # Calculate failing gates count
-            rank_names = [r["name"] for r in RANK_LADDER]
-            current_rank_name = fake_stats.get("rank", "Newcomer")
-            current_idx = rank_names.index(current_rank_name) if current_rank_name in rank_names else 0
-            next_idx = min(current_idx + 1, len(rank_names) - 1)
-            next_rank_name = rank_names[next_idx] if next_idx > current_idx else current_rank_name
-            
-            failing_gates_count = 0
-            if next_rank_name != "Max Rank":
-                next_gates = GATES.get(next_rank_name, [])
-                for gate in next_gates:
-                    gate_type = gate["type"]
-                    gate_min = gate["min"]
-                    
-                    if gate_type == "messages_7d" and fake_stats.get("messages_sent", 0) < gate_min:
-                        failing_gates_count += 1
-                    elif gate_type == "was" and fake_stats.get("was", 0) < gate_min:
-                        failing_gates_count += 1
-                    elif gate_type == "obedience14" and fake_stats.get("obedience_pct", 0) < gate_min:
-                        failing_gates_count += 1
-                
-                if fake_stats.get("orders_failed", 0) > 4:
-                    failing_gates_count += 1
-                if fake_stats.get("orders_late", 0) > 2:
-                    failing_gates_count += 1
-            
-            fake_stats["failing_gates_count"] = failing_gates_count
-            
-            embed = build_rank_embed(member, fake_stats)
-            
-            from core.config import ALLOWED_SEND_SET
-            if int(interaction.channel.id) in ALLOWED_SEND_SET:
-                await interaction.response.send_message(content=f"<@{member.id}>", embed=embed)
-            else:
-                await interaction.response.send_message(content=f"<@{member.id}>", embed=embed, delete_after=15)
-        
-        elif message_name == "rank_info":
-            from commands.user_commands import build_rank_info_embed
-            
-            embed = build_rank_info_embed()
-            
-            from core.config import ALLOWED_SEND_SET
-            if int(interaction.channel.id) in ALLOWED_SEND_SET:
-                await interaction.response.send_message(embed=embed)
-            else:
-                await interaction.response.send_message(embed=embed, delete_after=15)
-        
-        # Order messages
-        elif message_name == "orders":
-            from commands.user_commands import build_orders_embed, _get_available_orders
-            
-            guild_id = interaction.guild.id if interaction.guild else 0
-            user_id = member.id
-            available_orders = await _get_available_orders(guild_id)
-            embed = build_orders_embed(available_orders, guild_id, user_id)
-            
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-        
-        elif message_name.startswith("order_info:"):
-            order_name = message_name.split(":", 1)[1]
-            from commands.user_commands import build_order_info_embed, _normalize_order_name, _get_available_orders
-            
-            guild_id = interaction.guild.id if interaction.guild else 0
-            order_key = _normalize_order_name(order_name)
-            available_orders = await _get_available_orders(guild_id)
-            is_available = order_key in available_orders
-            
-            embed = build_order_info_embed(order_key, is_available)
-            if embed:
-                await interaction.response.send_message(embed=embed, ephemeral=True)
-            else:
-                await interaction.response.send_message("Unknown order.", ephemeral=True)
-        
-        elif message_name.startswith("order_accept:"):
-            order_name = message_name.split(":", 1)[1]
-            from commands.user_commands import build_order_accept_embed, _normalize_order_name, ORDERS_CATALOG
-            
-            order_key = _normalize_order_name(order_name)
-            if order_key in ORDERS_CATALOG:
-                order = ORDERS_CATALOG[order_key]
-                embed = build_order_accept_embed(order_key, order["due_seconds"])
-                if embed:
-                    await interaction.response.send_message(embed=embed, ephemeral=True)
-                else:
-                    await interaction.response.send_message("Error building embed.", ephemeral=True)
-            else:
-                await interaction.response.send_message("Unknown order.", ephemeral=True)
-        
-        elif message_name.startswith("order_complete:"):
-            order_name = message_name.split(":", 1)[1]
-            from commands.user_commands import build_order_complete_embed, _normalize_order_name, ORDERS_CATALOG
-            
-            order_key = _normalize_order_name(order_name)
-            if order_key in ORDERS_CATALOG:
-                order = ORDERS_CATALOG[order_key]
-                # Simulate completion proof
-                completion_proof = "💬 Messages: 2/2\n✅ Task completed"
-                embed = build_order_complete_embed(order_key, False, order["reward_coins"], completion_proof)
-                if embed:
-                    await interaction.response.send_message(embed=embed, ephemeral=True)
-                else:
-                    await interaction.response.send_message("Error building embed.", ephemeral=True)
-            else:
-                await interaction.response.send_message("Unknown order.", ephemeral=True)
-        
-        else:
-            await interaction.response.send_message(
-                f"Unknown message name: {message_name}\n\nAvailable messages:\n"
-                "**Onboarding:**\n"
-                "- onboarding_welcome\n- onboarding_rules\n- onboarding_rules_accept_1\n"
-                "- onboarding_rules_decline_1\n- onboarding_rules_accept_2\n- onboarding_rules_decline_2\n"
-                "- onboarding_rules_submission_false\n- onboarding_rules_submission_correct\n\n"
-                "**Profile:**\n"
-                "- profile\n- collection\n\n"
-                "**Rank:**\n"
-                "- rank\n- rank_info\n\n"
-                "**Orders:**\n"
-                "- orders\n- order_info:<order_name>\n- order_accept:<order_name>\n- order_complete:<order_name>",
-                ephemeral=True,
-                delete_after=15
-            )
+        from commands import admin_test_commands
+        await admin_test_commands.testmessage(interaction, message_name, category)
     
     @bot.tree.command(name="messages", description="List all registered message templates. Admin only.")
     @app_commands.describe()
@@ -16,10 +16,15 @@ from core.data import (
 from core.utils import get_timezone, USE_PYTZ
 # Leaderboard imports removed - /leaderboard and /leaderboards commands deleted
 from systems.gambling import (
-    gamble, dice, slots_bet, slots_free, coinflip, allin, roulette, blackjack,
-    build_casino_embed
+    gamble, dice, slots_bet, slots_free, coinflip, allin, roulette, blackjack
 )
 from core.data import check_daily_cooldown, update_daily_cooldown, check_give_cooldown, update_give_cooldown
+from core.locks import economy_lock, economy_lock_pair
+from systems.static_embeds import get_static_embed
+from systems.orders import (
+    ORDERS_CATALOG, normalize_order_name as _normalize_order_name,
+    get_open_runs, get_run_progress, get_runs_progress, resolve_run_order_key, get_progress_by_order_key
+)
 
 # Bot instance (set by main.py)
 bot = None
@@ -132,45 +137,45 @@ def register_commands(bot_instance):
             await bump_command(guild_id, user_id)
         
         user_id = interaction.user.id
-        on_cooldown, reset_timestamp = check_daily_cooldown(user_id)
-        
-        if on_cooldown:
-            embed = discord.Embed(
-                title="Daily 🎁",
-                description="You've already claimed your daily reward today.",
-                color=0xff000d,
-            )
-            embed.set_footer(text="Resets at 6:00 PM GMT")
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            return
-        
         guild_id = interaction.guild.id if interaction.guild else 0
-        
-        # Base amount is always 100 coins
-        base_daily = 100
-        
-        # Check for weekend bonus
-        uk_tz = get_timezone("Europe/London")
-        if uk_tz:
-            if USE_PYTZ:
-                now_uk = datetime.datetime.now(uk_tz)
-            else:
-                now_uk = datetime.datetime.now(uk_tz)
-            weekday = now_uk.weekday()
-            if weekday >= 4:  # Friday (4), Saturday (5), Sunday (6)
-                weekend_bonus = True
+        async with economy_lock(guild_id, user_id, command="daily"):
+            on_cooldown, reset_timestamp = check_daily_cooldown(user_id)
+            
+            if on_cooldown:
+                embed = discord.Embed(
+                    title="Daily 🎁",
+                    description="You've already claimed your daily reward today.",
+                    color=0xff000d,
+                )
+                embed.set_footer(text="Resets at 6:00 PM GMT")
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
+            
+            # Base amount is always 100 coins
+            base_daily = 100
+            
+            # Check for weekend bonus
+            uk_tz = get_timezone("Europe/London")
+            if uk_tz:
+                if USE_PYTZ:
+                    now_uk = datetime.datetime.now(uk_tz)
+                else:
+                    now_uk = datetime.datetime.now(uk_tz)
+                weekday = now_uk.weekday()
+                if weekday >= 4:  # Friday (4), Saturday (5), Sunday (6)
+                    weekend_bonus = True
+                else:
+                    weekend_bonus = False
             else:
                 weekend_bonus = False
-        else:
-            weekend_bonus = False
-        
-        # Calculate total daily amount
-        daily_amount = base_daily
-        if weekend_bonus:
-            daily_amount += 25
-        
-        await add_coins(user_id, daily_amount, guild_id=guild_id)
-        update_daily_cooldown(user_id)
+            
+            # Calculate total daily amount
+            daily_amount = base_daily
+            if weekend_bonus:
+                daily_amount += 25
+            
+            await add_coins(user_id, daily_amount, guild_id=guild_id)
+            update_daily_cooldown(user_id)
         
         # Format weekend bonus field
         weekend_bonus_text = "✅ +25 coins" if weekend_bonus else "❌ Not Active"
@@ -198,27 +203,27 @@ def register_commands(bot_instance):
             return
         
         user_id = interaction.user.id
-        on_cooldown, reset_timestamp = check_give_cooldown(user_id)
-        
-        if on_cooldown:
-            embed = discord.Embed(
-                title="Gift 🎁",
-                description="You've already given coins today.",
-                color=0xff000d,
-            )
-            embed.set_footer(text="Gifts reset daily at 6:00 PM GMT")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            return
-        
         guild_id = interaction.guild.id if interaction.guild else 0
-        if not await has_coins(user_id, amount, guild_id=guild_id):
-            await interaction.response.send_message("You don't have enough coins.", ephemeral=True, delete_after=5)
-            return
-        
-        guild_id = interaction.guild.id if interaction.guild else 0
-        await add_coins(user_id, -amount, guild_id=guild_id)
-        await add_coins(member.id, amount, guild_id=guild_id)
-        update_give_cooldown(user_id)
+        async with economy_lock_pair(guild_id, user_id, member.id, command="give"):
+            on_cooldown, reset_timestamp = check_give_cooldown(user_id)
+            
+            if on_cooldown:
+                embed = discord.Embed(
+                    title="Gift 🎁",
+                    description="You've already given coins today.",
+                    color=0xff000d,
+                )
+                embed.set_footer(text="Gifts reset daily at 6:00 PM GMT")
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+            
+            if not await has_coins(user_id, amount, guild_id=guild_id):
+                await interaction.response.send_message("You don't have enough coins.", ephemeral=True, delete_after=5)
+                return
+            
+            await add_coins(user_id, -amount, guild_id=guild_id)
+            await add_coins(member.id, amount, guild_id=guild_id)
+            update_give_cooldown(user_id)
         # Data now stored in DB - no need to save JSON
         
         embed = discord.Embed(
@@ -243,19 +248,7 @@ def register_commands(bot_instance):
         if not await check_user_command_permissions(interaction):
             return
         
-        embed = build_casino_embed(
-            kind="info",
-            outcome=None,
-            title="ℹ️ Dice Info",
-            description="Roll 1–6 vs dealer. Higher roll wins.",
-            fields=[
-                {"name": "Min Bet", "value": "**50** coins", "inline": True},
-                {"name": "Payout", "value": "**x2**", "inline": True},
-                {"name": "Ties", "value": "Bet returned", "inline": True},
-                {"name": "Cooldown", "value": "**10s**", "inline": True}
-            ],
-            footer_text="Use /dice <bet>"
-        )
+        embed = get_static_embed("diceinfo", interaction.locale)
         await interaction.response.send_message(embed=embed)
     
     # Slots command group
@@ -278,18 +271,7 @@ def register_commands(bot_instance):
         if not await check_user_command_permissions(interaction):
             return
         
-        embed = build_casino_embed(
-            kind="info",
-            outcome=None,
-            title="ℹ️ Slots Paytable",
-            description="3-of-a-kind multipliers (weighted reels).",
-            fields=[
-                {"name": "Multipliers", "value": "🥝 x1.5 • 🍇 x2 • 🍋 x3 • 🍑 x5 • 🍉 x8 • 🍒 x15 • 👑 x30 (JACKPOT)", "inline": False},
-                {"name": "Bonus 🎁", "value": "3x 🎁 → +5 free spins\n2x 🎁 → +2 free spins +250 coins\n🎁 + pair → x0.8 multiplier", "inline": False},
-                {"name": "Safety Nets", "value": "2-of-a-kind → -50% loss\nFree spins: `/slots free`", "inline": False}
-            ],
-            footer_text="Cooldown: 15s • Min bet: 10"
-        )
+        embed = get_static_embed("slotspaytable", interaction.locale)
         await interaction.response.send_message(embed=embed)
     
     @bot.tree.command(name="slotsinfo", description="Show slots info")
@@ -298,19 +280,7 @@ def register_commands(bot_instance):
         if not await check_user_command_permissions(interaction):
             return
         
-        embed = build_casino_embed(
-            kind="info",
-            outcome=None,
-            title="ℹ️ Slots Info",
-            description="3 reel weighted symbols. Match 3-of-a-kind to win.",
-            fields=[
-                {"name": "Min Bet", "value": "**10** coins", "inline": True},
-                {"name": "Cooldown", "value": "**15s**", "inline": True},
-                {"name": "Free Spins", "value": "Use `/slots free`", "inline": True},
-                {"name": "Streaks", "value": "🔥 Hot: 3+ wins • 🥶 Cold: 5+ losses", "inline": False}
-            ],
-            footer_text="See /slotspaytable for multipliers"
-        )
+        embed = get_static_embed("slotsinfo", interaction.locale)
         await interaction.response.send_message(embed=embed)
     
     @bot.tree.command(name="casino", description="Show casino information")
@@ -321,22 +291,7 @@ def register_commands(bot_instance):
         
         user_id = interaction.user.id
         
-        embed = discord.Embed(
-            title="<a:A_shuffle:1451743595681026125> Isla's Casino",
-            description="Welcome to my casino — where luck comes to play <:kisses:1449998044446593125>",
-            colour=0x0fa3ff
-        )
-        embed.add_field(name="Games",
-                        value="`/coinflip`\n`/dice`\n`/slots`\n`/roulette`\n`/blackjack`",
-                        inline=True)
-        embed.add_field(name="Cooldowns",
-                        value="Coinflip 8s\nDice 10s\nSlots 15s\nRoulette 20s\nBlackjack 30s",
-                        inline=True)
-        embed.add_field(name="Streaks",
-                        value="🔥 3+ wins\n🥶 5+ losses",
-                        inline=True)
-        embed.set_thumbnail(url="https://i.imgur.com/W30kCYP.png")
-        embed.set_footer(text="Have fun losing~")
+        embed = get_static_embed("casino", interaction.locale)
         
         content = f"<@{user_id}>"
         await interaction.response.send_message(content=content, embed=embed)
@@ -374,76 +329,7 @@ def register_commands(bot_instance):
             async def send_game_info(self, interaction: discord.Interaction, game: str):
                 user_id = interaction.user.id
                 content = f"<@{user_id}>"
-                
-                if game == "coinflip":
-                    embed = discord.Embed(
-                        title="ℹ️ Coinflip Info",
-                        description="49/51 chance to double or lose.",
-                        colour=0x0fa3ff
-                    )
-                    embed.add_field(name="Min Bet", value="**10** coins", inline=True)
-                    embed.add_field(name="Payout", value="**x2**", inline=True)
-                    embed.add_field(name="Cooldown", value="**8s**", inline=True)
-                    embed.set_thumbnail(url="https://i.imgur.com/W30kCYP.png")
-                    embed.set_footer(text="Use /coinflip <bet>")
-                
-                elif game == "dice":
-                    embed = discord.Embed(
-                        title="ℹ️ Dice Info",
-                        description="Roll 1–6 vs dealer. Higher roll wins.",
-                        colour=0x0fa3ff
-                    )
-                    embed.add_field(name="Min Bet", value="**50** coins", inline=True)
-                    embed.add_field(name="Payout", value="**x2**", inline=True)
-                    embed.add_field(name="Ties", value="Bet returned", inline=True)
-                    embed.add_field(name="Cooldown", value="**10s**", inline=True)
-                    embed.set_thumbnail(url="https://i.imgur.com/W30kCYP.png")
-                    embed.set_footer(text="Use /dice <bet>")
-                
-                elif game == "slots":
-                    embed = discord.Embed(
-                        title="<a:A_shuffle:1451743595681026125> Isla's Casino",
-                        description="Not all wins are equal. Some are worth waiting for.",
-                        colour=0x0fa3ff
-                    )
-                    embed.add_field(name="Multipliers",
-                                    value="🥝 x1.5\n🍇 x2\n🍋 x3\n🍑 x5\n🍉 x8\n🍒 x15\n👑 x30 **JACKPOT**",
-                                    inline=True)
-                    embed.add_field(name="Bonus",
-                                    value="3x 🎁 +5 free spins\n2x 🎁 +2 free spins",
-                                    inline=True)
-                    embed.add_field(name="Extra",
-                                    value="Cooldown: 15s\nMinimum bet: 10\nBonus: `/slots free`",
-                                    inline=True)
-                    embed.add_field(name="Safety Nets",
-                                    value="2-of-a-kind -50% loss",
-                                    inline=False)
-                    embed.set_thumbnail(url="https://i.imgur.com/W30kCYP.png")
-                    embed.set_footer(text="Good luck… and good losses~")
-                
-                elif game == "roulette":
-                    embed = discord.Embed(
-                        title="ℹ️ Roulette Info",
-                        description="Bet on red/black/green or a number (0-36).",
-                        colour=0x0fa3ff
-                    )
-                    embed.add_field(name="Bet Types", value="Red/Black: x2\nGreen: x14\nNumber: x36", inline=True)
-                    embed.add_field(name="Cooldown", value="**20s**", inline=True)
-                    embed.set_thumbnail(url="https://i.imgur.com/W30kCYP.png")
-                    embed.set_footer(text="Use /roulette <bet> <choice>")
-                
-                elif game == "blackjack":
-                    embed = discord.Embed(
-                        title="ℹ️ Blackjack Info",
-                        description="Get closer to 21 than the dealer without going over.",
-                        colour=0x0fa3ff
-                    )
-                    embed.add_field(name="Actions", value="Hit, Stand, Double", inline=True)
-                    embed.add_field(name="Payout", value="Blackjack: 3:2\nWin: x2\nTie: Refund", inline=True)
-                    embed.add_field(name="Cooldown", value="**30s**", inline=True)
-                    embed.set_thumbnail(url="https://i.imgur.com/W30kCYP.png")
-                    embed.set_footer(text="Use /blackjack <bet>")
-                
+                embed = get_static_embed(f"casinoinfo_{game}", interaction.locale)
                 await interaction.response.send_message(content=content, embed=embed)
         
         # Send public message with mention (A3: casinoinfo must be public)
@@ -466,16 +352,7 @@ def register_commands(bot_instance):
         user_id = interaction.user.id
         content = f"<@{user_id}>"
         
-        embed = discord.Embed(
-            title="ℹ️ Coinflip Info",
-            description="49/51 chance to double or lose.",
-            colour=0x0fa3ff
-        )
-        embed.add_field(name="Min Bet", value="**10** coins", inline=True)
-        embed.add_field(name="Payout", value="**x2**", inline=True)
-        embed.add_field(name="Cooldown", value="**8s**", inline=True)
-        embed.set_thumbnail(url="https://i.imgur.com/W30kCYP.png")
-        embed.set_footer(text="Use /coinflip <bet>")
+        embed = get_static_embed("coinflipinfo", interaction.locale)
         
         await interaction.response.send_message(content=content, embed=embed)
     
@@ -506,11 +383,7 @@ def register_commands(bot_instance):
         if not await check_user_command_permissions(interaction):
             return
         
-        embed = discord.Embed(
-            title="🏪 Store",
-            description="The store is coming soon...\n\nSpend your coins on exclusive rewards!",
-            color=0xff000d,
-        )
+        embed = get_static_embed("store", interaction.locale)
         await interaction.response.send_message(embed=embed)
     
     @bot.tree.command(name="rules", description="Show server rules")
@@ -819,63 +692,6 @@ def register_commands(bot_instance):
         
         return embed
     
-    def build_rank_info_embed() -> discord.Embed:
-        """Build the static rank system information embed"""
-        embed = discord.Embed(
-            description="Ranks are not earned by activity or coins alone.\nThey reflect consistency, obedience, and presence over time."
-        )
-        embed.set_author(
-            name="Rank System Overview",
-            icon_url="https://i.imgur.com/irmCXhw.gif"
-        )
-        
-        # Spacer
-        embed.add_field(name="", value="", inline=False)
-        
-        # How Ranks Work
-        embed.add_field(
-            name="How Ranks Work",
-            value="• Coins determine which rank bracket you qualify for.\n• Obedience and Activity determine if you can hold it.\n• Failing requirements can put your rank at risk.",
-            inline=True
-        )
-        
-        # Spacer
-        embed.add_field(name="", value="", inline=False)
-        
-        # What Affects Your Rank
-        embed.add_field(
-            name="What Affects Your Rank",
-            value="📈 Lifetime Coins — long-term contribution.\n🧠 Obedience — order completion & streaks.\n👁️ Activity — weekly presence (messages & VC).\n❌ Failed Orders — missed responsibilities.\n⏳ Late Orders — delayed compliance.\n🔥 Streak — consecutive compliant days.",
-            inline=False
-        )
-        
-        # Spacer
-        embed.add_field(name="", value="", inline=False)
-        
-        # Progress & Blockers
-        embed.add_field(
-            name="Progress & Blockers",
-            value="• Your progress bar shows readiness for the next rank\n• A blocker indicates the main requirement holding you back\n• Only one blocker is shown to keep focus clear",
-            inline=False
-        )
-        
-        # Spacer
-        embed.add_field(name="", value="", inline=False)
-        
-        # Stability & Risk
-        embed.add_field(
-            name="Stability & Risk",
-            value="• Stable ranks meet all requirements\n• At-risk ranks fail one or more gates\n• Repeated instability can result in demotion",
-            inline=True
-        )
-        
-        # Spacer
-        embed.add_field(name="", value="", inline=False)
-        
-        embed.set_footer(text="Use /rank to check your progress.")
-        
-        return embed
-    
     # Profile commands
     @bot.tree.command(name="profile", description="View your profile")
     async def profile(interaction: discord.Interaction):
@@ -929,7 +745,7 @@ def register_commands(bot_instance):
         if not await check_user_command_permissions(interaction):
             return
         
-        embed = build_rank_info_embed()
+        embed = get_static_embed("rank_info", interaction.locale)
         
         if int(interaction.channel.id) in ALLOWED_SEND_SET:
             await interaction.response.send_message(embed=embed)
@@ -1026,62 +842,63 @@ def register_commands(bot_instance):
         guild_id = interaction.guild.id if interaction.guild else 0
         user_id = interaction.user.id
         
-        # Check if user has already claimed this week
-        claim_row = await fetchone(
-            "SELECT last_claimed_at FROM weekly_claims WHERE guild_id = ? AND user_id = ?",
-            (guild_id, user_id)
-        )
-        
-        if claim_row and claim_row["last_claimed_at"]:
-            last_claimed = datetime.datetime.fromisoformat(claim_row["last_claimed_at"].replace('Z', '+00:00'))
-            now = datetime.datetime.now(datetime.UTC)
-            days_since_claim = (now - last_claimed).days
+        async with economy_lock(guild_id, user_id, command="coins_weekly"):
+            # Check if user has already claimed this week
+            claim_row = await fetchone(
+                "SELECT last_claimed_at FROM weekly_claims WHERE guild_id = ? AND user_id = ?",
+                (guild_id, user_id)
+            )
             
-            if days_since_claim < 7:
-                days_remaining = 7 - days_since_claim
-                await interaction.followup.send(
-                    f"You can claim weekly coins again in {days_remaining} day(s).",
-                    ephemeral=True,
-                    delete_after=10
+            if claim_row and claim_row["last_claimed_at"]:
+                last_claimed = datetime.datetime.fromisoformat(claim_row["last_claimed_at"].replace('Z', '+00:00'))
+                now = datetime.datetime.now(datetime.UTC)
+                days_since_claim = (now - last_claimed).days
+                
+                if days_since_claim < 7:
+                    days_remaining = 7 - days_since_claim
+                    await interaction.followup.send(
+                        f"You can claim weekly coins again in {days_remaining} day(s).",
+                        ephemeral=True,
+                        delete_after=10
+                    )
+                    return
+            
+            # Get user stats
+            stats = await get_profile_stats(guild_id, user_id)
+            was = stats.get("was", 0)
+            obedience_pct = stats.get("obedience_pct", 0)
+            streak = stats.get("obedience_streak", 0)
+            
+            # Calculate weekly claim amount
+            claim_data = await weekly_claim_amount(guild_id, user_id, was, obedience_pct, streak)
+            claim_amount = claim_data["claim_amount"]
+            garnish_amount = claim_data["garnish_amount"]
+            
+            # Award coins
+            from core.data import add_coins
+            await add_coins(user_id, claim_amount, guild_id=guild_id, reason="weekly_claim", meta={
+                "was": was,
+                "obedience": obedience_pct,
+                "streak": streak,
+                "base": claim_data["base_amount"]
+            })
+            
+            # If garnish to debt, update debt
+            if garnish_amount > 0:
+                await execute(
+                    """UPDATE discipline_state 
+                       SET debt = debt - ?, updated_at = ?
+                       WHERE guild_id = ? AND user_id = ?""",
+                    (garnish_amount, _now_iso(), guild_id, user_id)
                 )
-                return
-        
-        # Get user stats
-        stats = await get_profile_stats(guild_id, user_id)
-        was = stats.get("was", 0)
-        obedience_pct = stats.get("obedience_pct", 0)
-        streak = stats.get("obedience_streak", 0)
-        
-        # Calculate weekly claim amount
-        claim_data = await weekly_claim_amount(guild_id, user_id, was, obedience_pct, streak)
-        claim_amount = claim_data["claim_amount"]
-        garnish_amount = claim_data["garnish_amount"]
-        
-        # Award coins
-        from core.data import add_coins
-        await add_coins(guild_id, user_id, claim_amount, "weekly_claim", {
-            "was": was,
-            "obedience": obedience_pct,
-            "streak": streak,
-            "base": claim_data["base_amount"]
-        })
-        
-        # If garnish to debt, update debt
-        if garnish_amount > 0:
+            
+            # Record claim
             await execute(
-                """UPDATE discipline_state 
-                   SET debt = debt - ?, updated_at = ?
-                   WHERE guild_id = ? AND user_id = ?""",
-                (garnish_amount, _now_iso(), guild_id, user_id)
+                """INSERT OR REPLACE INTO weekly_claims (guild_id, user_id, last_claimed_at)
+                   VALUES (?, ?, ?)""",
+                (guild_id, user_id, _now_iso())
             )
         
-        # Record claim
-        await execute(
-            """INSERT OR REPLACE INTO weekly_claims (guild_id, user_id, last_claimed_at)
-               VALUES (?, ?, ?)""",
-            (guild_id, user_id, _now_iso())
-        )
-        
         # Build response embed
         embed = discord.Embed(
             title="Weekly Claim",
@@ -1111,121 +928,9 @@ def register_commands(bot_instance):
     
     bot.tree.add_command(coins_group)
     
-    # Orders catalog
-    ORDERS_CATALOG = {
-        "presence_ping": {
-            "title": "Presence Ping",
-            "difficulty": "easy",
-            "due_seconds": 21600,  # 6 hours
-            "reward_coins": 40,
-            "instructions": "Send a message to demonstrate you're here.",
-            "steps_json": {"type": "message_count", "min_count": 1, "spacing_seconds": 0},
-            "cooldown_type": "daily"
-        },
-        "profile_sync": {
-            "title": "Profile Sync",
-            "difficulty": "easy",
-            "due_seconds": 21600,
-            "reward_coins": 45,
-            "instructions": "Update your profile information using /profile command.",
-            "steps_json": {"type": "command_used", "command": "/profile"},
-            "cooldown_type": "daily"
-        },
-        "gratitude_receipt": {
-            "title": "Gratitude Receipt",
-            "difficulty": "easy",
-            "due_seconds": 28800,  # 8 hours
-            "reward_coins": 50,
-            "instructions": "Reply to another user's message with appreciation.",
-            "steps_json": {"type": "reply_count", "min_count": 1, "exclude_bots": True},
-            "cooldown_type": "daily"
-        },
-        "quiet_compliance": {
-            "title": "Quiet Compliance",
-            "difficulty": "medium",
-            "due_seconds": 43200,  # 12 hours
-            "reward_coins": 75,
-            "instructions": "Send messages spaced apart to show measured engagement.",
-            "steps_json": {"type": "message_count", "min_count": 3, "spacing_seconds": 1800},  # 30 min spacing
-            "cooldown_type": "daily"
-        },
-        "voice_attendance": {
-            "title": "Voice Attendance",
-            "difficulty": "medium",
-            "due_seconds": 86400,  # 24 hours
-            "reward_coins": 100,
-            "instructions": "Spend time in voice channels.",
-            "steps_json": {"type": "vc_minutes", "min_minutes": 30},
-            "cooldown_type": "daily"
-        },
-        "two_step_checkin": {
-            "title": "Two-Step Check-in",
-            "difficulty": "medium",
-            "due_seconds": 43200,
-            "reward_coins": 80,
-            "instructions": "Send a message, then use a command within the time window.",
-            "steps_json": {"type": "two_step", "message_first": True, "command_after": "/daily"},
-            "cooldown_type": "daily"
-        },
-        "anime_post": {
-            "title": "Community Contribution (Anime)",
-            "difficulty": "hard",
-            "due_seconds": 172800,  # 48 hours
-            "reward_coins": 150,
-            "instructions": "React to a post in the anime forum channel.",
-            "steps_json": {"type": "forum_reaction_any_post", "channel_category": "anime"},
-            "cooldown_type": "48h"
-        },
-        "games_post": {
-            "title": "Community Contribution (Games)",
-            "difficulty": "hard",
-            "due_seconds": 172800,
-            "reward_coins": 150,
-            "instructions": "React to a post in the games forum channel.",
-            "steps_json": {"type": "forum_reaction_any_post", "channel_category": "games"},
-            "cooldown_type": "48h"
-        },
-        "discipline_deposit": {
-            "title": "Discipline Deposit",
-            "difficulty": "hard",
-            "due_seconds": 86400,
-            "reward_coins": 200,
-            "instructions": "Burn coins through a discipline action (gambling, debt payment, etc.).",
-            "steps_json": {"type": "ledger_event", "event_type": "burn", "min_amount": 100},
-            "cooldown_type": "weekly"
-        },
-        "structured_hour": {
-            "title": "Structured Hour",
-            "difficulty": "hard",
-            "due_seconds": 86400,
-            "reward_coins": 180,
-            "instructions": "Send a reaction to a recent message in a specified channel.",
-            "steps_json": {"type": "reaction_on_channel_recent", "channel_id": None, "emoji": None, "hours_recent": 24},
-            "cooldown_type": "weekly"
-        }
-    }
-    
-    # Order name mapping
-    ORDER_NAME_TO_KEY = {
-        "Presence Ping": "presence_ping",
-        "Profile Sync": "profile_sync",
-        "Gratitude Receipt": "gratitude_receipt",
-        "Quiet Compliance": "quiet_compliance",
-        "Voice Attendance": "voice_attendance",
-        "Two-Step Check-in": "two_step_checkin",
-        "Community Contribution (Anime)": "anime_post",
-        "Community Contribution (Games)": "games_post",
-        "Discipline Deposit": "discipline_deposit",
-        "Structured Hour": "structured_hour"
-    }
-    
     # Daily availability tracking (in-memory, per guild)
     _orders_daily_available = {}  # {guild_id: {day_str: [order_keys]}}
     
-    def _normalize_order_name(order_name: str) -> str:
-        """Normalize order name to order_key"""
-        return ORDER_NAME_TO_KEY.get(order_name, order_name.lower().replace(" ", "_").replace("(", "").replace(")", ""))
-    
     def _get_difficulty_emoji(difficulty: str) -> str:
         """Get emoji for difficulty"""
         if difficulty == "easy":
@@ -1339,8 +1044,17 @@ def register_commands(bot_instance):
         return "Complete the task as specified."
     
     # Orders embed builders
-    def build_orders_embed(available_orders: list, guild_id: int, user_id: int) -> discord.Embed:
+    def _format_order_progress(progress: dict) -> str:
+        """Format live progress suffix for an accepted order"""
+        if not progress:
+            return ""
+        if progress["done"]:
+            return " ✅"
+        return f" `{progress['current']}/{progress['required']}`"
+    
+    def build_orders_embed(available_orders: list, guild_id: int, user_id: int, progress_by_key: dict = None) -> discord.Embed:
         """Build the /orders embed with exact layout"""
+        progress_by_key = progress_by_key or {}
         embed = discord.Embed(
             description="Isla has issued new orders. Complete them on time."
         )
@@ -1360,13 +1074,14 @@ def register_commands(bot_instance):
                 difficulty = order["difficulty"]
                 title = order["title"]
                 emoji = _get_difficulty_emoji(difficulty)
+                suffix = _format_order_progress(progress_by_key.get(order_key))
                 
                 if difficulty == "easy":
-                    easy_orders.append(f"{emoji} {title}")
+                    easy_orders.append(f"{emoji} {title}{suffix}")
                 elif difficulty == "medium":
-                    medium_orders.append(f"{emoji} {title}")
+                    medium_orders.append(f"{emoji} {title}{suffix}")
                 elif difficulty == "hard":
-                    hard_orders.append(f"{emoji} {title}")
+                    hard_orders.append(f"{emoji} {title}{suffix}")
         
         # Add unavailable orders (all orders not in available)
         for order_key, order in ORDERS_CATALOG.items():
@@ -1753,7 +1468,8 @@ def register_commands(bot_instance):
             
             # Return to orders list
             available_orders = await _get_available_orders(self.guild_id)
-            embed = build_orders_embed(available_orders, self.guild_id, self.user_id)
+            progress_by_key = await get_progress_by_order_key(self.guild_id, self.user_id)
+            embed = build_orders_embed(available_orders, self.guild_id, self.user_id, progress_by_key)
             view = OrdersSelectView(available_orders, self.guild_id, self.user_id)
             await interaction.response.edit_message(embed=embed, view=view)
         
@@ -1816,7 +1532,7 @@ def register_commands(bot_instance):
             
             if not order_row:
                 # Create order if doesn't exist
-                from core.db import execute, _now_iso
+                from core.db import _now_iso
                 await execute(
                     """INSERT INTO orders (guild_id, name, description, reward_coins, due_seconds, is_active, created_at)
                        VALUES (?, ?, ?, ?, ?, 1, ?)""",
@@ -1882,7 +1598,8 @@ def register_commands(bot_instance):
         user_id = interaction.user.id
         
         available_orders = await _get_available_orders(guild_id)
-        embed = build_orders_embed(available_orders, guild_id, user_id)
+        progress_by_key = await get_progress_by_order_key(guild_id, user_id)
+        embed = build_orders_embed(available_orders, guild_id, user_id, progress_by_key)
         
         view = OrdersSelectView(available_orders, guild_id, user_id)
         await interaction.response.send_message(embed=embed, view=view)
@@ -2109,7 +1826,7 @@ def register_commands(bot_instance):
         # Find active run for this order
         from core.db import fetchone
         active_run = await fetchone(
-            """SELECT run_id, accepted_at, due_at, status, progress_json FROM order_runs 
+            """SELECT run_id, order_key, accepted_at, due_at, status, progress_json FROM order_runs 
                WHERE guild_id = ? AND user_id = ? AND status = 'accepted'
                AND order_id IN (SELECT order_id FROM orders WHERE name = ?)
                ORDER BY accepted_at DESC LIMIT 1""",
@@ -2122,206 +1839,19 @@ def register_commands(bot_instance):
             return
         
         run_id = active_run["run_id"]
-        accepted_at = datetime.datetime.fromisoformat(active_run["accepted_at"].replace('Z', '+00:00'))
         due_at = datetime.datetime.fromisoformat(active_run["due_at"].replace('Z', '+00:00'))
         now = datetime.datetime.now(datetime.UTC)
         is_late = now > due_at
         
-        # Verify completion
-        steps = order["steps_json"]
+        # Verify completion: live progress when tracked, otherwise the compiled verifier
+        progress = await get_run_progress(guild_id, user_id, active_run, order_key=order_key)
         missing_requirements = []
         completion_proof_parts = []
-        
-        accepted_at_ts = int(accepted_at.timestamp())
-        
-        # Verify based on step type using event tables
-        from core.db import fetchall
-        if steps["type"] == "message_count":
-            min_count = steps.get("min_count", 1)
-            spacing = steps.get("spacing_seconds", 0)
-            
-            # Query message_events after accepted_at
-            message_rows = await fetchall(
-                """SELECT ts FROM message_events 
-                   WHERE guild_id = ? AND user_id = ? AND ts >= ?
-                   ORDER BY ts""",
-                (guild_id, user_id, accepted_at_ts)
-            )
-            
-            if spacing > 0:
-                # Apply spacing rule: count messages with min spacing between them
-                valid_messages = []
-                for row in message_rows:
-                    ts = row["ts"]
-                    if not valid_messages or (ts - valid_messages[-1]) >= spacing:
-                        valid_messages.append(ts)
-                total_messages = len(valid_messages)
-            else:
-                total_messages = len(message_rows)
-            
-            if total_messages < min_count:
-                missing_requirements.append(f"Send {min_count} message(s) with spacing (have {total_messages})")
+        if progress:
+            if progress["done"]:
+                completion_proof_parts.append(progress["proof"])
             else:
-                completion_proof_parts.append(f"💬 Messages: {total_messages}/{min_count}")
-        
-        elif steps["type"] == "command_used":
-            cmd = steps.get("command", "/profile")
-            cmd_name = cmd.replace("/", "")
-            
-            # Query command_events after accepted_at
-            cmd_rows = await fetchall(
-                """SELECT ts FROM command_events 
-                   WHERE guild_id = ? AND user_id = ? AND command_name = ? AND ts >= ?""",
-                (guild_id, user_id, cmd_name, accepted_at_ts)
-            )
-            
-            if len(cmd_rows) == 0:
-                missing_requirements.append(f"Use the {cmd} command")
-            else:
-                completion_proof_parts.append(f"✅ Command used: {cmd}")
-        
-        elif steps["type"] == "reply_count":
-            min_count = steps.get("min_count", 1)
-            
-            # Query message_events for replies after accepted_at
-            reply_rows = await fetchall(
-                """SELECT ts FROM message_events 
-                   WHERE guild_id = ? AND user_id = ? AND ts >= ?
-                   AND is_reply = 1 AND replied_to_user_is_bot = 0""",
-                (guild_id, user_id, accepted_at_ts)
-            )
-            
-            total_replies = len(reply_rows)
-            
-            if total_replies < min_count:
-                missing_requirements.append(f"Reply to {min_count} user message(s) (have {total_replies})")
-            else:
-                completion_proof_parts.append(f"💬 Replies: {total_replies}/{min_count}")
-        
-        elif steps["type"] == "vc_minutes":
-            min_minutes = steps.get("min_minutes", 30)
-            
-            # Get baseline from progress_json
-            import json
-            progress_data = {}
-            if active_run.get("progress_json"):
-                try:
-                    progress_data = json.loads(active_run["progress_json"])
-                except:
-                    pass
-            
-            vc_baseline = progress_data.get("vc_minutes_baseline", 0)
-            
-            # Get current VC minutes from activity_daily delta since accepted_at
-            accepted_date = accepted_at.date().isoformat()
-            activity_rows = await fetchall(
-                """SELECT SUM(vc_minutes) as total FROM activity_daily 
-                   WHERE guild_id = ? AND user_id = ? AND day >= ?""",
-                (guild_id, user_id, accepted_date)
-            )
-            
-            current_vc = activity_rows[0]["total"] if activity_rows and activity_rows[0]["total"] else 0
-            delta_vc = current_vc - vc_baseline
-            
-            if delta_vc < min_minutes:
-                missing_requirements.append(f"Spend {min_minutes} minutes in VC (have {delta_vc})")
-            else:
-                completion_proof_parts.append(f"🎧 VC: {delta_vc}/{min_minutes} min")
-        
-        elif steps["type"] == "two_step":
-            cmd = steps.get("command_after", "/daily")
-            cmd_name = cmd.replace("/", "")
-            
-            # Verify: message first, then command
-            message_rows = await fetchall(
-                """SELECT MIN(ts) as first_msg_ts FROM message_events 
-                   WHERE guild_id = ? AND user_id = ? AND ts >= ?""",
-                (guild_id, user_id, accepted_at_ts)
-            )
-            
-            if not message_rows or not message_rows[0]["first_msg_ts"]:
-                missing_requirements.append("Send a message first")
-            else:
-                first_msg_ts = message_rows[0]["first_msg_ts"]
-                
-                # Check if command was used after first message
-                cmd_rows = await fetchall(
-                    """SELECT ts FROM command_events 
-                       WHERE guild_id = ? AND user_id = ? AND command_name = ? 
-                       AND ts >= ? AND ts > ?""",
-                    (guild_id, user_id, cmd_name, accepted_at_ts, first_msg_ts)
-                )
-                
-                if len(cmd_rows) == 0:
-                    missing_requirements.append(f"Use {cmd} command after sending a message")
-                else:
-                    completion_proof_parts.append(f"✅ Two-step: message + {cmd}")
-        
-        elif steps["type"] == "forum_reaction_any_post":
-            category = steps.get("channel_category", "forum")
-            
-            # Query reaction_events for forum reactions after accepted_at
-            # Note: Channel matching would require channel_id from config, simplified here
-            reaction_rows = await fetchall(
-                """SELECT ts FROM reaction_events 
-                   WHERE guild_id = ? AND user_id = ? AND ts >= ?
-                   AND is_forum = 1""",
-                (guild_id, user_id, accepted_at_ts)
-            )
-            
-            if len(reaction_rows) == 0:
-                missing_requirements.append(f"React to a post in the {category} forum")
-            else:
-                completion_proof_parts.append(f"❤️ Reaction: detected in {category}")
-        
-        elif steps["type"] == "ledger_event":
-            min_amount = steps.get("min_amount", 100)
-            
-            # Query ledger for burns after accepted_at
-            ledger_rows = await fetchall(
-                """SELECT amount FROM economy_ledger 
-                   WHERE guild_id = ? AND user_id = ? AND ts >= ? 
-                   AND type = 'burn' AND amount < 0
-                   ORDER BY ts""",
-                (guild_id, user_id, accepted_at.isoformat())
-            )
-            
-            total_burned = abs(sum(row["amount"] for row in ledger_rows))
-            
-            if total_burned < min_amount:
-                missing_requirements.append(f"Burn {min_amount} coins (have burned {total_burned})")
-            else:
-                completion_proof_parts.append(f"💰 Coins burned: {total_burned}/{min_amount}")
-        
-        elif steps["type"] == "reaction_on_channel_recent":
-            hours = steps.get("hours_recent", 24)
-            channel_id = steps.get("channel_id")
-            emoji_str = steps.get("emoji")
-            
-            # Calculate recent threshold
-            recent_threshold_ts = int((datetime.datetime.now(datetime.UTC) - datetime.timedelta(hours=hours)).timestamp())
-            query_ts = max(accepted_at_ts, recent_threshold_ts)
-            
-            # Query reaction_events with channel and emoji matching
-            if channel_id and emoji_str:
-                reaction_rows = await fetchall(
-                    """SELECT ts FROM reaction_events 
-                       WHERE guild_id = ? AND user_id = ? AND ts >= ?
-                       AND channel_id = ? AND emoji = ?""",
-                    (guild_id, user_id, query_ts, channel_id, emoji_str)
-                )
-            else:
-                # Fallback: any recent reaction
-                reaction_rows = await fetchall(
-                    """SELECT ts FROM reaction_events 
-                       WHERE guild_id = ? AND user_id = ? AND ts >= ?""",
-                    (guild_id, user_id, query_ts)
-                )
-            
-            if len(reaction_rows) == 0:
-                missing_requirements.append(f"React to a message within the last {hours} hours")
-            else:
-                completion_proof_parts.append(f"❤️ Reaction: detected (last {hours}h)")
+                missing_requirements.append(progress["missing"])
         
         # Check if verification failed
         if missing_requirements:
@@ -2362,15 +1892,8 @@ def register_commands(bot_instance):
         guild_id = interaction.guild.id if interaction.guild else 0
         user_id = interaction.user.id
         
-        # Get all active orders
-        from core.db import fetchall, fetchone
-        active_runs = await fetchall(
-            """SELECT run_id, order_id, accepted_at, due_at, progress_json 
-               FROM order_runs 
-               WHERE guild_id = ? AND user_id = ? AND status = 'accepted'
-               ORDER BY accepted_at DESC""",
-            (guild_id, user_id)
-        )
+        # Get all active orders (with order names) and their progress in one pass
+        active_runs = await get_open_runs(guild_id, user_id)
         
         if not active_runs:
             embed = discord.Embed(
@@ -2383,36 +1906,24 @@ def register_commands(bot_instance):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
+        progress_by_run = await get_runs_progress(guild_id, user_id, active_runs)
+        
         embed = discord.Embed()
         embed.set_author(
             name="Order Progress Status",
             icon_url="https://i.imgur.com/irmCXhw.gif"
         )
         
-        accepted_at_ts_base = int(datetime.datetime.now(datetime.UTC).timestamp())
+        now = datetime.datetime.now(datetime.UTC)
         
         for run in active_runs:
-            # Get order info
-            order_row = await fetchone(
-                "SELECT name FROM orders WHERE order_id = ?",
-                (run["order_id"],)
-            )
-            
-            if not order_row:
-                continue
-            
-            order_name = order_row["name"]
-            order_key = _normalize_order_name(order_name)
-            
-            if order_key not in ORDERS_CATALOG:
+            order_key = resolve_run_order_key(run)
+            if not order_key:
                 continue
             
             order = ORDERS_CATALOG[order_key]
-            steps = order["steps_json"]
-            accepted_at = datetime.datetime.fromisoformat(run["accepted_at"].replace('Z', '+00:00'))
+            order_name = order["title"]
             due_at = datetime.datetime.fromisoformat(run["due_at"].replace('Z', '+00:00'))
-            now = datetime.datetime.now(datetime.UTC)
-            accepted_at_ts = int(accepted_at.timestamp())
             
             # Calculate time left
             time_left_seconds = int((due_at - now).total_seconds())
@@ -2426,85 +1937,10 @@ def register_commands(bot_instance):
                 else:
                     time_left = f"⏳ {minutes}min"
             
-            # Calculate progress based on step type
             progress_lines = []
-            
-            if steps["type"] == "message_count":
-                min_count = steps.get("min_count", 1)
-                spacing = steps.get("spacing_seconds", 0)
-                message_rows = await fetchall(
-                    """SELECT ts FROM message_events 
-                       WHERE guild_id = ? AND user_id = ? AND ts >= ?
-                       ORDER BY ts""",
-                    (guild_id, user_id, accepted_at_ts)
-                )
-                
-                if spacing > 0:
-                    valid_messages = []
-                    for row in message_rows:
-                        ts = row["ts"]
-                        if not valid_messages or (ts - valid_messages[-1]) >= spacing:
-                            valid_messages.append(ts)
-                    total = len(valid_messages)
-                else:
-                    total = len(message_rows)
-                
-                progress_lines.append(f"Messages Sent: {total}/{min_count}")
-            
-            elif steps["type"] == "vc_minutes":
-                min_minutes = steps.get("min_minutes", 30)
-                progress_data = {}
-                if run.get("progress_json"):
-                    import json
-                    try:
-                        progress_data = json.loads(run["progress_json"])
-                    except:
-                        pass
-                
-                vc_baseline = progress_data.get("vc_minutes_baseline", 0)
-                accepted_date = accepted_at.date().isoformat()
-                activity_rows = await fetchall(
-                    """SELECT SUM(vc_minutes) as total FROM activity_daily 
-                       WHERE guild_id = ? AND user_id = ? AND day >= ?""",
-                    (guild_id, user_id, accepted_date)
-                )
-                
-                current_vc = activity_rows[0]["total"] if activity_rows and activity_rows[0]["total"] else 0
-                delta_vc = current_vc - vc_baseline
-                
-                progress_lines.append(f"Voice Chat Time: {delta_vc}/{min_minutes} minutes")
-            
-            elif steps["type"] == "reply_count":
-                min_count = steps.get("min_count", 1)
-                reply_rows = await fetchall(
-                    """SELECT ts FROM message_events 
-                       WHERE guild_id = ? AND user_id = ? AND ts >= ?
-                       AND is_reply = 1 AND replied_to_user_is_bot = 0""",
-                    (guild_id, user_id, accepted_at_ts)
-                )
-                total = len(reply_rows)
-                progress_lines.append(f"Replies: {total}/{min_count}")
-            
-            elif steps["type"] == "command_used":
-                cmd = steps.get("command", "/profile")
-                cmd_name = cmd.replace("/", "")
-                cmd_rows = await fetchall(
-                    """SELECT ts FROM command_events 
-                       WHERE guild_id = ? AND user_id = ? AND command_name = ? AND ts >= ?""",
-                    (guild_id, user_id, cmd_name, accepted_at_ts)
-                )
-                total = len(cmd_rows)
-                progress_lines.append(f"Commands Used: {total}/1")
-            
-            elif steps["type"] == "reaction_on_channel_recent":
-                hours = steps.get("hours_recent", 24)
-                reaction_rows = await fetchall(
-                    """SELECT ts FROM reaction_events 
-                       WHERE guild_id = ? AND user_id = ? AND ts >= ?""",
-                    (guild_id, user_id, accepted_at_ts)
-                )
-                total = len(reaction_rows)
-                progress_lines.append(f"Reactions: {total}/1")
+            progress = progress_by_run.get(run["run_id"])
+            if progress:
+                progress_lines.append(progress["status"])
             
             # Add spacer between orders
             embed.add_field(name="", value="", inline=False)
@@ -0,0 +1,138 @@
+﻿"""
+Checkpointed batch runner for per-user jobs - processes a user list in chunks with bounded concurrency, yielding to
+the event loop between users, and keeps a (job, period, guild, user) marker plus a progress row per run in SQLite,
+so a rerun of the same period skips users already handled (optionally retrying the ones that failed) and admins can
+watch progress (/jobs)
+"""
+import asyncio
+import time
+
+from core.db import fetchall, transaction, _now_iso
+
+DEFAULT_CHUNK_SIZE = 100  # Users per checkpoint (one claim + one completion commit each)
+DEFAULT_CONCURRENCY = 4  # Users in flight at once within a chunk
+HISTORY_PER_JOB = 60  # batch_job_runs rows (periods) kept per job and guild
+
+async def _process_chunk(chunk: list, func, concurrency: int) -> list:
+    """[(user_id, error or None)] for one chunk"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(user_id):
+        async with semaphore:
+            try:
+                await func(user_id)
+                return user_id, None
+            except Exception as e:
+                return user_id, f"{type(e).__name__}: {e}"
+            finally:
+                await asyncio.sleep(0)  # Let gateway events and commands in between users
+
+    return await asyncio.gather(*(one(user_id) for user_id in chunk))
+
+async def run_batch(job: str, period: str, guild_id: int, user_ids, func,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, concurrency: int = DEFAULT_CONCURRENCY,
+                    retry_failed: bool = False) -> dict:
+    """
+    Run await func(user_id) once per user for this (job, period, guild). Users are claimed per chunk before they run
+    and marked done/failed after. A rerun skips users marked done and users left "claimed" by a crash (marked
+    interrupted): at most once, for effects like taxes and interest that must not apply twice. Users marked failed
+    are skipped too unless retry_failed is set, which is only safe when func applies all of a user's effects in one
+    transaction (a raise leaves nothing behind to apply again).
+    Callers must not run the same (job, period, guild) concurrently (core.scheduler's lease covers scheduled jobs).
+    Returns {"total", "done", "failed", "skipped", "resumed"} for this call.
+    """
+    users = list(dict.fromkeys(user_ids))
+    rows = await fetchall(
+        "SELECT user_id, status FROM batch_job_items WHERE job = ? AND period = ? AND guild_id = ?",
+        (job, period, guild_id)
+    )
+    marked = {row["user_id"]: row["status"] for row in rows}
+    interrupted = sum(1 for status in marked.values() if status == "claimed")
+    retry = ("failed",) if retry_failed else ()
+    pending = [user_id for user_id in users if user_id not in marked or marked[user_id] in retry]
+    retried = len(pending) - sum(1 for user_id in users if user_id not in marked)
+    now = _now_iso()
+    async with transaction() as conn:
+        if interrupted:
+            await conn.execute(
+                """UPDATE batch_job_items SET status = 'interrupted', updated_at = ?
+                   WHERE job = ? AND period = ? AND guild_id = ? AND status = 'claimed'""",
+                (now, job, period, guild_id)
+            )
+        await conn.execute(
+            """INSERT INTO batch_job_runs (job, period, guild_id, total, skipped, status, started_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, 'running', ?, ?)
+               ON CONFLICT(job, period, guild_id) DO UPDATE SET total = MAX(total, excluded.total),
+                   skipped = skipped + excluded.skipped, failed = MAX(failed - ?, 0), status = 'running',
+                   updated_at = excluded.updated_at, finished_at = NULL""",
+            (job, period, guild_id, len(users), interrupted, now, now, retried)
+        )
+    if marked:
+        print(f"[*] Batch {job} {period} (guild {guild_id}): resuming, {len(users) - len(pending)} user(s) already "
+              f"handled, {interrupted} interrupted mid-chunk skipped, {retried} failed retried, {len(pending)} left")
+
+    done = failed = 0
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        started = time.perf_counter()
+        async with transaction() as conn:
+            await conn.executemany(
+                """INSERT INTO batch_job_items (job, period, guild_id, user_id, status, updated_at)
+                   VALUES (?, ?, ?, ?, 'claimed', ?)
+                   ON CONFLICT(job, period, guild_id, user_id) DO UPDATE SET status = 'claimed', error = NULL,
+                       updated_at = excluded.updated_at
+                   WHERE status = 'failed'""",
+                [(job, period, guild_id, user_id, _now_iso()) for user_id in chunk]
+            )
+
+        results = await _process_chunk(chunk, func, concurrency)
+        chunk_failed = 0
+        for user_id, error in results:
+            if error:
+                chunk_failed += 1
+                print(f"Error processing user {user_id} in {job}: {error}")
+
+        async with transaction() as conn:
+            await conn.executemany(
+                """UPDATE batch_job_items SET status = ?, error = ?, updated_at = ?
+                   WHERE job = ? AND period = ? AND guild_id = ? AND user_id = ?""",
+                [("failed" if error else "done", error, _now_iso(), job, period, guild_id, user_id)
+                 for user_id, error in results]
+            )
+            await conn.execute(
+                """UPDATE batch_job_runs SET done = done + ?, failed = failed + ?, chunks = chunks + 1,
+                       seconds = seconds + ?, updated_at = ?
+                   WHERE job = ? AND period = ? AND guild_id = ?""",
+                (len(chunk) - chunk_failed, chunk_failed, time.perf_counter() - started, _now_iso(), job, period, guild_id)
+            )
+        done += len(chunk) - chunk_failed
+        failed += chunk_failed
+
+    async with transaction() as conn:
+        await conn.execute(
+            """UPDATE batch_job_runs SET status = 'done', finished_at = ?, updated_at = ?
+               WHERE job = ? AND period = ? AND guild_id = ?""",
+            (_now_iso(), _now_iso(), job, period, guild_id)
+        )
+        # Markers only matter for reruns of the current period; progress rows are kept for recent periods
+        await conn.execute(
+            "DELETE FROM batch_job_items WHERE job = ? AND guild_id = ? AND period <> ?",
+            (job, guild_id, period)
+        )
+        await conn.execute(
+            """DELETE FROM batch_job_runs WHERE job = ? AND guild_id = ? AND period NOT IN (
+                   SELECT period FROM batch_job_runs WHERE job = ? AND guild_id = ?
+                   ORDER BY started_at DESC, rowid DESC LIMIT ?)""",
+            (job, guild_id, job, guild_id, HISTORY_PER_JOB)
+        )
+    return {"total": len(users), "done": done, "failed": failed, "skipped": interrupted, "resumed": bool(marked)}
+
+async def get_batch_progress(limit: int = 10) -> list:
+    """Most recently updated batch runs: [{"job", "period", "guild_id", "total", "done", "failed", "skipped", ...}]"""
+    rows = await fetchall(
+        """SELECT job, period, guild_id, total, done, failed, skipped, chunks, seconds, status, started_at,
+                  updated_at, finished_at
+           FROM batch_job_runs ORDER BY updated_at DESC LIMIT ?""",
+        (limit,)
+    )
+    return [dict(row) for row in rows]
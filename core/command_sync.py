@@ -0,0 +1,78 @@
+﻿"""
+Incremental slash command sync - hashes the serialized command tree per scope (global, each allowed guild)
+and only calls tree.sync() for scopes whose hash differs from the last successful sync stored in SQLite
+"""
+import asyncio
+import hashlib
+import json
+
+import discord
+
+from core.db import fetchall, execute, _now_iso
+
+_sync_task = None
+
+def _scope_key(guild_id: int = None) -> str:
+    return f"guild:{guild_id}" if guild_id else "global"
+
+def tree_hash(tree: discord.app_commands.CommandTree, guild_id: int = None) -> tuple:
+    """(sha256 of the commands a sync of this scope would upload, command count)"""
+    guild = discord.Object(id=guild_id) if guild_id else None
+    payload = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+    payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    material = json.dumps(
+        {"application_id": tree.client.application_id, "commands": payload},
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest(), len(payload)
+
+async def sync_commands(bot, guild_ids=(), force: bool = False) -> dict:
+    """
+    Sync the global scope and each guild in guild_ids, skipping scopes whose tree hash is unchanged unless force.
+    Returns {scope: synced command count, "unchanged" or "ERROR: ..."}; hashes are stored only after a sync succeeds.
+    """
+    rows = await fetchall("SELECT scope, tree_hash FROM command_sync_state")
+    stored = {row["scope"]: row["tree_hash"] for row in rows}
+    results = {}
+    for guild_id in (None, *guild_ids):
+        scope = _scope_key(guild_id)
+        digest, count = tree_hash(bot.tree, guild_id)
+        if not force and stored.get(scope) == digest:
+            results[scope] = "unchanged"
+            continue
+        try:
+            synced = await bot.tree.sync(guild=discord.Object(id=guild_id) if guild_id else None)
+        except Exception as e:
+            results[scope] = f"ERROR: {e}"
+            continue
+        results[scope] = len(synced)
+        await execute(
+            """INSERT INTO command_sync_state (scope, tree_hash, commands, synced_at) VALUES (?, ?, ?, ?)
+               ON CONFLICT(scope) DO UPDATE SET tree_hash = excluded.tree_hash, commands = excluded.commands,
+               synced_at = excluded.synced_at""",
+            (scope, digest, count, _now_iso())
+        )
+    return results
+
+def start_sync(bot, guild_ids=()):
+    """Run sync_commands as a background task so on_ready isn't held up by rate-limited REST calls"""
+    global _sync_task
+    if _sync_task and not _sync_task.done():
+        return _sync_task
+
+    async def run():
+        try:
+            results = await sync_commands(bot, guild_ids)
+        except Exception as e:
+            print(f"[-] Command sync failed: {e}")
+            return
+        for scope, result in results.items():
+            if isinstance(result, int):
+                print(f"[+] Command sync ({scope}): {result} command(s)")
+            elif result == "unchanged":
+                print(f"[*] Command sync ({scope}): tree unchanged, skipped")
+            else:
+                print(f"[-] Command sync ({scope}) failed: {result}")
+
+    _sync_task = asyncio.create_task(run())
+    return _sync_task
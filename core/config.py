@@ -279,6 +279,8 @@ GAMBLING_COOLDOWNS = {
     "roulette": 20,
     "blackjack": 30,
 }
+CASINO_STREAK_TTL = 30 * 86400  # Win/loss streaks expire after 30 idle days
+SLOTS_FREE_SPINS_TTL = 30 * 86400  # Unused free spins expire after 30 days
 
 # Rank-based max bet caps (based on lifetime coins earned)
 RANK_MAX_BET = {
@@ -308,3 +310,37 @@ LCE_RANK_THRESHOLDS = {
     175000: "Prized",
 }
 
+# Held rank -> Discord role (from rank_cache, synced by the daily job)
+# Ranks set to None get no role; fill in role IDs to enable rank roles
+RANK_ROLE_MAP = {
+    "Stray": None,
+    "Leashed": None,
+    "Trained": None,
+    "Trusted": None,
+    "Devoted": None,
+    "Disciplined": None,
+    "Conditioned": None,
+    "Bound": None,
+    "Favored": None,
+}
+
+
+# -----------------------------
+# Orders configuration
+# -----------------------------
+# Settle orders automatically the moment live progress meets their requirements
+ORDERS_AUTO_COMPLETE = os.getenv("ORDERS_AUTO_COMPLETE", "0").lower() in ("1", "true", "yes")
+
+# -----------------------------
+# Metrics endpoint
+# -----------------------------
+# OpenMetrics on http://127.0.0.1:<port>/metrics; unset or 0 keeps it off
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0") or 0)
+
+# -----------------------------
+# Event loop watchdog
+# -----------------------------
+# Seconds the loop may go without running the watchdog ticker before the stall is recorded with a stack
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", "0.5"))
+# > 0 enables asyncio debug mode and records callbacks slower than this many seconds (adds overhead)
+SLOW_CALLBACK_DURATION = float(os.getenv("SLOW_CALLBACK_DURATION", "0"))
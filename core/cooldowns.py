@@ -0,0 +1,220 @@
+﻿"""
+Cooldown store - TTL entries on an expiry heap, flushed to SQLite and restored at startup
+"""
+import asyncio
+import datetime
+import heapq
+import itertools
+import json
+import sys
+import time
+
+from core.db import fetchall, fetchone, transaction
+
+FLUSH_INTERVAL_SECONDS = 30  # Background flush cadence (urgent sets flush immediately)
+
+_entries = {}  # {(namespace, key): (expires_at, value)}
+_expiry_heap = []  # [(expires_at, seq, namespace, key)], stale items skipped on pop
+_seq = itertools.count()
+_dirty = set()  # (namespace, key) changed since the last flush
+_deleted = set()  # (namespace, key) cleared since the last flush
+_flush_lock = asyncio.Lock()
+_flush_task = None
+_restored = False
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "sets": 0,
+    "expired": 0,
+    "flushes": 0,
+    "flushed_rows": 0,
+    "restored": 0,
+}
+
+def _evict(now: float):
+    """Drop entries whose expiry has passed (heap top first, so each check stays O(1) amortized)"""
+    while _expiry_heap and _expiry_heap[0][0] <= now:
+        expires_at, _, namespace, key = heapq.heappop(_expiry_heap)
+        entry = _entries.get((namespace, key))
+        if entry is not None and entry[0] == expires_at:
+            del _entries[(namespace, key)]
+            _dirty.discard((namespace, key))
+            _stats["expired"] += 1
+
+    # Overwritten keys leave stale heap items behind; rebuild once they dominate
+    if len(_expiry_heap) > 2 * len(_entries) + 64:
+        _expiry_heap[:] = [(exp, next(_seq), ns, k) for (ns, k), (exp, _) in _entries.items()]
+        heapq.heapify(_expiry_heap)
+
+def _lookup(namespace: str, key):
+    """Live entry or None, counting hits/misses"""
+    now = time.time()
+    _evict(now)
+    entry = _entries.get((namespace, key))
+    if entry is None or entry[0] <= now:
+        _stats["misses"] += 1
+        return None
+    _stats["hits"] += 1
+    return entry
+
+def get(namespace: str, key, default=None):
+    """Value stored under key, or default when absent/expired"""
+    entry = _lookup(namespace, key)
+    return entry[1] if entry else default
+
+def remaining(namespace: str, key) -> float:
+    """Seconds until key expires (0 when not on cooldown)"""
+    entry = _lookup(namespace, key)
+    return max(0.0, entry[0] - time.time()) if entry else 0.0
+
+def put(namespace: str, key, ttl: float = None, value=None, expires_at: float = None, urgent: bool = False):
+    """
+    Store key for ttl seconds (or until the expires_at Unix timestamp) with an optional JSON-able value.
+    urgent=True flushes to SQLite right away instead of waiting for the next background flush.
+    """
+    if expires_at is None:
+        expires_at = time.time() + ttl
+    _entries[(namespace, key)] = (expires_at, value)
+    heapq.heappush(_expiry_heap, (expires_at, next(_seq), namespace, key))
+    _dirty.add((namespace, key))
+    _deleted.discard((namespace, key))
+    _stats["sets"] += 1
+    if urgent:
+        _schedule_flush()
+
+def clear(namespace: str, key):
+    """Remove key (its heap item goes stale and is skipped)"""
+    if _entries.pop((namespace, key), None) is not None:
+        _dirty.discard((namespace, key))
+        _deleted.add((namespace, key))
+
+# -----------------------------
+# Persistence
+# -----------------------------
+def _encode_key(key) -> str:
+    return json.dumps(list(key) if isinstance(key, tuple) else key)
+
+def _decode_key(key_json: str):
+    key = json.loads(key_json)
+    return tuple(key) if isinstance(key, list) else key
+
+def _schedule_flush():
+    global _flush_task
+    if _flush_task and not _flush_task.done():
+        return
+    try:
+        _flush_task = asyncio.get_running_loop().create_task(flush())
+    except RuntimeError:
+        pass  # No running loop; the next background flush picks it up
+
+async def flush():
+    """Write changed entries to SQLite, delete cleared ones and purge expired rows"""
+    async with _flush_lock:
+        if not _dirty and not _deleted:
+            return
+        dirty = list(_dirty)
+        deleted = list(_deleted)
+        _dirty.clear()
+        _deleted.clear()
+
+        rows = []
+        for namespace, key in dirty:
+            entry = _entries.get((namespace, key))
+            if entry is not None:
+                rows.append((namespace, _encode_key(key), entry[0], json.dumps(entry[1])))
+        try:
+            async with transaction() as conn:
+                if rows:
+                    await conn.executemany(
+                        """INSERT INTO cooldowns (namespace, key, expires_at, value_json) VALUES (?, ?, ?, ?)
+                           ON CONFLICT(namespace, key) DO UPDATE SET
+                               expires_at = excluded.expires_at, value_json = excluded.value_json""",
+                        rows
+                    )
+                if deleted:
+                    await conn.executemany(
+                        "DELETE FROM cooldowns WHERE namespace = ? AND key = ?",
+                        [(namespace, _encode_key(key)) for namespace, key in deleted]
+                    )
+                await conn.execute("DELETE FROM cooldowns WHERE expires_at <= ?", (time.time(),))
+        except Exception as e:
+            # Keep the changes queued for the next flush
+            _dirty.update(k for k in dirty if k in _entries)
+            _deleted.update(k for k in deleted if k not in _entries)
+            print(f"[-] Failed to flush cooldowns: {e}")
+            return
+        _stats["flushes"] += 1
+        _stats["flushed_rows"] += len(rows) + len(deleted)
+
+_LEGACY_INTRO_REPLY_SECONDS = 6 * 3600  # Intro reply cooldown (systems.handlers)
+
+async def _migrate_introduction_replies() -> int:
+    """One-off: move the pre-store introduction_replies rows into the intro_reply namespace, then drop the table"""
+    exists = await fetchone("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'introduction_replies'")
+    if not exists:
+        return 0
+    now = time.time()
+    rows = []
+    for row in await fetchall("SELECT guild_id, user_id, last_replied_at FROM introduction_replies"):
+        replied = datetime.datetime.fromisoformat(row["last_replied_at"].replace('Z', '+00:00')).timestamp()
+        if replied + _LEGACY_INTRO_REPLY_SECONDS > now:
+            key = _encode_key((row["guild_id"], row["user_id"]))
+            rows.append(("intro_reply", key, replied + _LEGACY_INTRO_REPLY_SECONDS, json.dumps(None)))
+    async with transaction() as conn:
+        if rows:
+            await conn.executemany(
+                """INSERT INTO cooldowns (namespace, key, expires_at, value_json) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(namespace, key) DO NOTHING""",
+                rows
+            )
+        await conn.execute("DROP TABLE introduction_replies")
+    print(f"[+] Migrated {len(rows)} active intro reply cooldown(s) from introduction_replies")
+    return len(rows)
+
+async def restore():
+    """Load unexpired cooldowns from SQLite (once per process; entries set since startup win)"""
+    global _restored
+    if _restored:
+        return
+    try:
+        await _migrate_introduction_replies()
+        rows = await fetchall(
+            "SELECT namespace, key, expires_at, value_json FROM cooldowns WHERE expires_at > ?",
+            (time.time(),)
+        )
+    except Exception as e:
+        print(f"[-] Failed to restore cooldowns: {e}")
+        return
+
+    restored = 0
+    for row in rows:
+        entry_key = (row["namespace"], _decode_key(row["key"]))
+        if entry_key in _entries:
+            continue
+        value = json.loads(row["value_json"]) if row["value_json"] else None
+        _entries[entry_key] = (row["expires_at"], value)
+        heapq.heappush(_expiry_heap, (row["expires_at"], next(_seq), entry_key[0], entry_key[1]))
+        restored += 1
+    _restored = True
+    _stats["restored"] = restored
+    print(f"[+] Restored {restored} cooldown(s)")
+
+def get_cooldown_stats() -> dict:
+    """Hit/miss counters, entry counts per namespace and approximate memory use"""
+    namespaces = {}
+    memory = sys.getsizeof(_entries) + sys.getsizeof(_expiry_heap)
+    for (namespace, key), entry in _entries.items():
+        namespaces[namespace] = namespaces.get(namespace, 0) + 1
+        memory += sys.getsizeof(key) + sys.getsizeof(entry) + sys.getsizeof(entry[1])
+    memory += sum(sys.getsizeof(item) for item in _expiry_heap)
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": _stats["hits"] / lookups if lookups else 0.0,
+        "entries": len(_entries),
+        "heap_size": len(_expiry_heap),
+        "pending_writes": len(_dirty) + len(_deleted),
+        "namespaces": namespaces,
+        "memory_bytes": memory,
+    }
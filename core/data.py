@@ -5,30 +5,28 @@ import random
 import datetime
 import json
 from core.db import (
-    init_db, close_db, upsert_user_profile, upsert_economy_balance,
+    init_db, close_db, is_open, upsert_user_profile, upsert_economy_balance,
     bump_message, add_vc_minutes, bump_event, get_activity_7d,
     get_inventory_items, get_equipped_items,
     fetchone, execute, _now_iso
 )
+from core import cooldowns
+from core.locks import economy_lock, economy_lock_pair
 
 # Legacy xp_data dict for backward compatibility during transition
 xp_data = {}
 
-# Track if DB is initialized
-_db_initialized = False
-
 async def initialize_database():
-    """Initialize database (V3: JSON import removed)"""
-    global _db_initialized
-    if _db_initialized:
+    """Initialize database (V3: JSON import removed); no-op while the connection is open"""
+    if is_open():
         return
     
     await init_db()
     # V3: import_json_to_db removed (XP/Level system deprecated)
-    _db_initialized = True
 
 async def shutdown_database():
-    """Close database connection"""
+    """Flush pending cooldowns and close database connection"""
+    await cooldowns.flush()
     await close_db()
 
 def load_xp_data():
@@ -85,20 +83,25 @@ async def add_coins(user_id, amount, guild_id=None, guild=None, reason: str = "u
     gid = _get_guild_id(guild_id, guild)
     user_id = int(user_id)
     
-    # Update economy balance
-    await upsert_economy_balance(gid, user_id, amount)
-    
-    # Log to ledger
-    now = _now_iso()
-    meta_json = json.dumps(meta) if meta else None
-    await execute(
-        "INSERT INTO economy_ledger (guild_id, user_id, ts, type, amount, meta_json) VALUES (?, ?, ?, ?, ?, ?)",
-        (gid, user_id, now, reason, amount, meta_json)
-    )
-    
-    # Also update user_profile.coins for backward compatibility
-    current = await get_coins(user_id, gid)
-    await upsert_user_profile(gid, user_id, coins=current)
+    async with economy_lock(gid, user_id, command=reason):
+        # Update economy balance
+        await upsert_economy_balance(gid, user_id, amount)
+        
+        # Log to ledger
+        now = _now_iso()
+        meta_json = json.dumps(meta) if meta else None
+        await execute(
+            "INSERT INTO economy_ledger (guild_id, user_id, ts, type, amount, meta_json) VALUES (?, ?, ?, ?, ?, ?)",
+            (gid, user_id, now, reason, amount, meta_json)
+        )
+        
+        # Advance live order progress (ledger_event orders)
+        from systems.orders import ingest_ledger
+        await ingest_ledger(gid, user_id, reason, amount)
+        
+        # Also update user_profile.coins for backward compatibility
+        current = await get_coins(user_id, gid)
+        await upsert_user_profile(gid, user_id, coins=current)
 
 async def has_coins(user_id, amount, guild_id=None, guild=None):
     """Check if user has enough coins"""
@@ -149,10 +152,19 @@ async def increment_gambling_win(user_id, guild_id=None, guild=None):
 
 # ===== GAMBLING POLICY HELPERS (V3-STYLE) =====
 
-async def get_user_economy(guild_id, user_id):
-    """Get user economy stats (bal, lce, debt)"""
+def rank_for_lce(lce: int) -> tuple:
+    """Gambling rank and bet cap for a lifetime-earned total. Returns (rank, rank_cap)"""
     from core.config import LCE_RANK_THRESHOLDS, RANK_MAX_BET
     
+    rank = "Stray"
+    for threshold, rank_name in sorted(LCE_RANK_THRESHOLDS.items(), reverse=True):
+        if lce >= threshold:
+            rank = rank_name
+            break
+    return rank, RANK_MAX_BET.get(rank, 500)
+
+async def get_user_economy(guild_id, user_id):
+    """Get user economy stats (bal, lce, debt)"""
     gid = int(guild_id) if guild_id else 0
     uid = int(user_id)
     
@@ -171,15 +183,8 @@ async def get_user_economy(guild_id, user_id):
     )
     debt = debt_row["debt"] if debt_row else 0
     
-    # Compute rank from LCE
-    rank = "Stray"
-    for threshold, rank_name in sorted(LCE_RANK_THRESHOLDS.items(), reverse=True):
-        if lce >= threshold:
-            rank = rank_name
-            break
-    
-    # Get rank bet cap
-    rank_cap = RANK_MAX_BET.get(rank, 500)
+    # Compute rank and bet cap from LCE
+    rank, rank_cap = rank_for_lce(lce)
     
     return {
         "bal": bal,
@@ -193,7 +198,8 @@ async def take_bet(guild_id, user_id, bet):
     """Deduct bet from balance"""
     gid = int(guild_id) if guild_id else 0
     uid = int(user_id)
-    await upsert_economy_balance(gid, uid, -bet)
+    async with economy_lock(gid, uid, command="take_bet"):
+        await upsert_economy_balance(gid, uid, -bet)
 
 async def payout_winnings(guild_id, user_id, amount):
     """Add winnings to balance AND lifetime earned (V3 invariant)"""
@@ -201,7 +207,8 @@ async def payout_winnings(guild_id, user_id, amount):
     uid = int(user_id)
     
     # Increase balance
-    await upsert_economy_balance(gid, uid, amount)
+    async with economy_lock(gid, uid, command="payout_winnings"):
+        await upsert_economy_balance(gid, uid, amount)
     
     # CRITICAL: Also increase lifetime earned for winnings (V3 rule)
     # This is handled by upsert_economy_balance when coins_delta > 0
@@ -314,7 +321,7 @@ async def get_rank(guild_id: int, user_id: int) -> dict:
     if cache_row:
         # Use cached data
         rank_names = [r["name"] for r in RANK_LADDER]
-        held_rank_idx = cache_row.get("held_rank_idx") or 0
+        held_rank_idx = cache_row["held_rank_idx"] or 0
         held_rank = rank_names[held_rank_idx] if held_rank_idx < len(rank_names) else rank_names[0]
         
         # Find next rank
@@ -327,26 +334,27 @@ async def get_rank(guild_id: int, user_id: int) -> dict:
             "final_rank": cache_row["final_rank"],
             "held_rank": held_rank,
             "held_rank_idx": held_rank_idx,
-            "at_risk": cache_row.get("at_risk", 0),
+            "at_risk": cache_row["at_risk"] or 0,
             "rank": held_rank,  # Display held_rank as the user's current rank
             "rank_prefix": held_rank,  # Prefix for formatting
             "next_rank": next_rank,
-            "readiness_pct": cache_row.get("readiness_pct", 0) or 0,
-            "blocker_text": cache_row.get("blocker_text", "🔓 Ready") or "🔓 Ready"
+            "readiness_pct": cache_row["readiness_pct"] or 0,
+            "blocker_text": cache_row["blocker_text"] or "🔓 Ready"
         }
     
     # Cache miss - compute and return (shouldn't happen often, but handle gracefully)
-    from systems.progression import compute_final_rank
+    from systems.progression import compute_final_rank, get_rank_metrics
     lce = await get_lce(guild_id, user_id)
-    rank_info = await compute_final_rank(guild_id, user_id, lce)
+    metrics = await get_rank_metrics(guild_id, user_id)
+    rank_info = await compute_final_rank(guild_id, user_id, lce, metrics)
     
     rank_names = [r["name"] for r in RANK_LADDER]
     current_idx = rank_names.index(rank_info["final_rank"]) if rank_info["final_rank"] in rank_names else 0
     next_idx = min(current_idx + 1, len(rank_names) - 1)
     next_rank = rank_names[next_idx] if next_idx > current_idx else rank_info["final_rank"]
     
-    readiness_pct = await compute_readiness_pct(guild_id, user_id, next_rank)
-    blocker_text = await compute_blocker(guild_id, user_id, next_rank)
+    readiness_pct = await compute_readiness_pct(guild_id, user_id, next_rank, metrics)
+    blocker_text = await compute_blocker(guild_id, user_id, next_rank, metrics)
     
     return {
         "coin_rank": rank_info["coin_rank"],
@@ -452,9 +460,7 @@ async def get_profile_stats(guild_id, user_id):
         "equipped_badge": equipped["equipped_badge"],
     }
 
-# Daily/Give cooldowns (resets at 6pm UK daily) - kept in memory for now
-daily_cooldowns = {}
-give_cooldowns = {}
+# Daily/Give cooldowns (resets at 6pm UK daily) - persisted through the cooldown store
 
 def get_uk_6pm_timestamp():
     """Get next 6pm UK time as Unix timestamp."""
@@ -467,56 +473,23 @@ def get_uk_6pm_timestamp():
 
 def check_daily_cooldown(user_id):
     """Check if user can claim daily. Returns (on_cooldown, reset_timestamp)."""
-    reset_timestamp = get_uk_6pm_timestamp()
-    
-    if user_id not in daily_cooldowns:
-        return False, reset_timestamp
-    
-    last_claim = daily_cooldowns[user_id]
-    now = datetime.datetime.now(datetime.UTC)
-    
-    uk_tz = datetime.timezone(datetime.timedelta(hours=0))
-    uk_now = datetime.datetime.now(uk_tz)
-    
-    last_claim_utc = last_claim.replace(tzinfo=datetime.timezone.utc)
-    uk_last_claim = last_claim_utc.astimezone(uk_tz)
-    
-    def get_reset_day(dt):
-        """Get the reset day for a datetime. Day resets at 6pm."""
-        if dt.hour < 18:
-            return (dt - datetime.timedelta(days=1)).date()
-        else:
-            return dt.date()
-    
-    last_reset_day = get_reset_day(uk_last_claim)
-    current_reset_day = get_reset_day(uk_now)
-    
-    if current_reset_day > last_reset_day:
-        return False, reset_timestamp
-    
-    return True, reset_timestamp
+    return cooldowns.remaining("daily", user_id) > 0, get_uk_6pm_timestamp()
 
 def update_daily_cooldown(user_id):
-    """Update daily cooldown for user."""
-    daily_cooldowns[user_id] = datetime.datetime.now(datetime.UTC)
+    """Update daily cooldown for user (claimable again at the next 6pm reset)."""
+    cooldowns.put("daily", user_id, expires_at=get_uk_6pm_timestamp(), urgent=True)
 
 def check_give_cooldown(user_id):
     """Check if user can use give command. Returns (on_cooldown, reset_timestamp)."""
-    reset_timestamp = get_uk_6pm_timestamp()
-    if user_id not in give_cooldowns:
-        return False, reset_timestamp
-    last_give = give_cooldowns[user_id]
-    now = datetime.datetime.now(datetime.UTC)
-    if now >= last_give + datetime.timedelta(days=1):
-        uk_tz = datetime.timezone(datetime.timedelta(hours=0))
-        uk_now = datetime.datetime.now(uk_tz)
-        if uk_now.hour >= 18:
-            return False, reset_timestamp
-    return True, reset_timestamp
+    return cooldowns.remaining("give", user_id) > 0, get_uk_6pm_timestamp()
 
 def update_give_cooldown(user_id):
-    """Update give cooldown for user."""
-    give_cooldowns[user_id] = datetime.datetime.now(datetime.UTC)
+    """Update give cooldown for user (a full day, then the next 6pm reset)."""
+    uk_tz = datetime.timezone(datetime.timedelta(hours=0))
+    available_at = datetime.datetime.now(uk_tz) + datetime.timedelta(days=1)
+    if available_at.hour < 18:
+        available_at = available_at.replace(hour=18, minute=0, second=0, microsecond=0)
+    cooldowns.put("give", user_id, expires_at=available_at.timestamp(), urgent=True)
 
 # Backward compatibility: synchronous wrappers that use asyncio
 import asyncio
@@ -584,15 +557,29 @@ async def order_accept(guild_id: int, user_id: int, order_id: int, due_seconds:
         "SELECT run_id FROM order_runs WHERE guild_id = ? AND user_id = ? AND order_id = ? AND accepted_at = ? ORDER BY run_id DESC LIMIT 1",
         (guild_id, user_id, order_id, accepted_at)
     )
-    return row["run_id"] if row else 0
+    run_id = row["run_id"] if row else 0
+    
+    # Track live progress and schedule the 2h-left reminder for the new run
+    if run_id and order_key:
+        from systems.orders import track_run, ORDERS_CATALOG
+        track_run(guild_id, user_id, run_id, order_key, json.loads(progress_json) if progress_json else None)
+        if order_key in ORDERS_CATALOG:
+            from systems.tasks import schedule_order_reminder
+            schedule_order_reminder(guild_id, user_id, run_id, due_at, ORDERS_CATALOG[order_key]["title"])
+    
+    return run_id
 
 async def order_complete(guild_id: int, user_id: int, run_id: int, late: bool = False):
-    """Mark an order run as completed and record outcome"""
+    """Mark an order run as completed and record outcome (once per run: manual and auto-complete can race)"""
+    async with economy_lock(guild_id, user_id, command="order_complete"):
+        return await _complete_order_run(guild_id, user_id, run_id, late)
+
+async def _complete_order_run(guild_id: int, user_id: int, run_id: int, late: bool):
     completed_at = _now_iso()
     
-    # Get order info for reward
+    # Get order info for reward (only runs still open)
     run = await fetchone(
-        "SELECT order_id, due_at FROM order_runs WHERE run_id = ? AND guild_id = ? AND user_id = ?",
+        "SELECT order_id, due_at FROM order_runs WHERE run_id = ? AND guild_id = ? AND user_id = ? AND status = 'accepted'",
         (run_id, guild_id, user_id)
     )
     
@@ -609,6 +596,11 @@ async def order_complete(guild_id: int, user_id: int, run_id: int, late: bool =
         (completed_at, 1 if is_late else 0, run_id, guild_id, user_id)
     )
     
+    from systems.orders import untrack_run
+    from systems.tasks import cancel_order_reminder
+    untrack_run(guild_id, user_id, run_id)
+    cancel_order_reminder(run_id)
+    
     # Award coins if order exists
     order = await fetchone(
         "SELECT reward_coins FROM orders WHERE order_id = ?",
@@ -658,6 +650,11 @@ async def order_fail(guild_id: int, user_id: int, run_id: int):
         (run_id, guild_id, user_id)
     )
     
+    from systems.orders import untrack_run
+    from systems.tasks import cancel_order_reminder
+    untrack_run(guild_id, user_id, run_id)
+    cancel_order_reminder(run_id)
+    
     # Record failed outcome in order_outcomes_daily
     from core.db import _today_str
     today = _today_str()
@@ -691,18 +688,19 @@ async def update_debt(guild_id: int, user_id: int, debt_delta: int):
     """Update user's debt"""
     now = _now_iso()
     
-    existing = await fetchone(
-        "SELECT debt FROM discipline_state WHERE guild_id = ? AND user_id = ?",
-        (guild_id, user_id)
-    )
-    
-    new_debt = max(0, (existing["debt"] if existing else 0) + debt_delta)
-    
-    await execute(
-        """INSERT OR REPLACE INTO discipline_state (guild_id, user_id, debt, updated_at)
-           VALUES (?, ?, ?, ?)""",
-        (guild_id, user_id, new_debt, now)
-    )
+    async with economy_lock(guild_id, user_id, command="update_debt"):
+        existing = await fetchone(
+            "SELECT debt FROM discipline_state WHERE guild_id = ? AND user_id = ?",
+            (guild_id, user_id)
+        )
+        
+        new_debt = max(0, (existing["debt"] if existing else 0) + debt_delta)
+        
+        await execute(
+            """INSERT OR REPLACE INTO discipline_state (guild_id, user_id, debt, updated_at)
+               VALUES (?, ?, ?, ?)""",
+            (guild_id, user_id, new_debt, now)
+        )
     return new_debt
 
 # Bank API - Unified economy functions
@@ -763,10 +761,11 @@ async def withdraw(guild_id: int, user_id: int, amount: int, reason: str = "with
 
 async def transfer(guild_id: int, from_user_id: int, to_user_id: int, amount: int, reason: str = "transfer", meta: dict = None):
     """Transfer coins between users"""
-    # Withdraw from sender
-    await withdraw(guild_id, from_user_id, amount, reason=f"{reason}_from", meta=meta)
-    # Deposit to receiver
-    await deposit_earned(guild_id, to_user_id, amount, reason=f"{reason}_to", meta=meta)
+    async with economy_lock_pair(guild_id, from_user_id, to_user_id, command=reason):
+        # Withdraw from sender
+        await withdraw(guild_id, from_user_id, amount, reason=f"{reason}_from", meta=meta)
+        # Deposit to receiver
+        await deposit_earned(guild_id, to_user_id, amount, reason=f"{reason}_to", meta=meta)
 
 async def apply_tax(guild_id: int, user_id: int, tax_amount: int, reason: str = "tax"):
     """Apply tax (subtracts from balance, logs to ledger with tax type)"""
@@ -774,29 +773,31 @@ async def apply_tax(guild_id: int, user_id: int, tax_amount: int, reason: str =
 
 async def pay_debt(guild_id: int, user_id: int, amount: int):
     """Pay off debt (subtracts from balance and debt, logs to ledger)"""
-    # Check if user has enough balance
-    current_balance = await get_coins(user_id, guild_id=guild_id)
-    if current_balance < amount:
-        return False
-    
-    # Withdraw from balance
-    await withdraw(guild_id, user_id, amount, reason="debt_payment", meta={"debt_payment": amount})
-    
-    # Reduce debt
-    await update_debt(guild_id, user_id, -amount)
+    async with economy_lock(guild_id, user_id, command="pay_debt"):
+        # Check if user has enough balance
+        current_balance = await get_coins(user_id, guild_id=guild_id)
+        if current_balance < amount:
+            return False
+        
+        # Withdraw from balance
+        await withdraw(guild_id, user_id, amount, reason="debt_payment", meta={"debt_payment": amount})
+        
+        # Reduce debt
+        await update_debt(guild_id, user_id, -amount)
     
     return True
 
 async def add_debt(guild_id: int, user_id: int, amount: int, reason: str = "debt"):
     """Add to debt (logs to ledger)"""
-    new_debt = await update_debt(guild_id, user_id, amount)
-    
-    # Log to ledger
-    now = _now_iso()
-    await execute(
-        "INSERT INTO economy_ledger (guild_id, user_id, ts, type, amount, meta_json) VALUES (?, ?, ?, ?, ?, ?)",
-        (guild_id, user_id, now, reason, amount, json.dumps({"debt_after": new_debt}))
-    )
+    async with economy_lock(guild_id, user_id, command=reason):
+        new_debt = await update_debt(guild_id, user_id, amount)
+        
+        # Log to ledger
+        now = _now_iso()
+        await execute(
+            "INSERT INTO economy_ledger (guild_id, user_id, ts, type, amount, meta_json) VALUES (?, ?, ?, ?, ?, ?)",
+            (guild_id, user_id, now, reason, amount, json.dumps({"debt_after": new_debt}))
+        )
     
     return new_debt
 
@@ -810,18 +811,19 @@ async def pay_loan(guild_id: int, user_id: int, amount: int):
     """Pay off part of a loan (subtracts from balance and loan, logs to ledger)"""
     from core.db import pay_loan as _pay_loan, get_loan_status
     
-    # Check if user has enough balance
-    current_balance = await get_coins(user_id, guild_id=guild_id)
-    if current_balance < amount:
-        return False
-    
-    # Pay the loan
-    success = await _pay_loan(guild_id, user_id, amount)
-    if not success:
-        return False
-    
-    # Withdraw from balance
-    await withdraw(guild_id, user_id, amount, reason="loan_payment", meta={"loan_payment": amount})
+    async with economy_lock(guild_id, user_id, command="pay_loan"):
+        # Check if user has enough balance
+        current_balance = await get_coins(user_id, guild_id=guild_id)
+        if current_balance < amount:
+            return False
+        
+        # Pay the loan
+        success = await _pay_loan(guild_id, user_id, amount)
+        if not success:
+            return False
+        
+        # Withdraw from balance
+        await withdraw(guild_id, user_id, amount, reason="loan_payment", meta={"loan_payment": amount})
     
     return True
 
@@ -2,18 +2,36 @@
 SQLite database management for IslaBot V2
 """
 import aiosqlite
+import asyncio
+import contextlib
 import datetime
 import json
 import os
+import time
+
+from core.latency import record_db_time
+from core.query_budget import record_query
 
 # Database connection
 _db = None
+# Serializes writes so a transaction on the shared connection is never committed by another coroutine
+_write_lock = asyncio.Lock()
+_db_stats = {
+    "commits": 0,
+    "rollbacks": 0,
+    "write_waiting": 0,  # Coroutines queued behind the write lock right now
+}
 # Use absolute path relative to repo root (fixes Wispbyte deployment issues)
 _REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 _db_path = os.path.join(_REPO_ROOT, "data", "isla_bot.db")
 
 async def init_db():
     """Initialize database and create tables if they don't exist"""
+    await open_db()
+    await migrate_db()
+
+async def open_db():
+    """Open the shared connection"""
     global _db
     
     # Ensure data directory exists
@@ -21,6 +39,14 @@ async def init_db():
     
     _db = await aiosqlite.connect(_db_path)
     _db.row_factory = aiosqlite.Row
+
+def is_open() -> bool:
+    return _db is not None
+
+async def migrate_db():
+    """Create tables and indexes if they don't exist"""
+    if not _db:
+        raise RuntimeError("Database not initialized. Call init_db() first.")
     
     # Create tables
     await _db.execute("""
@@ -290,15 +316,6 @@ async def init_db():
         )
     """)
     
-    await _db.execute("""
-        CREATE TABLE IF NOT EXISTS introduction_replies (
-            guild_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            last_replied_at TEXT NOT NULL,
-            PRIMARY KEY (guild_id, user_id)
-        )
-    """)
-    
     await _db.execute("""
         CREATE TABLE IF NOT EXISTS gift_claims (
             guild_id INTEGER NOT NULL,
@@ -474,6 +491,107 @@ async def init_db():
         )
     """)
     
+    await _db.execute("""
+        CREATE TABLE IF NOT EXISTS role_jobs (
+            job_key TEXT PRIMARY KEY,
+            guild_id INTEGER NOT NULL,
+            reason TEXT,
+            plan_json TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    
+    await _db.execute("""
+        CREATE TABLE IF NOT EXISTS casino_rounds (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            ts TEXT NOT NULL,
+            game TEXT NOT NULL,
+            bet INTEGER NOT NULL,
+            payout INTEGER NOT NULL,
+            outcome TEXT NOT NULL,
+            seed INTEGER
+        )
+    """)
+
+    await _db.execute("""
+        CREATE TABLE IF NOT EXISTS cooldowns (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            value_json TEXT,
+            PRIMARY KEY (namespace, key)
+        )
+    """)
+
+    await _db.execute("""
+        CREATE TABLE IF NOT EXISTS command_sync_state (
+            scope TEXT PRIMARY KEY,
+            tree_hash TEXT NOT NULL,
+            commands INTEGER NOT NULL,
+            synced_at TEXT NOT NULL
+        )
+    """)
+
+    await _db.execute("""
+        CREATE TABLE IF NOT EXISTS scheduled_jobs (
+            name TEXT PRIMARY KEY,
+            schedule TEXT NOT NULL,
+            next_run_at REAL NOT NULL,
+            last_run_at REAL,
+            last_status TEXT,
+            lease_owner TEXT,
+            lease_until REAL
+        )
+    """)
+
+    await _db.execute("""
+        CREATE TABLE IF NOT EXISTS scheduled_job_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            scheduled_for REAL NOT NULL,
+            started_at REAL NOT NULL,
+            finished_at REAL,
+            seconds REAL,
+            status TEXT NOT NULL,
+            error TEXT
+        )
+    """)
+
+    await _db.execute("""
+        CREATE TABLE IF NOT EXISTS batch_job_runs (
+            job TEXT NOT NULL,
+            period TEXT NOT NULL,
+            guild_id INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            done INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            chunks INTEGER NOT NULL DEFAULT 0,
+            seconds REAL NOT NULL DEFAULT 0,
+            status TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            finished_at TEXT,
+            PRIMARY KEY (job, period, guild_id)
+        )
+    """)
+
+    await _db.execute("""
+        CREATE TABLE IF NOT EXISTS batch_job_items (
+            job TEXT NOT NULL,
+            period TEXT NOT NULL,
+            guild_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            error TEXT,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (job, period, guild_id, user_id)
+        )
+    """)
+
     # Create indexes
     await _db.execute("""
         CREATE INDEX IF NOT EXISTS idx_economy_ledger_lookup 
@@ -526,6 +644,16 @@ async def init_db():
         ON command_events(guild_id, command_name, ts)
     """)
     
+    await _db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_casino_rounds_user_ts 
+        ON casino_rounds(guild_id, user_id, ts)
+    """)
+    
+    await _db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_scheduled_job_runs_name 
+        ON scheduled_job_runs(name, id)
+    """)
+    
     # Enable WAL mode for better concurrent performance
     await _db.execute("PRAGMA journal_mode=WAL")
     
@@ -544,33 +672,107 @@ async def close_db():
         _db = None
         print("[+] Database connection closed")
 
+@contextlib.asynccontextmanager
+async def _writer():
+    """Hold the write lock, counting coroutines queued behind it"""
+    _db_stats["write_waiting"] += 1
+    try:
+        await _write_lock.acquire()
+    finally:
+        _db_stats["write_waiting"] -= 1
+    try:
+        yield
+    finally:
+        _write_lock.release()
+
 async def execute(query: str, params: tuple = ()):
     """Execute a write query"""
     if not _db:
         raise RuntimeError("Database not initialized. Call init_db() first.")
-    await _db.execute(query, params)
-    await _db.commit()
+    started = time.perf_counter()
+    async with _writer():
+        await _db.execute(query, params)
+        await _db.commit()
+        _db_stats["commits"] += 1
+    record_db_time(started, commits=1)
+    record_query(query, commits=1)
 
 async def executemany(query: str, params_list: list):
     """Execute a write query multiple times"""
     if not _db:
         raise RuntimeError("Database not initialized. Call init_db() first.")
-    await _db.executemany(query, params_list)
-    await _db.commit()
+    started = time.perf_counter()
+    async with _writer():
+        await _db.executemany(query, params_list)
+        await _db.commit()
+        _db_stats["commits"] += 1
+    record_db_time(started, commits=1)
+    record_query(query, commits=1)
+
+class _CountedConnection:
+    """The connection transaction() yields; statements run on it are charged to open query budgets"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, query: str, params: tuple = ()):
+        record_query(query)
+        return self._conn.execute(query, params)
+
+    def executemany(self, query: str, params_list: list):
+        record_query(query)
+        return self._conn.executemany(query, params_list)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+@contextlib.asynccontextmanager
+async def transaction():
+    """
+    Run several statements atomically with one commit (rolls back on error).
+    Yields the connection; use it directly inside the block, not execute()/executemany().
+    """
+    if not _db:
+        raise RuntimeError("Database not initialized. Call init_db() first.")
+    started = time.perf_counter()
+    async with _writer():
+        await _db.execute("BEGIN IMMEDIATE")
+        try:
+            yield _CountedConnection(_db)
+        except BaseException:
+            await _db.rollback()
+            _db_stats["rollbacks"] += 1
+            raise
+        await _db.commit()
+        _db_stats["commits"] += 1
+    record_db_time(started, commits=1)
+    record_query("BEGIN IMMEDIATE ... COMMIT", commits=1)  # Statements inside were counted as they ran
 
 async def fetchone(query: str, params: tuple = ()):
     """Fetch one row"""
     if not _db:
         raise RuntimeError("Database not initialized. Call init_db() first.")
+    started = time.perf_counter()
     async with _db.execute(query, params) as cursor:
-        return await cursor.fetchone()
+        row = await cursor.fetchone()
+    record_db_time(started)
+    record_query(query)
+    return row
 
 async def fetchall(query: str, params: tuple = ()):
     """Fetch all rows"""
     if not _db:
         raise RuntimeError("Database not initialized. Call init_db() first.")
+    started = time.perf_counter()
     async with _db.execute(query, params) as cursor:
-        return await cursor.fetchall()
+        rows = await cursor.fetchall()
+    record_db_time(started)
+    record_query(query)
+    return rows
+
+def get_db_stats() -> dict:
+    """Commit/rollback counters and the current writer queue depth"""
+    return dict(_db_stats)
 
 def _now_iso():
     """Get current UTC time as ISO string"""
@@ -580,6 +782,11 @@ def _today_str():
     """Get today's date as YYYY-MM-DD string"""
     return datetime.datetime.now(datetime.UTC).date().isoformat()
 
+def _mark_leaderboards(guild_id: int, user_id: int, boards: tuple):
+    """Queue the user for re-read in any loaded leaderboard index"""
+    from systems.leaderboards import mark_dirty
+    mark_dirty(guild_id, user_id, boards)
+
 async def upsert_user_profile(guild_id: int, user_id: int, coins: int = None, 
                                times_gambled: int = None, total_wins: int = None, total_spent: int = None):
     """Upsert user profile (V3: XP/Level removed)"""
@@ -602,6 +809,7 @@ async def upsert_user_profile(guild_id: int, user_id: int, coins: int = None,
                WHERE guild_id = ? AND user_id = ?""",
             (coins, times_gambled, total_wins, total_spent, now, guild_id, user_id)
         )
+        _mark_leaderboards(guild_id, user_id, ("coins",))
     else:
         coins = coins or 0
         times_gambled = times_gambled or 0
@@ -625,6 +833,7 @@ async def bump_message(guild_id: int, user_id: int):
            ON CONFLICT(guild_id, user_id, day) DO UPDATE SET messages_count = messages_count + 1, updated_at = ?""",
         (guild_id, user_id, day, now, now)
     )
+    _mark_leaderboards(guild_id, user_id, ("activity",))
 
 async def add_vc_minutes(guild_id: int, user_id: int, minutes: int):
     """Add VC minutes to daily activity"""
@@ -637,6 +846,7 @@ async def add_vc_minutes(guild_id: int, user_id: int, minutes: int):
            ON CONFLICT(guild_id, user_id, day) DO UPDATE SET vc_minutes = vc_minutes + ?, updated_at = ?""",
         (guild_id, user_id, day, minutes, now, minutes, now)
     )
+    _mark_leaderboards(guild_id, user_id, ("activity",))
 
 async def bump_event(guild_id: int, user_id: int):
     """Increment daily event count"""
@@ -649,6 +859,7 @@ async def bump_event(guild_id: int, user_id: int):
            ON CONFLICT(guild_id, user_id, day) DO UPDATE SET events = events + 1, updated_at = ?""",
         (guild_id, user_id, day, now, now)
     )
+    _mark_leaderboards(guild_id, user_id, ("activity",))
 
 async def upsert_economy_balance(guild_id: int, user_id: int, coins_delta: int = 0):
     """Update economy balance and lifetime tracking"""
@@ -676,6 +887,7 @@ async def upsert_economy_balance(guild_id: int, user_id: int, coins_delta: int =
                WHERE guild_id = ? AND user_id = ?""",
             (new_balance, lifetime_earned, lifetime_burned, now, guild_id, user_id)
         )
+        _mark_leaderboards(guild_id, user_id, ("coins", "rank"))
         return new_balance
     else:
         new_balance = max(0, coins_delta)
@@ -687,6 +899,7 @@ async def upsert_economy_balance(guild_id: int, user_id: int, coins_delta: int =
                VALUES (?, ?, ?, ?, ?, ?)""",
             (guild_id, user_id, new_balance, lifetime_earned, lifetime_burned, now)
         )
+        _mark_leaderboards(guild_id, user_id, ("coins", "rank"))
         return new_balance
 
 async def get_activity_7d(guild_id: int, user_id: int):
@@ -895,16 +1108,25 @@ async def get_logs_channel_id(guild_id: int):
     )
     return row["channel_id"] if row else ADMIN_COMMAND_CHANNEL_ID
 
+_usercommands_channels = {}  # {guild_id: [channel_id]} - read on every user command permission check
+
 async def get_usercommands_channel_ids(guild_id: int):
     """Get usercommands channel IDs for a guild (returns list, falls back to USER_COMMAND_CHANNEL_ID if not configured)"""
+    cached = _usercommands_channels.get(guild_id)
+    if cached is not None:
+        return cached
     from core.config import USER_COMMAND_CHANNEL_ID
     rows = await fetchall(
         "SELECT channel_id FROM usercommands_channel_config WHERE guild_id = ?",
         (guild_id,)
     )
-    if rows:
-        return [row["channel_id"] for row in rows]
-    return [USER_COMMAND_CHANNEL_ID]
+    channel_ids = [row["channel_id"] for row in rows] if rows else [USER_COMMAND_CHANNEL_ID]
+    _usercommands_channels[guild_id] = channel_ids
+    return channel_ids
+
+def invalidate_usercommands_channels(guild_id: int):
+    """Forget the cached usercommands channels after the config table changes"""
+    _usercommands_channels.pop(guild_id, None)
 
 async def cleanup_expired_events():
     """Delete expired event data based on retention windows"""
@@ -0,0 +1,168 @@
+﻿"""
+Command latency instrumentation - per-command traces (first response, DB, Discord REST, wall time)
+kept in rolling windows for percentile reports and deadline alerts
+"""
+import collections
+import contextlib
+import contextvars
+import functools
+import time
+
+DEADLINE_BUDGET_SECONDS = 2.5  # Alert before Discord's 3s interaction deadline
+SAMPLE_WINDOW = 500  # Most recent invocations kept per command
+PHASES = ("first_response", "db", "rest", "wall")
+
+_current = contextvars.ContextVar("command_trace", default=None)
+_samples = {}  # {command: deque[(first_response, db, rest, wall)]}
+_stats = {
+    "invocations": 0,
+    "deadline_misses": 0,
+    "errors": 0,
+}
+_misses = collections.Counter()  # {command: deadline misses}
+_installed = False
+
+class CommandTrace:
+    """Timings for one command invocation (seconds, relative to when the handler started)"""
+
+    def __init__(self, command: str):
+        self.command = command
+        self.started = time.perf_counter()
+        self.first_response = None
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.db_commits = 0
+        self.rest_seconds = 0.0
+        self.rest_calls = 0
+        self.finished = False  # Tasks spawned during the command inherit the trace; stop charging it once done
+
+def record_db_time(started: float, commits: int = 0):
+    """Add a DB call (started = perf_counter() before it) to the running command, if any"""
+    trace = _current.get()
+    if trace is not None and not trace.finished:
+        trace.db_seconds += time.perf_counter() - started
+        trace.db_queries += 1
+        trace.db_commits += commits
+
+def _timed_request(request):
+    """Wrap an HTTP request coroutine so its time is charged to the running command"""
+    @functools.wraps(request)
+    async def wrapper(route, *args, **kwargs):
+        trace = _current.get()
+        if trace is None or trace.finished:
+            return await request(route, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await request(route, *args, **kwargs)
+        finally:
+            trace.rest_seconds += time.perf_counter() - started
+            trace.rest_calls += 1
+            # Interaction callbacks are the initial response/defer
+            if trace.first_response is None and route.path.endswith("/callback"):
+                trace.first_response = time.perf_counter() - trace.started
+    return wrapper
+
+def install(bot):
+    """Time Discord REST calls: the bot's HTTP client and the webhook adapter used for interaction responses"""
+    global _installed
+    if _installed:
+        return
+    from discord.webhook.async_ import async_context
+    bot.http.request = _timed_request(bot.http.request)
+    adapter = async_context.get()
+    adapter.request = _timed_request(adapter.request)
+    _installed = True
+
+def _finish(trace: CommandTrace):
+    trace.finished = True
+    wall = time.perf_counter() - trace.started
+    first_response = trace.first_response if trace.first_response is not None else wall
+    samples = _samples.get(trace.command)
+    if samples is None:
+        samples = collections.deque(maxlen=SAMPLE_WINDOW)
+        _samples[trace.command] = samples
+    samples.append((first_response, trace.db_seconds, trace.rest_seconds, wall))
+    _stats["invocations"] += 1
+
+    if first_response > DEADLINE_BUDGET_SECONDS:
+        _stats["deadline_misses"] += 1
+        _misses[trace.command] += 1
+        print(
+            f"[!] /{trace.command} first response {first_response:.2f}s (budget {DEADLINE_BUDGET_SECONDS:.1f}s): "
+            f"db {trace.db_seconds:.2f}s ({trace.db_queries} queries), rest {trace.rest_seconds:.2f}s "
+            f"({trace.rest_calls} calls), wall {wall:.2f}s"
+        )
+
+def instrument_callback(command: str, callback):
+    """Wrap an app command callback so each invocation runs inside a trace"""
+    @functools.wraps(callback)
+    async def wrapper(*args, **kwargs):
+        trace = CommandTrace(command)
+        token = _current.set(trace)
+        try:
+            return await callback(*args, **kwargs)
+        except Exception:
+            _stats["errors"] += 1
+            raise
+        finally:
+            _current.reset(token)
+            _finish(trace)
+    return wrapper
+
+@contextlib.contextmanager
+def capture(command: str):
+    """Run a block under a trace that stays out of the rolling windows (offline benchmarks); yields the trace"""
+    trace = CommandTrace(command)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        trace.finished = True
+
+def instrument_tree(tree) -> int:
+    """Trace every registered app command (including group subcommands); returns how many were wrapped"""
+    from discord import app_commands
+    wrapped = 0
+    for command in tree.walk_commands():
+        if isinstance(command, app_commands.Command) and not getattr(command._callback, "_latency_traced", False):
+            command._callback = instrument_callback(command.qualified_name, command._callback)
+            command._callback._latency_traced = True
+            wrapped += 1
+    return wrapped
+
+def _percentile(ordered: list, pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+def get_latency_stats() -> dict:
+    """Per-command p50/p95/p99 for each phase over the rolling window, plus deadline misses"""
+    commands = {}
+    for command, samples in _samples.items():
+        phases = {}
+        for i, phase in enumerate(PHASES):
+            ordered = sorted(sample[i] for sample in samples)
+            phases[phase] = {
+                "p50": _percentile(ordered, 50),
+                "p95": _percentile(ordered, 95),
+                "p99": _percentile(ordered, 99),
+                "max": ordered[-1],
+            }
+        commands[command] = {"count": len(samples), "deadline_misses": _misses[command], **phases}
+    return {
+        **_stats,
+        "budget_seconds": DEADLINE_BUDGET_SECONDS,
+        "commands": commands,
+    }
+
+def format_latency_report(stats: dict, limit: int = 15) -> str:
+    """Fixed-width table of the slowest commands by p95 first response"""
+    rows = sorted(stats["commands"].items(), key=lambda item: item[1]["first_response"]["p95"], reverse=True)[:limit]
+    lines = [f"{'command':<20} {'n':>5} {'1st p50':>8} {'1st p95':>8} {'db p95':>7} {'rest p95':>8} {'wall p99':>8} {'miss':>4}"]
+    for command, data in rows:
+        lines.append(
+            f"{command[:20]:<20} {data['count']:>5} {data['first_response']['p50']:>8.3f} {data['first_response']['p95']:>8.3f} "
+            f"{data['db']['p95']:>7.3f} {data['rest']['p95']:>8.3f} {data['wall']['p99']:>8.3f} {data['deadline_misses']:>4}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,128 @@
+﻿"""
+Per-user economy locks - a fixed array of asyncio locks striped by (guild_id, user_id)
+"""
+import asyncio
+import collections
+import contextlib
+import functools
+import time
+
+LOCK_STRIPES = 256  # Fixed lock count; unrelated users rarely share a stripe
+CONTENTION_TOP_N = 10  # Users/commands kept in the contention report
+_CONTENTION_TRACKED_MAX = 1000  # Trim per-user counters past this many keys
+
+_stripes = [asyncio.Lock() for _ in range(LOCK_STRIPES)]
+_owners = [None] * LOCK_STRIPES  # Task holding each stripe (re-entry by the same task does not block)
+_depth = [0] * LOCK_STRIPES
+_task_stripes = {}  # {task: set of stripe indices it holds}
+
+_stats = {
+    "acquired": 0,
+    "reentered": 0,
+    "contended": 0,
+    "wait_seconds": 0.0,
+    "max_wait_seconds": 0.0,
+}
+_contended_users = collections.Counter()  # {(guild_id, user_id): waits}
+_contended_commands = collections.Counter()  # {command: waits}
+
+class LockOrderError(RuntimeError):
+    """A task already holding a stripe tried to take a lower one (the pattern that deadlocks opposing transfers)"""
+
+def _stripe(guild_id, user_id) -> int:
+    return hash((int(guild_id or 0), int(user_id))) % LOCK_STRIPES
+
+def _record_wait(users, command, waited: float):
+    _stats["contended"] += 1
+    _stats["wait_seconds"] += waited
+    _stats["max_wait_seconds"] = max(_stats["max_wait_seconds"], waited)
+    for user in users:
+        _contended_users[user] += 1
+    _contended_commands[command or "unknown"] += 1
+    if len(_contended_users) > _CONTENTION_TRACKED_MAX:
+        kept = _contended_users.most_common(_CONTENTION_TRACKED_MAX // 2)
+        _contended_users.clear()
+        _contended_users.update(dict(kept))
+
+@contextlib.asynccontextmanager
+async def _hold(stripes, users, command):
+    """
+    Acquire stripes in ascending order (re-entering ones this task already holds), release in reverse.
+    Every task takes stripes in ascending order, so no two can wait on each other: a nested acquire below the
+    highest stripe the task already holds raises LockOrderError instead (take the pair lock first).
+    """
+    task = asyncio.current_task()
+    held = _task_stripes.get(task)
+    new = [index for index in set(stripes) if _owners[index] is not task]
+    if held and new and min(new) < max(held):
+        raise LockOrderError(
+            f"{command or 'economy lock'}: stripe {min(new)} requested while holding stripe {max(held)}; "
+            "take economy_lock_pair before any single-user lock"
+        )
+    taken = []
+    try:
+        for index in sorted(set(stripes)):
+            if _owners[index] is task:
+                _depth[index] += 1
+                _stats["reentered"] += 1
+                taken.append(index)
+                continue
+            lock = _stripes[index]
+            if lock.locked():
+                started = time.monotonic()
+                await lock.acquire()
+                _record_wait(users, command, time.monotonic() - started)
+            else:
+                await lock.acquire()
+            _owners[index] = task
+            _depth[index] = 1
+            _task_stripes.setdefault(task, set()).add(index)
+            _stats["acquired"] += 1
+            taken.append(index)
+        yield
+    finally:
+        for index in reversed(taken):
+            _depth[index] -= 1
+            if _depth[index] == 0:
+                _owners[index] = None
+                _stripes[index].release()
+                owned = _task_stripes.get(task)
+                if owned is not None:
+                    owned.discard(index)
+                    if not owned:
+                        del _task_stripes[task]
+
+def economy_lock(guild_id, user_id, command: str = None):
+    """
+    Serialize balance changes for one user: async with economy_lock(guild_id, user_id): ...
+    Re-entrant within a task, so helpers that lock (add_coins) can be called while holding it.
+    """
+    return _hold([_stripe(guild_id, user_id)], [(int(guild_id or 0), int(user_id))], command)
+
+def economy_lock_pair(guild_id, user_a, user_b, command: str = None):
+    """
+    Lock two users for a transfer; stripes are taken in index order so opposite transfers cannot deadlock.
+    Take it before any single-user lock on either user (nesting it under one can raise LockOrderError).
+    """
+    users = [(int(guild_id or 0), int(user_a)), (int(guild_id or 0), int(user_b))]
+    return _hold([_stripe(guild_id, user_a), _stripe(guild_id, user_b)], users, command)
+
+def economy_locked(command: str):
+    """Decorator for handlers taking an interaction first: holds the invoking user's economy lock"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(interaction, *args, **kwargs):
+            guild_id = interaction.guild.id if interaction.guild else 0
+            async with economy_lock(guild_id, interaction.user.id, command=command):
+                return await func(interaction, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_lock_stats() -> dict:
+    """Acquire/contention counters plus the users and commands that collide most"""
+    return {
+        **_stats,
+        "held": sum(1 for lock in _stripes if lock.locked()),
+        "top_users": _contended_users.most_common(CONTENTION_TOP_N),
+        "top_commands": _contended_commands.most_common(CONTENTION_TOP_N),
+    }
@@ -10,23 +10,25 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
+# First, so startup milestones are measured from here (python -m benchmarks.cold_start breaks imports down)
+from core import startup
+
 import discord
 from discord.ext import commands
 import datetime
 from dotenv import load_dotenv
 
 # Import all modules
-from core.config import ALLOWED_GUILDS
 # Legacy: load_xp_data is now a no-op (data is in DB)
 from core.utils import get_timezone, USE_PYTZ
 import systems.events as events
 import systems.handlers as handlers
-import systems.tasks as tasks
 from commands import user_commands, admin_commands
 # Legacy XP/Level system removed
 from core.utils import set_bot as set_utils_bot
 from systems.events import set_bot as set_events_bot
 from systems.tasks import set_bot as set_tasks_bot
+startup.mark("imports")
 
 # Load environment variables
 # Try loading from secret.env first (for local development)
@@ -51,7 +53,21 @@ intents.message_content = True
 intents.voice_states = True
 
 COMMAND_PREFIX = os.getenv("COMMAND_PREFIX", "!")
-bot = commands.Bot(
+
+class IslaBot(commands.Bot):
+    async def setup_hook(self):
+        """Once per process, before the gateway connects: DB open, migrations, cooldowns"""
+        await startup.setup(self)
+
+    async def close(self):
+        """Flush cooldowns and close the database on shutdown (not on gateway disconnects)"""
+        from core.data import shutdown_database
+        try:
+            await shutdown_database()
+        finally:
+            await super().close()
+
+bot = IslaBot(
     command_prefix=commands.when_mentioned_or(COMMAND_PREFIX),
     intents=intents,
     case_insensitive=True,
@@ -74,6 +90,12 @@ onboarding.set_bot(bot)
 user_commands.register_commands(bot)
 admin_commands.register_commands(bot)
 
+# Trace every app command (first response, DB, REST and wall time per invocation)
+from core import latency
+latency.install(bot)
+print(f"[+] Latency tracing on {latency.instrument_tree(bot.tree)} app commands")
+startup.mark("commands_registered")
+
 # Register event handlers
 @bot.event
 async def on_message(message):
@@ -107,13 +129,6 @@ async def on_member_remove(member):
 async def on_member_join(member):
     await handlers.on_member_join(member)
 
-@bot.event
-async def on_connect():
-    """Called when bot connects to Discord (before on_ready) - initialize database here"""
-    from core.data import initialize_database
-    await initialize_database()
-    print("[+] Database initialized in on_connect")
-
 @bot.event
 async def on_ready():
     print(f'{bot.user} has connected to Discord!')
@@ -141,21 +156,6 @@ async def on_ready():
             print(f"... and {commands_count - 10} more")
     print("=" * 60)
     
-    # Leave any guilds that aren't in the allowed list
-    for guild in bot.guilds:
-        if guild.id not in ALLOWED_GUILDS:
-            try:
-                await guild.leave()
-                print(f'Left {guild.name} (ID: {guild.id}) - not in allowed guilds list')
-            except Exception as e:
-                print(f'Failed to leave {guild.name} (ID: {guild.id}): {e}')
-    
-    print(f'Bot is now in {len([g for g in bot.guilds if g.id in ALLOWED_GUILDS])} allowed guild(s)')
-    
-    # Database already initialized in setup_hook, but verify it's ready
-    from core.data import initialize_database
-    await initialize_database()  # This is idempotent (checks _db_initialized flag)
-    
     # Initialize event scheduler with UK timezone
     uk_tz = get_timezone("Europe/London")
     if uk_tz is not None:
@@ -168,37 +168,9 @@ async def on_ready():
         print(f"[*] Current UK time: {now_uk.strftime('%Y-%m-%d %H:%M:%S %Z')}")
         print(f"[*] Promo rotation scheduler: Runs daily at 12:00 UK time (4-day cycle: Throne -> none -> Coffee -> none)")
     
-    # Start background tasks
-    tasks.auto_save.start()
-    tasks.promo_rotation_scheduler.start()
-    tasks.v3_daily_job.start()
-    tasks.v3_weekly_job.start()
-    tasks.cleanup_expired_events_task.start()
-    tasks.daily_orders_drop_task.start()
-    tasks.personal_order_reminders_task.start()
-    print("Background tasks started: auto-save, promo rotation scheduler, V3 progression jobs (daily/weekly), event cleanup, daily orders drop, and personal order reminders")
-    
-    # Sync slash commands (global + per-guild for faster propagation)
-    sync_results = {}
-    
-    # Global sync
-    try:
-        synced_global = await bot.tree.sync()
-        sync_results["global"] = len(synced_global)
-        print(f"[+] Global sync: {len(synced_global)} command(s)")
-    except Exception as e:
-        sync_results["global"] = f"ERROR: {e}"
-        print(f"[-] Global sync failed: {e}")
-    
-    # Per-guild sync for faster propagation in allowed guilds
-    for guild_id in ALLOWED_GUILDS:
-        try:
-            synced_guild = await bot.tree.sync(guild=discord.Object(id=guild_id))
-            sync_results[f"guild_{guild_id}"] = len(synced_guild)
-            print(f"[+] Guild sync ({guild_id}): {len(synced_guild)} command(s)")
-        except Exception as e:
-            sync_results[f"guild_{guild_id}"] = f"ERROR: {e}"
-            print(f"[-] Guild sync ({guild_id}) failed: {e}")
+    # Once per process: leave other guilds, warm caches, start background tasks and command sync (timed per phase).
+    # Reconnects only run a health check.
+    await startup.on_ready(bot)
 
 # Bot login
 TOKEN = os.getenv('DISCORD_TOKEN')
@@ -218,9 +190,8 @@ if not TOKEN:
 
 @bot.event
 async def on_disconnect():
-    """Clean up database connection on disconnect"""
-    from core.data import shutdown_database
-    await shutdown_database()
+    """Gateway dropped; discord.py reconnects on its own, so keep the database open"""
+    print("[*] Disconnected from Discord, waiting to reconnect")
 
 try:
     bot.run(TOKEN)
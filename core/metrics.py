@@ -0,0 +1,179 @@
+﻿"""
+Local metrics endpoint - bot internals as OpenMetrics text on http://127.0.0.1:METRICS_PORT/metrics
+Off unless METRICS_PORT is set; values are gathered only when scraped
+"""
+import collections
+import functools
+import os
+import time
+
+from core.config import METRICS_PORT
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+_event_counts = collections.Counter()  # {gateway event type: count}
+_jobs = {}  # {job name: {"runs", "failures", "seconds", "last_seconds", "max_seconds"}}
+_runner = None
+
+def record_job(name: str, seconds: float, failed: bool = False):
+    """Add one background job run"""
+    job = _jobs.get(name)
+    if job is None:
+        job = {"runs": 0, "failures": 0, "seconds": 0.0, "last_seconds": 0.0, "max_seconds": 0.0}
+        _jobs[name] = job
+    job["runs"] += 1
+    job["failures"] += 1 if failed else 0
+    job["seconds"] += seconds
+    job["last_seconds"] = seconds
+    job["max_seconds"] = max(job["max_seconds"], seconds)
+
+def timed_job(name: str):
+    """Decorator recording each run's duration (put it under @tasks.loop)"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            failed = False
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                record_job(name, time.perf_counter() - started, failed)
+        return wrapper
+    return decorator
+
+async def _on_socket_event_type(event_type: str):
+    _event_counts[event_type] += 1
+
+def _rss_bytes():
+    """Current resident set size (Linux), falling back to peak RSS where /proc is missing"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return None
+
+# -----------------------------
+# Exposition
+# -----------------------------
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class _Writer:
+    """Collects metric families in OpenMetrics text form"""
+
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name: str, kind: str, help_text: str, samples):
+        """samples: [(labels dict or None, value)]; counters get the _total suffix"""
+        self.lines.append(f"# TYPE {name} {kind}")
+        self.lines.append(f"# HELP {name} {help_text}")
+        suffix = "_total" if kind == "counter" else ""
+        for labels, value in samples:
+            if value is None:
+                continue
+            label_text = "{" + ",".join(f'{k}="{_label(v)}"' for k, v in labels.items()) + "}" if labels else ""
+            self.lines.append(f"{name}{suffix}{label_text} {value}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n# EOF\n"
+
+def render() -> str:
+    """Snapshot every exported metric"""
+    from core.db import get_db_stats
+    from core.outbound import get_outbound_stats
+    from core.cooldowns import get_cooldown_stats
+    from core.locks import get_lock_stats
+    from core.latency import get_latency_stats
+    from core.watchdog import get_loop_stats
+    from systems.leaderboards import get_page_cache_stats
+    from systems.static_embeds import get_static_embed_stats
+    from core.startup import get_startup_stats
+
+    out = _Writer()
+    out.family("islabot_gateway_events", "counter", "Gateway dispatch events received, by type",
+               [({"type": t}, n) for t, n in sorted(_event_counts.items())])
+
+    outbound = get_outbound_stats()
+    out.family("islabot_outbound_backlog", "gauge", "Outbound sends queued across routes", [(None, outbound["backlog"])])
+    out.family("islabot_outbound_sends", "counter", "Outbound sends by result",
+               [({"result": r}, outbound[r]) for r in ("sent", "failed", "retries", "rate_limited")])
+
+    db = get_db_stats()
+    out.family("islabot_db_write_waiting", "gauge", "Coroutines queued behind the DB write lock", [(None, db["write_waiting"])])
+    out.family("islabot_db_commits", "counter", "DB commits", [(None, db["commits"])])
+    out.family("islabot_db_rollbacks", "counter", "DB transaction rollbacks", [(None, db["rollbacks"])])
+
+    cooldown = get_cooldown_stats()
+    pages = get_page_cache_stats()
+    embeds = get_static_embed_stats()
+    caches = {
+        "cooldowns": (cooldown["hits"], cooldown["misses"]),
+        "leaderboard_pages": (pages["hits"], pages["misses"]),
+        "static_embeds": (embeds["hits"], embeds["builds"]),
+    }
+    out.family("islabot_cache_hits", "counter", "Cache hits", [({"cache": c}, h) for c, (h, _) in caches.items()])
+    out.family("islabot_cache_misses", "counter", "Cache misses", [({"cache": c}, m) for c, (_, m) in caches.items()])
+    out.family("islabot_cache_hit_ratio", "gauge", "Cache hit ratio since startup",
+               [({"cache": c}, round(h / (h + m), 4) if h + m else None) for c, (h, m) in caches.items()])
+    out.family("islabot_cooldown_entries", "gauge", "Live cooldown store entries", [(None, cooldown["entries"])])
+
+    locks = get_lock_stats()
+    out.family("islabot_economy_lock_contended", "counter", "Economy lock acquisitions that had to wait", [(None, locks["contended"])])
+    out.family("islabot_economy_lock_wait_seconds", "counter", "Time spent waiting for economy locks", [(None, round(locks["wait_seconds"], 6))])
+
+    latency = get_latency_stats()
+    out.family("islabot_command_invocations", "counter", "App command invocations", [(None, latency["invocations"])])
+    out.family("islabot_command_deadline_misses", "counter", "Invocations whose first response passed the budget", [(None, latency["deadline_misses"])])
+
+    jobs = sorted(_jobs.items())
+    out.family("islabot_job_runs", "counter", "Background job runs", [({"job": n}, j["runs"]) for n, j in jobs])
+    out.family("islabot_job_failures", "counter", "Background job runs that raised", [({"job": n}, j["failures"]) for n, j in jobs])
+    out.family("islabot_job_duration_seconds", "counter", "Total background job run time", [({"job": n}, round(j["seconds"], 6)) for n, j in jobs])
+    out.family("islabot_job_last_duration_seconds", "gauge", "Duration of the latest run", [({"job": n}, round(j["last_seconds"], 6)) for n, j in jobs])
+    out.family("islabot_job_max_duration_seconds", "gauge", "Longest run since startup", [({"job": n}, round(j["max_seconds"], 6)) for n, j in jobs])
+
+    loop = get_loop_stats()
+    out.family("islabot_event_loop_lag_seconds", "gauge", "Latest measured event-loop lag", [(None, round(loop["last_lag_seconds"], 6))])
+    out.family("islabot_event_loop_max_lag_seconds", "gauge", "Worst event-loop lag since startup", [(None, round(loop["max_lag_seconds"], 6))])
+    out.family("islabot_event_loop_stalls", "counter", "Lags over the watchdog threshold", [(None, loop["stalls"])])
+
+    startup = get_startup_stats()
+    out.family("islabot_startup_phase_seconds", "gauge", "Duration of each once-per-process startup phase",
+               [({"phase": n}, round(p["seconds"], 6)) for n, p in startup["phases"].items()])
+    out.family("islabot_gateway_reconnects", "counter", "on_ready after the first (reconnects)", [(None, startup["reconnects"])])
+
+    out.family("process_resident_memory_bytes", "gauge", "Resident memory size", [(None, _rss_bytes())])
+    return out.text()
+
+async def _handle_metrics(request):
+    from aiohttp import web
+    return web.Response(body=render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+async def start(bot):
+    """Serve /metrics on localhost when METRICS_PORT is set (idempotent across reconnects)"""
+    global _runner
+    if not METRICS_PORT or _runner is not None:
+        return
+    from aiohttp import web
+    bot.add_listener(_on_socket_event_type, "on_socket_event_type")
+    app = web.Application()
+    app.router.add_get("/metrics", _handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, "127.0.0.1", METRICS_PORT).start()
+    except OSError as e:
+        await runner.cleanup()
+        print(f"[-] Metrics endpoint failed to bind 127.0.0.1:{METRICS_PORT}: {e}")
+        return
+    _runner = runner
+    print(f"[+] Metrics endpoint on http://127.0.0.1:{METRICS_PORT}/metrics")
@@ -0,0 +1,199 @@
+﻿"""
+Outbound Discord send queue - per-route rate buckets, priority classes, 429 retry
+"""
+import discord
+import asyncio
+import heapq
+import itertools
+import random
+import time
+
+# Priority classes (lower sends first when concurrency slots are contended)
+PRIORITY_INTERACTION = 0
+PRIORITY_EVENT = 1
+PRIORITY_DM = 2
+PRIORITY_BULK = 3  # Background bulk work (role sync) yields to everything else
+
+# Discord allows roughly 5 messages per 5 seconds per channel
+ROUTE_BUCKET_CAPACITY = 5
+ROUTE_BUCKET_REFILL_PER_SEC = 1.0
+# Member edits: routes are ("roles", guild_id, user_id) so edits run in parallel (one worker per member),
+# sharing one bucket per guild; Discord's own limits beyond this come back as 429s and are retried
+ROLE_BUCKET_CAPACITY = 10
+ROLE_BUCKET_REFILL_PER_SEC = 5.0
+_BUCKET_SETTINGS = {"roles": (ROLE_BUCKET_CAPACITY, ROLE_BUCKET_REFILL_PER_SEC)}  # {route kind: (capacity, refill/s)}
+MAX_CONCURRENT_SENDS = 4
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+
+_seq = itertools.count()
+_route_buckets = {}  # {(kind, id): {"tokens": float, "updated": float}}
+_route_queues = {}  # {route: [(priority, seq, job)]}, one worker per non-empty route
+_route_workers = set()  # Running worker tasks (held so they aren't garbage-collected mid-drain)
+_slot_waiters = []  # [(priority, seq, future)]
+_active_sends = 0
+
+_stats = {
+    "queued": 0,
+    "sent": 0,
+    "failed": 0,
+    "retries": 0,
+    "rate_limited": 0,
+}
+
+def route_for(target) -> tuple:
+    """Rate-limit route for a send target (one bucket per channel or DM recipient)"""
+    if isinstance(target, (discord.User, discord.Member)):
+        return ("dm", target.id)
+    return ("channel", getattr(target, "id", id(target)))
+
+def _take_token(route: tuple) -> float:
+    """Take a token from the route's bucket (keyed on its first two parts). Returns seconds to wait (0 if taken)"""
+    capacity, refill = _BUCKET_SETTINGS.get(route[0], (ROUTE_BUCKET_CAPACITY, ROUTE_BUCKET_REFILL_PER_SEC))
+    now = time.monotonic()
+    key = route[:2]
+    bucket = _route_buckets.get(key)
+    if bucket is None:
+        bucket = {"tokens": capacity, "updated": now}
+        _route_buckets[key] = bucket
+
+    bucket["tokens"] = min(capacity, bucket["tokens"] + (now - bucket["updated"]) * refill)
+    bucket["updated"] = now
+
+    if bucket["tokens"] >= 1:
+        bucket["tokens"] -= 1
+        return 0
+    return (1 - bucket["tokens"]) / refill
+
+async def _acquire_slot(priority: int):
+    """Acquire a concurrency slot; waiters are served by priority, then FIFO"""
+    global _active_sends
+    if _active_sends < MAX_CONCURRENT_SENDS and not _slot_waiters:
+        _active_sends += 1
+        return
+    future = asyncio.get_running_loop().create_future()
+    heapq.heappush(_slot_waiters, (priority, next(_seq), future))
+    await future
+
+def _release_slot():
+    """Hand the slot to the best waiter, or free it"""
+    global _active_sends
+    while _slot_waiters:
+        _, _, future = heapq.heappop(_slot_waiters)
+        if not future.done():
+            future.set_result(None)
+            return
+    _active_sends -= 1
+
+def _retry_after(error) -> float:
+    """Seconds to back off for a 429 (None if the error is not a rate limit)"""
+    if isinstance(error, discord.RateLimited):
+        return error.retry_after
+    if isinstance(error, discord.HTTPException) and error.status == 429:
+        try:
+            return float(error.response.headers.get("Retry-After", RETRY_BASE_DELAY))
+        except Exception:
+            return RETRY_BASE_DELAY
+    return None
+
+async def _run_job(job: dict):
+    """Send one job: wait for a route token and a slot, retry 429s with jitter"""
+    route = job["route"]
+    while True:
+        wait = _take_token(route)
+        if wait > 0:
+            await asyncio.sleep(wait)
+            continue
+
+        await _acquire_slot(job["priority"])
+        try:
+            result = await job["factory"]()
+        except Exception as e:
+            retry_after = _retry_after(e)
+            if retry_after is None or job["attempts"] >= MAX_RETRIES:
+                _stats["failed"] += 1
+                if not job["future"].done():
+                    job["future"].set_exception(e)
+                return
+            job["attempts"] += 1
+            _stats["rate_limited"] += 1
+            _stats["retries"] += 1
+            delay = retry_after + random.uniform(0, RETRY_BASE_DELAY * job["attempts"])
+            print(f"[!] Outbound 429 on {route[0]} {route[1]} ({job['label']}), retrying in {delay:.1f}s")
+        else:
+            _stats["sent"] += 1
+            if not job["future"].done():
+                job["future"].set_result(result)
+            return
+        finally:
+            _release_slot()
+
+        await asyncio.sleep(delay)
+
+async def _route_worker(route: tuple):
+    """Drain one route in priority/FIFO order so messages in a channel stay ordered"""
+    queue = _route_queues[route]
+    try:
+        while queue:
+            _, _, job = heapq.heappop(queue)
+            try:
+                await _run_job(job)
+            except Exception as e:
+                if not job["future"].done():
+                    job["future"].set_exception(e)
+    finally:
+        _route_queues.pop(route, None)
+
+def _log_failure(future: asyncio.Future, label: str):
+    """Done callback for fire-and-forget sends"""
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        print(f"[-] Outbound send failed ({label}): {error}")
+
+def submit(route: tuple, factory, priority: int = PRIORITY_EVENT, label: str = "send") -> asyncio.Future:
+    """Queue a zero-arg coroutine factory on a route. Returns a future with its result"""
+    future = asyncio.get_running_loop().create_future()
+    job = {
+        "route": route,
+        "factory": factory,
+        "priority": priority,
+        "label": label,
+        "attempts": 0,
+        "future": future,
+    }
+    _stats["queued"] += 1
+
+    queue = _route_queues.get(route)
+    if queue is None:
+        queue = _route_queues[route] = []
+        heapq.heappush(queue, (priority, next(_seq), job))
+        worker = asyncio.create_task(_route_worker(route))
+        _route_workers.add(worker)
+        worker.add_done_callback(_route_workers.discard)
+    else:
+        heapq.heappush(queue, (priority, next(_seq), job))
+    return future
+
+async def send(target, *args, priority: int = PRIORITY_EVENT, wait: bool = True, **kwargs):
+    """
+    Send a message to a channel or user through the queue.
+    wait=True returns the sent message (raises on failure); wait=False is fire-and-forget.
+    """
+    label = kwargs.pop("label", "send")
+    future = submit(route_for(target), lambda: target.send(*args, **kwargs), priority=priority, label=label)
+    if wait:
+        return await future
+    future.add_done_callback(lambda f: _log_failure(f, label))
+    return None
+
+def get_outbound_stats() -> dict:
+    """Queue counters plus current backlog"""
+    return {
+        **_stats,
+        "backlog": sum(len(q) for q in _route_queues.values()),
+        "active_routes": len(_route_queues),
+        "active_sends": _active_sends,
+        "slot_waiters": len(_slot_waiters),
+    }
@@ -0,0 +1,103 @@
+﻿"""
+Sampling profiler for the live bot - a helper thread samples the event-loop thread's stack via
+sys._current_frames() and writes collapsed stacks (flamegraph.pl / speedscope) to data/profiles/
+"""
+import asyncio
+import collections
+import datetime
+import os
+import sys
+import threading
+import time
+
+SAMPLE_INTERVAL = 0.005  # 200 Hz
+MAX_SECONDS = 300
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "profiles")
+
+# asyncio's own dispatch frames sit under every callback; stacks start after them
+_LOOP_FRAMES = {("asyncio.base_events", "run_forever"), ("asyncio.base_events", "_run_once"), ("asyncio.events", "_run")}
+_IDLE_FRAMES = {("selectors", "select"), ("asyncio.windows_events", "select"), ("asyncio.proactor_events", "_loop_self_reading")}
+
+_active = None  # Running _Sampler, one profile at a time
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+
+def _collapse(frame) -> str:
+    """Root-first 'a;b;c' for a stack, starting at the callback the loop is running (or 'idle')"""
+    names = []
+    while frame is not None:
+        key = (frame.f_globals.get("__name__"), frame.f_code.co_name)
+        if key in _LOOP_FRAMES:
+            break
+        if key in _IDLE_FRAMES:
+            return "(idle)"
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names)) or "(loop)"
+
+class _Sampler(threading.Thread):
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="loop-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = collections.Counter()  # {collapsed stack: samples}
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_collapse(frame)] += 1
+            del frame
+
+async def profile(seconds: float, interval: float = SAMPLE_INTERVAL) -> dict:
+    """
+    Sample the event loop for seconds and write a collapsed-stack file.
+    Returns {"path", "samples", "seconds", "busy_pct", "top"} (top = [(function, self samples)]).
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("A profile is already running")
+    seconds = max(1.0, min(float(seconds), MAX_SECONDS))
+    sampler = _Sampler(threading.get_ident(), interval)
+    _active = sampler
+    started = time.monotonic()
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop_event.set()
+        await asyncio.to_thread(sampler.join)
+        _active = None
+    elapsed = time.monotonic() - started
+
+    stacks = sampler.samples
+    total = sum(stacks.values())
+    idle = stacks.get("(idle)", 0)
+    self_time = collections.Counter()
+    for stack, count in stacks.items():
+        if stack != "(idle)":
+            self_time[stack.rsplit(";", 1)[-1]] += count
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.datetime.now(datetime.UTC).strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(PROFILE_DIR, f"profile-{stamp}.collapsed")
+    lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+    await asyncio.to_thread(_write, path, "\n".join(lines) + "\n")
+    print(f"[+] Profile written: {path} ({total} samples over {elapsed:.1f}s)")
+    return {
+        "path": path,
+        "samples": total,
+        "seconds": elapsed,
+        "busy_pct": (total - idle) / total * 100 if total else 0.0,
+        "top": self_time.most_common(10),
+    }
+
+def _write(path: str, text: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def is_running() -> bool:
+    return _active is not None
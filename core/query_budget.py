@@ -0,0 +1,82 @@
+﻿"""
+Query budgets - count the statements issued through core.db inside a block and fail with their fingerprints
+when a limit is exceeded (catches N+1 shapes in tests and benchmarks)
+"""
+import collections
+import contextlib
+import contextvars
+import functools
+import re
+
+_active = contextvars.ContextVar("query_budgets", default=())  # Budgets open in this task (innermost last)
+
+@functools.cache
+def _patterns() -> tuple:
+    """Compiled on first fingerprint (core.db imports this module on every cold start)"""
+    return (
+        (re.compile(r"'(?:[^']|'')*'"), "?"),
+        (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+        (re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE), "IN (...)"),
+        (re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+"), r"\1, ..."),
+        (re.compile(r"\s+"), " "),
+    )
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised on leaving a query_budget block that issued too many statements or commits"""
+
+class QueryBudget:
+    """Statements and commits seen inside one query_budget block"""
+
+    def __init__(self, max_queries: int = None, max_commits: int = None, label: str = ""):
+        self.max_queries = max_queries
+        self.max_commits = max_commits
+        self.label = label
+        self.queries = 0
+        self.commits = 0
+        self.fingerprints = collections.Counter()  # {fingerprint: statements}
+
+    def over(self) -> bool:
+        return ((self.max_queries is not None and self.queries > self.max_queries)
+                or (self.max_commits is not None and self.commits > self.max_commits))
+
+    def report(self, top: int = 10) -> str:
+        limits = f"max_queries={self.max_queries}, max_commits={self.max_commits}"
+        lines = [f"Query budget{' ' + self.label if self.label else ''} exceeded: "
+                 f"{self.queries} queries, {self.commits} commits ({limits})"]
+        for fingerprint, count in self.fingerprints.most_common(top):
+            lines.append(f"  {count:>5}x {fingerprint}")
+        if len(self.fingerprints) > top:
+            lines.append(f"  ... {len(self.fingerprints) - top} more fingerprints")
+        return "\n".join(lines)
+
+def fingerprint(query: str) -> str:
+    """Normalize a statement so repeats of one query shape group together (literals and IN lists collapsed)"""
+    for pattern, replacement in _patterns():
+        query = pattern.sub(replacement, query)
+    return query.strip()
+
+def record_query(query: str, commits: int = 0):
+    """Charge a statement issued through core.db to every open budget in this task"""
+    budgets = _active.get()
+    if not budgets:
+        return
+    key = fingerprint(query)
+    for budget in budgets:
+        budget.queries += 1
+        budget.commits += commits
+        budget.fingerprints[key] += 1
+
+@contextlib.contextmanager
+def query_budget(max_queries: int = None, max_commits: int = None, label: str = ""):
+    """
+    Count statements issued through core.db in the block (and tasks it spawns); yields the QueryBudget.
+    Raises QueryBudgetExceeded with the top statement fingerprints on exit if a limit was passed.
+    """
+    budget = QueryBudget(max_queries, max_commits, label)
+    token = _active.set(_active.get() + (budget,))
+    try:
+        yield budget
+    finally:
+        _active.reset(token)
+    if budget.over():
+        raise QueryBudgetExceeded(budget.report())
@@ -0,0 +1,185 @@
+﻿"""
+Bulk role mutation engine - per-member role diffs applied with one edit each, resumable
+"""
+import discord
+import asyncio
+import json
+
+from core.db import fetchall, execute, _now_iso
+from core import outbound
+
+MAX_CONCURRENT_EDITS = 4  # Member edits in flight at once across all jobs (outbound paces them per guild)
+CHECKPOINT_EVERY = 25  # Persist remaining plan after this many members
+
+_edit_slots = asyncio.Semaphore(MAX_CONCURRENT_EDITS)
+_active_jobs = {}  # {job_key: asyncio.Task}
+_resumed_jobs = set()  # Resumed job tasks (held so they aren't garbage-collected mid-run)
+
+# -----------------------------
+# Plan builders
+# A plan is {user_id: (add_role_ids, remove_role_ids)}
+# -----------------------------
+def plan_strip_roles(guild: discord.Guild, role_ids) -> dict:
+    """Plan removing roles from everyone who holds them (walks role.members, not the whole guild)"""
+    plan = {}
+    for role_id in role_ids:
+        role = guild.get_role(int(role_id))
+        if not role:
+            continue
+        for member in role.members:
+            plan.setdefault(member.id, (set(), set()))[1].add(role.id)
+    return plan
+
+def plan_grant_roles(grants: dict) -> dict:
+    """Plan from {user_id: role_id} additions"""
+    plan = {}
+    for user_id, role_id in grants.items():
+        if role_id:
+            plan.setdefault(int(user_id), (set(), set()))[0].add(int(role_id))
+    return plan
+
+def plan_exclusive_roles(guild: discord.Guild, desired: dict, managed_role_ids, skip_role_ids=()) -> dict:
+    """
+    Plan so each member holds exactly their desired role out of a managed set.
+    desired: {user_id: role_id or None}. Members holding a managed role but absent from desired lose it.
+    """
+    managed = {int(r) for r in managed_role_ids if r}
+    skip = {int(r) for r in skip_role_ids}
+    candidates = set(desired)
+    for role_id in managed:
+        role = guild.get_role(role_id)
+        if role:
+            candidates.update(m.id for m in role.members)
+
+    plan = {}
+    for user_id in candidates:
+        member = guild.get_member(user_id)
+        if not member or member.bot:
+            continue
+        current = {r.id for r in member.roles}
+        if current & skip:
+            continue
+        want = {int(desired[user_id])} if desired.get(user_id) else set()
+        add = want - current
+        remove = (current & managed) - want
+        if add or remove:
+            plan[user_id] = (add, remove)
+    return plan
+
+# -----------------------------
+# Plan execution
+# -----------------------------
+def _target_roles(guild: discord.Guild, member: discord.Member, add_ids: set, remove_ids: set):
+    """Full role list for member.edit, or None when the member already matches"""
+    current = {r.id for r in member.roles if not r.is_default()}
+    target = (current - remove_ids) | add_ids
+    if target == current:
+        return None
+    roles = [guild.get_role(rid) for rid in target]
+    return [r for r in roles if r is not None]
+
+def _encode_plan(plan: dict) -> str:
+    return json.dumps({str(uid): [sorted(add), sorted(remove)] for uid, (add, remove) in plan.items()})
+
+def _decode_plan(plan_json: str) -> dict:
+    raw = json.loads(plan_json) if plan_json else {}
+    return {int(uid): (set(add), set(remove)) for uid, (add, remove) in raw.items()}
+
+async def _checkpoint(job_key: str, guild_id: int, reason: str, remaining: dict):
+    """Persist what is left of a job so a restart can pick it up"""
+    now = _now_iso()
+    await execute(
+        """INSERT INTO role_jobs (job_key, guild_id, reason, plan_json, created_at, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?)
+           ON CONFLICT(job_key) DO UPDATE SET plan_json = excluded.plan_json, updated_at = excluded.updated_at""",
+        (job_key, guild_id, reason, _encode_plan(remaining), now, now)
+    )
+
+async def _edit_member(guild: discord.Guild, user_id: int, add_ids: set, remove_ids: set, reason: str) -> str:
+    """Apply one member's diff against their current roles. Returns changed/skipped/failed"""
+    member = guild.get_member(user_id)
+    if not member:
+        return "skipped"
+    roles = _target_roles(guild, member, add_ids, remove_ids)
+    if roles is None:
+        return "skipped"
+    try:
+        await outbound.submit(
+            ("roles", guild.id, user_id),
+            lambda: member.edit(roles=roles, reason=reason),
+            priority=outbound.PRIORITY_BULK,
+            label=f"roles {user_id}",
+        )
+        return "changed"
+    except Exception as e:
+        print(f"  ↳ Failed to update roles for {member.name}: {e}")
+        return "failed"
+
+async def _run_plan(guild: discord.Guild, plan: dict, reason: str, job_key: str) -> dict:
+    remaining = dict(plan)
+    stats = {"changed": 0, "skipped": 0, "failed": 0}
+    done_since_checkpoint = 0
+
+    if job_key:
+        await _checkpoint(job_key, guild.id, reason, remaining)
+
+    async def worker(user_id, add_ids, remove_ids):
+        nonlocal done_since_checkpoint
+        async with _edit_slots:
+            result = await _edit_member(guild, user_id, add_ids, remove_ids, reason)
+        stats[result] += 1
+        remaining.pop(user_id, None)
+        done_since_checkpoint += 1
+        if job_key and done_since_checkpoint >= CHECKPOINT_EVERY:
+            done_since_checkpoint = 0
+            await _checkpoint(job_key, guild.id, reason, remaining)
+
+    await asyncio.gather(*(worker(uid, add, remove) for uid, (add, remove) in plan.items()))
+
+    if job_key:
+        await execute("DELETE FROM role_jobs WHERE job_key = ?", (job_key,))
+    return stats
+
+async def apply_role_plan(guild: discord.Guild, plan: dict, reason: str, job_key: str = None) -> dict:
+    """
+    Apply a role plan with one member.edit per member, bounded concurrency, checkpointed under job_key.
+    Diffs are re-checked against live roles, so rerunning an interrupted plan only touches what is left.
+    """
+    if not plan:
+        if job_key:
+            await execute("DELETE FROM role_jobs WHERE job_key = ?", (job_key,))
+        return {"changed": 0, "skipped": 0, "failed": 0}
+
+    previous = _active_jobs.get(job_key) if job_key else None
+    if previous and not previous.done():
+        await asyncio.shield(previous)
+
+    task = asyncio.create_task(_run_plan(guild, plan, reason, job_key))
+    if job_key:
+        _active_jobs[job_key] = task
+    try:
+        stats = await task
+    finally:
+        if job_key and _active_jobs.get(job_key) is task:
+            _active_jobs.pop(job_key, None)
+    print(f"[+] Role job {job_key or reason}: {stats['changed']} changed, {stats['skipped']} unchanged, {stats['failed']} failed")
+    return stats
+
+async def resume_role_jobs(bot):
+    """Resume role jobs that were interrupted by a restart"""
+    try:
+        rows = await fetchall("SELECT job_key, guild_id, reason, plan_json FROM role_jobs")
+    except Exception as e:
+        print(f"[-] Failed to load pending role jobs: {e}")
+        return
+
+    for row in rows:
+        guild = bot.get_guild(row["guild_id"])
+        if not guild:
+            await execute("DELETE FROM role_jobs WHERE job_key = ?", (row["job_key"],))
+            continue
+        plan = _decode_plan(row["plan_json"])
+        print(f"[*] Resuming role job {row['job_key']}: {len(plan)} member(s) left")
+        task = asyncio.create_task(apply_role_plan(guild, plan, row["reason"], job_key=row["job_key"]))
+        _resumed_jobs.add(task)
+        task.add_done_callback(_resumed_jobs.discard)
@@ -0,0 +1,285 @@
+﻿"""
+Persistent job scheduler - wall-clock jobs (daily / weekly at a local time) whose next and last run live in SQLite,
+run from one task that sleeps until the earliest due time; overdue jobs run once on startup (catch-up), a lease row
+stops two processes running the same job, and every run is kept in scheduled_job_runs with its duration
+"""
+import asyncio
+import datetime
+import os
+import socket
+import time
+
+from core.db import fetchall, fetchone, transaction
+
+MAX_SLEEP_SECONDS = 900  # Re-check the wall clock at least this often (suspend, clock jumps)
+DEFAULT_LEASE_SECONDS = 3600  # Must exceed the job's worst-case runtime
+HISTORY_PER_JOB = 200  # scheduled_job_runs rows kept per job
+STATS_RECENT_RUNS = 10  # Runs averaged per job in get_scheduler_stats
+
+_owner = f"{socket.gethostname()}:{os.getpid()}"  # Lease owner for this process
+_jobs = {}  # {name: {"func", "schedule", "lease_seconds"}}
+_next_runs = {}  # {name: next_run_at} (epoch seconds, mirrors scheduled_jobs)
+_running = {}  # {name: asyncio.Task}
+_wakeup = None  # asyncio.Event, set when a job is registered or finishes
+_task = None
+_stats = {
+    "runs": 0,
+    "failures": 0,
+    "catch_ups": 0,
+    "lease_conflicts": 0,
+}
+
+class Schedule:
+    """Fires at hour:minute local time every day, or only on one weekday (0 = Monday)"""
+
+    def __init__(self, hour: int, minute: int = 0, weekday: int = None, tz=None):
+        self.hour = hour
+        self.minute = minute
+        self.weekday = weekday
+        self.tz = tz or datetime.timezone.utc
+
+    def describe(self) -> str:
+        day = "daily" if self.weekday is None else f"weekday {self.weekday}"
+        return f"{day} {self.hour:02d}:{self.minute:02d} {self.tz}"
+
+    def _at(self, day: datetime.date) -> datetime.datetime:
+        naive = datetime.datetime.combine(day, datetime.time(self.hour, self.minute))
+        if hasattr(self.tz, "localize"):  # pytz
+            return self.tz.localize(naive)
+        return naive.replace(tzinfo=self.tz)
+
+    def next_after(self, ts: float) -> float:
+        """First firing strictly after ts (epoch seconds)"""
+        day = datetime.datetime.fromtimestamp(ts, self.tz).date()
+        for offset in range(9):
+            candidate = day + datetime.timedelta(days=offset)
+            if self.weekday is not None and candidate.weekday() != self.weekday:
+                continue
+            at = self._at(candidate).timestamp()
+            if at > ts:
+                return at
+        raise ValueError(f"No firing found for {self.describe()}")
+
+def daily(hour: int, minute: int = 0, tz=None) -> Schedule:
+    return Schedule(hour, minute, tz=tz)
+
+def weekly(weekday: int, hour: int, minute: int = 0, tz=None) -> Schedule:
+    return Schedule(hour, minute, weekday=weekday, tz=tz)
+
+def register(name: str, func, schedule: Schedule, lease_seconds: int = DEFAULT_LEASE_SECONDS):
+    """Add (or replace) a job; func is an async callable taking no arguments"""
+    _jobs[name] = {"func": func, "schedule": schedule, "lease_seconds": lease_seconds}
+    _next_runs.pop(name, None)  # Loaded from SQLite by the scheduler task
+    if _wakeup is not None:
+        _wakeup.set()
+
+# -----------------------------
+# Persistence
+# -----------------------------
+def _lease_is_stale(owner: str) -> bool:
+    """A lease left behind by a dead process on this host (or by a previous run with our pid, e.g. pid 1 in a container)"""
+    host, _, pid = (owner or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+async def _load_job(name: str):
+    """
+    Read (or create) the job's row; an overdue next_run_at is kept so the job catches up straight away.
+    A new row starts at the next firing: nothing records whether the loop it replaces already ran today
+    """
+    job = _jobs[name]
+    schedule = job["schedule"]
+    now = time.time()
+    row = await fetchone(
+        "SELECT schedule, next_run_at, last_run_at, lease_owner, lease_until FROM scheduled_jobs WHERE name = ?",
+        (name,)
+    )
+    if row is None:
+        next_run_at = schedule.next_after(now)
+    elif row["schedule"] != schedule.describe():
+        # Schedule changed: next firing after the last run (still catches up if that is already past)
+        next_run_at = schedule.next_after(row["last_run_at"] or now)
+    else:
+        next_run_at = row["next_run_at"]
+
+    stale = (row is not None and row["lease_until"] is not None and name not in _running
+             and _lease_is_stale(row["lease_owner"]))
+    async with transaction() as conn:
+        await conn.execute(
+            """INSERT INTO scheduled_jobs (name, schedule, next_run_at) VALUES (?, ?, ?)
+               ON CONFLICT(name) DO UPDATE SET schedule = excluded.schedule, next_run_at = excluded.next_run_at""",
+            (name, schedule.describe(), next_run_at)
+        )
+        if stale:
+            # Crashed mid-run: free the lease and close the run it left open
+            await conn.execute(
+                "UPDATE scheduled_jobs SET lease_owner = NULL, lease_until = NULL WHERE name = ?", (name,)
+            )
+            await conn.execute(
+                "UPDATE scheduled_job_runs SET status = 'abandoned' WHERE name = ? AND status = 'running'", (name,)
+            )
+    if next_run_at <= now:
+        _stats["catch_ups"] += 1
+        print(f"[*] Scheduler: {name} missed its run at {_fmt(next_run_at)}, catching up")
+    _next_runs[name] = next_run_at
+
+async def _acquire(name: str, now: float) -> int:
+    """Take the job's lease if it is still due and unleased; returns the scheduled_job_runs id (0 if not acquired)"""
+    async with transaction() as conn:
+        cursor = await conn.execute(
+            """UPDATE scheduled_jobs SET lease_owner = ?, lease_until = ?
+               WHERE name = ? AND next_run_at <= ? AND (lease_until IS NULL OR lease_until < ?)""",
+            (_owner, now + _jobs[name]["lease_seconds"], name, now, now)
+        )
+        if cursor.rowcount != 1:
+            return 0
+        cursor = await conn.execute(
+            """INSERT INTO scheduled_job_runs (name, scheduled_for, started_at, status)
+               SELECT name, next_run_at, ?, 'running' FROM scheduled_jobs WHERE name = ?""",
+            (now, name)
+        )
+        return cursor.lastrowid
+
+async def _finish(name: str, run_id: int, started: float, seconds: float, error: str, next_run_at: float):
+    status = "failed" if error else "ok"
+    async with transaction() as conn:
+        await conn.execute(
+            "UPDATE scheduled_job_runs SET finished_at = ?, seconds = ?, status = ?, error = ? WHERE id = ?",
+            (started + seconds, seconds, status, error, run_id)
+        )
+        await conn.execute(
+            """UPDATE scheduled_jobs SET last_run_at = ?, last_status = ?, next_run_at = ?,
+                   lease_owner = NULL, lease_until = NULL
+               WHERE name = ? AND lease_owner = ?""",
+            (started, status, next_run_at, name, _owner)
+        )
+        await conn.execute(
+            """DELETE FROM scheduled_job_runs WHERE name = ? AND id <= (
+                   SELECT id FROM scheduled_job_runs WHERE name = ? ORDER BY id DESC LIMIT 1 OFFSET ?)""",
+            (name, name, HISTORY_PER_JOB)
+        )
+
+# -----------------------------
+# Runner
+# -----------------------------
+def _fmt(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts, datetime.UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+async def _run_job(name: str):
+    from core.metrics import record_job
+    job = _jobs[name]
+    now = time.time()
+    try:
+        run_id = await _acquire(name, now)
+        if not run_id:
+            # Another process holds the lease or already ran it: wait for its next_run_at / lease expiry
+            _stats["lease_conflicts"] += 1
+            row = await fetchone("SELECT next_run_at, lease_until FROM scheduled_jobs WHERE name = ?", (name,))
+            _next_runs[name] = max(row["next_run_at"], row["lease_until"] or 0) if row else job["schedule"].next_after(now)
+            return
+
+        started = time.perf_counter()
+        error = None
+        try:
+            await job["func"]()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"[-] Scheduled job {name} failed: {error}")
+        seconds = time.perf_counter() - started
+
+        # Next firing after now, not after the missed one (several missed days collapse into one catch-up run)
+        next_run_at = job["schedule"].next_after(time.time())
+        _stats["runs"] += 1
+        _stats["failures"] += 1 if error else 0
+        record_job(name, seconds, failed=error is not None)
+        await _finish(name, run_id, now, seconds, error, next_run_at)
+        _next_runs[name] = next_run_at
+        print(f"[+] Scheduled job {name} {'failed' if error else 'done'} in {seconds:.2f}s; next run {_fmt(next_run_at)}")
+    except Exception as e:
+        print(f"[-] Scheduler error for {name}: {e}")
+        _next_runs[name] = time.time() + 60  # Retry the bookkeeping shortly
+    finally:
+        _running.pop(name, None)
+        _wakeup.set()
+
+async def _scheduler():
+    global _wakeup
+    _wakeup = asyncio.Event()
+    while True:
+        try:
+            for name in [n for n in _jobs if n not in _next_runs]:
+                await _load_job(name)
+
+            now = time.time()
+            for name, due in list(_next_runs.items()):
+                if due <= now and name in _jobs and name not in _running:
+                    _running[name] = asyncio.create_task(_run_job(name))
+
+            pending = [due for name, due in _next_runs.items() if name not in _running]
+            timeout = min([MAX_SLEEP_SECONDS] + [max(0.0, due - now) for due in pending])
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[-] Error in job scheduler: {e}")
+            await asyncio.sleep(5)
+
+def start() -> bool:
+    """Start the scheduler task once (safe to call on every on_ready); True if it was started now"""
+    global _task
+    if _task is not None and not _task.done():
+        return False
+    _task = asyncio.create_task(_scheduler())
+    return True
+
+def is_running() -> bool:
+    return _task is not None and not _task.done()
+
+# -----------------------------
+# Stats
+# -----------------------------
+async def get_job_history(name: str = None, limit: int = 20) -> list:
+    """Most recent runs first: [{"name", "scheduled_for", "started_at", "seconds", "status", "error"}]"""
+    where = "WHERE name = ?" if name else ""
+    params = (name, limit) if name else (limit,)
+    rows = await fetchall(
+        f"""SELECT name, scheduled_for, started_at, seconds, status, error FROM scheduled_job_runs
+            {where} ORDER BY id DESC LIMIT ?""",
+        params
+    )
+    return [dict(row) for row in rows]
+
+async def get_scheduler_stats() -> dict:
+    """Per-job schedule, next/last run, lease holder and recent durations, plus runner counters"""
+    # One query: each job's last STATS_RECENT_RUNS finished runs are numbered newest first and aggregated per job
+    rows = await fetchall(
+        """SELECT j.name, j.schedule, j.next_run_at, j.last_run_at, j.last_status, j.lease_owner, j.lease_until,
+                  MAX(CASE WHEN r.recent = 1 THEN r.seconds END) AS last_seconds, AVG(r.seconds) AS avg_seconds
+           FROM scheduled_jobs j
+           LEFT JOIN (SELECT name, seconds, ROW_NUMBER() OVER (PARTITION BY name ORDER BY id DESC) AS recent
+                      FROM scheduled_job_runs WHERE seconds IS NOT NULL) r
+             ON r.name = j.name AND r.recent <= ?
+           GROUP BY j.name""",
+        (STATS_RECENT_RUNS,)
+    )
+    jobs = {}
+    for row in rows:
+        jobs[row["name"]] = {
+            **dict(row),
+            "registered": row["name"] in _jobs,
+            "running": row["name"] in _running,
+        }
+    return {"jobs": jobs, "scheduler_running": is_running(), "owner": _owner, **_stats}
@@ -0,0 +1,193 @@
+﻿"""
+Startup orchestrator - once-per-process phases (DB open, migrations, state restore, parallel cache warm-up,
+background tasks, command sync) with a timing breakdown; reconnects only run a health check
+"""
+import asyncio
+import time
+
+from core.config import ALLOWED_GUILDS
+
+_process_started = time.perf_counter()  # core/main.py imports this module first
+_milestones = {}  # {milestone: seconds since _process_started} (imports, commands_registered, setup_hook, ready)
+_phases = {}  # {phase: {"seconds", "ok", "detail"}} in run order
+_done = set()  # Stages finished this process: "setup" (setup_hook), "ready" (first on_ready)
+_stats = {
+    "reconnects": 0,
+    "health_failures": 0,
+}
+
+async def _phase(name: str, func, *args, critical: bool = False):
+    """Run one phase, recording its time and result (sync funcs allowed); critical phases re-raise"""
+    started = time.perf_counter()
+    ok = True
+    detail = None
+    try:
+        detail = func(*args)
+        if asyncio.iscoroutine(detail):
+            detail = await detail
+    except Exception as e:
+        ok = False
+        detail = f"ERROR: {e}"
+        print(f"[-] Startup phase {name} failed: {e}")
+        if critical:
+            raise
+    finally:
+        _phases[name] = {"seconds": time.perf_counter() - started, "ok": ok, "detail": "" if detail is None else str(detail)}
+    return detail
+
+def mark(name: str):
+    """Record a process milestone (first occurrence wins)"""
+    _milestones.setdefault(name, time.perf_counter() - _process_started)
+
+# -----------------------------
+# Phases
+# -----------------------------
+async def _leave_other_guilds(bot) -> str:
+    left = 0
+    for guild in list(bot.guilds):
+        if guild.id in ALLOWED_GUILDS:
+            continue
+        try:
+            await guild.leave()
+            left += 1
+            print(f'Left {guild.name} (ID: {guild.id}) - not in allowed guilds list')
+        except Exception as e:
+            print(f'Failed to leave {guild.name} (ID: {guild.id}): {e}')
+    return f"{left} left, {len([g for g in bot.guilds if g.id in ALLOWED_GUILDS])} allowed"
+
+def _allowed_guilds(bot) -> list:
+    return [guild for guild in bot.guilds if guild.id in ALLOWED_GUILDS]
+
+async def _warm_guild_config(bot) -> str:
+    from core.db import get_usercommands_channel_ids, get_casino_channel_id, get_announcements_channel_id, get_logs_channel_id
+    guilds = _allowed_guilds(bot)
+    for guild in guilds:
+        await get_usercommands_channel_ids(guild.id)
+        await get_casino_channel_id(guild.id)
+        await get_announcements_channel_id(guild.id)
+        await get_logs_channel_id(guild.id)
+    return f"{len(guilds)} guild(s)"
+
+async def _warm_rank_cache(bot) -> str:
+    """Leaderboard indexes (rank, coins, activity); reading rank_cache also pulls its pages into SQLite's cache"""
+    from systems.leaderboards import BOARDS, get_leaderboard
+    entries = 0
+    for guild in _allowed_guilds(bot):
+        for board in BOARDS:
+            entries += len((await get_leaderboard(guild.id, board)).keys)
+    return f"{entries} entries"
+
+async def _warm_voice_sessions(bot) -> str:
+    from systems.handlers import restore_voice_sessions
+    restored = 0
+    for guild in _allowed_guilds(bot):
+        restored += await restore_voice_sessions(guild)
+    return f"{restored} member(s) in VC"
+
+async def _warm_member_roles(bot) -> str:
+    """Role membership (role.members) needs the member cache; chunk guilds the gateway didn't"""
+    chunked = 0
+    for guild in _allowed_guilds(bot):
+        if not guild.chunked:
+            await guild.chunk(cache=True)
+            chunked += 1
+    return f"{chunked} guild(s) chunked, {sum(g.member_count or 0 for g in _allowed_guilds(bot))} members"
+
+async def _start_background(bot) -> str:
+    from systems.tasks import start_background_tasks
+    from core import watchdog, metrics
+    started = start_background_tasks()
+    # Measure event-loop lag and capture stacks of stalls
+    watchdog.start()
+    # Local OpenMetrics endpoint (only when METRICS_PORT is set)
+    await metrics.start(bot)
+    return f"{len(started)} task(s)"
+
+def _start_command_sync(bot) -> str:
+    # Global + per-guild, only for scopes whose tree hash changed; runs in the background
+    from core.command_sync import start_sync
+    start_sync(bot, ALLOWED_GUILDS)
+    return "background"
+
+# -----------------------------
+# Entry points
+# -----------------------------
+async def setup(bot):
+    """setup_hook (before the gateway connects, once per process): DB, migrations and state that needs no guilds"""
+    if "setup" in _done:
+        return
+    mark("setup_hook")
+    from core import db
+    from core.cooldowns import restore as restore_cooldowns
+    if not db.is_open():
+        await _phase("db_open", db.open_db, critical=True)
+        await _phase("migrations", db.migrate_db, critical=True)
+    # Restore persisted cooldowns (daily/give claims survive a redeploy)
+    await _phase("cooldowns", restore_cooldowns)
+    _done.add("setup")
+
+async def on_ready(bot):
+    """First on_ready: guild-dependent phases and warm-up; later ones (reconnects) only run a health check"""
+    if "ready" in _done:
+        _stats["reconnects"] += 1
+        await health_check(bot)
+        return
+    _done.add("ready")
+    mark("gateway_ready")
+    started = time.perf_counter()
+    await setup(bot)
+
+    await _phase("leave_guilds", _leave_other_guilds, bot)
+
+    # Warm caches in parallel so the first commands don't hit cold pages or empty indexes
+    from systems.orders import load_open_runs
+    from core.roles import resume_role_jobs
+    from systems.static_embeds import build_static_embeds
+    warm_started = time.perf_counter()
+    await asyncio.gather(
+        _phase("warm_guild_config", _warm_guild_config, bot),
+        _phase("warm_rank_cache", _warm_rank_cache, bot),
+        _phase("warm_order_runs", load_open_runs),
+        _phase("warm_voice_sessions", _warm_voice_sessions, bot),
+        _phase("warm_member_roles", _warm_member_roles, bot),
+        _phase("resume_role_jobs", resume_role_jobs, bot),
+        _phase("warm_static_embeds", build_static_embeds),  # Built on demand anyway; kept off the pre-connect path
+    )
+    _phases["warmup"] = {"seconds": time.perf_counter() - warm_started, "ok": True, "detail": "wall time of the warm_* phases"}
+
+    await _phase("background_tasks", _start_background, bot)
+    await _phase("command_sync", _start_command_sync, bot)
+    _phases["ready_total"] = {"seconds": time.perf_counter() - started, "ok": True, "detail": ""}
+    mark("startup_done")
+    print(format_report())
+
+async def health_check(bot) -> bool:
+    """Reconnect path: ping the DB and restart any background loop that died"""
+    from core import db
+    from systems.tasks import start_background_tasks
+    try:
+        if not db.is_open():
+            await db.init_db()
+        await db.fetchone("SELECT 1")
+        restarted = start_background_tasks()
+    except Exception as e:
+        _stats["health_failures"] += 1
+        print(f"[-] Reconnect health check failed: {e}")
+        return False
+    suffix = f", restarted {', '.join(restarted)}" if restarted else ""
+    print(f"[+] Reconnected ({_stats['reconnects']}): DB ok{suffix}")
+    return True
+
+def format_report() -> str:
+    lines = ["[+] Startup milestones (since core.startup was imported):"]
+    for name, seconds in _milestones.items():
+        lines.append(f"    {name:<20} {seconds * 1000:>9.1f} ms")
+    lines.append("[+] Startup phases:")
+    for name, phase in _phases.items():
+        status = "ok" if phase["ok"] else "FAILED"
+        lines.append(f"    {name:<20} {phase['seconds'] * 1000:>9.1f} ms  {status:<6} {phase['detail']}")
+    return "\n".join(lines)
+
+def get_startup_stats() -> dict:
+    """Per-phase timings plus reconnect counters"""
+    return {"milestones": dict(_milestones), "phases": {name: dict(phase) for name, phase in _phases.items()}, **_stats}
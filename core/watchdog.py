@@ -0,0 +1,130 @@
+﻿"""
+Event-loop lag watchdog - a ticker measures loop lag; a helper thread captures the loop thread's
+stack while a stall is in progress. Optional asyncio slow-callback reports feed the same buffer.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from core.config import LOOP_LAG_THRESHOLD, SLOW_CALLBACK_DURATION
+
+TICK_SECONDS = 0.1
+WORST_KEPT = 20  # Offenders kept (largest lag first)
+STACK_LINES = 30  # Frames kept per captured stack
+
+_offenders = []  # min-heap [(lag, seq, entry)] holding the WORST_KEPT worst stalls
+_seq = itertools.count()
+_pending = None  # Stack captured by the helper thread for the stall in progress
+_pending_lock = threading.Lock()
+_last_tick = 0.0
+_tick_id = 0
+_loop_thread_id = None
+_ticker_task = None
+
+_stats = {
+    "ticks": 0,
+    "stalls": 0,
+    "slow_callbacks": 0,
+    "last_lag_seconds": 0.0,
+    "max_lag_seconds": 0.0,
+    "avg_lag_seconds": 0.0,  # Exponential moving average
+}
+
+def _record(kind: str, lag: float, stack: str, detail: str = ""):
+    entry = {"kind": kind, "at": time.time(), "lag": lag, "stack": stack, "detail": detail}
+    item = (lag, next(_seq), entry)
+    if len(_offenders) < WORST_KEPT:
+        heapq.heappush(_offenders, item)
+    elif lag > _offenders[0][0]:
+        heapq.heapreplace(_offenders, item)
+
+def _capture_loop_stack() -> str:
+    frame = sys._current_frames().get(_loop_thread_id)
+    if frame is None:
+        return ""
+    return "".join(traceback.format_stack(frame)[-STACK_LINES:])
+
+def _watch():
+    """Helper thread: if the ticker has not run for LOOP_LAG_THRESHOLD, snapshot what the loop thread is doing"""
+    global _pending
+    captured_for = None
+    while True:
+        time.sleep(TICK_SECONDS / 2)
+        tick_id = _tick_id
+        if captured_for == tick_id or time.monotonic() - _last_tick <= LOOP_LAG_THRESHOLD:
+            continue
+        captured_for = tick_id
+        stack = _capture_loop_stack()
+        with _pending_lock:
+            _pending = stack
+
+async def _ticker():
+    global _last_tick, _tick_id, _pending
+    while True:
+        expected = time.monotonic() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        now = time.monotonic()
+        lag = max(0.0, now - expected)
+        _last_tick = now
+        _tick_id += 1
+
+        _stats["ticks"] += 1
+        _stats["last_lag_seconds"] = lag
+        _stats["max_lag_seconds"] = max(_stats["max_lag_seconds"], lag)
+        _stats["avg_lag_seconds"] += (lag - _stats["avg_lag_seconds"]) * 0.05
+
+        with _pending_lock:
+            stack, _pending = _pending, None
+        if lag > LOOP_LAG_THRESHOLD:
+            _stats["stalls"] += 1
+            _record("stall", lag, stack or "(stall ended before the watchdog sampled it)")
+            print(f"[!] Event loop stalled for {lag:.2f}s (threshold {LOOP_LAG_THRESHOLD:.2f}s)")
+
+class _SlowCallbackHandler(logging.Handler):
+    """Collects asyncio debug-mode 'Executing <Handle ...> took N seconds' warnings"""
+
+    def emit(self, record):
+        if "took" not in record.msg or not record.args:
+            return
+        try:
+            lag = float(record.args[-1])
+        except (TypeError, ValueError):
+            return
+        _stats["slow_callbacks"] += 1
+        _record("slow_callback", lag, "", detail=str(record.args[0])[:300])
+
+def start():
+    """Start the ticker and helper thread on the running loop (idempotent)"""
+    global _ticker_task, _loop_thread_id, _last_tick
+    if _ticker_task is not None:
+        return
+    loop = asyncio.get_running_loop()
+    _loop_thread_id = threading.get_ident()
+    _last_tick = time.monotonic()
+    _ticker_task = loop.create_task(_ticker())
+    threading.Thread(target=_watch, name="loop-watchdog", daemon=True).start()
+
+    if SLOW_CALLBACK_DURATION > 0:
+        # Debug mode adds overhead to every task/callback; only on when asked for
+        loop.set_debug(True)
+        loop.slow_callback_duration = SLOW_CALLBACK_DURATION
+        logging.getLogger("asyncio").addHandler(_SlowCallbackHandler(level=logging.WARNING))
+    print(f"[+] Loop watchdog started (stall threshold {LOOP_LAG_THRESHOLD:.2f}s"
+          + (f", slow callbacks > {SLOW_CALLBACK_DURATION:.2f}s)" if SLOW_CALLBACK_DURATION > 0 else ")"))
+
+def get_worst_offenders() -> list:
+    """Recorded stalls/slow callbacks, worst first"""
+    return [entry for _, _, entry in sorted(_offenders, key=lambda item: item[0], reverse=True)]
+
+def get_loop_stats() -> dict:
+    return {
+        **_stats,
+        "threshold_seconds": LOOP_LAG_THRESHOLD,
+        "slow_callback_seconds": SLOW_CALLBACK_DURATION,
+        "offenders": len(_offenders),
+    }
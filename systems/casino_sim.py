@@ -0,0 +1,330 @@
+﻿"""
+Casino RTP / volatility simulator - vectorized Monte Carlo over the casino tables (NumPy, optional)
+Run offline: python -m systems.casino_sim --game all --rounds 1000000
+"""
+import argparse
+import math
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.config import RANK_MAX_BET, MAX_BET_ABS
+from systems.casino_tables import (
+    SLOTS_REEL, SLOTS_SYMBOL_INDEX, SLOTS_BONUS_SYMBOL, SLOTS_PAYOUT_TABLE,
+    SLOTS_FREE_SPIN_AWARDS, SLOTS_FREE_SPIN_RETRIGGER,
+    CARD_DECK, DIE, ROULETTE_WHEEL, ROULETTE_POCKETS, COINFLIP,
+    ROULETTE_COLOR_PAYOUTS, ROULETTE_NUMBER_PAYOUT,
+    BLACKJACK_DEALER_STANDS_ON, BLACKJACK_WIN_PAYOUT, BLACKJACK_NATURAL_PAYOUT,
+)
+
+GAMES = ("coinflip", "dice", "roulette", "slots", "blackjack")
+DEFAULT_ROUNDS = 1_000_000
+DEFAULT_BET = 100
+BATCH_SIZE = 200_000
+BLACKJACK_MAX_CARDS = 16
+BLACKJACK_PLAYER_STANDS_ON = 17  # Simulated player policy (hit below, never double)
+RUIN_CHECKPOINTS = (10, 50, 100, 250, 500)
+RUIN_PATHS = 1000
+RUIN_START_BETS = 20  # Starting bankroll, in max bets
+
+_alias_arrays = {}  # {id(sampler): (prob, alias)}
+
+def numpy_available() -> bool:
+    return np is not None
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy is required for the casino simulator (pip install numpy)")
+
+# -----------------------------
+# Vectorized draws
+# -----------------------------
+def _draw(sampler, size, gen):
+    """Vectorized alias draw; returns outcome indices"""
+    arrays = _alias_arrays.get(id(sampler))
+    if arrays is None:
+        arrays = (np.asarray(sampler.prob, dtype=np.int64), np.asarray(sampler.alias, dtype=np.int64))
+        _alias_arrays[id(sampler)] = arrays
+    prob, alias = arrays
+    columns = gen.integers(0, sampler.n, size)
+    thresholds = gen.integers(0, sampler.total, size)
+    return np.where(thresholds < prob[columns], columns, alias[columns])
+
+def _slots_arrays():
+    """Payout table as arrays: multiplier, fixed payout, free spins awarded, bonus symbol count"""
+    arrays = _alias_arrays.get("slots")
+    if arrays is None:
+        bonus_index = SLOTS_SYMBOL_INDEX[SLOTS_BONUS_SYMBOL]
+        n = len(SLOTS_REEL.outcomes)
+        multiplier = np.array([entry[1] for entry in SLOTS_PAYOUT_TABLE], dtype=np.float64)
+        fixed = np.array([entry[2] for entry in SLOTS_PAYOUT_TABLE], dtype=np.int64)
+        awards = np.array([SLOTS_FREE_SPIN_AWARDS.get(entry[0], 0) for entry in SLOTS_PAYOUT_TABLE], dtype=np.int64)
+        keys = np.arange(n ** 3)
+        reels = np.stack([keys // (n * n), (keys // n) % n, keys % n], axis=1)
+        bonus_count = (reels == bonus_index).sum(axis=1)
+        retrigger = np.array([SLOTS_FREE_SPIN_RETRIGGER.get(int(c), 0) for c in bonus_count], dtype=np.int64)
+        arrays = (multiplier, fixed, awards, retrigger)
+        _alias_arrays["slots"] = arrays
+    return arrays
+
+def _slots_keys(size, gen):
+    n = len(SLOTS_REEL.outcomes)
+    reels = _draw(SLOTS_REEL, (size, 3), gen)
+    return (reels[:, 0] * n + reels[:, 1]) * n + reels[:, 2]
+
+# -----------------------------
+# Per-game batches: total payout per round (stake included)
+# -----------------------------
+def _batch_coinflip(size, bet, gen, **_):
+    won = _draw(COINFLIP, size, gen) == COINFLIP.outcomes.index(True)
+    return np.where(won, bet * 2, 0), None
+
+def _batch_dice(size, bet, gen, **_):
+    rolls = _draw(DIE, (size, 2), gen)
+    payout = np.where(rolls[:, 0] > rolls[:, 1], bet * 2, np.where(rolls[:, 0] == rolls[:, 1], bet, 0))
+    return payout, None
+
+def _batch_roulette(size, bet, gen, roulette_choice="red", **_):
+    pockets = _draw(ROULETTE_WHEEL, size, gen)
+    choice = str(roulette_choice).lower()
+    colors = np.array([ROULETTE_POCKETS[num][0] for num in ROULETTE_WHEEL.outcomes])
+    if choice in ROULETTE_COLOR_PAYOUTS:
+        payout = np.where(colors[pockets] == choice, bet * ROULETTE_COLOR_PAYOUTS[choice], 0)
+    else:
+        numbers = np.array(ROULETTE_WHEEL.outcomes)
+        payout = np.where(numbers[pockets] == int(choice), bet * ROULETTE_NUMBER_PAYOUT, 0)
+    return payout, None
+
+def _free_spin_payouts(awarded, gen):
+    """Play out free-spin chains (bet 0: only fixed payouts count) for every round at once"""
+    _, fixed, _, retrigger = _slots_arrays()
+    pending = awarded.copy()
+    winnings = np.zeros(len(awarded), dtype=np.int64)
+    for _ in range(10000):
+        rows = np.nonzero(pending > 0)[0]
+        if len(rows) == 0:
+            break
+        keys = _slots_keys(len(rows), gen)
+        winnings[rows] += fixed[keys]
+        pending[rows] += retrigger[keys] - 1
+    return winnings
+
+def _batch_slots(size, bet, gen, **_):
+    multiplier, fixed, awards, _ = _slots_arrays()
+    keys = _slots_keys(size, gen)
+    payout = np.floor(bet * multiplier[keys]).astype(np.int64) + fixed[keys]
+    return payout, _free_spin_payouts(awards[keys], gen)
+
+def _hand_values(cards):
+    """Running blackjack hand values per card (aces drop from 11 to 1 as needed)"""
+    totals = np.cumsum(cards, axis=1)
+    aces = np.cumsum(cards == 11, axis=1)
+    over = np.maximum(0, np.ceil((totals - 21) / 10)).astype(np.int64)
+    return totals - 10 * np.minimum(aces, over)
+
+def _stop_values(values, stand_on):
+    """Hand value where each row first reaches stand_on (two cards minimum)"""
+    reached = values[:, 1:] >= stand_on
+    index = np.where(reached.any(axis=1), reached.argmax(axis=1) + 1, values.shape[1] - 1)
+    return values[np.arange(len(values)), index]
+
+def _batch_blackjack(size, bet, gen, stand_on=BLACKJACK_PLAYER_STANDS_ON, **_):
+    deck = np.asarray(CARD_DECK.outcomes)
+    player = _hand_values(deck[_draw(CARD_DECK, (size, BLACKJACK_MAX_CARDS), gen)])
+    dealer = _hand_values(deck[_draw(CARD_DECK, (size, BLACKJACK_MAX_CARDS), gen)])
+
+    natural = player[:, 1] == 21
+    player_final = _stop_values(player, stand_on)
+    dealer_final = _stop_values(dealer, BLACKJACK_DEALER_STANDS_ON)
+
+    payout = np.where(
+        player_final > 21, 0,
+        np.where((dealer_final > 21) | (player_final > dealer_final), bet * BLACKJACK_WIN_PAYOUT,
+                 np.where(player_final == dealer_final, bet, 0))
+    )
+    payout = np.where(natural, int(bet * BLACKJACK_NATURAL_PAYOUT), payout)
+    return payout, None
+
+_BATCHES = {
+    "coinflip": _batch_coinflip,
+    "dice": _batch_dice,
+    "roulette": _batch_roulette,
+    "slots": _batch_slots,
+    "blackjack": _batch_blackjack,
+}
+
+def _round_payouts(game, size, bet, gen, **options):
+    """Payout per round including free-spin winnings"""
+    payout, free = _BATCHES[game](size, bet, gen, **options)
+    return payout + free if free is not None else payout, free
+
+# -----------------------------
+# Simulations
+# -----------------------------
+def simulate_game(game: str, rounds: int = DEFAULT_ROUNDS, bet: int = DEFAULT_BET, seed: int = None, **options) -> dict:
+    """Monte Carlo RTP, hit frequency and volatility (net result per round in bets) for one game"""
+    _require_numpy()
+    if game not in _BATCHES:
+        raise ValueError(f"Unknown game: {game}")
+    gen = np.random.default_rng(seed)
+
+    total_payout = 0
+    total_free = 0
+    hits = 0
+    sum_net = 0.0
+    sum_net_sq = 0.0
+    max_multiple = 0.0
+    done = 0
+    while done < rounds:
+        size = min(BATCH_SIZE, rounds - done)
+        payout, free = _round_payouts(game, size, bet, gen, **options)
+        net = (payout - bet) / bet
+        total_payout += int(payout.sum())
+        total_free += int(free.sum()) if free is not None else 0
+        hits += int((payout > 0).sum())
+        sum_net += float(net.sum())
+        sum_net_sq += float((net * net).sum())
+        max_multiple = max(max_multiple, float(payout.max()) / bet)
+        done += size
+
+    mean_net = sum_net / rounds
+    variance = max(0.0, sum_net_sq / rounds - mean_net * mean_net)
+    std = math.sqrt(variance)
+    return {
+        "game": game,
+        "rounds": rounds,
+        "bet": bet,
+        "rtp": total_payout / (rounds * bet),
+        "rtp_ci95": 1.96 * std / math.sqrt(rounds),
+        "hit_frequency": hits / rounds,
+        "variance": variance,
+        "std": std,
+        "max_multiple": max_multiple,
+        "free_spin_rtp": total_free / (rounds * bet) if game == "slots" else None,
+    }
+
+def ruin_curves(game: str, bet_caps: dict = None, paths: int = RUIN_PATHS, horizon: int = max(RUIN_CHECKPOINTS),
+                start_bets: int = RUIN_START_BETS, seed: int = None, **options) -> dict:
+    """
+    Share of bankrolls that can no longer cover a max bet after N rounds, per rank cap.
+    Each path starts with start_bets x the cap and bets the cap every round.
+    Returns {rank: {"bet": cap, "curve": {rounds: ruined_share}}}.
+    """
+    _require_numpy()
+    gen = np.random.default_rng(seed)
+    bet_caps = bet_caps or RANK_MAX_BET
+    checkpoints = [c for c in RUIN_CHECKPOINTS if c <= horizon] or [horizon]
+    curves = {}
+    for rank, cap in bet_caps.items():
+        bet = min(MAX_BET_ABS, cap)
+        payout, _ = _round_payouts(game, paths * horizon, bet, gen, **options)
+        bankroll = start_bets * bet + np.cumsum((payout - bet).reshape(paths, horizon), axis=1)
+        ruined = np.logical_or.accumulate(bankroll < bet, axis=1)
+        curves[rank] = {"bet": bet, "curve": {c: float(ruined[:, c - 1].mean()) for c in checkpoints}}
+    return curves
+
+def exact_slots_rtp(bet: int = DEFAULT_BET) -> dict:
+    """
+    Exact slots RTP by enumerating all 8³ reel outcomes (no NumPy needed).
+    Free spins are a branching process: each spin re-triggers m spins on average, so an award of k
+    spins is worth k / (1 - m) spins at the fixed-payout value of a free spin.
+    """
+    probs = SLOTS_REEL.probabilities()
+    n = len(probs)
+    bonus_index = SLOTS_SYMBOL_INDEX[SLOTS_BONUS_SYMBOL]
+
+    base = 0.0
+    hit = 0.0
+    awarded = 0.0
+    free_value = 0.0
+    retrigger_mean = 0.0
+    for i in range(n):
+        for j in range(n):
+            for k in range(n):
+                p = probs[i] * probs[j] * probs[k]
+                win_type, multiplier, fixed_payout, _ = SLOTS_PAYOUT_TABLE[(i * n + j) * n + k]
+                payout = int(bet * multiplier) + fixed_payout
+                base += p * payout
+                hit += p if payout > 0 else 0
+                awarded += p * SLOTS_FREE_SPIN_AWARDS.get(win_type, 0)
+                free_value += p * fixed_payout
+                retrigger_mean += p * SLOTS_FREE_SPIN_RETRIGGER.get([i, j, k].count(bonus_index), 0)
+
+    free_ev = awarded * free_value / (1 - retrigger_mean)
+    return {
+        "bet": bet,
+        "base_rtp": base / bet,
+        "free_spin_rtp": free_ev / bet,
+        "rtp": (base + free_ev) / bet,
+        "hit_frequency": hit,
+        "free_spins_per_round": awarded / (1 - retrigger_mean),
+        "retrigger_mean": retrigger_mean,
+    }
+
+# -----------------------------
+# Reports
+# -----------------------------
+def format_result(result: dict) -> str:
+    """One-game summary lines"""
+    lines = [
+        f"{result['game']}: {result['rounds']:,} rounds @ {result['bet']}",
+        f"  RTP            {result['rtp'] * 100:.3f}% (±{result['rtp_ci95'] * 100:.3f})",
+        f"  Hit frequency  {result['hit_frequency'] * 100:.2f}%",
+        f"  Std dev (bets) {result['std']:.3f}  variance {result['variance']:.3f}",
+        f"  Max payout     x{result['max_multiple']:.1f}",
+    ]
+    if result.get("free_spin_rtp") is not None:
+        lines.append(f"  Free spins     {result['free_spin_rtp'] * 100:.3f}% of RTP")
+    return "\n".join(lines)
+
+def format_exact_slots(exact: dict) -> str:
+    return "\n".join([
+        f"slots exact (8³ enumeration) @ {exact['bet']}",
+        f"  RTP            {exact['rtp'] * 100:.3f}% (base {exact['base_rtp'] * 100:.3f}% + free spins {exact['free_spin_rtp'] * 100:.3f}%)",
+        f"  Hit frequency  {exact['hit_frequency'] * 100:.2f}%",
+        f"  Free spins     {exact['free_spins_per_round']:.4f} per paid round (re-trigger mean {exact['retrigger_mean']:.4f})",
+    ])
+
+def format_ruin(game: str, curves: dict) -> str:
+    checkpoints = list(next(iter(curves.values()))["curve"])
+    header = f"{'rank':<10}{'bet':>7}" + "".join(f"{f'@{c}':>8}" for c in checkpoints)
+    lines = [f"{game} ruin (bankroll {RUIN_START_BETS} max bets)", header]
+    for rank, data in curves.items():
+        lines.append(f"{rank:<10}{data['bet']:>7}" + "".join(f"{data['curve'][c] * 100:>7.1f}%" for c in checkpoints))
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate casino RTP and volatility")
+    parser.add_argument("--game", choices=GAMES + ("all",), default="all")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--bet", type=int, default=DEFAULT_BET)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--roulette-choice", default="red", help="red, black, green or a number (0-36)")
+    parser.add_argument("--stand-on", type=int, default=BLACKJACK_PLAYER_STANDS_ON, help="Simulated blackjack player stands at this value")
+    parser.add_argument("--ruin", action="store_true", help="Also print bankroll-ruin curves per rank bet cap")
+    parser.add_argument("--paths", type=int, default=RUIN_PATHS)
+    args = parser.parse_args(argv)
+
+    games = GAMES if args.game == "all" else (args.game,)
+    options = {"roulette_choice": args.roulette_choice, "stand_on": args.stand_on}
+
+    if "slots" in games:
+        print(format_exact_slots(exact_slots_rtp(args.bet)))
+        print()
+
+    if not numpy_available():
+        print("NumPy is not installed - only the exact slots figures are available (pip install numpy)")
+        return 1
+
+    for game in games:
+        print(format_result(simulate_game(game, args.rounds, args.bet, args.seed, **options)))
+        if args.ruin:
+            print(format_ruin(game, ruin_curves(game, paths=args.paths, seed=args.seed, **options)))
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
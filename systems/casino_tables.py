@@ -0,0 +1,171 @@
+﻿"""
+Casino samplers and lookup tables - Walker alias tables and the 8³ slots payout table, built at import
+"""
+import random
+import secrets
+
+# Slots configuration
+SLOTS_SYMBOLS = {
+    "🥝": {"multiplier": 1.5, "weight": 28},
+    "🍇": {"multiplier": 2, "weight": 22},
+    "🍋": {"multiplier": 3, "weight": 18},
+    "🍑": {"multiplier": 5, "weight": 12},
+    "🍉": {"multiplier": 8, "weight": 8},
+    "🍒": {"multiplier": 15, "weight": 4},
+    "👑": {"multiplier": 30, "weight": 2},
+    "🎁": {"multiplier": 0, "weight": 2},  # Bonus symbol
+}
+SLOTS_BONUS_SYMBOL = "🎁"
+SLOTS_PAIR_LOSS_FRACTION = 0.5  # Shown as "Lost N coins" on a pair (the whole bet is still lost)
+SLOTS_BIG_BONUS_PAYOUT = 250  # Two bonus symbols: fixed payout + free spins
+SLOTS_BONUS_WIN_MULTIPLIER = 0.8
+
+# Free spins: awarded on paid spins by outcome, re-triggered on free spins by bonus symbol count
+SLOTS_FREE_SPIN_AWARDS = {"big_bonus": 2, "mega_bonus": 5}
+SLOTS_FREE_SPIN_RETRIGGER = {1: 1, 2: 2, 3: 3}
+
+COINFLIP_WIN_WEIGHT = 49  # 49/51 house edge
+COINFLIP_LOSE_WEIGHT = 51
+
+# Roulette payouts (total returned, stake included)
+ROULETTE_COLOR_PAYOUTS = {"red": 2, "black": 2, "green": 14}
+ROULETTE_NUMBER_PAYOUT = 36
+
+# Blackjack rules
+BLACKJACK_DEALER_STANDS_ON = 17
+BLACKJACK_WIN_PAYOUT = 2
+BLACKJACK_NATURAL_PAYOUT = 2.5  # 3:2 on a two-card 21
+
+_secure_rng = secrets.SystemRandom()
+
+class AliasSampler:
+    """
+    Walker/Vose alias table over integer weights: O(1) draws, exact probabilities.
+    Draw = one uniform column + one integer threshold test. secure=True draws from the OS CSPRNG
+    unless a seeded rng is passed (rounds pass their own seeded rng so they can be replayed).
+    """
+
+    def __init__(self, outcomes, weights=None, secure=True):
+        self.outcomes = list(outcomes)
+        self.weights = [int(w) for w in (weights or [1] * len(self.outcomes))]
+        if len(self.outcomes) != len(self.weights) or not self.outcomes:
+            raise ValueError("outcomes and weights must be non-empty and the same length")
+        if any(w < 0 for w in self.weights) or sum(self.weights) <= 0:
+            raise ValueError("weights must be non-negative with a positive total")
+
+        self.n = len(self.outcomes)
+        self.total = sum(self.weights)
+        self.rng = _secure_rng if secure else random
+
+        # Column i keeps outcome i when a draw in [0, total) is below prob[i], else takes alias[i]
+        scaled = [w * self.n for w in self.weights]
+        self.prob = [self.total] * self.n
+        self.alias = list(range(self.n))
+        small = [i for i, w in enumerate(scaled) if w < self.total]
+        large = [i for i, w in enumerate(scaled) if w >= self.total]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= self.total - scaled[s]
+            (small if scaled[l] < self.total else large).append(l)
+
+    def draw_index(self, rng=None) -> int:
+        """Draw one outcome index"""
+        rng = rng or self.rng
+        column = rng.randrange(self.n)
+        return column if rng.randrange(self.total) < self.prob[column] else self.alias[column]
+
+    def draw(self, rng=None):
+        """Draw one outcome"""
+        return self.outcomes[self.draw_index(rng)]
+
+    def sample(self, n: int, rng=None) -> list:
+        """Draw n outcomes in one batch"""
+        rng = rng or self.rng
+        outcomes, prob, alias, cols, total = self.outcomes, self.prob, self.alias, self.n, self.total
+        result = []
+        for _ in range(n):
+            column = rng.randrange(cols)
+            result.append(outcomes[column if rng.randrange(total) < prob[column] else alias[column]])
+        return result
+
+    def probabilities(self) -> list:
+        """Exact outcome probabilities (weights / total)"""
+        return [w / self.total for w in self.weights]
+
+# -----------------------------
+# Samplers (built once at import)
+# -----------------------------
+SLOTS_REEL = AliasSampler(list(SLOTS_SYMBOLS), [s["weight"] for s in SLOTS_SYMBOLS.values()])
+SLOTS_SYMBOL_INDEX = {symbol: i for i, symbol in enumerate(SLOTS_REEL.outcomes)}
+
+# Blackjack: 2-9 once, 10/J/Q/K as 10, ace as 11
+CARD_DECK = AliasSampler([2, 3, 4, 5, 6, 7, 8, 9, 10, 11], [1, 1, 1, 1, 1, 1, 1, 1, 4, 1])
+DIE = AliasSampler(range(1, 7))
+ROULETTE_WHEEL = AliasSampler(range(37))
+COINFLIP = AliasSampler([True, False], [COINFLIP_WIN_WEIGHT, COINFLIP_LOSE_WEIGHT])
+
+# European roulette: pocket -> (color, display)
+ROULETTE_REDS = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
+ROULETTE_POCKETS = {0: ("green", "🟢 0")}
+for _num in range(1, 37):
+    ROULETTE_POCKETS[_num] = ("red", f"🔴 {_num}") if _num in ROULETTE_REDS else ("black", f"⚫ {_num}")
+
+# -----------------------------
+# Slots payout table
+# Entry per ordered 3-reel outcome: (win_type, multiplier, fixed_payout, message)
+# payout = int(bet * multiplier) + fixed_payout; "{loss}" in message is the displayed pair loss
+# -----------------------------
+def _classify_slots_reels(reels) -> tuple:
+    """Bet-independent slots result for one reel combination (only used to build the table)"""
+    bonus = SLOTS_BONUS_SYMBOL
+
+    # 3-of-a-kind
+    if reels[0] == reels[1] == reels[2]:
+        if reels[0] == bonus:
+            return ("mega_bonus", 0, 0, "🎁 You gained 5 Free Spins")
+        multiplier = SLOTS_SYMBOLS[reels[0]]["multiplier"]
+        return ("win", multiplier, 0, f"Win x{multiplier}")
+
+    # 2-of-a-kind (small loss message)
+    if reels[0] == reels[1] or reels[1] == reels[2] or reels[0] == reels[2]:
+        symbol = reels[1] if reels[1] in (reels[0], reels[2]) else reels[0]
+        if symbol != bonus and SLOTS_SYMBOLS[symbol]["multiplier"] > 0:
+            return ("loss", 0, 0, "Lost {loss} coins")
+
+    # Bonus symbols
+    bonus_count = reels.count(bonus)
+    if bonus_count == 2:
+        return ("big_bonus", 0, SLOTS_BIG_BONUS_PAYOUT, "🎁 You gained 2 Free Spins\n\nBonus payout: +250 chips")
+    if bonus_count == 1:
+        other_symbols = [s for s in reels if s != bonus]
+        if len(set(other_symbols)) != 1:
+            return ("mini_bonus", 0, 0, "🎁 Bonus payout: +0 coins")
+        if SLOTS_SYMBOLS[other_symbols[0]]["multiplier"] > 0:
+            return ("bonus_win", SLOTS_BONUS_WIN_MULTIPLIER, 0, f"Win x{SLOTS_BONUS_WIN_MULTIPLIER}")
+
+    return ("loss", 0, 0, None)
+
+def _slots_key(i: int, j: int, k: int) -> int:
+    return (i * len(SLOTS_REEL.outcomes) + j) * len(SLOTS_REEL.outcomes) + k
+
+SLOTS_PAYOUT_TABLE = [None] * (len(SLOTS_REEL.outcomes) ** 3)
+for _i, _a in enumerate(SLOTS_REEL.outcomes):
+    for _j, _b in enumerate(SLOTS_REEL.outcomes):
+        for _k, _c in enumerate(SLOTS_REEL.outcomes):
+            SLOTS_PAYOUT_TABLE[_slots_key(_i, _j, _k)] = _classify_slots_reels([_a, _b, _c])
+
+def slots_entry(reels) -> tuple:
+    """Payout table entry for displayed reels"""
+    index = SLOTS_SYMBOL_INDEX
+    return SLOTS_PAYOUT_TABLE[_slots_key(index[reels[0]], index[reels[1]], index[reels[2]])]
+
+def slots_payout(entry: tuple, bet: int) -> tuple:
+    """Resolve a table entry for a bet. Returns (payout, win_type, message)"""
+    win_type, multiplier, fixed_payout, message = entry
+    payout = int(bet * multiplier) + fixed_payout
+    if message and "{loss}" in message:
+        message = message.format(loss=int(bet * SLOTS_PAIR_LOSS_FRACTION))
+    return (payout, win_type, message)
@@ -21,6 +21,8 @@ from core.config import (
 from core.data import increment_event_participation
 # Legacy XP/Level system removed - events now use coins/activity only
 from core.utils import resolve_channel_id
+from core import outbound
+from core.roles import apply_role_plan, plan_strip_roles, plan_grant_roles
 
 # Global state
 active_event = None
@@ -44,19 +46,13 @@ async def clear_event_roles():
         return  # Don't clear roles if an event is active
     
     for guild in bot.guilds:
-        for role_id in EVENT_CLEANUP_ROLES:
-            role = guild.get_role(role_id)
-            if not role:
-                continue
-            
-            members_with_role = [m for m in guild.members if role in m.roles]
-            if members_with_role:
-                try:
-                    for member in members_with_role:
-                        await member.remove_roles(role, reason="Event cleanup - no active events")
-                    print(f"Cleared {len(members_with_role)} members from role {role.name} ({role_id})")
-                except Exception as e:
-                    print(f"Failed to clear role {role.name} ({role_id}): {e}")
+        plan = plan_strip_roles(guild, EVENT_CLEANUP_ROLES)
+        if not plan:
+            continue
+        try:
+            await apply_role_plan(guild, plan, "Event cleanup - no active events", job_key=f"event_cleanup:{guild.id}")
+        except Exception as e:
+            print(f"Failed to clear event roles in {guild.name}: {e}")
 
 def build_event_embed(description: str, image_url: str = None) -> discord.Embed:
     """Build event embed with description and optional image."""
@@ -212,7 +208,7 @@ async def start_event4_phase2(guild, state):
     if woof_channel:
         try:
             woof_embed = build_event_embed("*Who's a good puppy?*", "https://i.imgur.com/yHTrhB4.png")
-            await woof_channel.send("@everyone", embed=woof_embed)
+            await outbound.send(woof_channel, "@everyone", embed=woof_embed)
             print(f"Event 4 Phase 2: Sent message to Woof channel")
         except Exception as e:
             print(f"Failed to send Event 4 Phase 2 message to Woof channel: {e}")
@@ -222,7 +218,7 @@ async def start_event4_phase2(guild, state):
     if meow_channel:
         try:
             meow_embed = build_event_embed("*Who's a good kitty?*", "https://i.imgur.com/JfoxREn.png")
-            await meow_channel.send("@everyone", embed=meow_embed)
+            await outbound.send(meow_channel, "@everyone", embed=meow_embed)
             print(f"Event 4 Phase 2: Sent message to Meow channel")
         except Exception as e:
             print(f"Failed to send Event 4 Phase 2 message to Meow channel: {e}")
@@ -239,15 +235,10 @@ async def end_event7_phase2(state):
         return
     
     # Remove opt-in role from all users who have it
-    opt_in_role = guild.get_role(EVENT_7_OPT_IN_ROLE)
-    if opt_in_role:
-        for member in guild.members:
-            if opt_in_role in member.roles:
-                try:
-                    await member.remove_roles(opt_in_role, reason="Event 7 Phase 2 ended")
-                    print(f"  ↳ Removed opt-in role from {member.name}")
-                except Exception as e:
-                    print(f"  ↳ Failed to remove opt-in role from {member.name}: {e}")
+    try:
+        await apply_role_plan(guild, plan_strip_roles(guild, [EVENT_7_OPT_IN_ROLE]), "Event 7 Phase 2 ended", job_key=f"event7_phase2:{guild.id}")
+    except Exception as e:
+        print(f"  ↳ Failed to remove opt-in role: {e}")
     
     # Phase 2 ended, now start Phase 3
     await handle_event7_phase3(guild, state)
@@ -262,26 +253,11 @@ async def end_event7_phase3(state):
     guild = bot.get_guild(state["guild_id"])
     if guild:
         # Remove Phase 3 roles (success and failed roles)
-        success_role = guild.get_role(EVENT_7_SUCCESS_ROLE)
-        failed_role = guild.get_role(EVENT_7_FAILED_ROLE)
-        
-        if success_role:
-            for member in guild.members:
-                if success_role in member.roles:
-                    try:
-                        await member.remove_roles(success_role, reason="Event 7 Phase 3 ended")
-                        print(f"  ↳ Removed success role from {member.name}")
-                    except Exception as e:
-                        print(f"  ↳ Failed to remove success role from {member.name}: {e}")
-        
-        if failed_role:
-            for member in guild.members:
-                if failed_role in member.roles:
-                    try:
-                        await member.remove_roles(failed_role, reason="Event 7 Phase 3 ended")
-                        print(f"  ↳ Removed failed role from {member.name}")
-                    except Exception as e:
-                        print(f"  ↳ Failed to remove failed role from {member.name}: {e}")
+        try:
+            plan = plan_strip_roles(guild, [EVENT_7_SUCCESS_ROLE, EVENT_7_FAILED_ROLE])
+            await apply_role_plan(guild, plan, "Event 7 Phase 3 ended", job_key=f"event7_phase3_end:{guild.id}")
+        except Exception as e:
+            print(f"  ↳ Failed to remove Phase 3 roles: {e}")
     
     # End the event
     active_event = None
@@ -372,7 +348,7 @@ async def start_obedience_event(ctx_or_guild, event_type: int, channel=None):
     
     # Send with @everyone mention
     try:
-        message = await event_channel.send("@everyone", embed=embed)
+        message = await outbound.send(event_channel, "@everyone", embed=embed)
     except Exception as e:
         if hasattr(ctx_or_guild, 'response'):
             await ctx_or_guild.response.send_message(f"Failed to send event message: {e}", ephemeral=True)
@@ -757,6 +733,7 @@ async def handle_event7_phase3(guild, state):
     answered_correctly = state.get("answered_correctly", set())
     answered_incorrectly = state.get("answered_incorrectly", set())
     all_participants = answered_correctly | answered_incorrectly
+    grants = {}
     
     for user_id in all_participants:
         member = guild.get_member(user_id)
@@ -765,20 +742,15 @@ async def handle_event7_phase3(guild, state):
         
         if user_id in answered_correctly:
             successful_users.append(member)
-            if success_role and success_role not in member.roles:
-                try:
-                    await member.add_roles(success_role, reason="Event 7 Phase 2 correct answer")
-                    print(f"  ↳ Assigned success role to {member.name}")
-                except Exception as e:
-                    print(f"  ↳ Failed to assign success role to {member.name}: {e}")
+            grants[user_id] = success_role.id if success_role else None
         else:
             failed_users.append(member)
-            if failed_role and failed_role not in member.roles:
-                try:
-                    await member.add_roles(failed_role, reason="Event 7 Phase 2 failure - no correct answer")
-                    print(f"  ↳ Assigned failed role to {member.name}")
-                except Exception as e:
-                    print(f"  ↳ Failed to assign failed role to {member.name}: {e}")
+            grants[user_id] = failed_role.id if failed_role else None
+    
+    try:
+        await apply_role_plan(guild, plan_grant_roles(grants), "Event 7 Phase 3 results", job_key=f"event7_phase3:{guild.id}")
+    except Exception as e:
+        print(f"  ↳ Failed to assign Phase 3 roles: {e}")
     
     await asyncio.sleep(2)
     
@@ -790,10 +762,10 @@ async def handle_event7_phase3(guild, state):
     failed_channel = guild.get_channel(EVENT_PHASE3_FAILED_CHANNEL_ID)
     
     if success_channel and success_role and successful_users:
-        await success_channel.send(success_role.mention)
+        await outbound.send(success_channel, success_role.mention)
     
     if failed_channel and failed_role and failed_users:
-        await failed_channel.send(failed_role.mention)
+        await outbound.send(failed_channel, failed_role.mention)
     
     await asyncio.sleep(10)
     
@@ -809,7 +781,7 @@ async def handle_event7_phase3(guild, state):
                 "Good puppies like to please properly. My Throne is open.\n\n◊ ¿°ᵛ˘ æ¢ɲ≥[Throne](https://throne.com/lsla/item/1230a476-4752-4409-9583-9313e60686fe) Әᵛæ´. ✁æ ˘ɲ±æ≤ ┍ææ≥, \"˘æ\"¿˘, Әɲ≥",
                 "https://i.imgur.com/Yti9Kss.png"
             )
-            await throne_channel.send(embed=embed)
+            await outbound.send(throne_channel, embed=embed)
             print(f"✅ Sent Phase 3 throne message to success channel {throne_channel.id} ({throne_channel.name})")
     
     asyncio.create_task(end_event7_phase3(state))
@@ -821,8 +793,7 @@ async def send_event7_phase3_failed(guild, failed_users, failed_role):
         return
     
     if failed_role:
-        await channel.send(failed_role.mention)
-        await asyncio.sleep(1)
+        await outbound.send(channel, failed_role.mention, wait=False)
     
     quote_variations = [
         "Look at you. Still trying.",
@@ -861,22 +832,19 @@ async def send_event7_phase3_failed(guild, failed_users, failed_role):
         used_quotes.append(quote)
         used_images.append(image)
         embed = build_event_embed(quote, image)
-        await channel.send(embed=embed)
-        await asyncio.sleep(1)
+        await outbound.send(channel, embed=embed, wait=False)
     
     used_texts = []
     for i in range(12):
         text = random.choice([t for t in text_variations if t not in used_texts])
         used_texts.append(text)
         embed = build_event_embed(text)
-        await channel.send("@everyone", embed=embed)
-        await asyncio.sleep(1)
+        await outbound.send(channel, "@everyone", embed=embed, wait=False)
         
         if (i + 1) % 2 == 0 and failed_users:
             random_users = random.sample(failed_users, min(5, len(failed_users)))
             mentions = " ".join([u.mention for u in random_users])
-            await channel.send(mentions)
-            await asyncio.sleep(1)
+            await outbound.send(channel, mentions, wait=False)
 
 async def send_event7_phase3_success(guild, successful_users, success_role):
     """Send Phase 3 success messages."""
@@ -885,8 +853,7 @@ async def send_event7_phase3_success(guild, successful_users, success_role):
         return
     
     if success_role:
-        await channel.send(success_role.mention)
-        await asyncio.sleep(1)
+        await outbound.send(channel, success_role.mention, wait=False)
     
     quote_variations = [
         "Good… you earned this. Look closely—I don't show just anyone.",
@@ -935,22 +902,19 @@ async def send_event7_phase3_success(guild, successful_users, success_role):
         used_quotes.append(quote)
         used_images.append(image)
         embed = build_event_embed(quote, image)
-        await channel.send(embed=embed)
-        await asyncio.sleep(1)
+        await outbound.send(channel, embed=embed, wait=False)
     
     used_texts = []
     for i in range(12):
         text = random.choice([t for t in text_variations if t not in used_texts])
         used_texts.append(text)
         embed = build_event_embed(text)
-        await channel.send("@everyone", embed=embed)
-        await asyncio.sleep(1)
+        await outbound.send(channel, "@everyone", embed=embed, wait=False)
         
         if (i + 1) % 2 == 0 and successful_users:
             random_users = random.sample(successful_users, min(5, len(successful_users)))
             mentions = " ".join([u.mention for u in random_users])
-            await channel.send(mentions)
-            await asyncio.sleep(1)
+            await outbound.send(channel, mentions, wait=False)
 
 async def handle_event_message(message):
     """Handle messages during active events."""
@@ -3,24 +3,29 @@ Gambling system for coins - V3-style with debt blocking, rank caps, and casino c
 """
 import discord
 import random
+import secrets
 import re
-import datetime
+import json
 import asyncio
 
 from core.config import (
     EVENT_CHANNEL_ID, CASINO_CHANNEL_ID, DEBT_BLOCK_AT, MAX_BET_ABS, 
-    GAMBLING_COOLDOWNS
+    GAMBLING_COOLDOWNS, CASINO_STREAK_TTL, SLOTS_FREE_SPINS_TTL
 )
-from core.db import get_casino_channel_id, get_announcements_channel_id
-from core.data import (
-    increment_gambling_attempt, increment_gambling_win, add_gambling_spent,
-    get_user_economy, take_bet, payout_winnings, get_coins
+from core.db import get_casino_channel_id, get_announcements_channel_id, transaction, _now_iso
+from core import outbound, cooldowns
+from core.locks import economy_lock, economy_locked
+from core.data import get_user_economy, get_coins, rank_for_lce
+from systems.casino_tables import (
+    SLOTS_REEL, CARD_DECK, DIE, ROULETTE_WHEEL, ROULETTE_POCKETS, COINFLIP,
+    SLOTS_BONUS_SYMBOL, SLOTS_FREE_SPIN_AWARDS, SLOTS_FREE_SPIN_RETRIGGER,
+    ROULETTE_COLOR_PAYOUTS, ROULETTE_NUMBER_PAYOUT,
+    BLACKJACK_DEALER_STANDS_ON, BLACKJACK_WIN_PAYOUT, BLACKJACK_NATURAL_PAYOUT,
+    slots_entry, slots_payout
 )
 
-# Global state
-gambling_cooldowns = {}  # {(user_id, game): last_time}
-gambling_streaks = {}  # {user_id: {"streak": int, "last_activity": datetime}}
-slots_free_spins = {}  # {user_id: {"count": int, "total_winnings": int}}
+# Per-user state lives in the cooldown store:
+# "casino" {(user_id, game)}, "casino_streak" {user_id: streak}, "free_spins" {user_id: {"count", "total_winnings"}}
 
 # ===== CASINO EMBED SYSTEM =====
 # Thumbnail URLs
@@ -154,22 +159,22 @@ async def enforce_casino_channel(interaction):
     
     return True, None
 
-async def ensure_ok_to_bet(guild_id, user_id, bet, game):
-    """
-    V3-style bet validation.
-    Returns (ok: bool, error_embed: discord.Embed or None)
-    Checks: bet > 0, debt < DEBT_BLOCK_AT, bet <= min(MAX_BET_ABS, rank_cap), bet <= bal
-    """
-    # Get user economy
-    econ = await get_user_economy(guild_id, user_id)
-    bal = econ["bal"]
-    debt = econ["debt"]
-    rank = econ["rank"]
-    rank_cap = econ["rank_cap"]
-    
-    # Check bet > 0
+def _bet_rejection(bet, bal, debt, rank_cap, check_limits=True):
+    """Why a bet is not allowed (None if it is). Checks: bet > 0, debt, rank cap, balance"""
     if bet <= 0:
-        embed = build_casino_embed(
+        return "invalid"
+    if check_limits and debt >= DEBT_BLOCK_AT:
+        return "debt"
+    if check_limits and bet > min(MAX_BET_ABS, rank_cap):
+        return "cap"
+    if bet > bal:
+        return "funds"
+    return None
+
+def bet_rejection_embed(reason, bet, bal, debt, rank_cap):
+    """Build the casino embed explaining a rejected bet"""
+    if reason == "invalid":
+        return build_casino_embed(
             kind="info",
             outcome=None,
             title="ℹ️ Invalid Bet",
@@ -179,11 +184,9 @@ async def ensure_ok_to_bet(guild_id, user_id, bet, game):
             ],
             footer_text="Bets must be positive integers."
         )
-        return False, embed
     
-    # Debt block
-    if debt >= DEBT_BLOCK_AT:
-        embed = build_casino_embed(
+    if reason == "debt":
+        return build_casino_embed(
             kind="info",
             outcome=None,
             title="ℹ️ Gambling Locked",
@@ -194,12 +197,9 @@ async def ensure_ok_to_bet(guild_id, user_id, bet, game):
             ],
             footer_text="Clear debt to regain casino access."
         )
-        return False, embed
     
-    # Rank bet cap
-    effective_cap = min(MAX_BET_ABS, rank_cap)
-    if bet > effective_cap:
-        embed = build_casino_embed(
+    if reason == "cap":
+        return build_casino_embed(
             kind="info",
             outcome=None,
             title="ℹ️ Bet Limit Reached",
@@ -211,59 +211,177 @@ async def ensure_ok_to_bet(guild_id, user_id, bet, game):
             ],
             footer_text="Caps are based on Lifetime Coins Earned (LCE)."
         )
-        return False, embed
-    
-    # Insufficient funds
-    if bet > bal:
-        embed = build_casino_embed(
-            kind="info",
-            outcome=None,
-            title="ℹ️ Insufficient Funds",
-            description=f"You only have **{bal}** coins.",
-            fields=[
-                {"name": "Required", "value": f"**{bet}**", "inline": True},
-                {"name": "Available", "value": f"**{bal}**", "inline": True}
-            ],
-            footer_text="Earn more coins to place larger bets."
-        )
-        return False, embed
     
+    return build_casino_embed(
+        kind="info",
+        outcome=None,
+        title="ℹ️ Insufficient Funds",
+        description=f"You only have **{bal}** coins.",
+        fields=[
+            {"name": "Required", "value": f"**{bet}**", "inline": True},
+            {"name": "Available", "value": f"**{bal}**", "inline": True}
+        ],
+        footer_text="Earn more coins to place larger bets."
+    )
+
+async def ensure_ok_to_bet(guild_id, user_id, bet, game):
+    """
+    V3-style bet validation.
+    Returns (ok: bool, error_embed: discord.Embed or None)
+    Checks: bet > 0, debt < DEBT_BLOCK_AT, bet <= min(MAX_BET_ABS, rank_cap), bet <= bal
+    """
+    econ = await get_user_economy(guild_id, user_id)
+    reason = _bet_rejection(bet, econ["bal"], econ["debt"], econ["rank_cap"])
+    if reason:
+        return False, bet_rejection_embed(reason, bet, econ["bal"], econ["debt"], econ["rank_cap"])
     return True, None
 
+# ===== ROUND SETTLEMENT =====
+# Outcome codes stored in casino_rounds.outcome
+OUTCOME_WIN = "win"
+OUTCOME_LOSS = "loss"
+OUTCOME_PUSH = "push"
+OUTCOME_BONUS = "bonus"
+
+def new_round_rng():
+    """Seeded RNG for one round. Returns (seed, rng); the seed is stored with the round so it can be replayed"""
+    seed = secrets.randbits(63)
+    return seed, random.Random(seed)
+
+async def _load_wallet(conn, guild_id, user_id):
+    """Balance, LCE and debt in one query"""
+    async with conn.execute(
+        """SELECT
+               (SELECT coins_balance FROM economy_balance WHERE guild_id = ?1 AND user_id = ?2) AS bal,
+               (SELECT coins_lifetime_earned FROM economy_balance WHERE guild_id = ?1 AND user_id = ?2) AS lce,
+               (SELECT debt FROM discipline_state WHERE guild_id = ?1 AND user_id = ?2) AS debt""",
+        (guild_id, user_id)
+    ) as cursor:
+        row = await cursor.fetchone()
+    bal = row["bal"] or 0
+    lce = row["lce"] or 0
+    debt = row["debt"] or 0
+    rank, rank_cap = rank_for_lce(lce)
+    return {"bal": bal, "lce": lce, "debt": debt, "rank": rank, "rank_cap": rank_cap}
+
+async def _apply_round(conn, guild_id, user_id, now, debit, payout, stats, meta):
+    """Move coins, bump gambling stats and write ledger rows inside an open transaction. Returns new balance"""
+    net = payout - debit
+    await conn.execute(
+        """INSERT INTO economy_balance (guild_id, user_id, coins_balance, coins_lifetime_earned, coins_lifetime_burned, updated_at)
+           VALUES (?, ?, MAX(0, ?), ?, ?, ?)
+           ON CONFLICT(guild_id, user_id) DO UPDATE SET
+               coins_balance = MAX(0, coins_balance + ?),
+               coins_lifetime_earned = coins_lifetime_earned + excluded.coins_lifetime_earned,
+               coins_lifetime_burned = coins_lifetime_burned + excluded.coins_lifetime_burned,
+               updated_at = excluded.updated_at""",
+        (guild_id, user_id, net, payout, debit, now, net)
+    )
+    async with conn.execute(
+        "SELECT coins_balance FROM economy_balance WHERE guild_id = ? AND user_id = ?",
+        (guild_id, user_id)
+    ) as cursor:
+        balance = (await cursor.fetchone())["coins_balance"]
+    
+    await conn.execute(
+        """INSERT INTO user_profile (guild_id, user_id, coins, times_gambled, total_wins, total_spent, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(guild_id, user_id) DO UPDATE SET
+               coins = excluded.coins,
+               times_gambled = times_gambled + excluded.times_gambled,
+               total_wins = total_wins + excluded.total_wins,
+               total_spent = total_spent + excluded.total_spent,
+               updated_at = excluded.updated_at""",
+        (guild_id, user_id, balance, stats["attempts"], stats["wins"], stats["spent"], now)
+    )
+    
+    meta_json = json.dumps(meta)
+    ledger_rows = []
+    if debit:
+        ledger_rows.append((guild_id, user_id, now, "casino_bet", -debit, meta_json))
+    if payout:
+        ledger_rows.append((guild_id, user_id, now, "casino_payout", payout, meta_json))
+    if ledger_rows:
+        await conn.executemany(
+            "INSERT INTO economy_ledger (guild_id, user_id, ts, type, amount, meta_json) VALUES (?, ?, ?, ?, ?, ?)",
+            ledger_rows
+        )
+    return balance
+
+async def _ingest_round_ledger(guild_id, user_id, debit, payout):
+    """Feed settled casino ledger entries to live order progress and leaderboards (after commit)"""
+    from systems.orders import ingest_ledger
+    from systems.leaderboards import mark_dirty
+    mark_dirty(guild_id, user_id, ("coins", "rank"))
+    if debit:
+        await ingest_ledger(guild_id, user_id, "casino_bet", -debit)
+    if payout:
+        await ingest_ledger(guild_id, user_id, "casino_payout", payout)
+
+async def reserve_stake(guild_id, user_id, game, amount, check_limits=True):
+    """
+    Validate and debit a stake for a round that settles later (blackjack deal/double), in one transaction.
+    Returns {"ok", "balance"} or {"ok": False, "reason", "bal", "debt", "rank_cap"}.
+    """
+    gid = int(guild_id) if guild_id else 0
+    uid = int(user_id)
+    now = _now_iso()
+    async with economy_lock(gid, uid, command=game):
+        async with transaction() as conn:
+            wallet = await _load_wallet(conn, gid, uid)
+            reason = _bet_rejection(amount, wallet["bal"], wallet["debt"], wallet["rank_cap"], check_limits)
+            if reason:
+                return {"ok": False, "reason": reason, **wallet}
+            stats = {"attempts": 0, "wins": 0, "spent": amount}
+            balance = await _apply_round(conn, gid, uid, now, amount, 0, stats, {"game": game, "stage": "stake"})
+        await _ingest_round_ledger(gid, uid, amount, 0)
+    return {"ok": True, "balance": balance}
+
+async def settle_round(guild_id, user_id, game, bet, payout, outcome, seed=None, prepaid=0, check_limits=True):
+    """
+    Settle one casino round atomically: validate, debit the unpaid stake, credit the payout,
+    update gambling stats and ledger, and append a casino_rounds row - one transaction, one commit.
+    prepaid: part of bet already debited through reserve_stake.
+    Returns {"ok", "round_id", "balance", "net"} or {"ok": False, "reason", "bal", "debt", "rank_cap"}.
+    """
+    gid = int(guild_id) if guild_id else 0
+    uid = int(user_id)
+    debit = max(0, bet - prepaid)
+    now = _now_iso()
+    async with economy_lock(gid, uid, command=game):
+        async with transaction() as conn:
+            if debit:
+                wallet = await _load_wallet(conn, gid, uid)
+                reason = _bet_rejection(debit, wallet["bal"], wallet["debt"], wallet["rank_cap"], check_limits)
+                if reason:
+                    return {"ok": False, "reason": reason, **wallet}
+            
+            cursor = await conn.execute(
+                "INSERT INTO casino_rounds (guild_id, user_id, ts, game, bet, payout, outcome, seed) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (gid, uid, now, game, bet, payout, outcome, seed)
+            )
+            round_id = cursor.lastrowid
+            await cursor.close()
+            
+            stats = {"attempts": 1, "wins": 1 if outcome == OUTCOME_WIN else 0, "spent": debit}
+            balance = await _apply_round(conn, gid, uid, now, debit, payout, stats, {"game": game, "round_id": round_id})
+        await _ingest_round_ledger(gid, uid, debit, payout)
+    return {"ok": True, "round_id": round_id, "balance": balance, "net": payout - bet}
+
 def check_game_cooldown(user_id, game):
     """
     Check if user is on cooldown for a specific game.
     Returns (on_cooldown, seconds_remaining).
     """
-    key = (user_id, game)
-    if key not in gambling_cooldowns:
+    seconds_left = cooldowns.remaining("casino", (user_id, game))
+    if seconds_left <= 0:
         return False, 0
     
-    last_time = gambling_cooldowns[key]
-    cooldown_seconds = GAMBLING_COOLDOWNS.get(game, 10)
-    time_since = (datetime.datetime.now(datetime.UTC) - last_time).total_seconds()
-    
-    if time_since >= cooldown_seconds:
-        return False, 0
-    
-    return True, int(cooldown_seconds - time_since)
+    return True, int(seconds_left)
 
 def update_game_cooldown(user_id, game):
     """Update cooldown for a specific game."""
-    key = (user_id, game)
-    gambling_cooldowns[key] = datetime.datetime.now(datetime.UTC)
-
-# Slots configuration
-SLOTS_SYMBOLS = {
-    "🥝": {"multiplier": 1.5, "weight": 28},
-    "🍇": {"multiplier": 2, "weight": 22},
-    "🍋": {"multiplier": 3, "weight": 18},
-    "🍑": {"multiplier": 5, "weight": 12},
-    "🍉": {"multiplier": 8, "weight": 8},
-    "🍒": {"multiplier": 15, "weight": 4},
-    "👑": {"multiplier": 30, "weight": 2},
-    "🎁": {"multiplier": 0, "weight": 2},  # Bonus symbol
-}
+    cooldowns.put("casino", (user_id, game), GAMBLING_COOLDOWNS.get(game, 10))
 
 # Bot instance and events_enabled flag (set by main.py)
 bot = None
@@ -281,83 +399,43 @@ def set_events_enabled(enabled: bool):
 
 def update_gambling_streak(user_id, won):
     """Update gambling streak for user. Returns streak count.
-    Streaks do not reset after inactivity - they persist until broken by opposite outcome.
+    Streaks persist until broken by opposite outcome (or CASINO_STREAK_TTL without playing).
     """
-    now = datetime.datetime.now(datetime.UTC)
-    
-    if user_id not in gambling_streaks:
-        gambling_streaks[user_id] = {"streak": 0, "last_activity": now}
-    
-    streak_data = gambling_streaks[user_id]
-    
-    # Streaks persist - do NOT reset after inactivity
+    streak = cooldowns.get("casino_streak", user_id, 0)
     
     # Update streak
     if won:
-        if streak_data["streak"] < 0:
-            streak_data["streak"] = 1  # Break cold streak
+        if streak < 0:
+            streak = 1  # Break cold streak
         else:
-            streak_data["streak"] += 1
+            streak += 1
     else:
-        if streak_data["streak"] > 0:
-            streak_data["streak"] = -1  # Break hot streak
+        if streak > 0:
+            streak = -1  # Break hot streak
         else:
-            streak_data["streak"] -= 1
+            streak -= 1
     
-    streak_data["last_activity"] = now
-    return streak_data["streak"]
+    cooldowns.put("casino_streak", user_id, CASINO_STREAK_TTL, streak)
+    return streak
+
+def get_free_spins(user_id) -> dict:
+    """Free spin state for user (a copy; save changes with save_free_spins)."""
+    return dict(cooldowns.get("free_spins", user_id) or {"count": 0, "total_winnings": 0})
 
-def spin_slots_reels():
+def save_free_spins(user_id, free_spin_data):
+    """Persist free spin state for user (cleared once no spins are left)."""
+    if free_spin_data is None:
+        cooldowns.clear("free_spins", user_id)
+        return
+    cooldowns.put("free_spins", user_id, SLOTS_FREE_SPINS_TTL, free_spin_data, urgent=True)
+
+def spin_slots_reels(rng=None):
     """Spin the slots reels and return [symbol1, symbol2, symbol3]."""
-    weighted_symbols = []
-    for symbol, data in SLOTS_SYMBOLS.items():
-        weighted_symbols.extend([symbol] * data["weight"])
-    
-    return [secrets.choice(weighted_symbols) for _ in range(3)]
+    return SLOTS_REEL.sample(3, rng)
 
 def calculate_slots_payout(reels, bet):
-    """Calculate slots payout. Returns (payout, win_type, message)."""
-    # Check for 3-of-a-kind
-    if reels[0] == reels[1] == reels[2]:
-        symbol = reels[0]
-        if symbol == "🎁":
-            return (0, "mega_bonus", "🎁 You gained 5 Free Spins")
-        
-        multiplier = SLOTS_SYMBOLS[symbol]["multiplier"]
-        payout = int(bet * multiplier)
-        return (payout, "win", f"Win x{multiplier}")
-    
-    # Check for 2-of-a-kind (small win)
-    if reels[0] == reels[1] or reels[1] == reels[2] or reels[0] == reels[2]:
-        if reels[0] == reels[1]:
-            symbol = reels[0]
-        elif reels[1] == reels[2]:
-            symbol = reels[1]
-        else:
-            symbol = reels[0]
-        
-        if symbol != "🎁" and SLOTS_SYMBOLS[symbol]["multiplier"] > 0:
-            multiplier = 0.5
-            loss_amount = int(bet * multiplier)
-            return (0, "loss", f"Lost {loss_amount} coins")
-    
-    # Check for bonus symbols
-    bonus_count = reels.count("🎁")
-    if bonus_count == 2:
-        return (250, "big_bonus", "🎁 You gained 2 Free Spins\n\nBonus payout: +250 chips")
-    elif bonus_count == 1:
-        other_symbols = [s for s in reels if s != "🎁"]
-        if len(set(other_symbols)) == 1:
-            symbol = other_symbols[0]
-            if symbol in SLOTS_SYMBOLS and SLOTS_SYMBOLS[symbol]["multiplier"] > 0:
-                multiplier = 0.8
-                payout = int(bet * multiplier)
-                return (payout, "bonus_win", f"Win x{multiplier}")
-        else:
-            return (0, "mini_bonus", "🎁 Bonus payout: +0 coins")
-    
-    # No win
-    return (0, "loss", None)
+    """Calculate slots payout from the precomputed 8³ table. Returns (payout, win_type, message)."""
+    return slots_payout(slots_entry(reels), bet)
 
 async def send_jackpot_announcement(guild, user, reels=None, bet=None, payout=None, net=None):
     """
@@ -396,7 +474,7 @@ async def send_jackpot_announcement(guild, user, reels=None, bet=None, payout=No
         )
     
     try:
-        await event_channel.send("@everyone", embed=embed)
+        await outbound.send(event_channel, "@everyone", embed=embed)
         print(f"✅ Jackpot announcement sent for {user.name} to {event_channel.name}")
         return True
     except Exception as e:
@@ -406,6 +484,7 @@ async def send_jackpot_announcement(guild, user, reels=None, bet=None, payout=No
 # Note: Commands will be registered in commands/user_commands.py
 # These are the command functions that will be imported there
 
+@economy_locked("gamble")
 async def gamble(interaction: discord.Interaction, bet: int):
     """Gamble coins - 49/51 chance to double or lose (V3-compliant)."""
     from commands.user_commands import check_user_command_permissions
@@ -445,11 +524,16 @@ async def gamble(interaction: discord.Interaction, bet: int):
         await interaction.response.send_message(embed=embed, ephemeral=True)
         return
     
-    # V3: Validate bet (debt, rank cap, balance)
-    ok, error_embed = await ensure_ok_to_bet(guild_id, user_id, bet, "coinflip")
-    if not ok:
+    # V3: Determine outcome (49/51 house edge), then validate + settle in one transaction
+    seed, rng = new_round_rng()
+    won = COINFLIP.draw(rng)
+    payout = bet * 2 if won else 0
+    result = await settle_round(guild_id, user_id, "coinflip", bet, payout, OUTCOME_WIN if won else OUTCOME_LOSS, seed=seed)
+    if not result["ok"]:
+        error_embed = bet_rejection_embed(result["reason"], bet, result["bal"], result["debt"], result["rank_cap"])
         await interaction.response.send_message(embed=error_embed, ephemeral=True)
         return
+    new_balance = result["balance"]
     
     big_bet_messages = [
         "So confident. If luck favors you, I'll have a little present ready.",
@@ -472,25 +556,10 @@ async def gamble(interaction: discord.Interaction, bet: int):
     else:
         await interaction.response.defer()
     
-    # V3: Subtract bet immediately
-    await take_bet(guild_id, user_id, bet)
-    await increment_gambling_attempt(user_id, guild_id=guild_id)
-    await add_gambling_spent(user_id, bet, guild_id=guild_id)
-    
-    # V3: Determine outcome (49/51 house edge)
-    won = random.random() < 0.49
     update_game_cooldown(user_id, "coinflip")
     streak = update_gambling_streak(user_id, won)
     
-    # Get new balance for display
-    econ = await get_user_economy(guild_id, user_id)
-    new_balance = econ["bal"]
-    
     if won:
-        await increment_gambling_win(user_id, guild_id=guild_id)
-        # V3: Payout adds to balance AND lifetime earned
-        payout = bet * 2
-        await payout_winnings(guild_id, user_id, payout)
         net_gain = payout - bet
         
         embed = build_casino_embed(
@@ -512,7 +581,7 @@ async def gamble(interaction: discord.Interaction, bet: int):
         # Big bet bonus: send DM with image
         if is_big_bet:
             try:
-                user = await bot.fetch_user(user_id)
+                user = bot.get_user(user_id) or await bot.fetch_user(user_id)
                 image_variations = [
                     "https://i.imgur.com/GcH758a.png",
                     "https://i.imgur.com/jMcRIoX.png",
@@ -526,11 +595,10 @@ async def gamble(interaction: discord.Interaction, bet: int):
                     color=0xff000d,
                 )
                 dm_embed.set_image(url=random.choice(image_variations))
-                await user.send(embed=dm_embed)
+                await outbound.send(user, embed=dm_embed, priority=outbound.PRIORITY_DM, wait=False)
             except:
                 pass
     else:
-        # V3: Loss already handled by take_bet at start
         embed = build_casino_embed(
             kind="loss",
             outcome=-bet,
@@ -547,6 +615,7 @@ async def gamble(interaction: discord.Interaction, bet: int):
         # V3: Public output in casino with ping
         await interaction.followup.send(content=f"<@{user_id}>", embed=embed)
 
+@economy_locked("dice")
 async def dice(interaction: discord.Interaction, bet: int):
     """Roll dice - win if your roll > dealer roll (V3-compliant)."""
     from commands.user_commands import check_user_command_permissions
@@ -586,33 +655,28 @@ async def dice(interaction: discord.Interaction, bet: int):
         await interaction.response.send_message(embed=embed, ephemeral=True)
         return
     
-    # V3: Validate bet
-    ok, error_embed = await ensure_ok_to_bet(guild_id, user_id, bet, "dice")
-    if not ok:
+    # V3: Roll, then validate + settle in one transaction (tie refunds the bet)
+    seed, rng = new_round_rng()
+    user_roll, dealer_roll = DIE.sample(2, rng)
+    if user_roll > dealer_roll:
+        payout, outcome = bet * 2, OUTCOME_WIN
+    elif user_roll < dealer_roll:
+        payout, outcome = 0, OUTCOME_LOSS
+    else:
+        payout, outcome = bet, OUTCOME_PUSH
+    
+    result = await settle_round(guild_id, user_id, "dice", bet, payout, outcome, seed=seed)
+    if not result["ok"]:
+        error_embed = bet_rejection_embed(result["reason"], bet, result["bal"], result["debt"], result["rank_cap"])
         await interaction.response.send_message(embed=error_embed, ephemeral=True)
         return
+    new_balance = result["balance"]
     
     await interaction.response.defer()
     
-    # V3: Take bet immediately
-    await take_bet(guild_id, user_id, bet)
-    await increment_gambling_attempt(user_id, guild_id=guild_id)
-    await add_gambling_spent(user_id, bet, guild_id=guild_id)
-    
-    user_roll = random.randint(1, 6)
-    dealer_roll = random.randint(1, 6)
-    
     update_game_cooldown(user_id, "dice")
     
-    # Get new balance for display
-    econ = await get_user_economy(guild_id, user_id)
-    new_balance = econ["bal"]
-    
-    if user_roll > dealer_roll:
-        await increment_gambling_win(user_id, guild_id=guild_id)
-        # V3: Payout
-        payout = bet * 2
-        await payout_winnings(guild_id, user_id, payout)
+    if outcome == OUTCOME_WIN:
         streak = update_gambling_streak(user_id, True)
         net_gain = payout - bet
         
@@ -631,8 +695,7 @@ async def dice(interaction: discord.Interaction, bet: int):
             cooldown=GAMBLING_COOLDOWNS.get("dice", 10)
         )
         await interaction.followup.send(content=f"<@{user_id}>", embed=embed)
-    elif user_roll < dealer_roll:
-        # V3: Loss already handled by take_bet
+    elif outcome == OUTCOME_LOSS:
         streak = update_gambling_streak(user_id, False)
         
         embed = build_casino_embed(
@@ -651,8 +714,7 @@ async def dice(interaction: discord.Interaction, bet: int):
         )
         await interaction.followup.send(content=f"<@{user_id}>", embed=embed)
     else:
-        # V3: Tie - refund bet
-        await payout_winnings(guild_id, user_id, bet)
+        # V3: Tie - bet refunded by settle_round
         streak = update_gambling_streak(user_id, False)  # Tie doesn't count as win for streak
         
         embed = build_casino_embed(
@@ -671,6 +733,7 @@ async def dice(interaction: discord.Interaction, bet: int):
         )
         await interaction.followup.send(content=f"<@{user_id}>", embed=embed)
 
+@economy_locked("slots")
 async def slots_bet(interaction: discord.Interaction, bet: int):
     """Play slots with a bet (V3-compliant)."""
     from commands.user_commands import check_user_command_permissions
@@ -710,40 +773,32 @@ async def slots_bet(interaction: discord.Interaction, bet: int):
         await interaction.response.send_message(embed=embed, ephemeral=True)
         return
     
-    # V3: Validate bet
-    ok, error_embed = await ensure_ok_to_bet(guild_id, user_id, bet, "slots")
-    if not ok:
+    # V3: Spin, then validate + settle in one transaction
+    seed, rng = new_round_rng()
+    reels = spin_slots_reels(rng)
+    payout, win_type, message = calculate_slots_payout(reels, bet)
+    if win_type in ["win", "bonus_win"]:
+        outcome = OUTCOME_WIN
+    elif win_type == "loss":
+        outcome = OUTCOME_LOSS
+    else:
+        outcome = OUTCOME_BONUS
+    
+    result = await settle_round(guild_id, user_id, "slots", bet, payout, outcome, seed=seed)
+    if not result["ok"]:
+        error_embed = bet_rejection_embed(result["reason"], bet, result["bal"], result["debt"], result["rank_cap"])
         await interaction.response.send_message(embed=error_embed, ephemeral=True)
         return
+    new_balance = result["balance"]
     
     await interaction.response.defer()
     
-    # V3: Take bet immediately
-    await take_bet(guild_id, user_id, bet)
-    await increment_gambling_attempt(user_id, guild_id=guild_id)
-    await add_gambling_spent(user_id, bet, guild_id=guild_id)
-    
-    reels = spin_slots_reels()
-    payout, win_type, message = calculate_slots_payout(reels, bet)
-    
     update_game_cooldown(user_id, "slots")
     
-    # Get new balance for display
-    econ = await get_user_economy(guild_id, user_id)
-    new_balance = econ["bal"]
-    
-    # V3: Handle payouts
-    if win_type in ["win", "bonus_win"]:
-        await increment_gambling_win(user_id, guild_id=guild_id)
-        await payout_winnings(guild_id, user_id, payout)
+    if outcome == OUTCOME_WIN:
         streak = update_gambling_streak(user_id, True)
-    elif win_type == "loss":
-        # V3: Loss already handled by take_bet
+    elif outcome == OUTCOME_LOSS:
         streak = update_gambling_streak(user_id, False)
-    elif payout > 0:
-        # Bonus payouts
-        await payout_winnings(guild_id, user_id, payout)
-        streak = 0
     else:
         streak = 0
     
@@ -845,9 +900,9 @@ async def slots_bet(interaction: discord.Interaction, bet: int):
             cooldown=GAMBLING_COOLDOWNS.get("slots", 15)
         )
     elif win_type == "big_bonus":
-        free_spin_data = slots_free_spins.get(user_id, {"count": 0, "total_winnings": 0})
-        free_spin_data["count"] = free_spin_data.get("count", 0) + 2
-        slots_free_spins[user_id] = free_spin_data
+        free_spin_data = get_free_spins(user_id)
+        free_spin_data["count"] = free_spin_data.get("count", 0) + SLOTS_FREE_SPIN_AWARDS["big_bonus"]
+        save_free_spins(user_id, free_spin_data)
         net_gain = payout - bet
         embed = build_casino_embed(
             kind="win",
@@ -864,9 +919,9 @@ async def slots_bet(interaction: discord.Interaction, bet: int):
             cooldown=GAMBLING_COOLDOWNS.get("slots", 15)
         )
     elif win_type == "mega_bonus":
-        free_spin_data = slots_free_spins.get(user_id, {"count": 0, "total_winnings": 0})
-        free_spin_data["count"] = free_spin_data.get("count", 0) + 5
-        slots_free_spins[user_id] = free_spin_data
+        free_spin_data = get_free_spins(user_id)
+        free_spin_data["count"] = free_spin_data.get("count", 0) + SLOTS_FREE_SPIN_AWARDS["mega_bonus"]
+        save_free_spins(user_id, free_spin_data)
         net_loss = -bet  # Lost bet, got free spins
         embed = build_casino_embed(
             kind="neutral",
@@ -885,6 +940,7 @@ async def slots_bet(interaction: discord.Interaction, bet: int):
     # V3: Public output in casino with ping
     await interaction.followup.send(content=f"<@{user_id}>", embed=embed)
 
+@economy_locked("slots_free")
 async def slots_free(interaction: discord.Interaction):
     """Use a free spin (V3-compliant)."""
     from commands.user_commands import check_user_command_permissions
@@ -910,7 +966,7 @@ async def slots_free(interaction: discord.Interaction):
     
     user_id = interaction.user.id
     
-    free_spin_data = slots_free_spins.get(user_id, {"count": 0, "total_winnings": 0})
+    free_spin_data = get_free_spins(user_id)
     free_spins = free_spin_data.get("count", 0)
     if free_spins <= 0:
         embed = build_casino_embed(
@@ -928,33 +984,25 @@ async def slots_free(interaction: discord.Interaction):
     free_spin_data["count"] = free_spins - 1
     remaining = free_spin_data["count"]
     
-    reels = spin_slots_reels()
+    seed, rng = new_round_rng()
+    reels = spin_slots_reels(rng)
     payout, win_type, message = calculate_slots_payout(reels, 0)
     
     if payout > 0:
         free_spin_data["total_winnings"] = free_spin_data.get("total_winnings", 0) + payout
     
-    bonus_count = reels.count("🎁")
-    if bonus_count == 3:
-        free_spin_data["count"] += 3
-        remaining = free_spin_data["count"]
-    elif bonus_count == 2:
-        free_spin_data["count"] += 2
-        remaining = free_spin_data["count"]
-    elif bonus_count == 1:
-        free_spin_data["count"] += 1
+    bonus_count = reels.count(SLOTS_BONUS_SYMBOL)
+    if bonus_count:
+        free_spin_data["count"] += SLOTS_FREE_SPIN_RETRIGGER[bonus_count]
         remaining = free_spin_data["count"]
     
-    slots_free_spins[user_id] = free_spin_data
+    save_free_spins(user_id, free_spin_data)
     
     guild_id = interaction.guild.id if interaction.guild else 0
-    # V3: Payout for free spins also adds to LCE
-    if payout > 0:
-        await payout_winnings(guild_id, user_id, payout)
-    
-    # Get new balance for display
-    econ = await get_user_economy(guild_id, user_id)
-    new_balance = econ["bal"]
+    # V3: Payout for free spins also adds to LCE (no stake, so nothing to validate)
+    outcome = OUTCOME_WIN if payout > 0 else (OUTCOME_BONUS if bonus_count else OUTCOME_LOSS)
+    result = await settle_round(guild_id, user_id, "slots_free", 0, payout, outcome, seed=seed)
+    new_balance = result["balance"]
     
     if remaining == 0:
         total_winnings = free_spin_data.get("total_winnings", 0)
@@ -969,7 +1017,7 @@ async def slots_free(interaction: discord.Interaction):
             ],
             cooldown=GAMBLING_COOLDOWNS.get("slots", 15)
         )
-        slots_free_spins.pop(user_id, None)
+        save_free_spins(user_id, None)
     else:
         if bonus_count > 0:
             bonus_messages = {
@@ -1017,6 +1065,7 @@ async def slots_free(interaction: discord.Interaction):
     # V3: Public output in casino with ping
     await interaction.followup.send(content=f"<@{user_id}>", embed=embed)
 
+@economy_locked("roulette")
 async def roulette(interaction: discord.Interaction, bet: int, choice: str):
     """Roulette - bet on red/black/green/number (V3-compliant)."""
     from commands.user_commands import check_user_command_permissions
@@ -1056,12 +1105,6 @@ async def roulette(interaction: discord.Interaction, bet: int, choice: str):
         await interaction.response.send_message(embed=embed, ephemeral=True)
         return
     
-    # V3: Validate bet
-    ok, error_embed = await ensure_ok_to_bet(guild_id, user_id, bet, "roulette")
-    if not ok:
-        await interaction.response.send_message(embed=error_embed, ephemeral=True)
-        return
-    
     # Validate choice
     choice_lower = choice.lower()
     valid_choices = ["red", "black", "green", "0"]
@@ -1078,35 +1121,10 @@ async def roulette(interaction: discord.Interaction, bet: int, choice: str):
         await interaction.response.send_message(embed=embed, ephemeral=True)
         return
     
-    await interaction.response.defer()
-    
-    # V3: Take bet immediately
-    await take_bet(guild_id, user_id, bet)
-    await increment_gambling_attempt(user_id, guild_id=guild_id)
-    await add_gambling_spent(user_id, bet, guild_id=guild_id)
-    
     # Spin roulette
-    outcome_num = random.randint(0, 36)
-    
-    # Determine color
-    if outcome_num == 0:
-        outcome_color = "green"
-        outcome_display = "🟢 0"
-    else:
-        # European roulette: reds are 1,3,5,7,9,12,14,16,18,19,21,23,25,27,30,32,34,36
-        reds = {1,3,5,7,9,12,14,16,18,19,21,23,25,27,30,32,34,36}
-        if outcome_num in reds:
-            outcome_color = "red"
-            outcome_display = f"🔴 {outcome_num}"
-        else:
-            outcome_color = "black"
-            outcome_display = f"⚫ {outcome_num}"
-    
-    update_game_cooldown(user_id, "roulette")
-    
-    # Get new balance for display
-    econ = await get_user_economy(guild_id, user_id)
-    new_balance = econ["bal"]
+    seed, rng = new_round_rng()
+    outcome_num = ROULETTE_WHEEL.draw(rng)
+    outcome_color, outcome_display = ROULETTE_POCKETS[outcome_num]
     
     won = False
     payout = 0
@@ -1115,18 +1133,25 @@ async def roulette(interaction: discord.Interaction, bet: int, choice: str):
     if choice_lower == outcome_color:
         # Color match
         won = True
-        if outcome_color == "green":
-            payout = bet * 14  # Green pays 14x
-        else:
-            payout = bet * 2  # Red/Black pays 2x
+        payout = bet * ROULETTE_COLOR_PAYOUTS[outcome_color]  # Red/Black 2x, Green 14x
     elif choice == str(outcome_num):
         # Number match
         won = True
-        payout = bet * 36
+        payout = bet * ROULETTE_NUMBER_PAYOUT
+    
+    # V3: Validate + settle in one transaction
+    result = await settle_round(guild_id, user_id, "roulette", bet, payout, OUTCOME_WIN if won else OUTCOME_LOSS, seed=seed)
+    if not result["ok"]:
+        error_embed = bet_rejection_embed(result["reason"], bet, result["bal"], result["debt"], result["rank_cap"])
+        await interaction.response.send_message(embed=error_embed, ephemeral=True)
+        return
+    new_balance = result["balance"]
+    
+    await interaction.response.defer()
+    
+    update_game_cooldown(user_id, "roulette")
     
     if won:
-        await increment_gambling_win(user_id, guild_id=guild_id)
-        await payout_winnings(guild_id, user_id, payout)
         streak = update_gambling_streak(user_id, True)
         net_gain = payout - bet
         multiplier = payout // bet if bet > 0 else 0
@@ -1147,7 +1172,6 @@ async def roulette(interaction: discord.Interaction, bet: int, choice: str):
             cooldown=GAMBLING_COOLDOWNS.get("roulette", 20)
         )
     else:
-        # V3: Loss already handled by take_bet
         streak = update_gambling_streak(user_id, False)
         
         embed = build_casino_embed(
@@ -1171,6 +1195,7 @@ async def coinflip(interaction: discord.Interaction, bet: int):
     """Coin flip - same as gamble (49/51 chance, V3-compliant)."""
     await gamble(interaction, bet)
 
+@economy_locked("allin")
 async def allin(interaction: discord.Interaction, game: str):
     """Go all-in on a game (bet all coins)."""
     from commands.user_commands import check_user_command_permissions
@@ -1208,13 +1233,15 @@ async def allin(interaction: discord.Interaction, game: str):
 class BlackjackView(discord.ui.View):
     """Interactive blackjack view with Hit/Stand/Double buttons"""
     
-    def __init__(self, user_id, guild_id, bet, dealer_hand, player_hand):
+    def __init__(self, user_id, guild_id, bet, dealer_hand, player_hand, rng=None, seed=None):
         super().__init__(timeout=60)
         self.user_id = user_id
         self.guild_id = guild_id
-        self.bet = bet
+        self.bet = bet  # Already staked through reserve_stake
         self.dealer_hand = dealer_hand
         self.player_hand = player_hand
+        self.rng = rng
+        self.seed = seed
         self.settled = False
     
     def interaction_check(self, interaction: discord.Interaction) -> bool:
@@ -1223,98 +1250,102 @@ class BlackjackView(discord.ui.View):
     
     @discord.ui.button(label="Hit", style=discord.ButtonStyle.primary, emoji="🎯")
     async def hit_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.settled:
-            await interaction.response.defer()
-            return
-        
-        # Draw card
-        self.player_hand.append(draw_card())
-        player_value = calculate_hand_value(self.player_hand)
-        
-        if player_value > 21:
-            # Bust - loss already handled by take_bet
-            self.settled = True
-            await increment_gambling_attempt(self.user_id, guild_id=self.guild_id)
+        async with economy_lock(self.guild_id, self.user_id, command="blackjack_hit"):
+            if self.settled:
+                await interaction.response.defer()
+                return
             
-            # Get balance for display
-            econ = await get_user_economy(self.guild_id, self.user_id)
-            new_balance = econ["bal"]
+            # Draw card
+            self.player_hand.append(draw_card(self.rng))
+            player_value = calculate_hand_value(self.player_hand)
             
-            embed = build_casino_embed(
-                kind="loss",
-                outcome=-self.bet,
-                title="🃏 Blackjack — LOSS",
-                description=f"**{interaction.user.display_name}** loses.",
-                fields=[
-                    {"name": "Your Hand", "value": f"{format_hand(self.player_hand)}  (**{player_value}**)", "inline": False},
-                    {"name": "Dealer Hand", "value": f"{format_hand(self.dealer_hand)}", "inline": False},
-                    {"name": "Net", "value": f"**-{self.bet}**", "inline": True},
-                    {"name": "New Balance", "value": f"**{new_balance}**", "inline": True}
-                ],
-                cooldown=GAMBLING_COOLDOWNS.get("blackjack", 30)
-            )
-            await interaction.response.edit_message(embed=embed, view=None)
-        else:
-            embed = build_casino_embed(
-                kind="neutral",
-                outcome=None,
-                title="🃏 Blackjack",
-                description=f"**{interaction.user.display_name}** plays **{self.bet}** coins. Choose an action below.",
-                fields=[
-                    {"name": "Your Hand", "value": f"{format_hand(self.player_hand)}  (**{player_value}**)", "inline": False},
-                    {"name": "Dealer", "value": f"{format_hand([self.dealer_hand[0]])}  (`?`)", "inline": False}
-                ],
-                footer_text="Timeout: 60s (auto-stand)",
-                cooldown=GAMBLING_COOLDOWNS.get("blackjack", 30)
-            )
-            await interaction.response.edit_message(embed=embed, view=self)
+            if player_value > 21:
+                # Bust - stake already taken, settle the round as a loss
+                self.settled = True
+                result = await settle_round(self.guild_id, self.user_id, "blackjack", self.bet, 0, OUTCOME_LOSS, seed=self.seed, prepaid=self.bet)
+                new_balance = result["balance"]
+            
+                embed = build_casino_embed(
+                    kind="loss",
+                    outcome=-self.bet,
+                    title="🃏 Blackjack — LOSS",
+                    description=f"**{interaction.user.display_name}** loses.",
+                    fields=[
+                        {"name": "Your Hand", "value": f"{format_hand(self.player_hand)}  (**{player_value}**)", "inline": False},
+                        {"name": "Dealer Hand", "value": f"{format_hand(self.dealer_hand)}", "inline": False},
+                        {"name": "Net", "value": f"**-{self.bet}**", "inline": True},
+                        {"name": "New Balance", "value": f"**{new_balance}**", "inline": True}
+                    ],
+                    cooldown=GAMBLING_COOLDOWNS.get("blackjack", 30)
+                )
+                await interaction.response.edit_message(embed=embed, view=None)
+            else:
+                embed = build_casino_embed(
+                    kind="neutral",
+                    outcome=None,
+                    title="🃏 Blackjack",
+                    description=f"**{interaction.user.display_name}** plays **{self.bet}** coins. Choose an action below.",
+                    fields=[
+                        {"name": "Your Hand", "value": f"{format_hand(self.player_hand)}  (**{player_value}**)", "inline": False},
+                        {"name": "Dealer", "value": f"{format_hand([self.dealer_hand[0]])}  (`?`)", "inline": False}
+                    ],
+                    footer_text="Timeout: 60s (auto-stand)",
+                    cooldown=GAMBLING_COOLDOWNS.get("blackjack", 30)
+                )
+                await interaction.response.edit_message(embed=embed, view=self)
     
     @discord.ui.button(label="Stand", style=discord.ButtonStyle.success, emoji="✋")
     async def stand_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.settled:
-            await interaction.response.defer()
-            return
-        
-        self.settled = True
-        await settle_blackjack(interaction, self.guild_id, self.user_id, self.bet, self.dealer_hand, self.player_hand)
+        async with economy_lock(self.guild_id, self.user_id, command="blackjack_stand"):
+            if self.settled:
+                await interaction.response.defer()
+                return
+            
+            self.settled = True
+            await settle_blackjack(interaction, self.guild_id, self.user_id, self.bet, self.dealer_hand, self.player_hand, self.rng, self.seed)
     
     @discord.ui.button(label="Double", style=discord.ButtonStyle.secondary, emoji="💰")
     async def double_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.settled:
-            await interaction.response.defer()
-            return
-        
-        # Check if can double (need enough balance)
-        bal = (await get_user_economy(self.guild_id, self.user_id))["bal"]
-        if bal < self.bet:
-            embed = build_casino_embed(
-                kind="info",
-                outcome=None,
-                title="ℹ️ Insufficient Funds",
-                description=f"Not enough coins to double. You need **{self.bet}** more coins.",
-                footer_text="Double requires matching your original bet."
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            return
-        
-        # Take additional bet
-        await take_bet(self.guild_id, self.user_id, self.bet)
-        self.bet *= 2
-        
-        # Draw one card and auto-stand
-        self.player_hand.append(draw_card())
-        self.settled = True
-        
-        await settle_blackjack(interaction, self.guild_id, self.user_id, self.bet, self.dealer_hand, self.player_hand)
+        async with economy_lock(self.guild_id, self.user_id, command="blackjack_double"):
+            if self.settled:
+                await interaction.response.defer()
+                return
+            
+            # Stake the double (needs enough balance) in one transaction
+            result = await reserve_stake(self.guild_id, self.user_id, "blackjack", self.bet, check_limits=False)
+            if not result["ok"]:
+                embed = build_casino_embed(
+                    kind="info",
+                    outcome=None,
+                    title="ℹ️ Insufficient Funds",
+                    description=f"Not enough coins to double. You need **{self.bet}** more coins.",
+                    footer_text="Double requires matching your original bet."
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+            
+            self.bet *= 2
+            
+            # Draw one card and auto-stand
+            self.player_hand.append(draw_card(self.rng))
+            self.settled = True
+            
+            await settle_blackjack(interaction, self.guild_id, self.user_id, self.bet, self.dealer_hand, self.player_hand, self.rng, self.seed)
     
     async def on_timeout(self):
         """Auto-stand on timeout"""
-        if not self.settled:
-            self.settled = True
+        async with economy_lock(self.guild_id, self.user_id, command="blackjack_timeout"):
+            if not self.settled:
+                self.settled = True
+                # Stake is forfeited; record the round so the ledger and history stay complete
+                try:
+                    await settle_round(self.guild_id, self.user_id, "blackjack", self.bet, 0, OUTCOME_LOSS, seed=self.seed, prepaid=self.bet)
+                except Exception as e:
+                    print(f"Failed to settle timed out blackjack round for {self.user_id}: {e}")
 
-def draw_card():
+def draw_card(rng=None):
     """Draw a random card (1-11)"""
-    return random.choice([2,3,4,5,6,7,8,9,10,10,10,10,11])
+    return CARD_DECK.draw(rng)
 
 def calculate_hand_value(hand):
     """Calculate hand value with ace handling"""
@@ -1329,29 +1360,28 @@ def format_hand(hand):
     """Format hand for display"""
     return " + ".join(str(c) for c in hand)
 
-async def settle_blackjack(interaction, guild_id, user_id, bet, dealer_hand, player_hand):
-    """Settle blackjack game"""
+async def settle_blackjack(interaction, guild_id, user_id, bet, dealer_hand, player_hand, rng=None, seed=None):
+    """Settle blackjack game (the stake was already taken through reserve_stake)"""
     # Dealer draws
-    while calculate_hand_value(dealer_hand) < 17:
-        dealer_hand.append(draw_card())
+    while calculate_hand_value(dealer_hand) < BLACKJACK_DEALER_STANDS_ON:
+        dealer_hand.append(draw_card(rng))
     
     player_value = calculate_hand_value(player_hand)
     dealer_value = calculate_hand_value(dealer_hand)
     
-    await increment_gambling_attempt(user_id, guild_id=guild_id)
+    if dealer_value > 21 or player_value > dealer_value:
+        payout, outcome = bet * BLACKJACK_WIN_PAYOUT, OUTCOME_WIN
+    elif player_value < dealer_value:
+        payout, outcome = 0, OUTCOME_LOSS
+    else:
+        payout, outcome = bet, OUTCOME_PUSH
     
-    # Get balance for display
-    econ = await get_user_economy(guild_id, user_id)
-    new_balance = econ["bal"]
+    result = await settle_round(guild_id, user_id, "blackjack", bet, payout, outcome, seed=seed, prepaid=bet)
+    new_balance = result["balance"]
     
     if dealer_value > 21:
         # Dealer bust - player wins
-        await increment_gambling_win(user_id, guild_id=guild_id)
-        payout = bet * 2
-        await payout_winnings(guild_id, user_id, payout)
         net_gain = payout - bet
-        econ = await get_user_economy(guild_id, user_id)
-        new_balance = econ["bal"]
         
         embed = build_casino_embed(
             kind="win",
@@ -1368,12 +1398,7 @@ async def settle_blackjack(interaction, guild_id, user_id, bet, dealer_hand, pla
         )
     elif player_value > dealer_value:
         # Player wins
-        await increment_gambling_win(user_id, guild_id=guild_id)
-        payout = bet * 2
-        await payout_winnings(guild_id, user_id, payout)
         net_gain = payout - bet
-        econ = await get_user_economy(guild_id, user_id)
-        new_balance = econ["bal"]
         
         embed = build_casino_embed(
             kind="win",
@@ -1389,7 +1414,7 @@ async def settle_blackjack(interaction, guild_id, user_id, bet, dealer_hand, pla
             cooldown=GAMBLING_COOLDOWNS.get("blackjack", 30)
         )
     elif player_value < dealer_value:
-        # Dealer wins - loss already handled
+        # Dealer wins - stake already taken
         embed = build_casino_embed(
             kind="loss",
             outcome=-bet,
@@ -1404,11 +1429,7 @@ async def settle_blackjack(interaction, guild_id, user_id, bet, dealer_hand, pla
             cooldown=GAMBLING_COOLDOWNS.get("blackjack", 30)
         )
     else:
-        # Push - refund bet
-        await payout_winnings(guild_id, user_id, bet)
-        econ = await get_user_economy(guild_id, user_id)
-        new_balance = econ["bal"]
-        
+        # Push - bet refunded by settle_round
         embed = build_casino_embed(
             kind="draw",
             outcome=0,
@@ -1425,6 +1446,7 @@ async def settle_blackjack(interaction, guild_id, user_id, bet, dealer_hand, pla
     
     await interaction.response.edit_message(embed=embed, view=None)
 
+@economy_locked("blackjack")
 async def blackjack(interaction: discord.Interaction, bet: int):
     """Play blackjack (V3-compliant)."""
     from commands.user_commands import check_user_command_permissions
@@ -1464,36 +1486,30 @@ async def blackjack(interaction: discord.Interaction, bet: int):
         await interaction.response.send_message(embed=embed, ephemeral=True)
         return
     
-    # V3: Validate bet
-    ok, error_embed = await ensure_ok_to_bet(guild_id, user_id, bet, "blackjack")
-    if not ok:
-        await interaction.response.send_message(embed=error_embed, ephemeral=True)
-        return
-    
-    # V3: Take bet immediately
-    await take_bet(guild_id, user_id, bet)
-    await add_gambling_spent(user_id, bet, guild_id=guild_id)
-    
     # Deal initial hands
-    dealer_hand = [draw_card(), draw_card()]
-    player_hand = [draw_card(), draw_card()]
+    seed, rng = new_round_rng()
+    dealer_hand = [draw_card(rng), draw_card(rng)]
+    player_hand = [draw_card(rng), draw_card(rng)]
     
     player_value = calculate_hand_value(player_hand)
     
-    update_game_cooldown(user_id, "blackjack")
+    # V3: Instant blackjack settles now; otherwise stake the bet until the hand is played out
+    if player_value == 21:
+        payout = int(bet * BLACKJACK_NATURAL_PAYOUT)  # Blackjack pays 3:2
+        result = await settle_round(guild_id, user_id, "blackjack", bet, payout, OUTCOME_WIN, seed=seed)
+    else:
+        result = await reserve_stake(guild_id, user_id, "blackjack", bet)
+    if not result["ok"]:
+        error_embed = bet_rejection_embed(result["reason"], bet, result["bal"], result["debt"], result["rank_cap"])
+        await interaction.response.send_message(embed=error_embed, ephemeral=True)
+        return
     
-    # Get balance for display
-    econ = await get_user_economy(guild_id, user_id)
-    new_balance = econ["bal"]
+    update_game_cooldown(user_id, "blackjack")
     
     # Check for instant blackjack
     if player_value == 21:
-        await increment_gambling_win(user_id, guild_id=guild_id)
-        payout = int(bet * 2.5)  # Blackjack pays 3:2
-        await payout_winnings(guild_id, user_id, payout)
         net_gain = payout - bet
-        econ = await get_user_economy(guild_id, user_id)
-        new_balance = econ["bal"]
+        new_balance = result["balance"]
         
         embed = build_casino_embed(
             kind="win",
@@ -1525,6 +1541,6 @@ async def blackjack(interaction: discord.Interaction, bet: int):
         cooldown=GAMBLING_COOLDOWNS.get("blackjack", 30)
     )
     
-    view = BlackjackView(user_id, guild_id, bet, dealer_hand, player_hand)
+    view = BlackjackView(user_id, guild_id, bet, dealer_hand, player_hand, rng, seed)
     await interaction.response.send_message(content=f"<@{user_id}>", embed=embed, view=view)
 
@@ -20,6 +20,7 @@ from systems.events import active_event, handle_event_message, handle_event_reac
 # Global state
 message_cooldowns = {}
 vc_members_time = {}
+VC_RESTORE_MAX_AGE_SECONDS = 2 * 3600  # Older open voice_sessions rows are likely missed leaves; count from startup instead
 
 # Bot instance (set by main.py)
 bot = None
@@ -123,6 +124,8 @@ async def on_message(message):
         from core.db import record_message_event, bump_message
         await record_message_event(guild_id, user_id, channel_id, is_reply, replied_to_user_is_bot)
         await bump_message(guild_id, user_id)
+        from systems.orders import ingest_message
+        await ingest_message(guild_id, user_id, is_reply, replied_to_user_is_bot)
         print(f"  ↳ Tracked message for {message.author.name}")
     
     # Note: XP/Level system removed - progression now based on Coins, Rank, Activity, Orders
@@ -143,27 +146,13 @@ async def get_introductions_channel_id(guild_id: int):
 
 async def check_introduction_cooldown(guild_id: int, user_id: int) -> bool:
     """Check if user is on cooldown for introduction replies (6 hours)"""
-    from core.db import fetchone
-    row = await fetchone(
-        "SELECT last_replied_at FROM introduction_replies WHERE guild_id = ? AND user_id = ?",
-        (guild_id, user_id)
-    )
-    if not row:
-        return False
-    
-    last_replied = datetime.datetime.fromisoformat(row["last_replied_at"].replace('Z', '+00:00'))
-    six_hours_ago = datetime.datetime.now(datetime.UTC) - datetime.timedelta(hours=6)
-    return last_replied > six_hours_ago
+    from core import cooldowns
+    return cooldowns.remaining("intro_reply", (guild_id, user_id)) > 0
 
 async def update_introduction_cooldown(guild_id: int, user_id: int):
     """Update introduction reply cooldown"""
-    from core.db import execute
-    now = datetime.datetime.now(datetime.UTC).isoformat()
-    await execute(
-        """INSERT OR REPLACE INTO introduction_replies (guild_id, user_id, last_replied_at)
-           VALUES (?, ?, ?)""",
-        (guild_id, user_id, now)
-    )
+    from core import cooldowns
+    cooldowns.put("intro_reply", (guild_id, user_id), 6 * 3600, urgent=True)
 
 async def get_user_region(member: discord.Member) -> str:
     """Get user's region from their role selection (EMEA, APAC, AMERICAS, UNSPECIFIED)"""
@@ -427,9 +416,8 @@ async def on_voice_state_update(member, before, after):
         return
     
     from core.db import execute, _now_iso
-    from datetime import datetime
     
-    now_ts = int(datetime.now(datetime.UTC).timestamp())
+    now_ts = int(datetime.datetime.now(datetime.UTC).timestamp())
     
     # User joined a voice channel
     if not before.channel and after.channel:
@@ -472,6 +460,8 @@ async def on_voice_state_update(member, before, after):
             # Update activity_daily
             from core.db import add_vc_minutes
             await add_vc_minutes(guild_id, user_id, session_minutes)
+            from systems.orders import ingest_vc_minutes
+            await ingest_vc_minutes(guild_id, user_id, session_minutes)
             
             print(f"  ↳ Recorded VC session: {member.name} - {session_minutes} minutes")
     
@@ -522,6 +512,8 @@ async def on_voice_state_update(member, before, after):
                 guild_id = member.guild.id
                 from core.data import record_vc_minutes
                 await record_vc_minutes(guild_id, member.id, minutes)
+                from systems.orders import ingest_vc_minutes
+                await ingest_vc_minutes(guild_id, member.id, minutes)
                 
                 # V3 Progression: VC minutes tracked for Activity/WAS, not XP
                 print(f"Tracked {minutes} VC minutes for {member.name}")
@@ -529,6 +521,39 @@ async def on_voice_state_update(member, before, after):
     elif before.channel and after.channel and before.channel != after.channel:
         print(f"{member.name} switched from {before.channel.name} to {after.channel.name}")
 
+async def restore_voice_sessions(guild: discord.Guild) -> int:
+    """
+    Resume VC time tracking for members already in tracked voice channels at startup (their join was never seen).
+    Uses a recent open voice_sessions row as the join time when there is one. Returns members restored.
+    """
+    from core.db import fetchall
+    rows = await fetchall(
+        """SELECT user_id, MAX(join_ts) AS join_ts FROM voice_sessions
+           WHERE guild_id = ? AND leave_ts IS NULL GROUP BY user_id""",
+        (guild.id,)
+    )
+    open_sessions = {row["user_id"]: row["join_ts"] for row in rows}
+    now = datetime.datetime.now(datetime.UTC)
+    restored = 0
+    for channel in guild.voice_channels:
+        if channel.id not in VC_XP_TRACK_CHANNELS or channel.id in NON_XP_CHANNEL_IDS:
+            continue
+        if resolve_category_id(channel) in NON_XP_CATEGORY_IDS:
+            continue
+        for member in channel.members:
+            if member.bot or member.id in vc_members_time:
+                continue
+            if any(int(role.id) in EXCLUDED_ROLE_SET for role in member.roles):
+                continue
+            join_ts = open_sessions.get(member.id)
+            if join_ts and now.timestamp() - join_ts <= VC_RESTORE_MAX_AGE_SECONDS:
+                joined = datetime.datetime.fromtimestamp(join_ts, datetime.UTC)
+            else:
+                joined = now
+            vc_members_time[member.id] = {"time": joined, "channel_id": channel.id}
+            restored += 1
+    return restored
+
 async def on_raw_reaction_add(payload):
     """Handle reaction events for obedience events and order verification"""
     # Record reaction event for order verification
@@ -552,6 +577,8 @@ async def on_raw_reaction_add(payload):
                 from core.db import record_reaction_event, bump_reaction
                 await record_reaction_event(guild_id, user_id, channel_id, emoji, message_id, is_forum)
                 await bump_reaction(guild_id, user_id)
+                from systems.orders import ingest_reaction
+                await ingest_reaction(guild_id, user_id, channel_id, emoji, is_forum)
                 print(f"  ↳ Recorded reaction event for user {member.name if member else user_id}")
     
     # Handle event reactions
@@ -573,6 +600,8 @@ async def on_app_command_completion(interaction: discord.Interaction, command):
     if channel_id:
         from core.db import record_command_event
         await record_command_event(guild_id, user_id, command_name, channel_id)
+        from systems.orders import ingest_command
+        await ingest_command(guild_id, user_id, command_name)
         print(f"  ↳ Recorded command event: {command_name} for user {interaction.user.name}")
 
 async def on_command_error(ctx, error):
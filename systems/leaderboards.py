@@ -1,9 +1,191 @@
 ﻿"""
 Leaderboard system for displaying user rankings (V3 Progression System)
+Per-guild sorted indexes (bisect-maintained) refreshed incrementally from balance/activity changes
 """
 import discord
 import random
+import asyncio
+import bisect
+import datetime
+import collections
 from core.config import ALLOWED_SEND_SET
+from core.db import fetchall, _today_str
+
+BOARDS = ("rank", "coins", "activity")
+USERS_PER_PAGE = 20
+REFRESH_CHUNK = 500  # Dirty users re-read per query
+
+PAGE_CACHE_MAX = 256  # Rendered pages kept across all guilds/boards (LRU)
+
+_indexes = {}  # {(guild_id, board): LeaderboardIndex}
+_page_cache = collections.OrderedDict()  # {(guild_id, board, page, users_per_page): (index_version, embed)}
+_page_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+class LeaderboardIndex:
+    """
+    Sorted index for one board in one guild. keys holds (-score, user_id) in ascending order, so
+    position = placement - 1 and bisect finds a user's placement in O(log n).
+    """
+    
+    def __init__(self, guild_id: int, board: str):
+        self.guild_id = guild_id
+        self.board = board
+        self.keys = []
+        self.entries = {}  # {user_id: (score, data)}
+        self.dirty = set()  # user_ids changed since the last refresh
+        self.loaded = False
+        self.built_day = None
+        self.version = 0  # Bumped on every change (page caches key on it)
+        self.lock = asyncio.Lock()
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def upsert(self, user_id: int, score: int, data: dict):
+        """Insert or move one user"""
+        old = self.entries.get(user_id)
+        if old == (score, data):
+            return
+        if old is not None:
+            del self.keys[bisect.bisect_left(self.keys, (-old[0], user_id))]
+        bisect.insort(self.keys, (-score, user_id))
+        self.entries[user_id] = (score, data)
+        self.version += 1
+    
+    def remove(self, user_id: int):
+        old = self.entries.pop(user_id, None)
+        if old is not None:
+            del self.keys[bisect.bisect_left(self.keys, (-old[0], user_id))]
+            self.version += 1
+    
+    def placement(self, user_id: int):
+        """1-based placement, or None when the user is not on the board"""
+        entry = self.entries.get(user_id)
+        if entry is None:
+            return None
+        return bisect.bisect_left(self.keys, (-entry[0], user_id)) + 1
+    
+    def page_count(self, users_per_page: int = USERS_PER_PAGE) -> int:
+        return max(1, (len(self.keys) + users_per_page - 1) // users_per_page)
+    
+    def page(self, page: int, users_per_page: int = USERS_PER_PAGE) -> list:
+        """Rows for one page: [(placement, user_id, data)]"""
+        start = page * users_per_page
+        return [
+            (start + offset + 1, user_id, self.entries[user_id][1])
+            for offset, (_, user_id) in enumerate(self.keys[start:start + users_per_page])
+        ]
+
+# -----------------------------
+# Board queries: rows of (user_id, score, data) for a guild, optionally limited to some users
+# -----------------------------
+def _user_filter(column: str, user_ids) -> tuple:
+    if user_ids is None:
+        return "", ()
+    return f" AND {column} IN ({', '.join('?' * len(user_ids))})", tuple(user_ids)
+
+async def _query_rank(guild_id: int, user_ids=None) -> list:
+    from systems.progression import RANK_LADDER
+    where, params = _user_filter("e.user_id", user_ids)
+    rows = await fetchall(
+        f"""SELECT e.user_id, e.coins_lifetime_earned AS lce, COALESCE(r.held_rank_idx, 0) AS held_rank_idx
+            FROM economy_balance e
+            LEFT JOIN rank_cache r ON r.guild_id = e.guild_id AND r.user_id = e.user_id
+            WHERE e.guild_id = ? AND e.coins_lifetime_earned > 0{where}""",
+        (guild_id,) + params
+    )
+    names = [r["name"] for r in RANK_LADDER]
+    return [
+        (row["user_id"], row["lce"], {"lce": row["lce"], "rank": names[min(row["held_rank_idx"], len(names) - 1)]})
+        for row in rows
+    ]
+
+async def _query_coins(guild_id: int, user_ids=None) -> list:
+    where, params = _user_filter("e.user_id", user_ids)
+    rows = await fetchall(
+        f"""SELECT e.user_id, e.coins_balance AS coins, COALESCE(p.total_spent, 0) AS total_spent
+            FROM economy_balance e
+            LEFT JOIN user_profile p ON p.guild_id = e.guild_id AND p.user_id = e.user_id
+            WHERE e.guild_id = ? AND e.coins_balance > 0{where}""",
+        (guild_id,) + params
+    )
+    return [(row["user_id"], row["coins"], {"coins": row["coins"], "total_spent": row["total_spent"]}) for row in rows]
+
+async def _query_activity(guild_id: int, user_ids=None) -> list:
+    """WAS over the last 7 days, summed in SQL with the DAP caps from systems.progression"""
+    seven_days_ago = (datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=7)).date().isoformat()
+    where, params = _user_filter("user_id", user_ids)
+    rows = await fetchall(
+        f"""SELECT user_id,
+                   SUM(MIN(messages_count, 100) + MIN(vc_minutes, 480) / 2 + MIN(events, 10) * 10 + presence_ticks * 2) AS was,
+                   SUM(messages_count) AS messages_7d
+            FROM activity_daily
+            WHERE guild_id = ? AND day >= ?{where}
+            GROUP BY user_id
+            HAVING was > 0""",
+        (guild_id, seven_days_ago) + params
+    )
+    return [(row["user_id"], row["was"], {"was": row["was"], "messages_7d": row["messages_7d"]}) for row in rows]
+
+_BOARD_QUERIES = {
+    "rank": _query_rank,
+    "coins": _query_coins,
+    "activity": _query_activity,
+}
+
+async def _rebuild(index: LeaderboardIndex):
+    rows = await _BOARD_QUERIES[index.board](index.guild_id)
+    rows.sort(key=lambda row: (-row[1], row[0]))
+    index.keys = [(-score, user_id) for user_id, score, _ in rows]
+    index.entries = {user_id: (score, data) for user_id, score, data in rows}
+    index.dirty.clear()
+    index.loaded = True
+    index.built_day = _today_str()
+    index.version += 1
+
+async def _refresh(index: LeaderboardIndex):
+    """Re-read only the users marked dirty and move them within the index"""
+    dirty = list(index.dirty)
+    index.dirty.clear()
+    for start in range(0, len(dirty), REFRESH_CHUNK):
+        chunk = dirty[start:start + REFRESH_CHUNK]
+        found = set()
+        for user_id, score, data in await _BOARD_QUERIES[index.board](index.guild_id, chunk):
+            index.upsert(user_id, score, data)
+            found.add(user_id)
+        for user_id in chunk:
+            if user_id not in found:
+                index.remove(user_id)
+
+async def get_leaderboard(guild_id: int, board: str) -> LeaderboardIndex:
+    """Index for a board, built on first use and brought up to date with any pending changes"""
+    key = (int(guild_id), board)
+    index = _indexes.get(key)
+    if index is None:
+        index = LeaderboardIndex(int(guild_id), board)
+        _indexes[key] = index
+    async with index.lock:
+        # The 7-day activity window moves daily; rebuild once per day
+        if not index.loaded or (board == "activity" and index.built_day != _today_str()):
+            await _rebuild(index)
+        elif index.dirty:
+            await _refresh(index)
+    return index
+
+def mark_dirty(guild_id: int, user_id: int, boards=BOARDS):
+    """Note a balance/activity change; loaded indexes re-read the user on their next read"""
+    for board in boards:
+        index = _indexes.get((int(guild_id), board))
+        if index is not None and index.loaded:
+            index.dirty.add(int(user_id))
+
+def invalidate_leaderboards(guild_id: int = None):
+    """Force a full rebuild on next read (all guilds when guild_id is None)"""
+    for (gid, _), index in _indexes.items():
+        if guild_id is None or gid == guild_id:
+            index.loaded = False
+    for key in [key for key in _page_cache if guild_id is None or key[0] == guild_id]:
+        del _page_cache[key]
 
 def format_placement(place: int) -> str:
     """Format placement number as ordinal (1st, 2nd, 3rd, etc.)"""
@@ -18,23 +200,19 @@ def format_placement(place: int) -> str:
     else:
         return f"{place}th"
 
-def build_rank_leaderboard_embed(sorted_users, page: int = 0, users_per_page: int = 20):
-    """Build rank leaderboard embed with pagination support (V3 progression system)."""
+def build_rank_leaderboard_embed(rows):
+    """Build rank leaderboard embed for one page of index rows (V3 progression system)."""
     embed = discord.Embed(
         title="💋 Rank Leaderboard",
         description="",
         color=0x58585f,
     )
     
-    start_idx = page * users_per_page
-    end_idx = start_idx + users_per_page
-    users_to_show = sorted_users[start_idx:end_idx]
-    
     placement_lines = []
     rank_lines = []
     lce_lines = []
     
-    for idx, (user_id, data) in enumerate(users_to_show, start=start_idx + 1):
+    for idx, user_id, data in rows:
         try:
             rank = data.get("rank", "Newcomer")
             lce = data.get("lce", 0)
@@ -73,23 +251,19 @@ def build_rank_leaderboard_embed(sorted_users, page: int = 0, users_per_page: in
     
     return embed
 
-def build_coins_leaderboard_embed(sorted_users, page: int = 0, users_per_page: int = 20):
-    """Build coins leaderboard embed with pagination support."""
+def build_coins_leaderboard_embed(rows):
+    """Build coins leaderboard embed for one page of index rows."""
     embed = discord.Embed(
         title="💵 Coin Leaderboard",
         description="",
         color=0x58585f,
     )
     
-    start_idx = page * users_per_page
-    end_idx = start_idx + users_per_page
-    users_to_show = sorted_users[start_idx:end_idx]
-    
     placement_lines = []
     coins_lines = []
     spent_lines = []
     
-    for idx, (user_id, data) in enumerate(users_to_show, start=start_idx + 1):
+    for idx, user_id, data in rows:
         try:
             coins = data.get("coins", 0)
             total_spent = data.get("total_spent", 0)
@@ -128,23 +302,19 @@ def build_coins_leaderboard_embed(sorted_users, page: int = 0, users_per_page: i
     
     return embed
 
-def build_activity_leaderboard_embed(sorted_users, page: int = 0, users_per_page: int = 20):
-    """Build activity leaderboard embed with pagination support (V3 progression system - WAS)."""
+def build_activity_leaderboard_embed(rows):
+    """Build activity leaderboard embed for one page of index rows (V3 progression system - WAS)."""
     embed = discord.Embed(
         title="🎀 Activity Leaderboard",
         description="",
         color=0x58585f,
     )
     
-    start_idx = page * users_per_page
-    end_idx = start_idx + users_per_page
-    users_to_show = sorted_users[start_idx:end_idx]
-    
     placement_lines = []
     was_lines = []
     messages_lines = []
     
-    for idx, (user_id, data) in enumerate(users_to_show, start=start_idx + 1):
+    for idx, user_id, data in rows:
         try:
             was = data.get("was", 0)
             messages_7d = data.get("messages_7d", 0)
@@ -183,27 +353,52 @@ def build_activity_leaderboard_embed(sorted_users, page: int = 0, users_per_page
     
     return embed
 
+_EMBED_BUILDERS = {
+    "rank": build_rank_leaderboard_embed,
+    "coins": build_coins_leaderboard_embed,
+    "activity": build_activity_leaderboard_embed,
+}
+
+def render_page(index: LeaderboardIndex, page: int, users_per_page: int = USERS_PER_PAGE):
+    """
+    Page embed shared by every viewer, rebuilt only when the index version moves.
+    Cached embeds are sent as-is and must not be modified by callers.
+    """
+    key = (index.guild_id, index.board, page, users_per_page)
+    cached = _page_cache.get(key)
+    if cached is not None and cached[0] == index.version:
+        _page_cache.move_to_end(key)
+        _page_cache_stats["hits"] += 1
+        return cached[1]
+    _page_cache_stats["misses"] += 1
+    embed = _EMBED_BUILDERS[index.board](index.page(page, users_per_page))
+    _page_cache[key] = (index.version, embed)
+    _page_cache.move_to_end(key)
+    while len(_page_cache) > PAGE_CACHE_MAX:
+        _page_cache.popitem(last=False)
+        _page_cache_stats["evictions"] += 1
+    return embed
+
+def get_page_cache_stats() -> dict:
+    """Rendered-page cache counters"""
+    lookups = _page_cache_stats["hits"] + _page_cache_stats["misses"]
+    return {
+        **_page_cache_stats,
+        "hit_rate": _page_cache_stats["hits"] / lookups if lookups else 0.0,
+        "entries": len(_page_cache),
+        "indexes": len(_indexes),
+    }
+
 class LeaderboardView(discord.ui.View):
-    """View with pagination buttons for leaderboard."""
+    """View with pagination buttons for leaderboard (keeps only the page cursor; rows come from the index)."""
     
-    def __init__(self, sorted_users, embed_builder, users_per_page: int = 20, timeout: float = 300.0):
+    def __init__(self, guild_id: int, board: str, users_per_page: int = USERS_PER_PAGE, timeout: float = 300.0):
         super().__init__(timeout=timeout)
-        self.sorted_users = sorted_users or []
-        self.embed_builder = embed_builder
+        self.guild_id = guild_id
+        self.board = board
         self.users_per_page = users_per_page
         self.current_page = 0
-        self.max_pages = max(1, (len(self.sorted_users) + users_per_page - 1) // users_per_page) if self.sorted_users else 1
-        self._init_button_states()
-    
-    def _init_button_states(self):
-        """Initialize button states based on current page."""
-        for item in self.children:
-            if isinstance(item, discord.ui.Button):
-                if hasattr(item, 'custom_id'):
-                    if item.custom_id == "prev_page":
-                        item.disabled = (self.current_page == 0)
-                    elif item.custom_id == "next_page":
-                        item.disabled = (self.current_page >= self.max_pages - 1)
+        self.max_pages = 1
     
     def update_buttons(self):
         """Update button states based on current page."""
@@ -215,18 +410,28 @@ class LeaderboardView(discord.ui.View):
                     elif item.custom_id == "next_page":
                         item.disabled = (self.current_page >= self.max_pages - 1)
     
+    async def render(self):
+        """Embed for the current page, clamping the cursor if the board shrank."""
+        index = await get_leaderboard(self.guild_id, self.board)
+        self.max_pages = index.page_count(self.users_per_page)
+        self.current_page = min(self.current_page, self.max_pages - 1)
+        self.update_buttons()
+        return render_page(index, self.current_page, self.users_per_page)
+    
+    async def _show_page(self, interaction: discord.Interaction, page: int):
+        self.current_page = page
+        try:
+            embed = await self.render()
+            await interaction.response.edit_message(embed=embed, view=self)
+        except Exception as e:
+            print(f"Error updating leaderboard page: {e}")
+            await interaction.response.defer()
+    
     @discord.ui.button(emoji="⬅️", style=discord.ButtonStyle.secondary, custom_id="prev_page")
     async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to previous page."""
         if self.current_page > 0:
-            self.current_page -= 1
-            self.update_buttons()
-            try:
-                embed = self.embed_builder(self.sorted_users, page=self.current_page, users_per_page=self.users_per_page)
-                await interaction.response.edit_message(embed=embed, view=self)
-            except Exception as e:
-                print(f"Error updating leaderboard page: {e}")
-                await interaction.response.defer()
+            await self._show_page(interaction, self.current_page - 1)
         else:
             await interaction.response.defer()
     
@@ -234,14 +439,7 @@ class LeaderboardView(discord.ui.View):
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to next page."""
         if self.current_page < self.max_pages - 1:
-            self.current_page += 1
-            self.update_buttons()
-            try:
-                embed = self.embed_builder(self.sorted_users, page=self.current_page, users_per_page=self.users_per_page)
-                await interaction.response.edit_message(embed=embed, view=self)
-            except Exception as e:
-                print(f"Error updating leaderboard page: {e}")
-                await interaction.response.defer()
+            await self._show_page(interaction, self.current_page + 1)
         else:
             await interaction.response.defer()
     
@@ -272,8 +470,20 @@ class LeaderboardView(discord.ui.View):
         embed.add_field(name="User", value=f"<@{user_id}>", inline=True)
         embed.add_field(name="Rank", value=rank, inline=True)
         embed.add_field(name="LCE", value=str(lce), inline=True)
-        embed.add_field(name="WAS (7d)", value=str(was), inline=False)
+        embed.add_field(name="WAS (7d)", value=str(was), inline=True)
+        index = await get_leaderboard(guild_id, self.board)
+        placement = index.placement(user_id)
+        embed.add_field(name="Placement", value=f"#{placement} of {len(index)}" if placement else "Unranked", inline=True)
         embed.add_field(name="\u200b", value=f"𝙼𝚎𝚜𝚜𝚊𝚐𝚎 𝚁𝚎𝚌𝚎𝚒𝚟𝚎𝚍\n*{random.choice(messages)}*", inline=False)
         
         await interaction.response.send_message(content=f"<@{user_id}>", embed=embed, ephemeral=True)
 
+async def open_leaderboard(guild_id: int, board: str, users_per_page: int = USERS_PER_PAGE):
+    """
+    First page embed and its view for a board ("rank", "coins" or "activity").
+    Library entry point only: the /leaderboard commands were removed (D4), so nothing registers a command on it;
+    a command or panel that brings boards back should send these two rather than building its own pages.
+    """
+    view = LeaderboardView(guild_id, board, users_per_page=users_per_page)
+    embed = await view.render()
+    return embed, view
@@ -136,8 +136,8 @@ async def send_onboarding_welcome(member):
     view = RulesButtonView()
     await channel.send(content=f"<@{member.id}>", embed=embed, view=view)
 
-async def send_onboarding_rules(interaction_or_channel, user=None, is_reply=False):
-    """Send the rules message"""
+def build_rules_embed():
+    """Rules embed (static; sent through systems.static_embeds)"""
     embed = discord.Embed(
         description="<a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682>",
         colour=0x65566c
@@ -178,7 +178,13 @@ async def send_onboarding_rules(interaction_or_channel, user=None, is_reply=Fals
         value="<a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682><a:blacksparklies:1454433776649113682>",
         inline=False
     )
-    
+    return embed
+
+async def send_onboarding_rules(interaction_or_channel, user=None, is_reply=False):
+    """Send the rules message"""
+    from systems.static_embeds import get_static_embed
+    locale = interaction_or_channel.locale if isinstance(interaction_or_channel, discord.Interaction) else None
+    embed = get_static_embed("rules", locale)
     view = RulesAcceptDeclineView()
     
     if isinstance(interaction_or_channel, discord.Interaction):
@@ -0,0 +1,701 @@
+﻿"""
+Orders system - order catalog and compiled order verifiers
+"""
+import datetime
+import json
+
+from core.config import ORDERS_AUTO_COMPLETE
+from core.db import fetchone, fetchall, execute
+
+# Orders catalog
+ORDERS_CATALOG = {
+    "presence_ping": {
+        "title": "Presence Ping",
+        "difficulty": "easy",
+        "due_seconds": 21600,  # 6 hours
+        "reward_coins": 40,
+        "instructions": "Send a message to demonstrate you're here.",
+        "steps_json": {"type": "message_count", "min_count": 1, "spacing_seconds": 0},
+        "cooldown_type": "daily"
+    },
+    "profile_sync": {
+        "title": "Profile Sync",
+        "difficulty": "easy",
+        "due_seconds": 21600,
+        "reward_coins": 45,
+        "instructions": "Update your profile information using /profile command.",
+        "steps_json": {"type": "command_used", "command": "/profile"},
+        "cooldown_type": "daily"
+    },
+    "gratitude_receipt": {
+        "title": "Gratitude Receipt",
+        "difficulty": "easy",
+        "due_seconds": 28800,  # 8 hours
+        "reward_coins": 50,
+        "instructions": "Reply to another user's message with appreciation.",
+        "steps_json": {"type": "reply_count", "min_count": 1, "exclude_bots": True},
+        "cooldown_type": "daily"
+    },
+    "quiet_compliance": {
+        "title": "Quiet Compliance",
+        "difficulty": "medium",
+        "due_seconds": 43200,  # 12 hours
+        "reward_coins": 75,
+        "instructions": "Send messages spaced apart to show measured engagement.",
+        "steps_json": {"type": "message_count", "min_count": 3, "spacing_seconds": 1800},  # 30 min spacing
+        "cooldown_type": "daily"
+    },
+    "voice_attendance": {
+        "title": "Voice Attendance",
+        "difficulty": "medium",
+        "due_seconds": 86400,  # 24 hours
+        "reward_coins": 100,
+        "instructions": "Spend time in voice channels.",
+        "steps_json": {"type": "vc_minutes", "min_minutes": 30},
+        "cooldown_type": "daily"
+    },
+    "two_step_checkin": {
+        "title": "Two-Step Check-in",
+        "difficulty": "medium",
+        "due_seconds": 43200,
+        "reward_coins": 80,
+        "instructions": "Send a message, then use a command within the time window.",
+        "steps_json": {"type": "two_step", "message_first": True, "command_after": "/daily"},
+        "cooldown_type": "daily"
+    },
+    "anime_post": {
+        "title": "Community Contribution (Anime)",
+        "difficulty": "hard",
+        "due_seconds": 172800,  # 48 hours
+        "reward_coins": 150,
+        "instructions": "React to a post in the anime forum channel.",
+        "steps_json": {"type": "forum_reaction_any_post", "channel_category": "anime"},
+        "cooldown_type": "48h"
+    },
+    "games_post": {
+        "title": "Community Contribution (Games)",
+        "difficulty": "hard",
+        "due_seconds": 172800,
+        "reward_coins": 150,
+        "instructions": "React to a post in the games forum channel.",
+        "steps_json": {"type": "forum_reaction_any_post", "channel_category": "games"},
+        "cooldown_type": "48h"
+    },
+    "discipline_deposit": {
+        "title": "Discipline Deposit",
+        "difficulty": "hard",
+        "due_seconds": 86400,
+        "reward_coins": 200,
+        "instructions": "Burn coins through a discipline action (gambling, debt payment, etc.).",
+        "steps_json": {"type": "ledger_event", "event_type": "burn", "min_amount": 100},
+        "cooldown_type": "weekly"
+    },
+    "structured_hour": {
+        "title": "Structured Hour",
+        "difficulty": "hard",
+        "due_seconds": 86400,
+        "reward_coins": 180,
+        "instructions": "Send a reaction to a recent message in a specified channel.",
+        "steps_json": {"type": "reaction_on_channel_recent", "channel_id": None, "emoji": None, "hours_recent": 24},
+        "cooldown_type": "weekly"
+    }
+}
+
+# Order name mapping
+ORDER_NAME_TO_KEY = {
+    "Presence Ping": "presence_ping",
+    "Profile Sync": "profile_sync",
+    "Gratitude Receipt": "gratitude_receipt",
+    "Quiet Compliance": "quiet_compliance",
+    "Voice Attendance": "voice_attendance",
+    "Two-Step Check-in": "two_step_checkin",
+    "Community Contribution (Anime)": "anime_post",
+    "Community Contribution (Games)": "games_post",
+    "Discipline Deposit": "discipline_deposit",
+    "Structured Hour": "structured_hour"
+}
+
+def normalize_order_name(order_name: str) -> str:
+    """Normalize order name to order_key"""
+    return ORDER_NAME_TO_KEY.get(order_name, order_name.lower().replace(" ", "_").replace("(", "").replace(")", ""))
+
+# ===== ORDER VERIFIERS =====
+# Each steps_json spec is compiled once into an async verifier that answers with a
+# single aggregate query and returns a progress dict:
+#   {"type", "current", "required", "done", "status", "missing", "proof"}
+
+def _parse_iso(value: str) -> datetime.datetime:
+    """Parse an ISO timestamp stored in order_runs"""
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _load_progress_data(progress_json) -> dict:
+    """Decode order_runs.progress_json (baseline and live state)"""
+    if progress_json:
+        try:
+            return json.loads(progress_json)
+        except Exception:
+            pass
+    return {}
+
+def _run_context(run) -> dict:
+    """Parse the run fields every verifier needs"""
+    accepted_at = _parse_iso(run["accepted_at"])
+    return {
+        "accepted_at": accepted_at,
+        "accepted_ts": int(accepted_at.timestamp()),
+        "progress_data": _load_progress_data(run["progress_json"]),
+    }
+
+async def _fetch_cached(cache, query: str, params: tuple):
+    """Run an aggregate query once per batch (runs sharing a window share the row)"""
+    if cache is None:
+        return await fetchone(query, params)
+    key = (query, params)
+    if key not in cache:
+        cache[key] = await fetchone(query, params)
+    return cache[key]
+
+def describe_progress(steps: dict, current: int) -> dict:
+    """Build the structured progress result for a step spec at a given count"""
+    step_type = steps.get("type")
+    current = max(0, int(current or 0))
+    
+    if step_type == "message_count":
+        required = steps.get("min_count", 1)
+        status = f"Messages Sent: {current}/{required}"
+        missing = f"Send {required} message(s) with spacing (have {current})"
+        proof = f"💬 Messages: {current}/{required}"
+    elif step_type == "command_used":
+        cmd = steps.get("command", "/profile")
+        required = 1
+        status = f"Commands Used: {min(current, 1)}/1"
+        missing = f"Use the {cmd} command"
+        proof = f"✅ Command used: {cmd}"
+    elif step_type == "reply_count":
+        required = steps.get("min_count", 1)
+        status = f"Replies: {current}/{required}"
+        missing = f"Reply to {required} user message(s) (have {current})"
+        proof = f"💬 Replies: {current}/{required}"
+    elif step_type == "vc_minutes":
+        required = steps.get("min_minutes", 30)
+        status = f"Voice Chat Time: {current}/{required} minutes"
+        missing = f"Spend {required} minutes in VC (have {current})"
+        proof = f"🎧 VC: {current}/{required} min"
+    elif step_type == "two_step":
+        cmd = steps.get("command_after", "/daily")
+        required = 2
+        status = f"Steps: {min(current, 2)}/2"
+        missing = f"Use {cmd} command after sending a message" if current >= 1 else "Send a message first"
+        proof = f"✅ Two-step: message + {cmd}"
+    elif step_type == "forum_reaction_any_post":
+        category = steps.get("channel_category", "forum")
+        required = 1
+        status = f"Forum Reactions: {min(current, 1)}/1"
+        missing = f"React to a post in the {category} forum"
+        proof = f"❤️ Reaction: detected in {category}"
+    elif step_type == "ledger_event":
+        required = steps.get("min_amount", 100)
+        status = f"Coins Burned: {current}/{required}"
+        missing = f"Burn {required} coins (have burned {current})"
+        proof = f"💰 Coins burned: {current}/{required}"
+    elif step_type == "reaction_on_channel_recent":
+        hours = steps.get("hours_recent", 24)
+        required = 1
+        status = f"Reactions: {min(current, 1)}/1"
+        missing = f"React to a message within the last {hours} hours"
+        proof = f"❤️ Reaction: detected (last {hours}h)"
+    else:
+        required = 1
+        status = "Progress tracking..."
+        missing = "Complete the task as specified"
+        proof = "✅ Task completed"
+    
+    done = current >= required
+    return {
+        "type": step_type,
+        "current": current,
+        "required": required,
+        "done": done,
+        "status": status,
+        "missing": None if done else missing,
+        "proof": proof if done else None,
+    }
+
+def _with_timestamps(progress: dict, last_ts: int = None, first_msg_ts: int = None) -> dict:
+    """Attach the event timestamps live tracking needs (spacing, recency, two-step order) to a verifier result"""
+    progress["last_ts"] = last_ts
+    progress["first_msg_ts"] = first_msg_ts
+    return progress
+
+def _compile_message_count(steps: dict):
+    """Messages since accept, optionally with minimum spacing"""
+    min_count = steps.get("min_count", 1)
+    spacing = steps.get("spacing_seconds", 0)
+    
+    if spacing > 0:
+        # Greedy spacing: each pick is the first message at least `spacing` seconds after
+        # the previous pick. Every step is one MIN() index seek, capped at min_count picks.
+        query = """WITH RECURSIVE picks(ts, n) AS (
+                       SELECT MIN(ts), 1 FROM message_events
+                       WHERE guild_id = ? AND user_id = ? AND ts >= ?
+                       UNION ALL
+                       SELECT (SELECT MIN(m.ts) FROM message_events m
+                               WHERE m.guild_id = ? AND m.user_id = ? AND m.ts >= picks.ts + ?),
+                              picks.n + 1
+                       FROM picks WHERE picks.ts IS NOT NULL AND picks.n < ?
+                   )
+                   SELECT COUNT(ts) AS total, MAX(ts) AS last_ts FROM picks"""
+        
+        def params(guild_id, user_id, ctx):
+            return (guild_id, user_id, ctx["accepted_ts"], guild_id, user_id, spacing, min_count)
+    else:
+        query = """SELECT COUNT(*) AS total, MAX(ts) AS last_ts FROM message_events
+                   WHERE guild_id = ? AND user_id = ? AND ts >= ?"""
+        
+        def params(guild_id, user_id, ctx):
+            return (guild_id, user_id, ctx["accepted_ts"])
+    
+    async def verify(guild_id, user_id, ctx, cache=None):
+        row = await _fetch_cached(cache, query, params(guild_id, user_id, ctx))
+        return _with_timestamps(describe_progress(steps, row["total"] if row else 0), last_ts=row["last_ts"] if row else None)
+    return verify
+
+def _compile_command_used(steps: dict):
+    """A specific command used since accept"""
+    cmd_name = steps.get("command", "/profile").replace("/", "")
+    query = """SELECT COUNT(*) AS total FROM command_events
+               WHERE guild_id = ? AND user_id = ? AND command_name = ? AND ts >= ?"""
+    
+    async def verify(guild_id, user_id, ctx, cache=None):
+        row = await _fetch_cached(cache, query, (guild_id, user_id, cmd_name, ctx["accepted_ts"]))
+        return describe_progress(steps, row["total"] if row else 0)
+    return verify
+
+def _compile_reply_count(steps: dict):
+    """Replies to other users since accept"""
+    bot_filter = " AND replied_to_user_is_bot = 0" if steps.get("exclude_bots", True) else ""
+    query = f"""SELECT COUNT(*) AS total FROM message_events
+                WHERE guild_id = ? AND user_id = ? AND ts >= ?
+                AND is_reply = 1{bot_filter}"""
+    
+    async def verify(guild_id, user_id, ctx, cache=None):
+        row = await _fetch_cached(cache, query, (guild_id, user_id, ctx["accepted_ts"]))
+        return describe_progress(steps, row["total"] if row else 0)
+    return verify
+
+def _compile_vc_minutes(steps: dict):
+    """Voice minutes gained since accept"""
+    query = """SELECT COALESCE(SUM(vc_minutes), 0) AS total FROM activity_daily
+               WHERE guild_id = ? AND user_id = ? AND day >= ?"""
+    
+    async def verify(guild_id, user_id, ctx, cache=None):
+        accepted_date = ctx["accepted_at"].date().isoformat()
+        row = await _fetch_cached(cache, query, (guild_id, user_id, accepted_date))
+        current_vc = row["total"] if row else 0
+        return describe_progress(steps, current_vc - ctx["progress_data"].get("vc_minutes_baseline", 0))
+    return verify
+
+def _compile_two_step(steps: dict):
+    """A message followed by a specific command"""
+    cmd_name = steps.get("command_after", "/daily").replace("/", "")
+    query = """WITH first_msg AS (
+                   SELECT MIN(ts) AS ts FROM message_events
+                   WHERE guild_id = ? AND user_id = ? AND ts >= ?
+               )
+               SELECT first_msg.ts AS first_msg_ts,
+                      (SELECT COUNT(*) FROM command_events c
+                       WHERE c.guild_id = ? AND c.user_id = ? AND c.command_name = ?
+                       AND c.ts > first_msg.ts) AS cmd_count
+               FROM first_msg"""
+    
+    async def verify(guild_id, user_id, ctx, cache=None):
+        row = await _fetch_cached(cache, query, (guild_id, user_id, ctx["accepted_ts"], guild_id, user_id, cmd_name))
+        has_message = bool(row and row["first_msg_ts"])
+        has_command = bool(has_message and row["cmd_count"])
+        progress = describe_progress(steps, int(has_message) + int(has_command))
+        return _with_timestamps(progress, first_msg_ts=row["first_msg_ts"] if has_message else None)
+    return verify
+
+def _compile_forum_reaction_any_post(steps: dict):
+    """A reaction on any forum post since accept"""
+    query = """SELECT COUNT(*) AS total FROM reaction_events
+               WHERE guild_id = ? AND user_id = ? AND ts >= ?
+               AND is_forum = 1"""
+    
+    async def verify(guild_id, user_id, ctx, cache=None):
+        row = await _fetch_cached(cache, query, (guild_id, user_id, ctx["accepted_ts"]))
+        return describe_progress(steps, row["total"] if row else 0)
+    return verify
+
+def _compile_ledger_event(steps: dict):
+    """Coins moved through a ledger event type (burns) since accept"""
+    event_type = steps.get("event_type", "burn")
+    query = """SELECT COALESCE(-SUM(amount), 0) AS total FROM economy_ledger
+               WHERE guild_id = ? AND user_id = ? AND ts >= ?
+               AND type = ? AND amount < 0"""
+    
+    async def verify(guild_id, user_id, ctx, cache=None):
+        row = await _fetch_cached(cache, query, (guild_id, user_id, ctx["accepted_at"].isoformat(), event_type))
+        return describe_progress(steps, row["total"] if row else 0)
+    return verify
+
+def _compile_reaction_on_channel_recent(steps: dict):
+    """A recent reaction, optionally in a channel with a specific emoji"""
+    hours = steps.get("hours_recent", 24)
+    channel_id = steps.get("channel_id")
+    emoji_str = steps.get("emoji")
+    
+    if channel_id and emoji_str:
+        query = """SELECT COUNT(*) AS total, MAX(ts) AS last_ts FROM reaction_events
+                   WHERE guild_id = ? AND user_id = ? AND ts >= ?
+                   AND channel_id = ? AND emoji = ?"""
+        extra = (channel_id, emoji_str)
+    else:
+        # Fallback: any recent reaction
+        query = """SELECT COUNT(*) AS total, MAX(ts) AS last_ts FROM reaction_events
+                   WHERE guild_id = ? AND user_id = ? AND ts >= ?"""
+        extra = ()
+    
+    async def verify(guild_id, user_id, ctx, cache=None):
+        recent_threshold_ts = int((datetime.datetime.now(datetime.UTC) - datetime.timedelta(hours=hours)).timestamp())
+        query_ts = max(ctx["accepted_ts"], recent_threshold_ts)
+        row = await _fetch_cached(cache, query, (guild_id, user_id, query_ts) + extra)
+        return _with_timestamps(describe_progress(steps, row["total"] if row else 0), last_ts=row["last_ts"] if row else None)
+    return verify
+
+_VERIFIER_COMPILERS = {
+    "message_count": _compile_message_count,
+    "command_used": _compile_command_used,
+    "reply_count": _compile_reply_count,
+    "vc_minutes": _compile_vc_minutes,
+    "two_step": _compile_two_step,
+    "forum_reaction_any_post": _compile_forum_reaction_any_post,
+    "ledger_event": _compile_ledger_event,
+    "reaction_on_channel_recent": _compile_reaction_on_channel_recent,
+}
+
+def compile_verifier(steps: dict):
+    """Compile a steps_json spec into an async verifier (None if the type is unknown)"""
+    compiler = _VERIFIER_COMPILERS.get(steps.get("type"))
+    return compiler(steps) if compiler else None
+
+# Compiled once at import: {order_key: verifier}
+ORDER_VERIFIERS = {
+    order_key: compile_verifier(order["steps_json"])
+    for order_key, order in ORDERS_CATALOG.items()
+}
+
+def resolve_run_order_key(run):
+    """Get the catalog key for a run (older runs only have the order name)"""
+    order_key = run["order_key"]
+    if not order_key and run["name"]:
+        order_key = normalize_order_name(run["name"])
+    return order_key if order_key in ORDERS_CATALOG else None
+
+async def get_open_runs(guild_id: int, user_id: int) -> list:
+    """Get a user's accepted runs with their order name in one query"""
+    return await fetchall(
+        """SELECT r.run_id, r.order_id, r.order_key, r.accepted_at, r.due_at, r.progress_json, o.name
+           FROM order_runs r LEFT JOIN orders o ON o.order_id = r.order_id
+           WHERE r.guild_id = ? AND r.user_id = ? AND r.status = 'accepted'
+           ORDER BY r.accepted_at DESC""",
+        (guild_id, user_id)
+    )
+
+async def verify_run(guild_id: int, user_id: int, run, order_key: str = None, cache=None) -> dict:
+    """Verify one run from the event tables. Returns a progress dict, or None if the order has no verifier"""
+    order_key = order_key or resolve_run_order_key(run)
+    verifier = ORDER_VERIFIERS.get(order_key)
+    if not verifier:
+        return None
+    return await verifier(guild_id, user_id, _run_context(run), cache)
+
+async def verify_runs(guild_id: int, user_id: int, runs: list) -> dict:
+    """Verify a batch of runs in one pass. Returns {run_id: progress}"""
+    cache = {}
+    results = {}
+    for run in runs:
+        progress = await verify_run(guild_id, user_id, run, cache=cache)
+        if progress is not None:
+            results[run["run_id"]] = progress
+    return results
+
+# ===== LIVE ORDER PROGRESS =====
+# Open runs are indexed by (guild_id, user_id) so each ingested event only touches that
+# user's accepted orders. Live state is persisted in order_runs.progress_json["live"]:
+#   {"current": int, "last_ts": int or None, "first_msg_ts": int or None}
+# It is a fast path only: a run the live state doesn't show as met is verified against the
+# event tables before it is reported incomplete.
+
+_open_runs = {}  # {(guild_id, user_id): {run_id: {"order_key", "progress_data"}}}
+
+def _new_live_state(current: int = 0) -> dict:
+    """Empty live state for a freshly tracked run"""
+    return {"current": current, "last_ts": None, "first_msg_ts": None}
+
+def _live_from_progress(progress: dict) -> dict:
+    """Live state rebuilt from a verify_run result (count and timestamps read from the event tables)"""
+    return {"current": progress["current"], "last_ts": progress.get("last_ts"), "first_msg_ts": progress.get("first_msg_ts")}
+
+def _live_needs_backfill(steps: dict, live) -> bool:
+    """No live state yet, or progress without the timestamp its type depends on (states saved before they were backfilled)"""
+    if not live:
+        return True
+    if not live.get("current"):
+        return False
+    step_type = steps.get("type")
+    if step_type == "two_step":
+        return live.get("first_msg_ts") is None
+    if step_type == "reaction_on_channel_recent" or (step_type == "message_count" and steps.get("spacing_seconds", 0) > 0):
+        return live.get("last_ts") is None
+    return False
+
+def track_run(guild_id: int, user_id: int, run_id: int, order_key: str, progress_data: dict = None):
+    """Start tracking live progress for an accepted run"""
+    if order_key not in ORDERS_CATALOG:
+        return
+    progress_data = dict(progress_data or {})
+    progress_data.setdefault("live", _new_live_state())
+    _open_runs.setdefault((guild_id, user_id), {})[run_id] = {
+        "order_key": order_key,
+        "progress_data": progress_data,
+    }
+
+def untrack_run(guild_id: int, user_id: int, run_id: int):
+    """Stop tracking a run (completed, failed or forfeited)"""
+    runs = _open_runs.get((guild_id, user_id))
+    if runs is None:
+        return
+    runs.pop(run_id, None)
+    if not runs:
+        _open_runs.pop((guild_id, user_id), None)
+
+def _live_progress(state: dict) -> dict:
+    """Describe a tracked run's live state"""
+    steps = ORDERS_CATALOG[state["order_key"]]["steps_json"]
+    live = state["progress_data"]["live"]
+    current = live["current"]
+    if steps["type"] == "reaction_on_channel_recent":
+        # The reaction only counts while it is within the recency window
+        hours = steps.get("hours_recent", 24)
+        now_ts = int(datetime.datetime.now(datetime.UTC).timestamp())
+        if not live.get("last_ts") or now_ts - live["last_ts"] > hours * 3600:
+            current = 0
+    return describe_progress(steps, current)
+
+def get_live_progress(guild_id: int, user_id: int, run_id: int):
+    """O(1) progress read for a tracked run (None if the run is not tracked)"""
+    state = _open_runs.get((guild_id, user_id), {}).get(run_id)
+    return _live_progress(state) if state else None
+
+async def get_run_progress(guild_id: int, user_id: int, run, order_key: str = None, cache=None):
+    """
+    Live progress when tracked and met; otherwise verify from the event tables, which stay authoritative
+    (an event ingestion missed can't block completion), and catch the live state up if it was behind
+    """
+    state = _open_runs.get((guild_id, user_id), {}).get(run["run_id"])
+    live_progress = _live_progress(state) if state else None
+    if live_progress and live_progress["done"]:
+        return live_progress
+    progress = await verify_run(guild_id, user_id, run, order_key=order_key, cache=cache)
+    if progress is None:
+        return live_progress
+    if state and progress["current"] > state["progress_data"]["live"]["current"]:
+        state["progress_data"]["live"] = _live_from_progress(progress)
+        await _save_progress(run["run_id"], state["progress_data"])
+    return progress
+
+async def get_runs_progress(guild_id: int, user_id: int, runs: list) -> dict:
+    """Progress for a batch of runs (live where tracked). Returns {run_id: progress}"""
+    cache = {}
+    results = {}
+    for run in runs:
+        progress = await get_run_progress(guild_id, user_id, run, cache=cache)
+        if progress is not None:
+            results[run["run_id"]] = progress
+    return results
+
+async def get_progress_by_order_key(guild_id: int, user_id: int) -> dict:
+    """Get live progress for all of a user's accepted orders. Returns {order_key: progress}"""
+    runs = await get_open_runs(guild_id, user_id)
+    progress_by_run = await get_runs_progress(guild_id, user_id, runs)
+    progress_by_key = {}
+    for run in runs:
+        order_key = resolve_run_order_key(run)
+        # Runs are newest first; keep the latest run per order
+        if order_key and order_key not in progress_by_key and run["run_id"] in progress_by_run:
+            progress_by_key[order_key] = progress_by_run[run["run_id"]]
+    return progress_by_key
+
+async def load_open_runs():
+    """Rebuild the open-runs index at startup, backfilling live state from the event tables"""
+    _open_runs.clear()
+    try:
+        rows = await fetchall(
+            """SELECT r.run_id, r.guild_id, r.user_id, r.order_key, r.accepted_at, r.progress_json, o.name
+               FROM order_runs r LEFT JOIN orders o ON o.order_id = r.order_id
+               WHERE r.status = 'accepted'"""
+        )
+        backfilled = 0
+        for run in rows:
+            order_key = resolve_run_order_key(run)
+            if not order_key:
+                continue
+            progress_data = _load_progress_data(run["progress_json"])
+            if _live_needs_backfill(ORDERS_CATALOG[order_key]["steps_json"], progress_data.get("live")):
+                progress = await verify_run(run["guild_id"], run["user_id"], run, order_key=order_key)
+                progress_data["live"] = _live_from_progress(progress) if progress else _new_live_state()
+                await _save_progress(run["run_id"], progress_data)
+                backfilled += 1
+            track_run(run["guild_id"], run["user_id"], run["run_id"], order_key, progress_data)
+        print(f"[+] Loaded {len(rows)} open order runs ({backfilled} backfilled)")
+    except Exception as e:
+        print(f"[-] Failed to load open order runs: {e}")
+
+async def _save_progress(run_id: int, progress_data: dict):
+    """Persist a run's progress_json"""
+    await execute(
+        "UPDATE order_runs SET progress_json = ? WHERE run_id = ?",
+        (json.dumps(progress_data), run_id)
+    )
+
+def _advance_message_count(steps: dict, live: dict, event: dict) -> bool:
+    """Count a message, honoring minimum spacing"""
+    if event["kind"] != "message":
+        return False
+    spacing = steps.get("spacing_seconds", 0)
+    if spacing > 0 and live["last_ts"] is not None and event["ts"] - live["last_ts"] < spacing:
+        return False
+    live["current"] += 1
+    live["last_ts"] = event["ts"]
+    return True
+
+def _advance_command_used(steps: dict, live: dict, event: dict) -> bool:
+    """Mark the required command as used"""
+    if event["kind"] != "command" or event["command_name"] != steps.get("command", "/profile").replace("/", ""):
+        return False
+    live["current"] = 1
+    return True
+
+def _advance_reply_count(steps: dict, live: dict, event: dict) -> bool:
+    """Count a reply to another user"""
+    if event["kind"] != "message" or not event["is_reply"]:
+        return False
+    if steps.get("exclude_bots", True) and event["replied_to_user_is_bot"]:
+        return False
+    live["current"] += 1
+    return True
+
+def _advance_vc_minutes(steps: dict, live: dict, event: dict) -> bool:
+    """Add voice minutes"""
+    if event["kind"] != "vc" or event["minutes"] <= 0:
+        return False
+    live["current"] += event["minutes"]
+    return True
+
+def _advance_two_step(steps: dict, live: dict, event: dict) -> bool:
+    """Record the first message, then a command after it"""
+    if event["kind"] == "message" and live["first_msg_ts"] is None:
+        live["first_msg_ts"] = event["ts"]
+        live["current"] = max(live["current"], 1)
+        return True
+    if (event["kind"] == "command" and live["first_msg_ts"] is not None
+            and event["command_name"] == steps.get("command_after", "/daily").replace("/", "")
+            and event["ts"] > live["first_msg_ts"]):
+        live["current"] = 2
+        return True
+    return False
+
+def _advance_forum_reaction_any_post(steps: dict, live: dict, event: dict) -> bool:
+    """Mark a forum reaction"""
+    if event["kind"] != "reaction" or not event["is_forum"]:
+        return False
+    live["current"] = 1
+    return True
+
+def _advance_ledger_event(steps: dict, live: dict, event: dict) -> bool:
+    """Add coins from a matching negative ledger entry"""
+    if event["kind"] != "ledger" or event["entry_type"] != steps.get("event_type", "burn") or event["amount"] >= 0:
+        return False
+    live["current"] += -event["amount"]
+    return True
+
+def _advance_reaction_on_channel_recent(steps: dict, live: dict, event: dict) -> bool:
+    """Mark a matching reaction and when it happened"""
+    if event["kind"] != "reaction":
+        return False
+    channel_id = steps.get("channel_id")
+    emoji_str = steps.get("emoji")
+    if channel_id and emoji_str and (event["channel_id"] != channel_id or event["emoji"] != emoji_str):
+        return False
+    live["current"] = 1
+    live["last_ts"] = event["ts"]
+    return True
+
+_ADVANCERS = {
+    "message_count": _advance_message_count,
+    "command_used": _advance_command_used,
+    "reply_count": _advance_reply_count,
+    "vc_minutes": _advance_vc_minutes,
+    "two_step": _advance_two_step,
+    "forum_reaction_any_post": _advance_forum_reaction_any_post,
+    "ledger_event": _advance_ledger_event,
+    "reaction_on_channel_recent": _advance_reaction_on_channel_recent,
+}
+
+async def _advance(guild_id: int, user_id: int, event: dict):
+    """Apply one ingested event to the user's open runs"""
+    runs = _open_runs.get((guild_id, user_id))
+    if not runs:
+        return
+    event.setdefault("ts", int(datetime.datetime.now(datetime.UTC).timestamp()))
+    
+    for run_id, state in list(runs.items()):
+        try:
+            steps = ORDERS_CATALOG[state["order_key"]]["steps_json"]
+            advancer = _ADVANCERS.get(steps["type"])
+            if not advancer:
+                continue
+            # Stop advancing once met (recent reactions keep refreshing their timestamp)
+            if _live_progress(state)["done"] and steps["type"] != "reaction_on_channel_recent":
+                continue
+            if not advancer(steps, state["progress_data"]["live"], event):
+                continue
+            
+            await _save_progress(run_id, state["progress_data"])
+            
+            if ORDERS_AUTO_COMPLETE and _live_progress(state)["done"]:
+                await _auto_complete(guild_id, user_id, run_id, state)
+        except Exception as e:
+            print(f"[-] Failed to advance order run {run_id}: {e}")
+
+async def _auto_complete(guild_id: int, user_id: int, run_id: int, state: dict):
+    """Settle a run as soon as its requirements are met"""
+    from core.data import order_complete
+    result = await order_complete(guild_id, user_id, run_id)
+    if result and result.get("success"):
+        print(f"[+] Auto-completed order {state['order_key']} (run {run_id}) for user {user_id}")
+
+async def ingest_message(guild_id: int, user_id: int, is_reply: bool = False, replied_to_user_is_bot: bool = False):
+    """Advance open runs for a tracked message"""
+    await _advance(guild_id, user_id, {
+        "kind": "message", "is_reply": is_reply, "replied_to_user_is_bot": replied_to_user_is_bot
+    })
+
+async def ingest_command(guild_id: int, user_id: int, command_name: str):
+    """Advance open runs for a used command"""
+    await _advance(guild_id, user_id, {"kind": "command", "command_name": command_name})
+
+async def ingest_reaction(guild_id: int, user_id: int, channel_id: int, emoji, is_forum: bool = False):
+    """Advance open runs for a reaction"""
+    await _advance(guild_id, user_id, {
+        "kind": "reaction", "channel_id": channel_id, "emoji": str(emoji) if emoji else "", "is_forum": is_forum
+    })
+
+async def ingest_vc_minutes(guild_id: int, user_id: int, minutes: int):
+    """Advance open runs for voice minutes"""
+    await _advance(guild_id, user_id, {"kind": "vc", "minutes": minutes})
+
+async def ingest_ledger(guild_id: int, user_id: int, entry_type: str, amount: int):
+    """Advance open runs for a ledger entry (burns)"""
+    await _advance(guild_id, user_id, {"kind": "ledger", "entry_type": entry_type, "amount": amount})
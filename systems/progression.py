@@ -36,7 +36,7 @@ GATES = {
 async def compute_dap_for_day(guild_id: int, user_id: int, day: str) -> int:
     """Compute Daily Activity Points (DAP) for a specific day with caps per spec"""
     row = await fetchone(
-        "SELECT messages, vc_minutes, events, presence_ticks FROM activity_daily WHERE guild_id = ? AND user_id = ? AND day = ?",
+        "SELECT messages_count AS messages, vc_minutes, events, presence_ticks FROM activity_daily WHERE guild_id = ? AND user_id = ? AND day = ?",
         (guild_id, user_id, day)
     )
     
@@ -58,21 +58,25 @@ async def compute_dap_for_day(guild_id: int, user_id: int, day: str) -> int:
     return dap
 
 async def compute_was(guild_id: int, user_id: int) -> int:
-    """Compute Weekly Activity Score (WAS) from last 7 days activity_daily"""
+    """Compute Weekly Activity Score (WAS) from last 7 days activity_daily (sum of each day's DAP, same caps)"""
     seven_days_ago = (datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=7)).date().isoformat()
     
-    rows = await fetchall(
-        "SELECT day FROM activity_daily WHERE guild_id = ? AND user_id = ? AND day >= ? ORDER BY day",
+    row = await fetchone(
+        """SELECT SUM(MIN(COALESCE(messages_count, 0), 100) + MIN(COALESCE(vc_minutes, 0), 480) / 2
+                      + MIN(COALESCE(events, 0), 10) * 10 + COALESCE(presence_ticks, 0) * 2) AS was
+           FROM activity_daily WHERE guild_id = ? AND user_id = ? AND day >= ?""",
         (guild_id, user_id, seven_days_ago)
     )
-    
-    was = 0
-    for row in rows:
-        day = row["day"]
-        dap = await compute_dap_for_day(guild_id, user_id, day)
-        was += dap
-    
-    return was
+    return (row["was"] or 0) if row else 0
+
+async def get_rank_metrics(guild_id: int, user_id: int) -> dict:
+    """Inputs shared by the gate, held-rank, readiness and blocker checks, read once: {"messages_7d", "was", "obedience"}"""
+    activity = await get_activity_7d(guild_id, user_id)
+    return {
+        "messages_7d": activity["messages"],
+        "was": await compute_was(guild_id, user_id),
+        "obedience": await compute_obedience14(guild_id, user_id),
+    }
 
 async def compute_obedience14(guild_id: int, user_id: int) -> dict:
     """Compute Obedience14 from last 14 days order_runs with streak bonus and decay rule"""
@@ -155,16 +159,13 @@ def compute_coin_rank(lce: int) -> str:
                 return rank["name"]
     return "Stray"
 
-async def compute_eligible_rank(guild_id: int, user_id: int) -> dict:
+async def compute_eligible_rank(guild_id: int, user_id: int, metrics: dict = None) -> dict:
     """Compute eligible rank based on gates (minimum requirements)"""
     # Get current metrics
-    activity = await get_activity_7d(guild_id, user_id)
-    was = await compute_was(guild_id, user_id)
-    obedience = await compute_obedience14(guild_id, user_id)
-    
-    messages_7d = activity["messages"]
-    was_score = was
-    obedience14 = obedience["obedience_pct"]
+    metrics = metrics or await get_rank_metrics(guild_id, user_id)
+    messages_7d = metrics["messages_7d"]
+    was_score = metrics["was"]
+    obedience14 = metrics["obedience"]["obedience_pct"]
     
     # Find highest rank where all gates are passed
     eligible_rank = "Stray"
@@ -198,10 +199,10 @@ async def compute_eligible_rank(guild_id: int, user_id: int) -> dict:
         "obedience14": obedience14
     }
 
-async def compute_final_rank(guild_id: int, user_id: int, lce: int) -> dict:
+async def compute_final_rank(guild_id: int, user_id: int, lce: int, metrics: dict = None) -> dict:
     """Compute final rank: min(coin_rank, eligible_rank)"""
     coin_rank = compute_coin_rank(lce)
-    eligible_data = await compute_eligible_rank(guild_id, user_id)
+    eligible_data = await compute_eligible_rank(guild_id, user_id, metrics)
     eligible_rank = eligible_data["rank"]
     
     # Convert ranks to indices to compare
@@ -219,7 +220,8 @@ async def compute_final_rank(guild_id: int, user_id: int, lce: int) -> dict:
         "eligible_data": eligible_data
     }
 
-async def compute_held_rank(guild_id: int, user_id: int, coin_rank: str, eligible_rank: str, current_held_rank_idx: int = 0, debt: int = 0) -> dict:
+async def compute_held_rank(guild_id: int, user_id: int, coin_rank: str, eligible_rank: str, current_held_rank_idx: int = 0, debt: int = 0,
+                            metrics: dict = None) -> dict:
     """
     Compute held rank with promotion/demotion rules.
     Returns: {"held_rank_idx": int, "held_rank": str, "at_risk": int, "promoted": bool, "demoted": bool}
@@ -239,13 +241,11 @@ async def compute_held_rank(guild_id: int, user_id: int, coin_rank: str, eligibl
         current_held_rank = rank_names[held_idx]
         if current_held_rank in GATES:
             # Get user metrics
-            activity = await get_activity_7d(guild_id, user_id)
-            obedience = await compute_obedience14(guild_id, user_id)
-            was = await compute_was(guild_id, user_id)
-            
-            messages_7d = activity["messages"]
-            obedience14 = obedience["obedience_pct"]
-            fail14 = obedience["failed"]
+            metrics = metrics or await get_rank_metrics(guild_id, user_id)
+            messages_7d = metrics["messages_7d"]
+            was = metrics["was"]
+            obedience14 = metrics["obedience"]["obedience_pct"]
+            fail14 = metrics["obedience"]["failed"]
             
             gates = GATES[current_held_rank]
             failing_gates_count = 0
@@ -292,7 +292,7 @@ async def compute_held_rank(guild_id: int, user_id: int, coin_rank: str, eligibl
         "demoted": demoted
     }
 
-async def compute_readiness_pct(guild_id: int, user_id: int, next_rank_name: str) -> int:
+async def compute_readiness_pct(guild_id: int, user_id: int, next_rank_name: str, metrics: dict = None) -> int:
     """Compute readiness percentage toward next rank (weighted progress across gates)"""
     if next_rank_name not in GATES:
         return 100
@@ -302,13 +302,10 @@ async def compute_readiness_pct(guild_id: int, user_id: int, next_rank_name: str
         return 100
     
     # Get current metrics
-    activity = await get_activity_7d(guild_id, user_id)
-    was = await compute_was(guild_id, user_id)
-    obedience = await compute_obedience14(guild_id, user_id)
-    
-    messages_7d = activity["messages"]
-    was_score = was
-    obedience14 = obedience["obedience_pct"]
+    metrics = metrics or await get_rank_metrics(guild_id, user_id)
+    messages_7d = metrics["messages_7d"]
+    was_score = metrics["was"]
+    obedience14 = metrics["obedience"]["obedience_pct"]
     
     # Calculate progress for each gate
     total_progress = 0
@@ -334,7 +331,7 @@ async def compute_readiness_pct(guild_id: int, user_id: int, next_rank_name: str
     readiness_pct = int(total_progress / total_weight) if total_weight > 0 else 0
     return min(100, readiness_pct)
 
-async def compute_blocker(guild_id: int, user_id: int, next_rank_name: str) -> str:
+async def compute_blocker(guild_id: int, user_id: int, next_rank_name: str, metrics: dict = None) -> str:
     """Find the most limiting gate; show (current/required) or (current <= limit)"""
     if next_rank_name not in GATES:
         return "🔓 Ready"
@@ -344,13 +341,10 @@ async def compute_blocker(guild_id: int, user_id: int, next_rank_name: str) -> s
         return "🔓 Ready"
     
     # Get current metrics
-    activity = await get_activity_7d(guild_id, user_id)
-    was = await compute_was(guild_id, user_id)
-    obedience = await compute_obedience14(guild_id, user_id)
-    
-    messages_7d = activity["messages"]
-    was_score = was
-    obedience14 = obedience["obedience_pct"]
+    metrics = metrics or await get_rank_metrics(guild_id, user_id)
+    messages_7d = metrics["messages_7d"]
+    was_score = metrics["was"]
+    obedience14 = metrics["obedience"]["obedience_pct"]
     
     # Find the gate with lowest progress percentage
     worst_gate = None
@@ -0,0 +1,337 @@
+﻿"""
+Static response registry - informational embeds built once per (command, locale) and shared across sends
+Benchmark: python -m systems.static_embeds --iterations 1000
+"""
+import argparse
+import time
+
+import discord
+
+DEFAULT_LOCALE = "en-US"  # Locales without their own builder share this entry
+CASINO_THUMBNAIL = "https://i.imgur.com/W30kCYP.png"
+
+_builders = {}  # {(name, locale): builder}
+_registry = {}  # {(name, locale): discord.Embed}
+_stats = {
+    "builds": 0,
+    "hits": 0,
+    "build_seconds": 0.0,
+}
+
+def static_embed(name: str, locale: str = DEFAULT_LOCALE):
+    """Register a zero-argument embed builder for a command name (and locale)"""
+    def decorator(func):
+        _builders[(name, locale)] = func
+        return func
+    return decorator
+
+def _resolve(name: str, locale: str = None) -> tuple:
+    key = (name, str(locale) if locale else DEFAULT_LOCALE)
+    if key in _builders:
+        return key
+    if (name, DEFAULT_LOCALE) in _builders:
+        return (name, DEFAULT_LOCALE)
+    raise KeyError(f"No static embed registered for {name!r}")
+
+def get_static_embed(name: str, locale: str = None, copy: bool = False) -> discord.Embed:
+    """
+    Shared embed for a command, built on first use. The returned embed is shared by every
+    send and must not be modified; pass copy=True before adding per-user fields.
+    """
+    key = _resolve(name, locale)
+    embed = _registry.get(key)
+    if embed is None:
+        started = time.perf_counter()
+        embed = _builders[key]()
+        _stats["build_seconds"] += time.perf_counter() - started
+        _stats["builds"] += 1
+        _registry[key] = embed
+    else:
+        _stats["hits"] += 1
+    return embed.copy() if copy else embed
+
+def build_static_embeds():
+    """Build every registered embed up front (startup warm-up)"""
+    for name, locale in _builders:
+        get_static_embed(name, locale)
+
+def invalidate_static_embeds():
+    """Drop built embeds so the next send rebuilds them (called by the admin config commands after every write)"""
+    _registry.clear()
+
+def get_static_embed_stats() -> dict:
+    return {
+        **_stats,
+        "registered": len(_builders),
+        "built": len(_registry),
+    }
+
+# -----------------------------
+# Casino
+# -----------------------------
+@static_embed("casino")
+def build_casino_overview_embed() -> discord.Embed:
+    """/casino"""
+    embed = discord.Embed(
+        title="<a:A_shuffle:1451743595681026125> Isla's Casino",
+        description="Welcome to my casino — where luck comes to play <:kisses:1449998044446593125>",
+        colour=0x0fa3ff
+    )
+    embed.add_field(name="Games",
+                    value="`/coinflip`\n`/dice`\n`/slots`\n`/roulette`\n`/blackjack`",
+                    inline=True)
+    embed.add_field(name="Cooldowns",
+                    value="Coinflip 8s\nDice 10s\nSlots 15s\nRoulette 20s\nBlackjack 30s",
+                    inline=True)
+    embed.add_field(name="Streaks",
+                    value="🔥 3+ wins\n🥶 5+ losses",
+                    inline=True)
+    embed.set_thumbnail(url=CASINO_THUMBNAIL)
+    embed.set_footer(text="Have fun losing~")
+    return embed
+
+@static_embed("coinflipinfo")
+@static_embed("casinoinfo_coinflip")
+def build_coinflip_info_embed() -> discord.Embed:
+    """/coinflipinfo and the /casinoinfo coinflip page"""
+    embed = discord.Embed(
+        title="ℹ️ Coinflip Info",
+        description="49/51 chance to double or lose.",
+        colour=0x0fa3ff
+    )
+    embed.add_field(name="Min Bet", value="**10** coins", inline=True)
+    embed.add_field(name="Payout", value="**x2**", inline=True)
+    embed.add_field(name="Cooldown", value="**8s**", inline=True)
+    embed.set_thumbnail(url=CASINO_THUMBNAIL)
+    embed.set_footer(text="Use /coinflip <bet>")
+    return embed
+
+@static_embed("casinoinfo_dice")
+def build_casinoinfo_dice_embed() -> discord.Embed:
+    embed = discord.Embed(
+        title="ℹ️ Dice Info",
+        description="Roll 1–6 vs dealer. Higher roll wins.",
+        colour=0x0fa3ff
+    )
+    embed.add_field(name="Min Bet", value="**50** coins", inline=True)
+    embed.add_field(name="Payout", value="**x2**", inline=True)
+    embed.add_field(name="Ties", value="Bet returned", inline=True)
+    embed.add_field(name="Cooldown", value="**10s**", inline=True)
+    embed.set_thumbnail(url=CASINO_THUMBNAIL)
+    embed.set_footer(text="Use /dice <bet>")
+    return embed
+
+@static_embed("casinoinfo_slots")
+def build_casinoinfo_slots_embed() -> discord.Embed:
+    embed = discord.Embed(
+        title="<a:A_shuffle:1451743595681026125> Isla's Casino",
+        description="Not all wins are equal. Some are worth waiting for.",
+        colour=0x0fa3ff
+    )
+    embed.add_field(name="Multipliers",
+                    value="🥝 x1.5\n🍇 x2\n🍋 x3\n🍑 x5\n🍉 x8\n🍒 x15\n👑 x30 **JACKPOT**",
+                    inline=True)
+    embed.add_field(name="Bonus",
+                    value="3x 🎁 +5 free spins\n2x 🎁 +2 free spins",
+                    inline=True)
+    embed.add_field(name="Extra",
+                    value="Cooldown: 15s\nMinimum bet: 10\nBonus: `/slots free`",
+                    inline=True)
+    embed.add_field(name="Safety Nets",
+                    value="2-of-a-kind -50% loss",
+                    inline=False)
+    embed.set_thumbnail(url=CASINO_THUMBNAIL)
+    embed.set_footer(text="Good luck… and good losses~")
+    return embed
+
+@static_embed("casinoinfo_roulette")
+def build_casinoinfo_roulette_embed() -> discord.Embed:
+    embed = discord.Embed(
+        title="ℹ️ Roulette Info",
+        description="Bet on red/black/green or a number (0-36).",
+        colour=0x0fa3ff
+    )
+    embed.add_field(name="Bet Types", value="Red/Black: x2\nGreen: x14\nNumber: x36", inline=True)
+    embed.add_field(name="Cooldown", value="**20s**", inline=True)
+    embed.set_thumbnail(url=CASINO_THUMBNAIL)
+    embed.set_footer(text="Use /roulette <bet> <choice>")
+    return embed
+
+@static_embed("casinoinfo_blackjack")
+def build_casinoinfo_blackjack_embed() -> discord.Embed:
+    embed = discord.Embed(
+        title="ℹ️ Blackjack Info",
+        description="Get closer to 21 than the dealer without going over.",
+        colour=0x0fa3ff
+    )
+    embed.add_field(name="Actions", value="Hit, Stand, Double", inline=True)
+    embed.add_field(name="Payout", value="Blackjack: 3:2\nWin: x2\nTie: Refund", inline=True)
+    embed.add_field(name="Cooldown", value="**30s**", inline=True)
+    embed.set_thumbnail(url=CASINO_THUMBNAIL)
+    embed.set_footer(text="Use /blackjack <bet>")
+    return embed
+
+@static_embed("diceinfo")
+def build_diceinfo_embed() -> discord.Embed:
+    """/diceinfo"""
+    from systems.gambling import build_casino_embed
+    return build_casino_embed(
+        kind="info",
+        outcome=None,
+        title="ℹ️ Dice Info",
+        description="Roll 1–6 vs dealer. Higher roll wins.",
+        fields=[
+            {"name": "Min Bet", "value": "**50** coins", "inline": True},
+            {"name": "Payout", "value": "**x2**", "inline": True},
+            {"name": "Ties", "value": "Bet returned", "inline": True},
+            {"name": "Cooldown", "value": "**10s**", "inline": True}
+        ],
+        footer_text="Use /dice <bet>"
+    )
+
+@static_embed("slotspaytable")
+def build_slotspaytable_embed() -> discord.Embed:
+    """/slotspaytable"""
+    from systems.gambling import build_casino_embed
+    return build_casino_embed(
+        kind="info",
+        outcome=None,
+        title="ℹ️ Slots Paytable",
+        description="3-of-a-kind multipliers (weighted reels).",
+        fields=[
+            {"name": "Multipliers", "value": "🥝 x1.5 • 🍇 x2 • 🍋 x3 • 🍑 x5 • 🍉 x8 • 🍒 x15 • 👑 x30 (JACKPOT)", "inline": False},
+            {"name": "Bonus 🎁", "value": "3x 🎁 → +5 free spins\n2x 🎁 → +2 free spins +250 coins\n🎁 + pair → x0.8 multiplier", "inline": False},
+            {"name": "Safety Nets", "value": "2-of-a-kind → -50% loss\nFree spins: `/slots free`", "inline": False}
+        ],
+        footer_text="Cooldown: 15s • Min bet: 10"
+    )
+
+@static_embed("slotsinfo")
+def build_slotsinfo_embed() -> discord.Embed:
+    """/slotsinfo"""
+    from systems.gambling import build_casino_embed
+    return build_casino_embed(
+        kind="info",
+        outcome=None,
+        title="ℹ️ Slots Info",
+        description="3 reel weighted symbols. Match 3-of-a-kind to win.",
+        fields=[
+            {"name": "Min Bet", "value": "**10** coins", "inline": True},
+            {"name": "Cooldown", "value": "**15s**", "inline": True},
+            {"name": "Free Spins", "value": "Use `/slots free`", "inline": True},
+            {"name": "Streaks", "value": "🔥 Hot: 3+ wins • 🥶 Cold: 5+ losses", "inline": False}
+        ],
+        footer_text="See /slotspaytable for multipliers"
+    )
+
+# -----------------------------
+# Server info
+# -----------------------------
+@static_embed("store")
+def build_store_embed() -> discord.Embed:
+    """/store (placeholder for now)"""
+    return discord.Embed(
+        title="🏪 Store",
+        description="The store is coming soon...\n\nSpend your coins on exclusive rewards!",
+        color=0xff000d,
+    )
+
+@static_embed("rules")
+def build_rules_embed() -> discord.Embed:
+    """/rules and onboarding"""
+    from systems.onboarding import build_rules_embed
+    return build_rules_embed()
+
+@static_embed("rank_info")
+def build_rank_info_embed() -> discord.Embed:
+    """/rank info - how ranks are earned and held"""
+    embed = discord.Embed(
+        description="Ranks are not earned by activity or coins alone.\nThey reflect consistency, obedience, and presence over time."
+    )
+    embed.set_author(
+        name="Rank System Overview",
+        icon_url="https://i.imgur.com/irmCXhw.gif"
+    )
+    
+    # Spacer
+    embed.add_field(name="", value="", inline=False)
+    
+    # How Ranks Work
+    embed.add_field(
+        name="How Ranks Work",
+        value="• Coins determine which rank bracket you qualify for.\n• Obedience and Activity determine if you can hold it.\n• Failing requirements can put your rank at risk.",
+        inline=True
+    )
+    
+    # Spacer
+    embed.add_field(name="", value="", inline=False)
+    
+    # What Affects Your Rank
+    embed.add_field(
+        name="What Affects Your Rank",
+        value="📈 Lifetime Coins — long-term contribution.\n🧠 Obedience — order completion & streaks.\n👁️ Activity — weekly presence (messages & VC).\n❌ Failed Orders — missed responsibilities.\n⏳ Late Orders — delayed compliance.\n🔥 Streak — consecutive compliant days.",
+        inline=False
+    )
+    
+    # Spacer
+    embed.add_field(name="", value="", inline=False)
+    
+    # Progress & Blockers
+    embed.add_field(
+        name="Progress & Blockers",
+        value="• Your progress bar shows readiness for the next rank\n• A blocker indicates the main requirement holding you back\n• Only one blocker is shown to keep focus clear",
+        inline=False
+    )
+    
+    # Spacer
+    embed.add_field(name="", value="", inline=False)
+    
+    # Stability & Risk
+    embed.add_field(
+        name="Stability & Risk",
+        value="• Stable ranks meet all requirements\n• At-risk ranks fail one or more gates\n• Repeated instability can result in demotion",
+        inline=True
+    )
+    
+    # Spacer
+    embed.add_field(name="", value="", inline=False)
+    
+    embed.set_footer(text="Use /rank to check your progress.")
+    
+    return embed
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+def benchmark_static_embeds(iterations: int = 1000) -> dict:
+    """Per-command cost of building each embed vs. fetching it from the registry: {name: (build_us, cached_us)}"""
+    results = {}
+    for key in sorted(_builders):
+        builder = _builders[key]
+        started = time.perf_counter()
+        for _ in range(iterations):
+            builder()
+        build_us = (time.perf_counter() - started) / iterations * 1e6
+        
+        get_static_embed(*key)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            get_static_embed(*key)
+        cached_us = (time.perf_counter() - started) / iterations * 1e6
+        results[key[0] if key[1] == DEFAULT_LOCALE else f"{key[0]} [{key[1]}]"] = (build_us, cached_us)
+    return results
+
+def format_benchmark(results: dict, iterations: int) -> str:
+    lines = [f"Static embeds ({iterations} iterations each)", f"{'command':<22} {'build µs':>10} {'cached µs':>10} {'speedup':>8}"]
+    for name, (build_us, cached_us) in results.items():
+        lines.append(f"{name:<22} {build_us:>10.2f} {cached_us:>10.2f} {build_us / cached_us if cached_us else 0:>7.0f}x")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark static embed build time before/after the registry")
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args(argv)
+    print(format_benchmark(benchmark_static_embeds(args.iterations), args.iterations))
+
+if __name__ == "__main__":
+    main()
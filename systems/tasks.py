@@ -5,16 +5,21 @@ import discord
 from discord.ext import tasks
 import datetime
 import random
+import asyncio
+import heapq
 
 from core.config import (
     NON_XP_CATEGORY_IDS, NON_XP_CHANNEL_IDS,
-    EXCLUDED_ROLE_SET
+    EXCLUDED_ROLE_SET, RANK_ROLE_MAP
 )
 # Legacy XP/Level system removed - V3 progression only
 from core.utils import resolve_category_id, get_channel_multiplier, get_timezone, USE_PYTZ
 # Legacy event system removed
 from core.db import fetchall, fetchone, execute, _today_str, _now_iso, get_announcements_channel_id, get_promo_rotation_state, update_promo_rotation_state
-from systems.progression import compute_final_rank, compute_readiness_pct, compute_blocker, compute_held_rank, RANK_LADDER, GATES
+from core import outbound, cooldowns
+from core.metrics import timed_job
+from systems.leaderboards import mark_dirty
+from systems.progression import compute_final_rank, compute_readiness_pct, compute_blocker, compute_held_rank, get_rank_metrics, RANK_LADDER, GATES
 
 # Global flag to stop all automated messages (legacy, kept for compatibility)
 automated_messages_enabled = True
@@ -85,7 +90,7 @@ async def send_throne_announcement(guild):
     embed.set_author(name="Throne", icon_url=impact_icon("positive"))
     
     try:
-        await channel.send("@everyone", embed=embed)
+        await outbound.send(channel, "@everyone", embed=embed)
         print(f"✅ Throne announcement sent to {channel.name}")
         return True
     except Exception as e:
@@ -121,7 +126,7 @@ async def send_coffee_announcement(guild):
     embed.set_author(name="Coffee", icon_url=impact_icon("positive"))
     
     try:
-        await channel.send("@everyone", embed=embed)
+        await outbound.send(channel, "@everyone", embed=embed)
         print(f"✅ Coffee announcement sent to {channel.name}")
         return True
     except Exception as e:
@@ -134,84 +139,65 @@ async def auto_save():
     # Data is now in SQLite, no periodic JSON save needed
     print(f"Auto-save check completed at {datetime.datetime.now(datetime.UTC)} (using SQLite)")
 
-# V3 Progression: Daily and Weekly Jobs
-_last_daily_job_run = None
-_last_weekly_job_run = None
+@tasks.loop(seconds=cooldowns.FLUSH_INTERVAL_SECONDS)
+async def cooldown_flush():
+    """Persist changed cooldowns (daily/give claims, free spins, streaks) to SQLite"""
+    await cooldowns.flush()
 
-@tasks.loop(hours=1)
+# V3 Progression: Daily and Weekly Jobs (scheduled by core.scheduler, see register_scheduled_jobs)
 async def v3_daily_job():
-    """V3 Progression daily job: inactivity tax, obedience decay, rank cache, role assignment"""
-    global _last_daily_job_run
+    """V3 Progression daily job (00:00 UK): inactivity tax, obedience decay, rank cache, role assignment"""
+    print(f"Running V3 daily job at {datetime.datetime.now(_get_uk_timezone()).strftime('%Y-%m-%d %H:%M:%S')} UK time")
     
-    uk_tz = _get_uk_timezone()
-    if uk_tz is None:
-        return
-    
-    now_uk = datetime.datetime.now(uk_tz)
-    today_str = now_uk.strftime("%Y-%m-%d")
-    
-    # Run once per day at 00:00 UK time
-    if now_uk.hour != 0 or now_uk.minute > 5:
-        return
-    
-    if _last_daily_job_run == today_str:
-        return
+    # Convert overdue loans to debt (run once, processes all guilds)
+    from core.data import convert_overdue_loans
+    converted = await convert_overdue_loans()
+    if converted > 0:
+        print(f"Converted {converted} overdue loans to debt")
     
-    _last_daily_job_run = today_str
-    print(f"Running V3 daily job at {now_uk.strftime('%Y-%m-%d %H:%M:%S')} UK time")
+    for guild in bot.guilds:
+        guild_id = guild.id if guild else 0
+        processed_count = await run_daily_progression(guild_id)
+        print(f"V3 daily job completed for guild {guild_id}: {processed_count} users processed")
+
+async def run_daily_progression(guild_id: int, period: str = None) -> int:
+    """
+    Daily per-guild pass: tax and rank cache for users active in the last 30 days, then rank roles.
+    Checkpointed per UK day (period), so a rerun after a crash skips users already taxed. Returns users processed
+    """
+    from core.batch_jobs import run_batch
+    period = period or datetime.datetime.now(_get_uk_timezone()).strftime("%Y-%m-%d")
+    # Get all active users (users with activity in last 30 days)
+    thirty_days_ago = (datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=30)).date().isoformat()
+    active_users = await fetchall(
+        """SELECT DISTINCT user_id FROM activity_daily 
+           WHERE guild_id = ? AND day >= ?""",
+        (guild_id, thirty_days_ago)
+    )
     
-    try:
-        # Convert overdue loans to debt (run once, processes all guilds)
-        from core.data import convert_overdue_loans
-        converted = await convert_overdue_loans()
-        if converted > 0:
-            print(f"Converted {converted} overdue loans to debt")
+    async def process_user(user_id):
+        # 1. Apply inactivity tax
+        await _apply_inactivity_tax(guild_id, user_id)
         
-        # Get all active users (users with activity in last 30 days)
-        thirty_days_ago = (datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=30)).date().isoformat()
+        # 2. Obedience decay is already handled in compute_obedience14
+        # (it checks if no orders completed today and reduces by 1%)
         
-        for guild in bot.guilds:
-            guild_id = guild.id if guild else 0
-            
-            # Get users with recent activity
-            active_users = await fetchall(
-                """SELECT DISTINCT user_id FROM activity_daily 
-                   WHERE guild_id = ? AND day >= ?""",
-                (guild_id, thirty_days_ago)
-            )
-            
-            processed_count = 0
-            for row in active_users:
-                user_id = row["user_id"]
-                
-                try:
-                    # 1. Apply inactivity tax
-                    await _apply_inactivity_tax(guild_id, user_id)
-                    
-                    # 2. Obedience decay is already handled in compute_obedience14
-                    # (it checks if no orders completed today and reduces by 1%)
-                    
-                    # 3. Recompute rank cache
-                    await _recompute_rank_cache(guild_id, user_id)
-                    
-                    processed_count += 1
-                except Exception as e:
-                    print(f"Error processing user {user_id} in daily job: {e}")
-            
-            # 4. Role assignment by rank (process all users with rank_cache entries)
-            await _assign_ranks_roles(guild_id)
-            
-            print(f"V3 daily job completed for guild {guild_id}: {processed_count} users processed")
+        # 3. Recompute rank cache
+        await _recompute_rank_cache(guild_id, user_id)
     
-    except Exception as e:
-        print(f"Error in V3 daily job: {e}")
+    # No retry_failed: the tax/interest commits before the later steps, so a failed user may already be charged
+    result = await run_batch("v3_daily", period, guild_id, [row["user_id"] for row in active_users], process_user)
+    
+    # 4. Role assignment by rank (process all users with rank_cache entries)
+    await _assign_ranks_roles(guild_id)
+    return result["done"]
 
 async def _apply_inactivity_tax(guild_id: int, user_id: int):
     """Apply inactivity tax if user hasn't been active"""
     # Check if user had qualifying activity today
     today = _today_str()
     activity = await fetchall(
-        """SELECT messages, vc_minutes FROM activity_daily 
+        """SELECT messages_count AS messages, vc_minutes FROM activity_daily 
            WHERE guild_id = ? AND user_id = ? AND day = ?""",
         (guild_id, user_id, today)
     )
@@ -237,7 +223,7 @@ async def _apply_inactivity_tax(guild_id: int, user_id: int):
             
             # Deduct tax
             from core.data import add_coins
-            await add_coins(guild_id, user_id, -tax_amount, "inactivity_tax", {"tax_amount": tax_amount})
+            await add_coins(user_id, -tax_amount, guild_id=guild_id, reason="inactivity_tax", meta={"tax_amount": tax_amount})
             
             # Update discipline state
             await execute(
@@ -256,13 +242,14 @@ async def _recompute_rank_cache(guild_id: int, user_id: int):
         "SELECT held_rank_idx, at_risk, at_risk_since FROM rank_cache WHERE guild_id = ? AND user_id = ?",
         (guild_id, user_id)
     )
-    current_held_rank_idx = current_cache["held_rank_idx"] if current_cache and current_cache.get("held_rank_idx") is not None else 0
-    current_at_risk = current_cache["at_risk"] if current_cache and current_cache.get("at_risk") else 0
+    current_held_rank_idx = current_cache["held_rank_idx"] if current_cache and current_cache["held_rank_idx"] is not None else 0
+    current_at_risk = current_cache["at_risk"] if current_cache and current_cache["at_risk"] else 0
     at_risk_since = current_cache["at_risk_since"] if current_cache else None
     
     lce = await get_lce(guild_id, user_id)
     debt = await get_debt(guild_id, user_id)
-    rank_data = await compute_final_rank(guild_id, user_id, lce)
+    metrics = await get_rank_metrics(guild_id, user_id)  # Read once; every rank check below reuses it
+    rank_data = await compute_final_rank(guild_id, user_id, lce, metrics)
     
     # Compute held rank with promotion/demotion logic
     held_rank_data = await compute_held_rank(
@@ -270,7 +257,8 @@ async def _recompute_rank_cache(guild_id: int, user_id: int):
         rank_data["coin_rank"], 
         rank_data["eligible_rank"],
         current_held_rank_idx,
-        debt
+        debt,
+        metrics
     )
     
     held_rank = held_rank_data["held_rank"]
@@ -300,31 +288,8 @@ async def _recompute_rank_cache(guild_id: int, user_id: int):
     next_idx = min(held_rank_idx + 1, len(rank_names) - 1)
     next_rank = rank_names[next_idx] if next_idx > held_rank_idx else held_rank
     
-    readiness_pct = await compute_readiness_pct(guild_id, user_id, next_rank)
-    blocker_text = await compute_blocker(guild_id, user_id, next_rank)
-    
-    # Check for failed gates (for soft demotion tracking)
-    failed_gates_count = 0
-    if next_rank != "Max Rank" and next_rank in GATES:
-        from core.data import get_profile_stats
-        stats = await get_profile_stats(guild_id, user_id)
-        gates = GATES[next_rank]
-        
-        for gate in gates:
-            gate_type = gate["type"]
-            gate_min = gate["min"]
-            
-            if gate_type == "messages_7d" and stats.get("messages_sent", 0) < gate_min:
-                failed_gates_count += 1
-            elif gate_type == "was" and stats.get("was", 0) < gate_min:
-                failed_gates_count += 1
-            elif gate_type == "obedience14" and stats.get("obedience_pct", 0) < gate_min:
-                failed_gates_count += 1
-        
-        if stats.get("orders_failed", 0) > 4:
-            failed_gates_count += 1
-        if stats.get("orders_late", 0) > 2:
-            failed_gates_count += 1
+    readiness_pct = await compute_readiness_pct(guild_id, user_id, next_rank, metrics)
+    blocker_text = await compute_blocker(guild_id, user_id, next_rank, metrics)
     
     # Track promotions
     last_promotion_at = None
@@ -341,78 +306,76 @@ async def _recompute_rank_cache(guild_id: int, user_id: int):
          rank_data["final_rank"], held_rank_idx, at_risk, at_risk_since,
          readiness_pct, blocker_text, now_iso, last_promotion_at)
     )
+    mark_dirty(guild_id, user_id, ("rank",))
 
 async def _assign_ranks_roles(guild_id: int):
-    """Assign Discord roles based on user ranks (placeholder - implement role IDs mapping)"""
-    # This is a placeholder - implement role assignment logic based on your server's role setup
-    # You'll need to map ranks to role IDs in config.py
-    pass
-
-@tasks.loop(hours=12)
-async def v3_weekly_job():
-    """V3 Progression weekly job: debt interest, weekly claim reset, soft demotion"""
-    global _last_weekly_job_run
+    """Sync Discord rank roles to each user's held rank in rank_cache (one role edit per member that differs)"""
+    from core.roles import apply_role_plan, plan_exclusive_roles
     
-    uk_tz = _get_uk_timezone()
-    if uk_tz is None:
+    rank_role_ids = {rank: role_id for rank, role_id in RANK_ROLE_MAP.items() if role_id}
+    if not rank_role_ids:
         return
     
-    now_uk = datetime.datetime.now(uk_tz)
-    
-    # Run once per week on Monday at 00:00 UK time
-    if now_uk.weekday() != 0 or now_uk.hour != 0 or now_uk.minute > 5:
+    guild = bot.get_guild(guild_id) if bot else None
+    if not guild:
         return
     
+    rank_names = [r["name"] for r in RANK_LADDER]
+    rows = await fetchall(
+        "SELECT user_id, held_rank_idx FROM rank_cache WHERE guild_id = ?",
+        (guild_id,)
+    )
+    desired = {}
+    for row in rows:
+        held_idx = row["held_rank_idx"] or 0
+        held_rank = rank_names[held_idx] if held_idx < len(rank_names) else rank_names[0]
+        desired[row["user_id"]] = rank_role_ids.get(held_rank)
+    
+    plan = plan_exclusive_roles(guild, desired, rank_role_ids.values(), skip_role_ids=EXCLUDED_ROLE_SET)
+    await apply_role_plan(guild, plan, "Rank role sync", job_key=f"rank_roles:{guild_id}")
+
+async def v3_weekly_job():
+    """V3 Progression weekly job (Monday 00:00 UK): debt interest, weekly claim reset, soft demotion"""
+    from core.batch_jobs import run_batch
+    now_uk = datetime.datetime.now(_get_uk_timezone())
     week_str = now_uk.strftime("%Y-W%W")
-    if _last_weekly_job_run == week_str:
-        return
-    
-    _last_weekly_job_run = week_str
     print(f"Running V3 weekly job at {now_uk.strftime('%Y-%m-%d %H:%M:%S')} UK time")
     
-    try:
-        for guild in bot.guilds:
-            guild_id = guild.id if guild else 0
+    for guild in bot.guilds:
+        guild_id = guild.id if guild else 0
+        
+        # Get all users with debt or discipline state
+        users = await fetchall(
+            """SELECT DISTINCT user_id FROM discipline_state WHERE guild_id = ? AND debt > 0
+               UNION
+               SELECT DISTINCT user_id FROM weekly_claims WHERE guild_id = ?""",
+            (guild_id, guild_id)
+        )
+        
+        async def process_user(user_id, guild_id=guild_id):
+            # 1. Apply debt interest (3%)
+            await _apply_debt_interest(guild_id, user_id)
             
-            # Get all users with debt or discipline state
-            users = await fetchall(
-                """SELECT DISTINCT user_id FROM discipline_state WHERE guild_id = ? AND debt > 0
-                   UNION
-                   SELECT DISTINCT user_id FROM weekly_claims WHERE guild_id = ?""",
-                (guild_id, guild_id)
+            # 2. Reset weekly claim (allow users to claim again)
+            # Weekly claim reset happens automatically when they use /coins weekly
+            # But we can clear old entries older than 7 days
+            seven_days_ago = (datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=7)).isoformat()
+            await execute(
+                """DELETE FROM weekly_claims 
+                   WHERE guild_id = ? AND user_id = ? AND last_claimed_at < ?""",
+                (guild_id, user_id, seven_days_ago)
             )
             
-            processed_count = 0
-            for row in users:
-                user_id = row["user_id"]
-                
-                try:
-                    # 1. Apply debt interest (3%)
-                    await _apply_debt_interest(guild_id, user_id)
-                    
-                    # 2. Reset weekly claim (allow users to claim again)
-                    # Weekly claim reset happens automatically when they use /coins weekly
-                    # But we can clear old entries older than 7 days
-                    seven_days_ago = (datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=7)).isoformat()
-                    await execute(
-                        """DELETE FROM weekly_claims 
-                           WHERE guild_id = ? AND user_id = ? AND last_claimed_at < ?""",
-                        (guild_id, user_id, seven_days_ago)
-                    )
-                    
-                    # 3. Evaluate soft demotion (2 consecutive weeks failing gates)
-                    await _evaluate_soft_demotion(guild_id, user_id)
-                    
-                    processed_count += 1
-                except Exception as e:
-                    print(f"Error processing user {user_id} in weekly job: {e}")
-            
-            print(f"V3 weekly job completed for guild {guild_id}: {processed_count} users processed")
-    
-    except Exception as e:
-        print(f"Error in V3 weekly job: {e}")
+            # 3. Evaluate soft demotion (2 consecutive weeks failing gates)
+            await _evaluate_soft_demotion(guild_id, user_id)
+        
+        # Checkpointed per week, so a rerun after a crash doesn't charge interest twice
+        # No retry_failed: the tax/interest commits before the later steps, so a failed user may already be charged
+        result = await run_batch("v3_weekly", week_str, guild_id, [row["user_id"] for row in users], process_user)
+        print(f"V3 weekly job completed for guild {guild_id}: {result['done']} users processed")
 
 @tasks.loop(hours=6)
+@timed_job("cleanup_expired_events_task")
 async def cleanup_expired_events_task():
     """Cleanup expired event data (runs every 6 hours)"""
     try:
@@ -452,7 +415,7 @@ async def _evaluate_soft_demotion(guild_id: int, user_id: int):
         return
     
     current_rank = rank_cache["final_rank"]
-    failed_weeks = rank_cache.get("failed_weeks_count", 0) or 0
+    failed_weeks = rank_cache["failed_weeks_count"] or 0
     
     # Check if user is failing gates for their current rank
     if current_rank in GATES:
@@ -511,19 +474,9 @@ async def _evaluate_soft_demotion(guild_id: int, user_id: int):
                 )
 
 
-@tasks.loop(hours=1)
 async def promo_rotation_scheduler():
-    """4-day rotation scheduler for Throne and Coffee announcements"""
-    uk_tz = _get_uk_timezone()
-    if uk_tz is None:
-        return
-    
-    now_uk = datetime.datetime.now(uk_tz)
-    today_str = now_uk.strftime("%Y-%m-%d")
-    
-    # Run once per day at 12:00 UK time (noon)
-    if now_uk.hour != 12 or now_uk.minute > 5:
-        return
+    """4-day rotation of Throne and Coffee announcements (daily at 12:00 UK)"""
+    today_str = datetime.datetime.now(_get_uk_timezone()).strftime("%Y-%m-%d")
     
     for guild in bot.guilds:
         try:
@@ -576,154 +529,237 @@ def _get_uk_timezone():
 
 # Legacy event scheduler removed - replaced with promo rotation scheduler
 
-_last_orders_drop_run = None
-
-@tasks.loop(hours=1)
 async def daily_orders_drop_task():
-    """Daily orders drop: update available orders and send announcement at reset time"""
-    global _last_orders_drop_run
+    """Daily orders drop (00:00 UK): send the new-orders announcement to each configured channel"""
+    now_uk = datetime.datetime.now(_get_uk_timezone())
+    print(f"Running daily orders drop at {now_uk.strftime('%Y-%m-%d %H:%M:%S')} UK time")
     
-    uk_tz = _get_uk_timezone()
-    if uk_tz is None:
+    for guild in bot.guilds:
+        guild_id = guild.id if guild else 0
+        
+        # Get announcement channel
+        config_row = await fetchone(
+            "SELECT channel_id FROM orders_announcement_config WHERE guild_id = ?",
+            (guild_id,)
+        )
+        
+        if not config_row:
+            continue  # No channel configured
+        
+        channel_id = config_row["channel_id"]
+        channel = guild.get_channel(channel_id)
+        
+        if not channel:
+            continue
+        
+        # Clear today's orders cache (forces refresh on next /orders call)
+        # The cache is in user_commands module, so orders will refresh naturally
+        
+        # Send announcement embed
+        from core.utils import impact_icon
+        embed = discord.Embed(
+            title="Orders",
+            description="New orders available, complete them to gain my favor. \n\nRemember, I reward good pups who get their orders done, and those who don't.. well..",
+        )
+        embed.set_thumbnail(url="https://i.imgur.com/sGDoIDA.png")
+        embed.set_footer(text="Type /orders in #commands channel")
+        embed.set_author(name="Orders", icon_url=impact_icon("neutral"))
+        
+        try:
+            await outbound.send(channel, embed=embed)
+            print(f"Sent daily orders drop announcement to {channel.name} in {guild.name}")
+        except Exception as e:
+            print(f"Failed to send orders announcement in {guild.name}: {e}")
+
+# ===== PERSONAL ORDER REMINDERS =====
+# Reminders sit on a min-heap keyed on due_at - 2h and fire precisely from one sleeping
+# task. Entries are added on order accept and cancelled on complete/fail; an entry stays
+# until its reminder is sent (re-queued while the user is not opted in or a send fails),
+# and the heap is rebuilt at startup from one join (order_reminders marks the ones already sent).
+
+ORDER_REMINDER_LEAD_SECONDS = 7200  # Remind when 2 hours are left
+ORDER_REMINDER_RETRY_SECONDS = 900  # Not opted in yet / transient send failure: check again (the old loop's tick)
+
+_reminder_heap = []  # [(fire_ts, run_id)]
+_reminder_entries = {}  # {run_id: {"guild_id", "user_id", "due_ts", "order_name", "fire_ts"}}
+_reminder_wakeup = None  # asyncio.Event, set when an earlier reminder is scheduled
+_reminder_task = None
+_reminder_sends = set()  # In-flight reminder tasks (held so they aren't garbage-collected)
+
+def schedule_order_reminder(guild_id: int, user_id: int, run_id: int, due_at: str, order_name: str):
+    """Schedule the 2h-left reminder for an accepted run"""
+    due_ts = int(datetime.datetime.fromisoformat(due_at.replace('Z', '+00:00')).timestamp())
+    fire_ts = due_ts - ORDER_REMINDER_LEAD_SECONDS
+    _reminder_entries[run_id] = {
+        "guild_id": guild_id,
+        "user_id": user_id,
+        "due_ts": due_ts,
+        "order_name": order_name,
+        "fire_ts": fire_ts,
+    }
+    heapq.heappush(_reminder_heap, (fire_ts, run_id))
+    # Wake the scheduler if this reminder is now the earliest one
+    if _reminder_wakeup is not None and _reminder_heap[0][1] == run_id:
+        _reminder_wakeup.set()
+
+def cancel_order_reminder(run_id: int):
+    """Cancel a pending reminder (heap entry is dropped lazily when it surfaces)"""
+    _reminder_entries.pop(run_id, None)
+
+async def rebuild_order_reminders():
+    """Rebuild the reminder heap from accepted runs that have not been reminded yet"""
+    _reminder_heap.clear()
+    _reminder_entries.clear()
+    rows = await fetchall(
+        """SELECT r.run_id, r.guild_id, r.user_id, r.due_at, o.name
+           FROM order_runs r
+           JOIN orders o ON o.order_id = r.order_id
+           LEFT JOIN order_reminders rem ON rem.guild_id = r.guild_id AND rem.user_id = r.user_id AND rem.run_id = r.run_id
+           WHERE r.status = 'accepted' AND rem.run_id IS NULL"""
+    )
+    for row in rows:
+        schedule_order_reminder(row["guild_id"], row["user_id"], row["run_id"], row["due_at"], row["name"])
+    print(f"[+] Scheduled {len(_reminder_entries)} personal order reminder(s)")
+
+async def _get_cached_user(user_id: int):
+    """Resolve a user from the cache, falling back to the REST API"""
+    user = bot.get_user(user_id)
+    if user is None:
+        user = await bot.fetch_user(user_id)
+    return user
+
+def _finish_order_reminder(run_id: int, entry: dict):
+    """Drop a reminder that is done with (unless it was cancelled or rescheduled meanwhile)"""
+    if _reminder_entries.get(run_id) is entry:
+        del _reminder_entries[run_id]
+
+def _retry_order_reminder(run_id: int, entry: dict):
+    """Check a reminder again in ORDER_REMINDER_RETRY_SECONDS, while the run is not yet due"""
+    fire_ts = int(datetime.datetime.now(datetime.UTC).timestamp()) + ORDER_REMINDER_RETRY_SECONDS
+    if _reminder_entries.get(run_id) is not entry:
+        return  # Cancelled (completed/failed) or rescheduled while it was firing
+    if fire_ts >= entry["due_ts"]:
+        del _reminder_entries[run_id]
+        return
+    entry["fire_ts"] = fire_ts
+    heapq.heappush(_reminder_heap, (fire_ts, run_id))
+
+@timed_job("personal_order_reminders")
+async def _fire_order_reminder(run_id: int, entry: dict):
+    """Send one personal order reminder DM (opted-in users only; re-queued until they opt in or the run is due)"""
+    guild_id = entry["guild_id"]
+    user_id = entry["user_id"]
+    
+    time_left = entry["due_ts"] - int(datetime.datetime.now(datetime.UTC).timestamp())
+    if time_left <= 0:
+        _finish_order_reminder(run_id, entry)
+        return  # Already overdue
+    
+    opted_in = await fetchone(
+        "SELECT enabled FROM user_notifications WHERE guild_id = ? AND user_id = ? AND enabled = 1",
+        (guild_id, user_id)
+    )
+    if not opted_in:
+        _retry_order_reminder(run_id, entry)
         return
     
-    now_uk = datetime.datetime.now(uk_tz)
-    today_str = now_uk.strftime("%Y-%m-%d")
+    hours_left = int(time_left / 3600)
+    minutes_left = int((time_left % 3600) / 60)
     
-    # Run at reset time (00:00 UK, or configurable)
-    if now_uk.hour != 0 or now_uk.minute > 5:
+    try:
+        user = await _get_cached_user(user_id)
+        from core.utils import impact_icon
+        
+        embed = discord.Embed(
+            title="Order Reminder",
+            description=f"Your order **{entry['order_name']}** is due in {hours_left}h {minutes_left}min.\n\nComplete it on time to earn your reward.",
+        )
+        embed.set_author(name="Orders", icon_url=impact_icon("neutral"))
+        
+        await outbound.send(user, embed=embed, priority=outbound.PRIORITY_DM)
+    except discord.Forbidden:
+        # User has DMs disabled, skip
+        _finish_order_reminder(run_id, entry)
         return
-    
-    if _last_orders_drop_run == today_str:
+    except Exception as e:
+        print(f"Failed to send reminder to user {user_id}, retrying: {e}")
+        _retry_order_reminder(run_id, entry)
         return
     
-    _last_orders_drop_run = today_str
-    print(f"Running daily orders drop at {now_uk.strftime('%Y-%m-%d %H:%M:%S')} UK time")
+    # Mark reminder as sent
+    _finish_order_reminder(run_id, entry)
+    await execute(
+        "INSERT INTO order_reminders (guild_id, user_id, run_id, reminder_sent_at) VALUES (?, ?, ?, ?)",
+        (guild_id, user_id, run_id, _now_iso())
+    )
+
+async def _order_reminder_scheduler():
+    """Sleep until the next reminder is due, fire it, repeat"""
+    global _reminder_wakeup
+    _reminder_wakeup = asyncio.Event()
     
     try:
-        for guild in bot.guilds:
-            guild_id = guild.id if guild else 0
-            
-            # Get announcement channel
-            config_row = await fetchone(
-                "SELECT channel_id FROM orders_announcement_config WHERE guild_id = ?",
-                (guild_id,)
-            )
-            
-            if not config_row:
-                continue  # No channel configured
-            
-            channel_id = config_row["channel_id"]
-            channel = guild.get_channel(channel_id)
-            
-            if not channel:
-                continue
-            
-            # Clear today's orders cache (forces refresh on next /orders call)
-            # The cache is in user_commands module, so orders will refresh naturally
+        await rebuild_order_reminders()
+    except Exception as e:
+        print(f"[-] Failed to rebuild order reminders: {e}")
+    
+    while True:
+        try:
+            now_ts = int(datetime.datetime.now(datetime.UTC).timestamp())
             
-            # Send announcement embed
-            from core.utils import impact_icon
-            embed = discord.Embed(
-                title="Orders",
-                description="New orders available, complete them to gain my favor. \n\nRemember, I reward good pups who get their orders done, and those who don't.. well..",
-            )
-            embed.set_thumbnail(url="https://i.imgur.com/sGDoIDA.png")
-            embed.set_footer(text="Type /orders in #commands channel")
-            embed.set_author(name="Orders", icon_url=impact_icon("neutral"))
+            # Fire everything that is due (skipping cancelled/rescheduled entries)
+            while _reminder_heap and _reminder_heap[0][0] <= now_ts:
+                fire_ts, run_id = heapq.heappop(_reminder_heap)
+                entry = _reminder_entries.get(run_id)
+                if not entry or entry["fire_ts"] != fire_ts:
+                    continue
+                entry["fire_ts"] = None  # In flight: stale heap copies are skipped until it is re-queued or done
+                # One task per reminder: a burst after a restart goes out in parallel (outbound paces the DMs)
+                task = asyncio.create_task(_fire_order_reminder(run_id, entry))
+                _reminder_sends.add(task)
+                task.add_done_callback(_reminder_sends.discard)
             
+            timeout = _reminder_heap[0][0] - now_ts if _reminder_heap else None
+            _reminder_wakeup.clear()
             try:
-                await channel.send(embed=embed)
-                print(f"Sent daily orders drop announcement to {channel.name} in {guild.name}")
-            except Exception as e:
-                print(f"Failed to send orders announcement in {guild.name}: {e}")
-    
-    except Exception as e:
-        print(f"Error in daily_orders_drop_task: {e}")
+                await asyncio.wait_for(_reminder_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error in order reminder scheduler: {e}")
+            await asyncio.sleep(5)
 
-@tasks.loop(minutes=15)
-async def personal_order_reminders_task():
-    """Send personal DM reminders for active orders with <= 2h left (for opted-in users)"""
-    try:
-        for guild in bot.guilds:
-            guild_id = guild.id if guild else 0
-            
-            # Get all opted-in users
-            opted_in_users = await fetchall(
-                "SELECT user_id FROM user_notifications WHERE guild_id = ? AND enabled = 1",
-                (guild_id,)
-            )
-            
-            for row in opted_in_users:
-                user_id = row["user_id"]
-                
-                try:
-                    # Get active orders for this user
-                    active_runs = await fetchall(
-                        """SELECT run_id, order_id, due_at FROM order_runs 
-                           WHERE guild_id = ? AND user_id = ? AND status = 'accepted'
-                           ORDER BY due_at""",
-                        (guild_id, user_id)
-                    )
-                    
-                    now = datetime.datetime.now(datetime.UTC)
-                    
-                    for run in active_runs:
-                        due_at = datetime.datetime.fromisoformat(run["due_at"].replace('Z', '+00:00'))
-                        time_left = (due_at - now).total_seconds()
-                        
-                        # Check if <= 2 hours left (7200 seconds)
-                        if 0 < time_left <= 7200:
-                            # Check if reminder already sent for this run
-                            reminder_sent = await fetchone(
-                                "SELECT reminder_sent_at FROM order_reminders WHERE guild_id = ? AND user_id = ? AND run_id = ?",
-                                (guild_id, user_id, run["run_id"])
-                            )
-                            
-                            if reminder_sent:
-                                continue  # Already sent
-                            
-                            # Get order name
-                            order_row = await fetchone(
-                                "SELECT name FROM orders WHERE order_id = ?",
-                                (run["order_id"],)
-                            )
-                            
-                            if not order_row:
-                                continue
-                            
-                            order_name = order_row["name"]
-                            hours_left = int(time_left / 3600)
-                            minutes_left = int((time_left % 3600) / 60)
-                            
-                            # Send DM reminder
-                            try:
-                                user = await bot.fetch_user(user_id)
-                                from core.utils import impact_icon
-                                
-                                embed = discord.Embed(
-                                    title="Order Reminder",
-                                    description=f"Your order **{order_name}** is due in {hours_left}h {minutes_left}min.\n\nComplete it on time to earn your reward.",
-                                )
-                                embed.set_author(name="Orders", icon_url=impact_icon("neutral"))
-                                
-                                await user.send(embed=embed)
-                                
-                                # Mark reminder as sent
-                                await execute(
-                                    "INSERT INTO order_reminders (guild_id, user_id, run_id, reminder_sent_at) VALUES (?, ?, ?, ?)",
-                                    (guild_id, user_id, run["run_id"], _now_iso())
-                                )
-                                
-                            except discord.Forbidden:
-                                # User has DMs disabled, skip
-                                pass
-                            except Exception as e:
-                                print(f"Failed to send reminder to user {user_id}: {e}")
-                
-                except Exception as e:
-                    print(f"Error processing reminders for user {user_id}: {e}")
-    
-    except Exception as e:
-        print(f"Error in personal_order_reminders_task: {e}")
+def start_order_reminder_scheduler():
+    """Start the reminder scheduler once (safe to call on every on_ready)"""
+    global _reminder_task
+    if _reminder_task is not None and not _reminder_task.done():
+        return
+    _reminder_task = asyncio.create_task(_order_reminder_scheduler())
+
+def register_scheduled_jobs():
+    """Wall-clock jobs (UK time) run by core.scheduler; next/last runs persist, so a restart catches up missed ones"""
+    from core import scheduler
+    uk_tz = _get_uk_timezone()
+    scheduler.register("v3_daily_job", v3_daily_job, scheduler.daily(0, 0, tz=uk_tz))
+    scheduler.register("daily_orders_drop", daily_orders_drop_task, scheduler.daily(0, 0, tz=uk_tz))
+    scheduler.register("v3_weekly_job", v3_weekly_job, scheduler.weekly(0, 0, 0, tz=uk_tz), lease_seconds=4 * 3600)
+    scheduler.register("promo_rotation", promo_rotation_scheduler, scheduler.daily(12, 0, tz=uk_tz))
 
+def start_background_tasks() -> list:
+    """Start every scheduled loop that isn't running (safe on reconnect); returns the names started"""
+    from core import scheduler
+    started = []
+    for loop in (auto_save, cleanup_expired_events_task, cooldown_flush):
+        if not loop.is_running():
+            loop.start()
+            started.append(loop.coro.__name__)
+    if _reminder_task is None or _reminder_task.done():
+        start_order_reminder_scheduler()
+        started.append("order_reminder_scheduler")
+    if not scheduler.is_running():
+        register_scheduled_jobs()
+        scheduler.start()
+        started.append("job_scheduler")
+    return started
@@ -0,0 +1,50 @@
+﻿"""
+Shared fixtures - a fresh SQLite database per test, seeded the way benchmarks/gateway_load.py seeds it,
+with every test run on one event loop (module-level asyncio locks bind to the first loop that waits on them)
+"""
+import asyncio
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MEMBERS = 20
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture
+def guild():
+    from benchmarks.gateway_load import build_guild
+    return build_guild(MEMBERS, random.Random(0))
+
+@pytest.fixture
+def run(loop, tmp_path, monkeypatch, guild):
+    """run(async_fn) awaits async_fn() against a fresh seeded database and returns its result"""
+    from core import db
+    from benchmarks.gateway_load import seed_database
+    monkeypatch.setattr(db, "_db_path", str(tmp_path / "isla_bot.db"))
+
+    def runner(body):
+        async def main():
+            # Process-level caches start cold, so statement counts do not depend on test order
+            from core import cooldowns
+            from systems import leaderboards, orders
+            db.invalidate_usercommands_channels(guild.id)
+            leaderboards.invalidate_leaderboards()
+            orders._open_runs.clear()
+            cooldowns._entries.clear()
+            await db.init_db()
+            try:
+                await seed_database(guild)
+                return await body()
+            finally:
+                await db.close_db()
+        return loop.run_until_complete(main())
+    return runner
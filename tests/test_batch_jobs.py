@@ -0,0 +1,67 @@
+﻿"""
+Checkpointed batch runner - failed users are retried only on request, crashed (claimed) users never are, and run history is pruned
+"""
+from core import batch_jobs
+from core.db import execute, fetchall, _now_iso
+
+GUILD = 1
+
+def test_rerun_with_retry_failed_retries_failed_and_skips_interrupted(run):
+    calls = []
+    broken = {2}
+
+    async def func(user_id):
+        calls.append(user_id)
+        if user_id in broken:
+            raise RuntimeError("boom")
+
+    async def body():
+        first = await batch_jobs.run_batch("job", "p1", GUILD, [1, 2, 3], func)
+        # User 4 was claimed when the process died: at most once, so it must not run again
+        await execute(
+            "INSERT INTO batch_job_items (job, period, guild_id, user_id, status, updated_at) VALUES (?, ?, ?, ?, 'claimed', ?)",
+            ("job", "p1", GUILD, 4, _now_iso())
+        )
+        broken.clear()
+        second = await batch_jobs.run_batch("job", "p1", GUILD, [1, 2, 3, 4], func, retry_failed=True)
+        items = await fetchall("SELECT user_id, status FROM batch_job_items WHERE job = 'job' ORDER BY user_id")
+        runs = await fetchall("SELECT done, failed, skipped FROM batch_job_runs WHERE job = 'job'")
+        return first, second, [tuple(row) for row in items], [tuple(row) for row in runs]
+
+    first, second, items, runs = run(body)
+    assert (first["done"], first["failed"]) == (2, 1)
+    assert (second["done"], second["failed"], second["skipped"]) == (1, 0, 1)
+    assert calls == [1, 2, 3, 2]
+    assert items == [(1, "done"), (2, "done"), (3, "done"), (4, "interrupted")]
+    assert runs == [(3, 0, 1)]
+
+def test_rerun_skips_failed_by_default(run):
+    calls = []
+
+    async def func(user_id):
+        calls.append(user_id)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    async def body():
+        await batch_jobs.run_batch("job", "p1", GUILD, [1, 2], func)
+        return await batch_jobs.run_batch("job", "p1", GUILD, [1, 2], func)
+
+    second = run(body)
+    assert calls == [1, 2]
+    assert (second["done"], second["failed"], second["resumed"]) == (0, 0, True)
+
+def test_run_history_is_pruned_per_job(run, monkeypatch):
+    monkeypatch.setattr(batch_jobs, "HISTORY_PER_JOB", 2)
+
+    async def func(user_id):
+        pass
+
+    async def body():
+        for period in ("p1", "p2", "p3"):
+            await batch_jobs.run_batch("job", period, GUILD, [1], func)
+        await batch_jobs.run_batch("other", "p1", GUILD, [1], func)
+        rows = await fetchall("SELECT job, period FROM batch_job_runs ORDER BY job, period")
+        return [tuple(row) for row in rows]
+
+    assert run(body) == [("job", "p2"), ("job", "p3"), ("other", "p1")]
@@ -0,0 +1,22 @@
+﻿"""
+Leaderboard indexes - open_leaderboard renders the first page from the index and pages with the view's cursor
+"""
+from benchmarks.gateway_load import GUILD_ID, FIRST_MEMBER_ID
+from systems import leaderboards
+
+def test_open_leaderboard_pages_the_coins_board(run):
+    from core.data import add_coins
+
+    async def body():
+        leaderboards.invalidate_leaderboards()
+        await add_coins(GUILD_ID, FIRST_MEMBER_ID, 500, reason="test")
+        embed, view = await leaderboards.open_leaderboard(GUILD_ID, "coins", users_per_page=5)
+        index = await leaderboards.get_leaderboard(GUILD_ID, "coins")
+        return embed, view, index
+
+    embed, view, index = run(body)
+    assert index.placement(FIRST_MEMBER_ID) == 1
+    assert view.max_pages == index.page_count(5) > 1
+    buttons = {item.custom_id: item.disabled for item in view.children if getattr(item, "custom_id", None)}
+    assert buttons["prev_page"] and not buttons["next_page"]
+    assert embed is not None
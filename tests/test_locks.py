@@ -0,0 +1,67 @@
+﻿"""
+Economy lock ordering - opposing transfers must not deadlock, and out-of-order nesting must fail fast
+"""
+import asyncio
+
+from benchmarks.gateway_load import GUILD_ID, FIRST_MEMBER_ID, STARTING_COINS
+from core.locks import LockOrderError, _stripe, economy_lock, economy_lock_pair
+
+def _users_by_stripe():
+    """(high, low): two members whose lock stripes are in descending order"""
+    high = FIRST_MEMBER_ID
+    for low in range(FIRST_MEMBER_ID + 1, FIRST_MEMBER_ID + 20):
+        if _stripe(GUILD_ID, low) < _stripe(GUILD_ID, high):
+            return high, low
+    raise AssertionError("no member with a lower stripe")
+
+def test_opposing_gives_do_not_deadlock(run):
+    from core.db import fetchall
+    from core.data import transfer
+    high, low = _users_by_stripe()
+
+    async def give(from_user, to_user):
+        # Mirrors /give: pair lock first, then transfer (which re-enters both stripes)
+        for _ in range(10):
+            async with economy_lock_pair(GUILD_ID, from_user, to_user, command="give"):
+                await transfer(GUILD_ID, from_user, to_user, 10, reason="give")
+
+    async def body():
+        await asyncio.wait_for(asyncio.gather(give(high, low), give(low, high)), timeout=20)
+        rows = await fetchall(
+            "SELECT user_id, coins_balance FROM economy_balance WHERE guild_id = ? AND user_id IN (?, ?)",
+            (GUILD_ID, high, low)
+        )
+        return {row["user_id"]: row["coins_balance"] for row in rows}
+
+    assert run(body) == {high: STARTING_COINS, low: STARTING_COINS}
+
+def test_pair_nested_under_a_higher_stripe_raises_instead_of_deadlocking(loop):
+    high, low = _users_by_stripe()
+
+    async def give_inside_handler_lock(invoker, member):
+        # A handler holding the invoker's lock (economy_locked) that then takes the pair
+        async with economy_lock(GUILD_ID, invoker, command="handler"):
+            await asyncio.sleep(0)
+            async with economy_lock_pair(GUILD_ID, invoker, member, command="give"):
+                await asyncio.sleep(0.01)
+
+    async def body():
+        return await asyncio.wait_for(
+            asyncio.gather(give_inside_handler_lock(high, low), give_inside_handler_lock(low, high), return_exceptions=True),
+            timeout=5
+        )
+
+    results = loop.run_until_complete(body())
+    assert isinstance(results[0], LockOrderError)
+    assert results[1] is None
+
+def test_single_lock_inside_pair_reenters(loop):
+    high, low = _users_by_stripe()
+
+    async def body():
+        async with economy_lock_pair(GUILD_ID, high, low):
+            async with economy_lock(GUILD_ID, high):
+                async with economy_lock(GUILD_ID, low):
+                    return True
+
+    assert loop.run_until_complete(asyncio.wait_for(body(), timeout=5))
@@ -0,0 +1,75 @@
+﻿"""
+Personal order reminders - an entry stays queued until its DM is sent, through opt-in and transient failures
+"""
+import datetime
+
+import pytest
+
+from core import outbound
+from core.db import execute, fetchall
+from systems import tasks
+
+GUILD, USER, RUN = 1, 2, 3
+
+@pytest.fixture(autouse=True)
+def fresh_reminders(monkeypatch):
+    monkeypatch.setattr(tasks, "_reminder_heap", [])
+    monkeypatch.setattr(tasks, "_reminder_entries", {})
+    monkeypatch.setattr(tasks, "_reminder_wakeup", None)
+
+    async def cached_user(user_id):
+        return user_id
+    monkeypatch.setattr(tasks, "_get_cached_user", cached_user)
+
+def _schedule(hours_left: float = 1):
+    due = datetime.datetime.now(datetime.UTC) + datetime.timedelta(hours=hours_left)
+    tasks.schedule_order_reminder(GUILD, USER, RUN, due.isoformat(), "Presence Ping")
+    return tasks._reminder_entries[RUN]
+
+def _sent_markers():
+    return fetchall("SELECT run_id FROM order_reminders WHERE guild_id = ? AND user_id = ?", (GUILD, USER))
+
+def test_reminder_waits_for_opt_in_then_sends(run, monkeypatch):
+    sent = []
+
+    async def send(target, **kwargs):
+        sent.append(target)
+    monkeypatch.setattr(outbound, "send", send)
+
+    async def body():
+        entry = _schedule()
+        await tasks._fire_order_reminder(RUN, entry)
+        requeued = (tasks._reminder_entries.get(RUN) is entry, entry["fire_ts"], list(tasks._reminder_heap))
+        await execute("INSERT INTO user_notifications (guild_id, user_id, enabled) VALUES (?, ?, 1)", (GUILD, USER))
+        await tasks._fire_order_reminder(RUN, entry)
+        return requeued, [row["run_id"] for row in await _sent_markers()]
+
+    (kept, fire_ts, heap), markers = run(body)
+    assert kept and (fire_ts, RUN) in heap
+    assert sent == [USER] and markers == [RUN]
+    assert RUN not in tasks._reminder_entries
+
+def test_transient_send_failure_is_retried_but_cancel_wins(run, monkeypatch):
+    async def send(target, **kwargs):
+        raise ConnectionError("gateway hiccup")
+    monkeypatch.setattr(outbound, "send", send)
+
+    async def body():
+        await execute("INSERT INTO user_notifications (guild_id, user_id, enabled) VALUES (?, ?, 1)", (GUILD, USER))
+        entry = _schedule()
+        await tasks._fire_order_reminder(RUN, entry)
+        retried = tasks._reminder_entries.get(RUN) is entry
+        tasks.cancel_order_reminder(RUN)  # Order completed before the retry
+        await tasks._fire_order_reminder(RUN, entry)
+        return retried, await _sent_markers()
+
+    retried, markers = run(body)
+    assert retried
+    assert RUN not in tasks._reminder_entries and markers == []
+
+def test_retry_stops_once_the_run_is_due(run):
+    async def body():
+        entry = _schedule(hours_left=0.1)  # Next check would land after due_at
+        await tasks._fire_order_reminder(RUN, entry)
+    run(body)
+    assert RUN not in tasks._reminder_entries
@@ -0,0 +1,114 @@
+﻿"""
+Query budgets for the hot paths - each block fails with its statement fingerprints if a change adds queries
+(counts measured against the seeded database from benchmarks/gateway_load.py, statements inside transaction()
+included; raise them only on purpose)
+"""
+import random
+
+import discord
+import pytest
+from discord.ext import commands
+
+from benchmarks.gateway_load import (
+    FIRST_MEMBER_ID, TEXT_CHANNEL_IDS, USER_COMMAND_CHANNEL_ID, FakeBot, FakeInteraction, FakeMessage
+)
+from core import db
+from core.query_budget import QueryBudgetExceeded, query_budget
+
+PROFILE_QUERIES, PROFILE_COMMITS = 20, 2
+SLOTS_BET_QUERIES, SLOTS_BET_COMMITS = 9, 1
+ORDER_COMPLETE_QUERIES, ORDER_COMPLETE_COMMITS = 14, 6
+ON_MESSAGE_QUERIES, ON_MESSAGE_COMMITS = 4, 2
+DAILY_BASE_QUERIES, DAILY_QUERIES_PER_USER = 13, 9
+DAILY_BASE_COMMITS, DAILY_COMMITS_PER_USER = 4, 1
+
+@pytest.fixture
+def tree(guild):
+    from systems import handlers, events, gambling, tasks
+    from commands import user_commands
+    fake_bot = FakeBot(guild)
+    for module in (handlers, events, gambling, tasks):
+        module.set_bot(fake_bot)
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+    user_commands.register_commands(bot)
+    return bot.tree
+
+def _interaction(guild, user_id):
+    return FakeInteraction(guild.members[user_id], guild.get_channel(USER_COMMAND_CHANNEL_ID))
+
+def _message(guild, user_id, content="hello there"):
+    return FakeMessage(random.getrandbits(40), guild.members[user_id], guild.get_channel(TEXT_CHANNEL_IDS[0]), content)
+
+def test_profile(run, guild, tree):
+    async def body():
+        with query_budget(PROFILE_QUERIES, PROFILE_COMMITS, label="/profile"):
+            await tree.get_command("profile")._callback(_interaction(guild, FIRST_MEMBER_ID))
+    run(body)
+
+def test_profile_over_budget_fails(run, guild, tree):
+    async def body():
+        with query_budget(PROFILE_QUERIES // 2, label="/profile"):
+            await tree.get_command("profile")._callback(_interaction(guild, FIRST_MEMBER_ID))
+
+    with pytest.raises(QueryBudgetExceeded, match="/profile"):
+        run(body)
+
+def test_slots_bet(run, guild, tree):
+    async def body():
+        command = tree.get_command("slots").get_command("bet")
+        with query_budget(SLOTS_BET_QUERIES, SLOTS_BET_COMMITS, label="/slots bet") as budget:
+            await command._callback(_interaction(guild, FIRST_MEMBER_ID + 1), bet=50)
+        return budget.commits
+    assert run(body) == SLOTS_BET_COMMITS  # Settled, not stopped by a cooldown or channel check
+
+def test_order_complete(run, guild, tree):
+    from core.data import order_accept
+    from systems import handlers
+    user_id = FIRST_MEMBER_ID + 2
+
+    async def body():
+        await db.execute(
+            """INSERT INTO orders (guild_id, name, reward_coins, due_seconds, created_at)
+               VALUES (?, 'Presence Ping', 40, 21600, ?)""",
+            (guild.id, db._now_iso())
+        )
+        order = await db.fetchone("SELECT order_id FROM orders WHERE guild_id = ?", (guild.id,))
+        await order_accept(guild.id, user_id, order["order_id"], 21600, "presence_ping")
+        await handlers.on_message(_message(guild, user_id))
+
+        command = tree.get_command("order").get_command("complete")
+        with query_budget(ORDER_COMPLETE_QUERIES, ORDER_COMPLETE_COMMITS, label="/order complete"):
+            await command._callback(_interaction(guild, user_id), order_name="Presence Ping")
+        row = await db.fetchone("SELECT status FROM order_runs WHERE guild_id = ? AND user_id = ?", (guild.id, user_id))
+        return row["status"]
+    assert run(body) == "completed"
+
+def test_on_message(run, guild):
+    from systems import handlers, events, gambling, tasks
+    fake_bot = FakeBot(guild)
+    for module in (handlers, events, gambling, tasks):
+        module.set_bot(fake_bot)
+
+    async def body():
+        for user_id in (FIRST_MEMBER_ID + 3, FIRST_MEMBER_ID + 3, FIRST_MEMBER_ID + 4):
+            with query_budget(ON_MESSAGE_QUERIES, ON_MESSAGE_COMMITS, label="on_message"):
+                await handlers.on_message(_message(guild, user_id))
+    run(body)
+
+def test_daily_progression(run, guild, tree):
+    from systems.tasks import run_daily_progression
+
+    async def body():
+        now = db._now_iso()
+        await db.executemany(
+            """INSERT INTO activity_daily (guild_id, user_id, day, messages_count, updated_at)
+               VALUES (?, ?, ?, 1, ?)""",
+            [(guild.id, user_id, db._today_str(), now) for user_id in guild.members]
+        )
+        users = len(guild.members)
+        with query_budget(DAILY_BASE_QUERIES + DAILY_QUERIES_PER_USER * users,
+                          DAILY_BASE_COMMITS + DAILY_COMMITS_PER_USER * users, label="daily job"):
+            processed = await run_daily_progression(guild.id, "2026-01-01")
+        return processed, users
+    processed, users = run(body)
+    assert processed == users
@@ -0,0 +1,54 @@
+﻿"""
+Persistent scheduler - a new job waits for its next firing, and stats come from one query
+"""
+import datetime
+import time
+
+import pytest
+
+from core import scheduler
+from core.query_budget import query_budget
+
+@pytest.fixture(autouse=True)
+def fresh_scheduler(monkeypatch):
+    monkeypatch.setattr(scheduler, "_jobs", {})
+    monkeypatch.setattr(scheduler, "_next_runs", {})
+    monkeypatch.setattr(scheduler, "_running", {})
+
+def _daily_at(ts: float) -> scheduler.Schedule:
+    at = datetime.datetime.fromtimestamp(ts, datetime.timezone.utc)
+    return scheduler.daily(at.hour, at.minute)
+
+async def _noop():
+    pass
+
+def test_first_load_starts_at_the_next_firing(run):
+    async def body():
+        now = time.time()
+        scheduler.register("recent", _noop, _daily_at(now - 600))  # Fired 10 minutes ago (maybe by the old loop)
+        await scheduler._load_job("recent")
+        return now
+    now = run(body)
+    assert now < scheduler._next_runs["recent"] <= now + 86400
+
+def test_scheduler_stats_in_one_query(run):
+    from core.db import executemany
+
+    async def body():
+        scheduler.register("a", _noop, scheduler.daily(3))
+        scheduler.register("b", _noop, scheduler.daily(4))
+        await scheduler._load_job("a")
+        await scheduler._load_job("b")
+        runs = [("a", 0, 0, float(seconds), "ok") for seconds in range(1, 13)] + [("b", 0, 0, None, "running")]
+        await executemany(
+            "INSERT INTO scheduled_job_runs (name, scheduled_for, started_at, seconds, status) VALUES (?, ?, ?, ?, ?)",
+            runs
+        )
+        with query_budget(1, label="get_scheduler_stats"):
+            return await scheduler.get_scheduler_stats()
+
+    jobs = run(body)["jobs"]
+    assert jobs["a"]["last_seconds"] == 12.0
+    assert jobs["a"]["avg_seconds"] == sum(range(3, 13)) / scheduler.STATS_RECENT_RUNS
+    assert jobs["b"]["last_seconds"] is None and jobs["b"]["avg_seconds"] is None
+    assert jobs["a"]["registered"] and not jobs["a"]["running"]